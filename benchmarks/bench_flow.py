@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+#
+# Benchmarks fftgen.py's own orchestration against local stand-ins for SPIRAL and the EDA tools.
+#
+# The flow runs against the SPIRAL stand-in server and a stand-in Hammer CAD
+# repository (see fftgen_standins), whose fake tools take a configurable
+# runtime, follow a configurable slack curve and write reports of a
+# configurable size. Each section runs in its own process, so module state
+# and peak memory are measured per section:
+#
+#   latency     full flows one at a time: wall time per design, the parts of it
+#               spent in the tools and waiting on SPIRAL (from the flow's profile
+#               spans, see fftgen_profile) and the rest, fftgen's own overhead
+#   throughput  sweeps of the same points on the scheduler at each worker count,
+#               and as a pipeline: designs per minute and the speedup over 1 worker
+#   reports     reading synthetic timing reports of each size: MB/s of the full
+#               PPA read and the time to read only the worst path
+#   tuning      flows per clock period search strategy: runs per tuning stage,
+#               aborted runs and the closed periods
+#
+# Results are written to a JSON file for regression tracking; --baseline compares
+# them with an earlier file and exits 1 if a metric got worse beyond --tolerance.
+#
+# Usage: python3 benchmarks/bench_flow.py [--quick] [--sections latency,tuning] [--output FILE] [--baseline FILE]
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+
+import fftgen_standins
+import fftgen_profile
+
+SECTIONS = ["latency", "throughput", "reports", "tuning"]
+
+# The metrics compared with a baseline, and whether higher values are better
+TRACKED_METRICS = {
+    "latency.mean_overhead_seconds": False,
+    "latency.mean_wall_seconds": False,
+    "throughput.designs_per_minute": True,
+    "reports.mb_per_second": True,
+    "tuning.mean_runs": False,
+    "peak_rss_mb": False,
+}
+
+DEFAULTS = {
+    "designs": 4,
+    "points": 8,
+    "workers": [1, 2, 4],
+    "report_mb": [1, 8],
+    "strategies": ["bracket", "ladder"],
+    "tuning_points": 6,
+    "syn_seconds": 0.3,
+    "par_seconds": 0.4,
+    "report_paths": 200,
+    "critical_path": 2.0,
+    "effort": 0.3,
+    "slack_noise": 0.05,
+    "generation_delay": 0.5,
+    "verilog_kb": 256,
+}
+
+QUICK = dict(DEFAULTS, designs=2, points=4, workers=[1, 2], report_mb=[1], tuning_points=3, syn_seconds=0.1,
+             par_seconds=0.1, generation_delay=0.2, verilog_kb=64)
+
+def design_points(fftgen, count):
+    """Returns count design points spread over transform sizes, widths and stream widths."""
+    points, _ = fftgen.expand_sweep({"sweep": {"idN": [64, 256, 1024, 4096], "idWidth": [12, 16, 24],
+                                               "idStreamWidth": [2, 4]}})
+    return points[::max(1, len(points) // count)][:count]
+
+def tool_seconds(spans):
+    """The time spent in the tools (make, and the Hammer clone and build) according to a flow's spans."""
+    return sum(s["wall"] for s in spans if s["cat"] == "tool")
+
+def spiral_seconds(spans):
+    """The time spent waiting on the SPIRAL server (requests, polling and downloads) according to a flow's spans."""
+    return sum(s["wall"] for s in spans if s["name"] in ("spiral-request", "spiral-poll-wait", "verilog-download"))
+
+def summary(values):
+    """Mean, median and maximum of a list of numbers."""
+    ordered = sorted(values)
+    return {"mean": round(sum(ordered) / len(ordered), 4), "p50": round(ordered[len(ordered) // 2], 4),
+            "max": round(ordered[-1], 4)}
+
+def bench_latency(fftgen, settings, work_dir, server, hammer_url):
+    """
+    Runs full flows one at a time, splitting each design's wall time into the tools, the
+    SPIRAL server (including polls beyond its generation delay) and fftgen's own overhead.
+    """
+    designs = []
+    for params in design_points(fftgen, settings["designs"]):
+        start_time = time.time()
+        project = fftgen.run_flow(params, os.path.join(work_dir, "latency", fftgen.point_name(params)),
+                                  use_cache=False, base_url=server.base_url, hammer_url=hammer_url,
+                                  predict_periods=False)
+        wall = time.time() - start_time
+        spans = project.spans if project else []
+        designs.append({"name": fftgen.point_name(params), "wall_seconds": round(wall, 3),
+                        "tool_seconds": round(tool_seconds(spans), 3), "spiral_seconds": round(spiral_seconds(spans), 3),
+                        "overhead_seconds": round(wall - tool_seconds(spans) - spiral_seconds(spans), 3),
+                        "stage_seconds": project.stage_seconds if project else None,
+                        "completed": bool(project and project.completed_stages == list(fftgen.FLOW_STAGES))})
+    return {"designs": designs,
+            "mean_wall_seconds": summary([d["wall_seconds"] for d in designs])["mean"],
+            "mean_overhead_seconds": summary([d["overhead_seconds"] for d in designs])["mean"],
+            "overhead_seconds": summary([d["overhead_seconds"] for d in designs])}
+
+def bench_throughput(fftgen, settings, work_dir, server, hammer_url):
+    """Sweeps the same points at every worker count, and as a pipeline."""
+    points = design_points(fftgen, settings["points"])
+    spec_path = os.path.join(work_dir, "throughput.json")
+    with open(spec_path, 'w') as f:
+        json.dump({"initial_clock_period": 3, "points": points}, f)
+    runs = []
+    for label, options in [(f"{workers} worker(s)", {"jobs": workers}) for workers in settings["workers"]] + \
+                          [("pipeline", {"pipeline": True})]:
+        output_dir = os.path.join(work_dir, "throughput", label.split()[0])
+        start_time = time.time()
+        results = fftgen.run_sweep(spec_path, output_dir, use_cache=False, base_url=server.base_url,
+                                   predict_periods=False, **options)
+        wall = time.time() - start_time
+        completed = sum(result["status"] == "completed" for result in results)
+        runs.append({"mode": label, "workers": options.get("jobs"), "designs": completed,
+                     "wall_seconds": round(wall, 3), "designs_per_minute": round(60 * completed / wall, 2)})
+    base = runs[0]["designs_per_minute"]
+    for run in runs:
+        run["speedup"] = round(run["designs_per_minute"] / base, 2) if base else None
+    return {"runs": runs, "designs_per_minute": max(run["designs_per_minute"] for run in runs)}
+
+def bench_reports(fftgen, settings, work_dir, server, hammer_url):
+    """Reads synthetic Place-and-Route reports of each size, in full and worst path only."""
+    import fftgen_reports
+    from bench_reports import write_reports
+    sizes = []
+    for megabytes in settings["report_mb"]:
+        project_dir = os.path.join(work_dir, "reports", f"{megabytes}mb")
+        paths = write_reports(project_dir, megabytes)
+        start_time = time.time()
+        ppa = fftgen_reports.read_ppa(project_dir)
+        full = time.time() - start_time
+        start_time = time.time()
+        fftgen.read_setup_slack(os.path.join(project_dir, fftgen_reports.PAR_SETUP_REPORT))
+        worst = time.time() - start_time
+        sizes.append({"report_mb": megabytes, "paths_per_report": paths, "read_ppa_seconds": round(full, 3),
+                      "mb_per_second": round(2 * megabytes / full, 2), "worst_path_seconds": round(worst, 5),
+                      "setup_paths": ppa.setup.paths})
+    # Small reads are dominated by fixed costs, so the largest size is tracked
+    return {"sizes": sizes, "mb_per_second": max(sizes, key=lambda size: size["report_mb"])["mb_per_second"]}
+
+def bench_tuning(fftgen, settings, work_dir, server, hammer_url):
+    """Runs the same points with every clock period search strategy and counts the tuning runs."""
+    points = design_points(fftgen, settings["tuning_points"])
+    strategies = {}
+    for strategy in settings["strategies"]:
+        flows = []
+        for params in points:
+            project = fftgen.run_flow(params, os.path.join(work_dir, "tuning", strategy, fftgen.point_name(params)),
+                                      initial_clock_period=3, use_cache=True, base_url=server.base_url,
+                                      hammer_url=hammer_url, search_strategy=strategy, predict_periods=False)
+            history = project.history if project else []
+            flows.append({"name": fftgen.point_name(params),
+                          "syn_runs": sum(entry["stage"] == "Synthesis" for entry in history),
+                          "par_runs": sum(entry["stage"] == "Place-and-Route" for entry in history),
+                          "aborted": sum(entry["outcome"] == "aborted" for entry in history),
+                          "syn_clock_period": project and project.syn_clock_period,
+                          "par_clock_period": project and project.par_clock_period})
+        strategies[strategy] = {"flows": flows,
+                                "syn_runs": summary([flow["syn_runs"] for flow in flows]),
+                                "par_runs": summary([flow["par_runs"] for flow in flows]),
+                                "aborted": sum(flow["aborted"] for flow in flows),
+                                "mean_runs": round(sum(flow["syn_runs"] + flow["par_runs"] for flow in flows)
+                                                   / len(flows), 3)}
+    return {"strategies": strategies, "mean_runs": min(s["mean_runs"] for s in strategies.values())}
+
+BENCHMARKS = {"latency": bench_latency, "throughput": bench_throughput, "reports": bench_reports,
+              "tuning": bench_tuning}
+
+def run_section(section, settings, result_path):
+    """Runs one section in this process and writes its results, with the process's peak memory."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ["FFTGEN_CACHE_DIR"] = os.path.join(work_dir, "cache")
+        os.environ["FFTGEN_HAMMER_CACHE"] = os.path.join(work_dir, "hammer_cache")
+        hammer_url = fftgen_standins.create_fake_hammer(
+            os.path.join(work_dir, "fake_hammer"), syn_seconds=settings["syn_seconds"],
+            par_seconds=settings["par_seconds"], critical_path=settings["critical_path"],
+            report_paths=settings["report_paths"], effort=settings["effort"], slack_noise=settings["slack_noise"])
+        # Sweeps create their projects with the default Hammer URL, read when fftgen is imported
+        os.environ["FFTGEN_HAMMER_URL"] = hammer_url
+        import fftgen
+        fftgen.PAUSE_SECONDS = 0
+        fftgen.RESULTS_DB_PATH = None
+
+        start_time = time.time()
+        with fftgen_standins.FakeSpiralServer(generation_delay=settings["generation_delay"],
+                                              verilog_bytes=settings["verilog_kb"] * 1024) as server:
+            results = BENCHMARKS[section](fftgen, settings, work_dir, server, hammer_url)
+            results["spiral_requests"] = dict(server.requests)
+        results["seconds"] = round(time.time() - start_time, 3)
+        results["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * fftgen_profile.RSS_UNIT_MB, 1)
+        results["child_peak_rss_mb"] = round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * fftgen_profile.RSS_UNIT_MB, 1)
+    with open(result_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BENCH_DIR, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, universal_newlines=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def metric(results, name):
+    """Looks up a tracked metric, e.g. 'latency.mean_wall_seconds', or 'peak_rss_mb' over all sections."""
+    if name == "peak_rss_mb":
+        values = [section["peak_rss_mb"] for section in results["sections"].values() if "peak_rss_mb" in section]
+        return max(values) if values else None
+    section, key = name.split(".")
+    return results["sections"].get(section, {}).get(key)
+
+def compare(results, baseline, tolerance):
+    """Prints each tracked metric against the baseline. Returns the names of those that regressed."""
+    regressions = []
+    print(f"{'metric':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, higher_is_better in TRACKED_METRICS.items():
+        old, new = metric(baseline, name), metric(results, name)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<36} {old:>10.3f} {new:>10.3f} {100 * change:>+7.1f}%{flag}")
+    return regressions
+
+def print_results(results):
+    sections = {name: section for name, section in results["sections"].items() if "error" not in section}
+    print("============================================================")
+    if "latency" in sections:
+        latency = sections["latency"]
+        print(f"Latency: {latency['mean_wall_seconds']:.2f} s per design, of which "
+              f"{latency['mean_overhead_seconds']:.2f} s outside the tools and SPIRAL")
+        for design in latency["designs"]:
+            print(f"  {design['name']:<40} wall {design['wall_seconds']:>7.2f} s  tools {design['tool_seconds']:>7.2f} s  "
+                  f"SPIRAL {design['spiral_seconds']:>6.2f} s  overhead {design['overhead_seconds']:>6.2f} s")
+    if "throughput" in sections:
+        print("Throughput:")
+        for run in sections["throughput"]["runs"]:
+            print(f"  {run['mode']:<12} {run['designs']:>3} design(s) in {run['wall_seconds']:>7.2f} s  "
+                  f"{run['designs_per_minute']:>7.2f} designs/min  {run['speedup']:>5.2f}x")
+    if "reports" in sections:
+        print("Report parsing:")
+        for size in sections["reports"]["sizes"]:
+            print(f"  2 x {size['report_mb']:>4g} MB  read_ppa {size['read_ppa_seconds']:>7.3f} s  "
+                  f"{size['mb_per_second']:>7.1f} MB/s  worst path {1000 * size['worst_path_seconds']:>6.2f} ms")
+    if "tuning" in sections:
+        print("Tuning runs per design:")
+        for strategy, stats in sections["tuning"]["strategies"].items():
+            print(f"  {strategy:<8} synthesis {stats['syn_runs']['mean']:>5.2f} (max {stats['syn_runs']['max']})  "
+                  f"Place-and-Route {stats['par_runs']['mean']:>5.2f} (max {stats['par_runs']['max']})  "
+                  f"aborted {stats['aborted']}")
+    print("Peak memory: " + ", ".join(f"{name} {section['peak_rss_mb']:.0f} MB (tools {section['child_peak_rss_mb']:.0f} MB)"
+                                      for name, section in sections.items()))
+    print("============================================================")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fftgen.py's orchestration against local stand-ins.")
+    parser.add_argument("--sections", default=",".join(SECTIONS),
+                        help="The comma-separated sections to run (default: %(default)s).")
+    parser.add_argument("--quick", action="store_true", help="Use fewer and shorter runs, e.g. for CI.")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a setting, e.g. --set syn_seconds=1 or --set workers=[1,8] "
+                             f"(settings: {', '.join(DEFAULTS)}).")
+    parser.add_argument("--output", default="bench_flow.json", help="The results file (default: %(default)s).")
+    parser.add_argument("--baseline", help="Compare with an earlier results file and exit 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="The relative change counted as a regression (default: %(default)s).")
+    parser.add_argument("--verbose", action="store_true", help="Show the flows' output.")
+    parser.add_argument("--section", help=argparse.SUPPRESS)
+    parser.add_argument("--settings", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.section:
+        run_section(args.section, json.loads(args.settings), args.result)
+        return 0
+
+    settings = dict(QUICK if args.quick else DEFAULTS)
+    for item in args.set:
+        key, _, value = item.partition("=")
+        if key not in DEFAULTS:
+            parser.error(f"unknown setting {key}")
+        settings[key] = json.loads(value)
+    sections = [section.strip() for section in args.sections.split(",") if section.strip()]
+    for section in sections:
+        if section not in BENCHMARKS:
+            parser.error(f"unknown section {section}")
+
+    results = {"created_at": time.time(), "commit": git_commit(), "python": platform.python_version(),
+               "host": {"platform": platform.platform(), "cpus": os.cpu_count()}, "settings": settings,
+               "sections": {}}
+    for section in sections:
+        print(f"Running the {section} benchmark...", flush=True)
+        with tempfile.NamedTemporaryFile(suffix=".json") as result_file:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--section", section, "--settings", json.dumps(settings),
+                 "--result", result_file.name],
+                stdout=None if args.verbose else subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+            if completed.returncode != 0:
+                print(f"The {section} benchmark failed:\n{completed.stderr[-2000:]}")
+                results["sections"][section] = {"error": completed.stderr[-2000:]}
+                continue
+            with open(result_file.name) as f:
+                results["sections"][section] = json.load(f)
+
+    print_results(results)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote the results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {100 * args.tolerance:.0f}%.")
+            return 1
+    return 1 if any("error" in section for section in results["sections"].values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
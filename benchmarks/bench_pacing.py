@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+#
+# Measures fftgen.py's orchestration overhead per design with and without pauses.
+#
+# The full flow (generate, setup, synthesis tuning, Place-and-Route tuning) runs
+# against the local SPIRAL stand-in and a stand-in Hammer CAD repository. The
+# overhead of a design is its wall time minus the time spent inside the stand-in
+# tools, as recorded in the per-iteration tuning history.
+#
+# Usage: python3 benchmarks/bench_pacing.py [--designs N] [--pause-before SECONDS]
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import fftgen_standins
+
+def run_designs(fftgen, points, work_dir, base_url, hammer_url, pause_seconds):
+    """Runs the flow for every point and returns (wall seconds, tool seconds) per design."""
+    fftgen.PAUSE_SECONDS = pause_seconds
+    timings = []
+    for params in points:
+        base_dir = os.path.join(work_dir, f"pause{pause_seconds}", fftgen.point_name(params))
+        start_time = time.time()
+        fftgen.run_flow(params, base_dir, initial_clock_period=3, use_cache=False, base_url=base_url,
+                        hammer_url=hammer_url)
+        wall = time.time() - start_time
+        with open(os.path.join(base_dir, "fft_block_design", "fftgen", "tuning_history.json")) as f:
+            tool = sum(entry["runtime"] for entry in json.load(f))
+        timings.append((wall, tool))
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-design orchestration overhead with and without pauses.")
+    parser.add_argument("--designs", type=int, default=2, help="The number of designs to run (default: %(default)s).")
+    parser.add_argument("--pause-before", type=float, default=5.0,
+                        help="The pause of the 'before' run in seconds (default: %(default)s).")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ["FFTGEN_CACHE_DIR"] = os.path.join(work_dir, "cache")
+        os.environ["FFTGEN_HAMMER_CACHE"] = os.path.join(work_dir, "hammer_cache")
+        import fftgen
+
+        hammer_url = fftgen_standins.create_fake_hammer(os.path.join(work_dir, "fake_hammer"),
+                                                        syn_seconds=0.2, par_seconds=0.3)
+        points, _ = fftgen.expand_sweep({"sweep": {"idN": [64, 256, 1024, 4096], "idRadix": [2, 4]}})
+        points = points[:args.designs]
+
+        results = {}
+        for label, pause_seconds in (("before", args.pause_before), ("after", 0)):
+            with fftgen_standins.FakeSpiralServer(generation_delay=0.5) as server:
+                timings = run_designs(fftgen, points, work_dir, server.base_url, hammer_url, pause_seconds)
+            overheads = [wall - tool for wall, tool in timings]
+            results[label] = {
+                "pause_seconds": pause_seconds,
+                "designs": len(timings),
+                "mean_wall_seconds": sum(wall for wall, _ in timings) / len(timings),
+                "mean_overhead_seconds": sum(overheads) / len(overheads),
+            }
+
+    print("============================================================")
+    print(f"{'run':<8} {'pause (s)':>10} {'designs':>8} {'wall/design (s)':>16} {'overhead/design (s)':>20}")
+    for label, result in results.items():
+        print(f"{label:<8} {result['pause_seconds']:>10} {result['designs']:>8} "
+              f"{result['mean_wall_seconds']:>16.2f} {result['mean_overhead_seconds']:>20.2f}")
+    print("============================================================")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
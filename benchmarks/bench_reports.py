@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+#
+# Measures how long it takes to ingest large Place-and-Route reports.
+#
+# Synthetic Innovus setup and hold reports of the requested size are written
+# gzip-compressed, as Innovus writes them. The "before" run does what the flow
+# used to do: gunzip both reports to disk, then scan each file line by line
+# (here for every path, to also get WNS/TNS). The "after" run streams both .gz
+# reports in a single in-memory pass each with fftgen_reports.read_ppa(). The
+# time to read only the worst path, as clock period tuning does, is shown too.
+#
+# Usage: python3 benchmarks/bench_reports.py [--mb MEGABYTES] [--output FILE]
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import fftgen_reports
+import fftgen_standins
+
+def write_reports(project_dir, megabytes):
+    """Writes gzip-compressed setup and hold reports of about the given uncompressed size, plus area and power."""
+    paths = fftgen_standins.timing_report_paths(megabytes, style="innovus")
+    fftgen_standins.write_par_reports(project_dir, -0.05, 0.02, 3.0, 250000.0, paths, seed=1)
+    return paths
+
+def ingest_before(project_dir):
+    """Decompresses both timing reports to disk and scans them line by line."""
+    results = {}
+    for name, report in (("setup", fftgen_reports.PAR_SETUP_REPORT), ("hold", fftgen_reports.PAR_HOLD_REPORT)):
+        report_path = os.path.join(project_dir, report)
+        if os.path.exists(report_path):
+            os.remove(report_path)
+        subprocess.run(["gunzip", "-k", os.path.basename(report_path) + ".gz"], cwd=os.path.dirname(report_path),
+                       check=True)
+        worst, tns, paths = None, 0.0, 0
+        with open(report_path, 'r') as report_file:
+            for line in report_file:
+                if "Path " in line and (": MET" in line or ": VIOLATED" in line):
+                    slack = float(line[line.find("(") + 1:line.find(")")].split()[0])
+                    worst = slack if worst is None else worst
+                    tns += min(0.0, slack)
+                    paths += 1
+        results[name] = (worst, round(tns, 6), paths)
+        os.remove(report_path)
+    return results
+
+def ingest_after(project_dir):
+    """Streams both gzip-compressed timing reports, plus area and power, in one pass each."""
+    ppa = fftgen_reports.read_ppa(project_dir)
+    return {name: (summary.slack, round(summary.tns, 6), summary.paths)
+            for name, summary in (("setup", ppa.setup), ("hold", ppa.hold))}
+
+def timed(func, *args):
+    start_time = time.time()
+    result = func(*args)
+    return time.time() - start_time, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Place-and-Route report ingestion.")
+    parser.add_argument("--mb", type=float, default=300,
+                        help="The uncompressed size of each timing report in MB (default: %(default)s).")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        print(f"Writing two {args.mb:g} MB timing reports...")
+        paths = write_reports(work_dir, args.mb)
+        compressed = sum(os.path.getsize(os.path.join(work_dir, report + ".gz"))
+                         for report in (fftgen_reports.PAR_SETUP_REPORT, fftgen_reports.PAR_HOLD_REPORT))
+
+        before_seconds, before = timed(ingest_before, work_dir)
+        after_seconds, after = timed(ingest_after, work_dir)
+        worst_seconds, _ = timed(fftgen_reports.scan_timing_report,
+                                 os.path.join(work_dir, fftgen_reports.PAR_SETUP_REPORT), 1)
+        if before != after:
+            print(f"Results differ: before {before}, after {after}")
+            sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir)
+
+    results = {
+        "report_mb": args.mb,
+        "paths_per_report": paths,
+        "compressed_mb": round(compressed / 1024 ** 2, 1),
+        "before_seconds": round(before_seconds, 3),
+        "after_seconds": round(after_seconds, 3),
+        "worst_path_seconds": round(worst_seconds, 4),
+        "speedup": round(before_seconds / after_seconds, 2),
+    }
+    print("============================================================")
+    print(f"{paths} paths per report, {results['compressed_mb']} MB compressed in total")
+    print(f"{'gunzip to disk + line scan':<36} {before_seconds:>8.2f} s")
+    print(f"{'single-pass streaming (read_ppa)':<36} {after_seconds:>8.2f} s  ({results['speedup']}x)")
+    print(f"{'worst path only (tuning)':<36} {worst_seconds:>8.4f} s")
+    print("============================================================")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -18,49 +18,523 @@ import subprocess
 import os
 import shutil
 import time
+import re
+import copy
+import json
+import hashlib
+import tempfile
+import fcntl
+import itertools
+import argparse
+import random
+import concurrent.futures
+import threading
+import queue
+import uuid
+import sqlite3
 import requests
+import yaml
 from bs4 import BeautifulSoup
+import fftgen_reports
+import fftgen_paths
+import fftgen_db
+import fftgen_explore
+import fftgen_predict
+import fftgen_verilog
+import fftgen_model
+import fftgen_traces
+import fftgen_logs
+import fftgen_profile
 import os
 
+# Local cache of SPIRAL-generated Verilog, keyed by a hash of the generator parameters
+VERILOG_CACHE_DIR = os.environ.get(
+    "FFTGEN_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "fftgen", "verilog"))
+VERILOG_CACHE_MAX_ENTRIES = 256
+VERILOG_CACHE_MAX_BYTES = 4 * 1024 ** 3
+
+# Whether every cache hit re-hashes the cached Verilog file (--verify-cache). Otherwise a hit
+# whose size and mtime match the entry's metadata is trusted without reading the file.
+VERIFY_VERILOG_CACHE = False
+
 def get_user_input(descriptive_name):
     return input(f"Enter {descriptive_name}: ")
 
-def fetch_verilog_file_content():
-    def fetch_initial_page(params):
-        base_url = "https://pmilder.ece.stonybrook.edu/dftgen/gen.php"
-        response = requests.get(base_url, params=params)
-        return response.text if response.status_code == 200 else None
+def params_cache_key(params):
+    """
+    Computes a canonical cache key for a set of SPIRAL generator parameters.
 
-    def check_iframe_ready(soup):
-        iframe = soup.find('iframe', id='resframe')
-        if iframe and 'gen2.php' in iframe['src']:
-            iframe_src = iframe['src']
-            return f"https://pmilder.ece.stonybrook.edu/dftgen/{iframe_src}"
+    Values are compared by their string form so that e.g. idN=64 and idN='64'
+    map to the same entry, and key order does not matter.
+
+    Args:
+        params (dict): The SPIRAL generator parameters (idN, idRadix, idStreamWidth, ...).
+
+    Returns:
+        str: The hex sha256 digest of the canonical parameter encoding.
+    """
+    canonical = json.dumps({str(k): str(v) for k, v in params.items()}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Returns the hex sha256 digest of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def verilog_filename(params):
+    """Returns the per-configuration file name for the Verilog file of a parameter set."""
+    return f"spiral_{params_cache_key(params)[:12]}.v"
+
+def copy_file_atomic(source_path, destination_path):
+    """Copies a file via a temporary file in the destination directory and an atomic rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(destination_path)), suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, destination_path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+def ends_with_endmodule(path, block_size=4096):
+    """
+    Returns True if the last token of a Verilog file is `endmodule`.
+
+    Only the end of the file is read, backwards in blocks past any trailing whitespace.
+    A file cut anywhere after the last module began fails the check, even if an earlier
+    module's `endmodule` is close to the cut.
+    """
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b""
+        while end > 0 and len(tail.rstrip()) <= len(b"endmodule"):
+            start = max(0, end - block_size)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            end = start
+    tail = tail.rstrip()
+    return tail.endswith(b"endmodule") and (len(tail) == len(b"endmodule") or tail[-10:-9].isspace())
+
+def stream_download(session, url, output_path, request_timeout=30, chunk_size=256 * 1024):
+    """
+    Streams a Verilog file to disk in chunks and atomically renames it into place.
+
+    The download is written to a temporary file next to the output path while a running
+    sha256 is computed, so the file is never held in memory and readers of the output
+    path never see a partial file. Downloads whose size differs from the advertised
+    Content-Length, or whose last token is not the `endmodule` of a complete Verilog
+    module (see ends_with_endmodule()), are rejected.
+
+    Args:
+        session (requests.Session): The session to download with.
+        url (str): The URL of the Verilog file.
+        output_path (str): Where to write the Verilog file.
+        request_timeout (float, optional): The timeout of the request in seconds. Default is 30.
+        chunk_size (int, optional): The size of the chunks read from the response.
+
+    Returns:
+        tuple: A tuple containing:
+            - sha256 (str): The hex sha256 digest of the file.
+            - size (int): The size of the file in bytes.
+
+    Raises:
+        requests.RequestException: If the request fails.
+        IOError: If the download is incomplete or corrupt.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            with session.get(url, stream=True, timeout=request_timeout) as response:
+                response.raise_for_status()
+                expected_size = response.headers.get("Content-Length")
+                if response.headers.get("Content-Encoding"):
+                    expected_size = None  # Content-Length counts the encoded bytes
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+
+        if expected_size is not None and int(expected_size) != size:
+            raise IOError(f"Incomplete download of {url}: got {size} of {expected_size} bytes")
+        if not ends_with_endmodule(tmp_path):
+            raise IOError(f"Corrupt download of {url}: file does not end with a complete module")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return digest.hexdigest(), size
+
+def lookup_verilog_cache(params, destination_path, cache_dir=VERILOG_CACHE_DIR, verify=None):
+    """
+    Copies a cached Verilog file for the given parameters to the destination path.
+
+    A hit is checked against the entry's metadata: an entry whose size differs is
+    corrupt, and one whose mtime differs (or any entry, with verify) is re-hashed and
+    corrupt if its sha256 differs. Corrupt entries are removed. An entry that passes
+    the re-hash has its new mtime recorded. A hit refreshes the entry's last-used time
+    (the mtime of its metadata file), which is what eviction orders on.
+
+    Args:
+        params (dict): The SPIRAL generator parameters.
+        destination_path (str): Where to copy the cached Verilog file on a hit.
+        cache_dir (str, optional): The cache directory. Default is VERILOG_CACHE_DIR.
+        verify (bool, optional): Whether to re-hash the cached file on every hit.
+                                 Default is VERIFY_VERILOG_CACHE.
+
+    Returns:
+        dict: The cache entry metadata on a hit, or None on a miss.
+    """
+    if verify is None:
+        verify = VERIFY_VERILOG_CACHE
+    key = params_cache_key(params)
+    verilog_path = os.path.join(cache_dir, f"{key}.v")
+    meta_path = os.path.join(cache_dir, f"{key}.json")
+
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        st = os.stat(verilog_path)
+        if st.st_size != meta["size"]:
+            print(f"Cached Verilog file {verilog_path} is corrupt. Discarding it.")
+            remove_verilog_cache_entry(cache_dir, key)
+            return None
+        if verify or st.st_mtime_ns != meta.get("mtime_ns"):
+            if file_sha256(verilog_path) != meta["sha256"]:
+                print(f"Cached Verilog file {verilog_path} is corrupt. Discarding it.")
+                remove_verilog_cache_entry(cache_dir, key)
+                return None
+            if st.st_mtime_ns != meta.get("mtime_ns"):
+                meta["mtime_ns"] = st.st_mtime_ns
+                write_verilog_cache_meta(cache_dir, key, meta)
+        copy_file_atomic(verilog_path, destination_path)
+        os.utime(meta_path, None)
+    except (OSError, ValueError, KeyError):
         return None
 
-    def fetch_iframe_content(iframe_url):
-        result_response = requests.get(iframe_url)
-        return result_response.text if result_response.status_code == 200 else None
+    return meta
 
-    def extract_download_link(iframe_content):
-        result_soup = BeautifulSoup(iframe_content, 'html.parser')
-        link = result_soup.find('a', string='Download Verilog')
-        return link['href'] if link else None
+def write_verilog_cache_meta(cache_dir, key, meta):
+    """Writes a cache entry's metadata via a temporary file and an atomic rename."""
+    fd, tmp_meta = tempfile.mkstemp(dir=cache_dir, suffix=".json.tmp")
+    with os.fdopen(fd, 'w') as f:
+        json.dump(meta, f, indent=2, sort_keys=True)
+    os.replace(tmp_meta, os.path.join(cache_dir, f"{key}.json"))
 
-    def download_verilog_file(link):
-        base_url = "https://pmilder.ece.stonybrook.edu/dftgen/"
-        full_url = f"{base_url}{link}"
-        response = requests.get(full_url)
-        if response.status_code == 200:
-            filename = "spiral.v"  # Always save as spiral.v
-            with open(filename, 'wb') as file:
-                file.write(response.content)
-            return filename
+def store_verilog_cache(params, verilog_path, source_url=None, sha256=None, cache_dir=VERILOG_CACHE_DIR,
+                        max_entries=VERILOG_CACHE_MAX_ENTRIES, max_bytes=VERILOG_CACHE_MAX_BYTES):
+    """
+    Stores a generated Verilog file in the cache along with its metadata.
+
+    The Verilog file and its metadata are written to temporary files and renamed into
+    place, so concurrent readers never see a partially written entry. The cache is
+    then trimmed to the configured entry count and size.
+
+    Args:
+        params (dict): The SPIRAL generator parameters used to generate the file.
+        verilog_path (str): The path of the generated Verilog file.
+        source_url (str, optional): The URL the file was downloaded from.
+        sha256 (str, optional): The file's sha256, if already known from the download.
+        cache_dir (str, optional): The cache directory. Default is VERILOG_CACHE_DIR.
+        max_entries (int, optional): The maximum number of cached files to keep.
+        max_bytes (int, optional): The maximum total size of cached files to keep.
+
+    Returns:
+        dict: The metadata of the stored entry, or None if the entry could not be stored.
+    """
+    key = params_cache_key(params)
+    meta = {
+        "key": key,
+        "params": {str(k): str(v) for k, v in params.items()},
+        "fetched_at": time.time(),
+        "size": os.path.getsize(verilog_path),
+        "sha256": sha256 or file_sha256(verilog_path),
+        "source_url": source_url,
+    }
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        cached_path = os.path.join(cache_dir, f"{key}.v")
+        copy_file_atomic(verilog_path, cached_path)
+        meta["mtime_ns"] = os.stat(cached_path).st_mtime_ns
+        write_verilog_cache_meta(cache_dir, key, meta)
+    except OSError as e:
+        print(f"Failed to cache Verilog file {verilog_path}. Reason: {e}")
+        return None
+
+    evict_verilog_cache(cache_dir, max_entries, max_bytes)
+    return meta
+
+def remove_verilog_cache_entry(cache_dir, key):
+    """Removes a cache entry's Verilog, metadata and cached statistics files, ignoring missing files."""
+    paths = [os.path.join(cache_dir, key + suffix) for suffix in (".v", ".json")]
+    try:
+        with open(paths[1], 'r') as f:
+            paths.append(verilog_stats_cache_path(json.load(f)["sha256"], cache_dir))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def verilog_stats_cache_path(sha256, cache_dir=VERILOG_CACHE_DIR):
+    """Returns the path of the cached statistics of the Verilog file with the given sha256."""
+    return os.path.join(cache_dir, f"{sha256}.stats.json")
+
+def lookup_verilog_stats(sha256, cache_dir=VERILOG_CACHE_DIR):
+    """
+    Loads the cached statistics of a Verilog file, stored next to the Verilog cache entries.
+
+    Args:
+        sha256 (str): The hex sha256 digest of the Verilog file.
+        cache_dir (str, optional): The cache directory. Default is VERILOG_CACHE_DIR.
+
+    Returns:
+        fftgen_verilog.VerilogStats: The statistics, or None if none are cached for the file
+                                     by the current analyzer version.
+    """
+    try:
+        with open(verilog_stats_cache_path(sha256, cache_dir), 'r') as f:
+            cached = json.load(f)
+        if cached["version"] != fftgen_verilog.STATS_VERSION or cached["sha256"] != sha256:
+            return None
+        return fftgen_verilog.VerilogStats.from_dict(cached["stats"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
         return None
 
-    def get_user_input(descriptive_name):
-        return input(f"Enter {descriptive_name}: ")
+def store_verilog_stats(sha256, stats, cache_dir=VERILOG_CACHE_DIR):
+    """
+    Caches the statistics of a Verilog file, keyed by the file's sha256, written atomically.
+
+    Args:
+        sha256 (str): The hex sha256 digest of the Verilog file.
+        stats (fftgen_verilog.VerilogStats): Its statistics.
+        cache_dir (str, optional): The cache directory. Default is VERILOG_CACHE_DIR.
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".stats.tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump({"version": fftgen_verilog.STATS_VERSION, "sha256": sha256, "stats": stats.as_dict()}, f)
+        os.replace(tmp_path, verilog_stats_cache_path(sha256, cache_dir))
+    except OSError as e:
+        print(f"Failed to cache the statistics of {stats.path}. Reason: {e}")
+
+def evict_verilog_cache(cache_dir=VERILOG_CACHE_DIR, max_entries=VERILOG_CACHE_MAX_ENTRIES,
+                        max_bytes=VERILOG_CACHE_MAX_BYTES):
+    """
+    Evicts least recently used entries until the cache fits its entry and size limits.
+
+    Args:
+        cache_dir (str, optional): The cache directory. Default is VERILOG_CACHE_DIR.
+        max_entries (int, optional): The maximum number of cached files to keep.
+        max_bytes (int, optional): The maximum total size of cached files to keep.
+
+    Returns:
+        int: The number of evicted entries.
+    """
+    entries = []
+    try:
+        for name in os.listdir(cache_dir):
+            if name.endswith(".v"):
+                st = os.stat(os.path.join(cache_dir, name))
+                try:
+                    last_used = os.path.getmtime(os.path.join(cache_dir, name[:-2] + ".json"))
+                except OSError:
+                    last_used = st.st_mtime
+                entries.append((last_used, st.st_size, name[:-2]))
+    except OSError:
+        return 0
+
+    entries.sort()
+    total_bytes = sum(size for _, size, _ in entries)
+    evicted = 0
+    while entries and (len(entries) > max_entries or total_bytes > max_bytes):
+        _, size, key = entries.pop(0)
+        remove_verilog_cache_entry(cache_dir, key)
+        total_bytes -= size
+        evicted += 1
+    return evicted
+
+# Valid SPIRAL transform sizes, radices and stream widths
+VALID_IDN_VALUES = ['4', '8', '16', '32', '64', '128', '256', '512', '1024', '2048', '4096', '8192', '16384', '32768']
+ITERATIVE_RADICES = {
+    4: [2],
+    8: [2],
+    16: [2, 4],
+    32: [2],
+    64: [2, 4, 8],
+    128: [2],
+    256: [2, 4, 16],
+    512: [2, 8],
+    1024: [2, 4, 32],
+    2048: [2],
+    4096: [2, 4, 8, 16, 64],
+    8192: [2],
+    16384: [2, 4],
+    32768: [2, 8, 32],
+}
+STREAM_WIDTHS = [2, 4, 8, 16, 32, 64]
+
+HAMMER_URL = os.environ.get("FFTGEN_HAMMER_URL", "https://github.com/bsg-external/ee477-hammer-cad.git")
+
+# Shared tool cache holding one built Hammer CAD installation per URL and commit
+HAMMER_CACHE_DIR = os.environ.get(
+    "FFTGEN_HAMMER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "fftgen", "hammer"))
+HAMMER_COMMIT = os.environ.get("FFTGEN_HAMMER_COMMIT")
+
+# A commit SHA or a git ref name, without leading dashes, '..' or other path tricks
+HAMMER_COMMIT_PATTERN = re.compile(r"[0-9A-Za-z_][0-9A-Za-z._/-]*")
+
+# Seconds to pause after key status messages so they can be read. The interactive
+# flow sets this from --pause (5 s by default); sweeps and library callers run without pauses.
+PAUSE_SECONDS = 0
+
+# Whether Synthesis and Place-and-Route runs whose inputs are unchanged are skipped (--no-incremental)
+INCREMENTAL = True
+
+# Whether Synthesis and Place-and-Route runs are killed once their timing is clearly hopeless (--no-early-abort)
+EARLY_ABORT = True
+
+# The clock period synthesis starts at when it is neither given nor predicted (--no-predict)
+DEFAULT_CLOCK_PERIOD = 3
+
+# The SQLite database every finished flow is recorded in (--db), or None not to record flows (--no-db)
+RESULTS_DB_PATH = fftgen_db.DEFAULT_DB_PATH
+
+SPIRAL_BASE_URL = os.environ.get("FFTGEN_SPIRAL_URL", "https://pmilder.ece.stonybrook.edu/dftgen/")
+
+def get_valid_radices(idN, idArch):
+    """
+    Returns the radix algorithms SPIRAL supports for a transform size and architecture.
+
+    Args:
+        idN (int): The transform size.
+        idArch (str): The architecture ('0' for iterative, '1' for fully-streaming).
+
+    Returns:
+        list: The valid radices, or an empty list if the size or architecture is invalid.
+    """
+    idN = int(idN)
+    if str(idArch) == '0':
+        return list(ITERATIVE_RADICES.get(idN, []))
+    elif str(idArch) == '1':  # If fully-streaming architecture
+        if str(idN) not in VALID_IDN_VALUES:
+            return []
+        return [r for r in [2, 4, 8, 16, 32, 64] if r <= idN]
+    return []
+
+def get_valid_stream_widths(idN, idRadix):
+    """Returns the stream widths SPIRAL supports for a transform size and radix."""
+    max_stream_width = min(64, int(idN))
+    min_stream_width = max(2, int(idRadix))
+    return [i for i in STREAM_WIDTHS if min_stream_width <= i <= max_stream_width]
 
+def normalize_params(point):
+    """
+    Builds a complete SPIRAL parameter dict from a (possibly partial) design point.
+
+    Missing parameters take the defaults below, and values are converted to the same
+    types the interactive prompts produce. For the floating-point data type the width
+    and scaling are forced to the values the prompts use.
+
+    Args:
+        point (dict): The design point, keyed by SPIRAL parameter names (idN, idRadix, ...).
+
+    Returns:
+        dict: The complete SPIRAL parameter dict.
+
+    Raises:
+        ValueError: If the point contains an unknown parameter name or a non-integer
+                    idN, idBRAM or idIP.
+    """
+    defaults = {
+        "idInverse": '0',
+        "idDataType": '0',
+        "idWidth": '16',
+        "idScale": '1',
+        "idArch": '1',
+        "idRadix": '2',
+        "idStreamWidth": '2',
+        "idOrder": '0',
+        "idBRAM": -1,
+        "idIP": 1,
+    }
+    unknown = set(point) - set(defaults) - {"idN", "idTWidth"}
+    if unknown:
+        raise ValueError(f"Unknown SPIRAL parameter(s): {', '.join(sorted(unknown))}")
+    if "idN" not in point:
+        raise ValueError("Missing SPIRAL parameter: idN")
+
+    merged = dict(defaults)
+    merged.update(point)
+    params = {key: str(value) for key, value in merged.items()}
+    if params["idDataType"] == '1':
+        params["idWidth"] = '1'
+        params["idScale"] = '0'
+    params["idTWidth"] = params["idWidth"]
+    for key in ("idN", "idBRAM", "idIP"):
+        try:
+            params[key] = int(params[key])
+        except ValueError:
+            raise ValueError(f"{key} must be an integer, not {params[key]!r}") from None
+    return params
+
+def validate_params(params):
+    """
+    Checks a SPIRAL parameter dict against the rules the interactive prompts enforce.
+
+    Args:
+        params (dict): The SPIRAL parameter dict, as returned by normalize_params().
+
+    Raises:
+        ValueError: If any parameter is out of range, with a message naming it.
+    """
+    if params["idInverse"] not in ['0', '1']:
+        raise ValueError("idInverse must be 0 (forward) or 1 (inverse)")
+    if str(params["idN"]) not in VALID_IDN_VALUES:
+        raise ValueError("idN must be a power-of-2 from 4 to 32768")
+    if params["idDataType"] not in ['0', '1']:
+        raise ValueError("idDataType must be 0 (fixed) or 1 (floating)")
+    if params["idDataType"] == '0':
+        if not params["idWidth"].isdigit() or not 4 <= int(params["idWidth"]) <= 32:
+            raise ValueError("idWidth must be between 4 and 32 for fixed point")
+        if params["idScale"] not in ['0', '1']:
+            raise ValueError("idScale must be 1 (scaled) or 0 (unscaled)")
+    if params["idArch"] not in ['0', '1']:
+        raise ValueError("idArch must be 0 (iterative) or 1 (fully-streaming)")
+
+    valid_radices = get_valid_radices(params["idN"], params["idArch"])
+    if not params["idRadix"].isdigit() or int(params["idRadix"]) not in valid_radices:
+        raise ValueError(f"idRadix {params['idRadix']} is not valid for idN={params['idN']}, "
+                         f"idArch={params['idArch']} (valid: {', '.join(map(str, valid_radices))})")
+
+    valid_stream_widths = get_valid_stream_widths(params["idN"], params["idRadix"])
+    if not params["idStreamWidth"].isdigit() or int(params["idStreamWidth"]) not in valid_stream_widths:
+        raise ValueError(f"idStreamWidth {params['idStreamWidth']} is not valid for idN={params['idN']}, "
+                         f"idRadix={params['idRadix']} (valid: {', '.join(map(str, valid_stream_widths))})")
+
+    if params["idOrder"] != '0':
+        raise ValueError("idOrder must be 0 (natural input and natural output)")
+    if not -1 <= int(params["idBRAM"]) <= 1000:
+        raise ValueError("idBRAM must be from -1 (unlimited) to 1000")
+
+def prompt_fft_params():
+    """
+    Prompts the user for the FFT block specifications.
+
+    Returns:
+        dict: The SPIRAL parameter dict, or None if the transform size is invalid.
+    """
     # Inputs from user
     while True:
         idInverse = get_user_input("Forward or Inverse (0 for Forward, 1 for Inverse)")
@@ -68,10 +542,9 @@ def fetch_verilog_file_content():
             break
         print("Invalid entry. Please enter 0 for Forward or 1 for Inverse.")
 
-    valid_idN_values = ['4', '8', '16', '32', '64', '128', '256', '512', '1024', '2048', '4096', '8192', '16384', '32768']
     while True:
         idN = get_user_input("transform size (Pick a power-of-2 from 4 to 32768)")
-        if idN in valid_idN_values:
+        if idN in VALID_IDN_VALUES:
             break
         print("Invalid entry. Please enter a valid power-of-2 from 4 to 32768.")
 
@@ -111,55 +584,10 @@ def fetch_verilog_file_content():
 
     # Valid radix algorithms based on size and architecture
     idN = int(idN)
-    valid_radices = []
-
-    # Radix options if iterative
-    if idArch == '0':
-        if idN == 4:
-            valid_radices = [2]
-        elif idN == 8:
-            valid_radices = [2]
-        elif idN == 16:
-            valid_radices = [2, 4]
-        elif idN == 32:
-            valid_radices = [2]
-        elif idN == 64:
-            valid_radices = [2, 4, 8]
-        elif idN == 128:
-            valid_radices = [2]
-        elif idN == 256:
-            valid_radices = [2, 4, 16]
-        elif idN == 512:
-            valid_radices = [2, 8]
-        elif idN == 1024:
-            valid_radices = [2, 4, 32]
-        elif idN == 2048:
-            valid_radices = [2]
-        elif idN == 4096:
-            valid_radices = [2, 4, 8, 16, 64]
-        elif idN == 8192:
-            valid_radices = [2]
-        elif idN == 16384:
-            valid_radices = [2, 4]
-        elif idN == 32768:
-            valid_radices = [2, 8, 32]
-        else:
-            print("Invalid transform size. Please restart and enter a valid power-of-2 from 4 to 32768.")
-            return
-    elif idArch == '1':  # If fully-streaming architecture
-        if idN == 4:
-            valid_radices = [2, 4]
-        elif idN == 8:
-            valid_radices = [2, 4, 8]
-        elif idN == 16:
-            valid_radices = [2, 4, 8, 16]
-        elif idN == 32:
-            valid_radices = [2, 4, 8, 16, 32]
-        elif idN >= 64 and idN <= 32768:
-            valid_radices = [2, 4, 8, 16, 32, 64]
-        else:
-            print("Invalid transform size. Please restart and enter a valid power-of-2 from 4 to 32768.")
-            return
+    valid_radices = get_valid_radices(idN, idArch)
+    if not valid_radices:
+        print("Invalid transform size. Please restart and enter a valid power-of-2 from 4 to 32768.")
+        return
 
     valid_radices_str = ", ".join(map(str, valid_radices))
     while True:
@@ -173,10 +601,7 @@ def fetch_verilog_file_content():
             print(f"Invalid entry. Please enter a valid integer. Valid options: {valid_radices_str}")
 
     # Valid stream widths based on size and radix
-    max_stream_width = min(64, idN)
-    min_stream_width = max(2, int(idRadix))
-
-    valid_stream_widths = [i for i in [2, 4, 8, 16, 32, 64] if min_stream_width <= i <= max_stream_width]
+    valid_stream_widths = get_valid_stream_widths(idN, idRadix)
 
     valid_stream_widths_str = ", ".join(map(str, valid_stream_widths))
     while True:
@@ -223,37 +648,204 @@ def fetch_verilog_file_content():
         "idInverse": idInverse,
         "idIP": idIP
     }
+    return params
 
-    print("Generating Verilog file for FFT block...")
+def create_http_session(pool_size=8):
+    """
+    Creates a requests session with a connection pool sized for concurrent generation.
 
-    initial_page_content = fetch_initial_page(params)
-    if not initial_page_content:
-        return
+    Args:
+        pool_size (int, optional): The maximum number of pooled connections per host.
+                                   Default is 8.
 
-    soup = BeautifulSoup(initial_page_content, 'html.parser')
+    Returns:
+        requests.Session: The session, to be shared by all requests to the SPIRAL server.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-    start_time = time.time()
-    timeout_seconds = 30
+def poll_delays(initial=0.5, maximum=8.0, factor=1.6, jitter=0.25):
+    """
+    Yields exponentially growing delays with random jitter for polling the SPIRAL server.
 
+    Jitter keeps many concurrent generations from polling the server in lockstep.
+
+    Args:
+        initial (float, optional): The first delay in seconds. Default is 0.5.
+        maximum (float, optional): The largest delay in seconds. Default is 8.
+        factor (float, optional): The growth factor between delays. Default is 1.6.
+        jitter (float, optional): The relative jitter applied to every delay. Default is 0.25.
+
+    Yields:
+        float: The next delay in seconds.
+    """
+    delay = initial
     while True:
-        iframe_url = check_iframe_ready(soup)
-        if iframe_url:
-            iframe_content = fetch_iframe_content(iframe_url)
-            if iframe_content:
-                download_link = extract_download_link(iframe_content)
-                if download_link:
-                    filename = download_verilog_file(download_link)
-                    if filename:
-                        return filename
-        elapsed_time = time.time() - start_time
-        if elapsed_time > timeout_seconds:
-            break
-        time.sleep(1)
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * factor, maximum)
+
+def generate_verilog(params, output_path=None, use_cache=True, session=None,
+                     base_url=SPIRAL_BASE_URL, request_timeout=30, poll_timeout=120):
+    """
+    Generates the Verilog file for a set of SPIRAL parameters.
+
+    The SPIRAL generator page is polled, with growing and jittered delays, until the
+    result iframe links to the generated Verilog, which is then streamed to the output
+    path. Incomplete or corrupt downloads are retried. Files are served from and stored
+    to the local Verilog cache unless use_cache is False.
+
+    Args:
+        params (dict): The SPIRAL generator parameters.
+        output_path (str, optional): Where to write the Verilog file. Default is the
+                                     per-configuration name from verilog_filename().
+        use_cache (bool, optional): Whether to use the local Verilog cache. Default is True.
+        session (requests.Session, optional): The session to send requests with. If not
+                                              given, a new session is created for this call
+                                              and closed before returning.
+        base_url (str, optional): The URL of the SPIRAL generator directory, ending in '/'.
+        request_timeout (float, optional): The timeout of every HTTP request in seconds.
+        poll_timeout (float, optional): How long to wait for the generated Verilog in seconds.
+
+    Returns:
+        str: The path of the Verilog file, or None if generation failed.
+    """
+    output_path = output_path or verilog_filename(params)
+
+    def fetch_initial_page(params):
+        with fftgen_profile.span("spiral-request", "network", page="gen.php"):
+            response = session.get(f"{base_url}gen.php", params=params, timeout=request_timeout)
+        return response.text if response.status_code == 200 else None
+
+    def check_iframe_ready(soup):
+        iframe = soup.find('iframe', id='resframe')
+        if iframe and 'gen2.php' in iframe['src']:
+            iframe_src = iframe['src']
+            return f"{base_url}{iframe_src}"
+        return None
+
+    def fetch_iframe_content(iframe_url):
+        with fftgen_profile.span("spiral-request", "network", page="gen2.php"):
+            result_response = session.get(iframe_url, timeout=request_timeout)
+        return result_response.text if result_response.status_code == 200 else None
+
+    def extract_download_link(iframe_content):
+        result_soup = BeautifulSoup(iframe_content, 'html.parser')
+        link = result_soup.find('a', string='Download Verilog')
+        return link['href'] if link else None
+
+    def download_verilog_file(link):
+        full_url = f"{base_url}{link}"
+        try:
+            with fftgen_profile.span("verilog-download", "network") as span:
+                sha256, size = retry(lambda: stream_download(session, full_url, output_path, request_timeout))
+                span["bytes"] = size
+        except Exception as e:
+            print(f"Failed to download Verilog file. Reason: {e}")
+            return None, None, None
+        print(f"Downloaded {output_path} ({size} bytes, sha256 {sha256[:12]}).")
+        return output_path, full_url, sha256
+
+    if use_cache:
+        cached = lookup_verilog_cache(params, output_path)
+        if cached:
+            print(f"Using cached Verilog file (fetched {time.ctime(cached['fetched_at'])}, "
+                  f"{cached['size']} bytes, sha256 {cached['sha256'][:12]}).")
+            return output_path
+
+    print("Generating Verilog file for FFT block...")
+
+    owns_session = session is None
+    session = session or create_http_session(pool_size=1)
+    try:
         initial_page_content = fetch_initial_page(params)
         if not initial_page_content:
             return
+
         soup = BeautifulSoup(initial_page_content, 'html.parser')
 
+        deadline = time.time() + poll_timeout
+        delays = poll_delays()
+
+        while True:
+            iframe_url = check_iframe_ready(soup)
+            if iframe_url:
+                iframe_content = fetch_iframe_content(iframe_url)
+                if iframe_content:
+                    download_link = extract_download_link(iframe_content)
+                    if download_link:
+                        filename, source_url, sha256 = download_verilog_file(download_link)
+                        if filename:
+                            if use_cache:
+                                store_verilog_cache(params, filename, source_url, sha256)
+                            return filename
+            delay = next(delays)
+            if time.time() + delay > deadline:
+                print(f"Timed out after {poll_timeout} s waiting for the generated Verilog file.")
+                break
+            with fftgen_profile.span("spiral-poll-wait", "sleep"):
+                time.sleep(delay)
+            initial_page_content = fetch_initial_page(params)
+            if not initial_page_content:
+                return
+            soup = BeautifulSoup(initial_page_content, 'html.parser')
+    except requests.RequestException as e:
+        print(f"Failed to generate Verilog file. Reason: {e}")
+    finally:
+        if owns_session:
+            session.close()
+
+def generate_verilog_batch(jobs, max_workers=4, use_cache=True, base_url=SPIRAL_BASE_URL, **kwargs):
+    """
+    Generates the Verilog files for many SPIRAL parameter sets concurrently.
+
+    All generations share one connection-pooled session, and at most max_workers of
+    them are in flight at once so the SPIRAL server is not flooded with requests.
+
+    Args:
+        jobs (list): (params, output_path) tuples, one per Verilog file to generate.
+        max_workers (int, optional): The maximum number of concurrent generations. Default is 4.
+        use_cache (bool, optional): Whether to use the local Verilog cache. Default is True.
+        base_url (str, optional): The URL of the SPIRAL generator directory, ending in '/'.
+        **kwargs: Further keyword arguments for generate_verilog().
+
+    Returns:
+        list: The path of each generated Verilog file (None where generation failed),
+              in the order of the jobs.
+    """
+    session = create_http_session(pool_size=max_workers)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(fftgen_profile.bind(generate_verilog), params, output_path, use_cache=use_cache,
+                                       session=session, base_url=base_url, **kwargs)
+                       for params, output_path in jobs]
+            return [future.result() for future in futures]
+    finally:
+        session.close()
+
+def fetch_verilog_file_content(use_cache=True):
+    """
+    Prompts the user for the FFT block specifications and generates the Verilog file.
+
+    Args:
+        use_cache (bool, optional): Whether to use the local Verilog cache. Default is True.
+
+    Returns:
+        str: The name of the downloaded Verilog file, or None on failure.
+    """
+    params = prompt_fft_params()
+    if not params:
+        return
+    return generate_verilog(params, use_cache=use_cache)
+
+def pause():
+    """Pauses for PAUSE_SECONDS so that status messages can be read before the flow continues."""
+    if PAUSE_SECONDS > 0:
+        with fftgen_profile.span("pause", "sleep"):
+            time.sleep(PAUSE_SECONDS)
+
 def retry(func, retries=3, delay=1):
     """
     Retries a function or operation multiple times with a delay in between attempts.
@@ -277,47 +869,151 @@ def retry(func, retries=3, delay=1):
         except Exception as e:
             last_exception = e
             print(f"Attempt {attempt+1} failed with error: {e}. Retrying in {delay} seconds...")
-            time.sleep(delay)
+            with fftgen_profile.span("retry-backoff", "sleep"):
+                time.sleep(delay)
     raise Exception(f"Operation failed after {retries} attempts. Last error: {last_exception}")
 
-def setup_project():
+def check_hammer_commit(commit):
     """
-    Sets up the project environment by cloning the Hammer CAD library, running make,
-    and creating the necessary project directories.
+    Checks that a Hammer CAD commit is a commit SHA or a git ref name that is safe to
+    pass to git and to build a path from.
+
+    Args:
+        commit (str): The commit SHA or ref name, or None for the default branch.
+
+    Returns:
+        str: The commit, or None.
+
+    Raises:
+        ValueError: If the commit is not a plausible SHA or ref name.
+    """
+    if commit is None:
+        return None
+    if not HAMMER_COMMIT_PATTERN.fullmatch(commit) or ".." in commit or "//" in commit or \
+            commit.endswith(("/", ".", ".lock")):
+        raise ValueError(f"Invalid Hammer CAD commit {commit!r}: expected a commit SHA or a git ref name")
+    return commit
+
+def hammer_commit_dir_name(commit):
+    """Returns the cache directory name part for a Hammer CAD commit (see check_hammer_commit())."""
+    if commit is None:
+        return "head"
+    if "/" not in commit:
+        return commit
+    # Ref names like 'release/1.0' get a digest so they cannot collide with 'release-1.0'
+    return f"{commit.replace('/', '-')}-{hashlib.sha256(commit.encode()).hexdigest()[:8]}"
+
+def ensure_hammer_cad(hammer_url=HAMMER_URL, commit=HAMMER_COMMIT, cache_dir=None):
+    """
+    Returns a built Hammer CAD installation from the shared tool cache, creating it if needed.
+
+    The installation is cloned shallowly (pinned to a commit if one is given) and built
+    with `make` once, then reused by every project. A lock file serializes concurrent
+    flows, so only the first one clones and builds while the others wait for it. A
+    marker file written after a successful build distinguishes complete installations
+    from ones left behind by an interrupted build, which are removed and rebuilt.
+
+    Args:
+        hammer_url (str, optional): The git URL of the Hammer CAD library. Default is HAMMER_URL.
+        commit (str, optional): The commit SHA or ref name to pin the installation to, or
+                                None for the tip of the default branch. Default is
+                                HAMMER_COMMIT ($FFTGEN_HAMMER_COMMIT).
+        cache_dir (str, optional): The tool cache directory. Default is HAMMER_CACHE_DIR.
+
+    Returns:
+        str: The absolute path of the built Hammer CAD installation.
+
+    Raises:
+        ValueError: If the commit is not a commit SHA or a git ref name.
+        Exception: If cloning or building fails, the `retry` function will raise an
+                   exception after the specified number of retries.
+    """
+    commit = check_hammer_commit(commit)
+    cache_dir = cache_dir or HAMMER_CACHE_DIR
+    url_hash = hashlib.sha256(hammer_url.encode("utf-8")).hexdigest()[:12]
+    hammer_dir = os.path.join(os.path.abspath(cache_dir), f"hammer_cad-{url_hash}-{hammer_commit_dir_name(commit)}")
+    marker_path = os.path.join(hammer_dir, ".fftgen_built")
+    os.makedirs(os.path.dirname(hammer_dir), exist_ok=True)
+
+    with open(hammer_dir + ".lock", 'w') as lock_file:
+        with fftgen_profile.span("hammer-lock-wait", "sleep"):
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(marker_path):
+                print(f"Using shared Hammer CAD library at {hammer_dir}")
+                return hammer_dir
+            if os.path.exists(hammer_dir):
+                print(f"Removing incomplete Hammer CAD library at {hammer_dir}")
+                shutil.rmtree(hammer_dir)
+
+            def clone():
+                if os.path.exists(hammer_dir):
+                    shutil.rmtree(hammer_dir)
+                if commit:
+                    subprocess.run(["git", "init", "-q", hammer_dir], check=True)
+                    subprocess.run(["git", "remote", "add", "origin", hammer_url], cwd=hammer_dir, check=True)
+                    subprocess.run(["git", "fetch", "-q", "--depth", "1", "origin", commit], cwd=hammer_dir, check=True)
+                    subprocess.run(["git", "checkout", "-q", "FETCH_HEAD"], cwd=hammer_dir, check=True)
+                else:
+                    subprocess.run(["git", "clone", "-q", "--depth", "1", hammer_url, hammer_dir], check=True)
+
+            # Clone Hammer CAD
+            print(f"Cloning Hammer CAD library into the shared tool cache at {hammer_dir}...")
+            with fftgen_profile.span("hammer-clone", "tool"):
+                retry(clone)
+            print("Successfully cloned Hammer CAD library.")
+
+            # Run make in the hammer_cad directory
+            print("Running make in hammer_cad directory...")
+            with fftgen_profile.span("hammer-make", "tool"):
+                retry(lambda: subprocess.run(["make"], cwd=hammer_dir, check=True))
+            print("Successfully ran make in hammer_cad directory.")
+
+            head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=hammer_dir, stdout=subprocess.PIPE,
+                                  universal_newlines=True, check=True).stdout.strip()
+            with open(marker_path, 'w') as f:
+                json.dump({"url": hammer_url, "commit": head, "built_at": time.time()}, f, indent=2)
+            return hammer_dir
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def setup_project(base_dir=".", hammer_url=HAMMER_URL, hammer_commit=HAMMER_COMMIT):
+    """
+    Sets up the project environment by fetching the shared Hammer CAD library and
+    creating the necessary project directories.
 
     Steps:
-        1. Clones the Hammer CAD library.
-        2. Runs the `make` command in the cloned `hammer_cad` directory.
-        3. Creates the main project directory named `fft_block_design`.
-        4. Creates a subdirectory named `fftgen` within the main project directory.
-        5. Creates a subdirectory named `v` within the `fftgen` directory.
+        1. Clones and builds the Hammer CAD library in the shared tool cache, unless
+           a built installation is already there (see ensure_hammer_cad()).
+        2. Creates the main project directory named `fft_block_design`.
+        3. Creates a subdirectory named `fftgen` within the main project directory.
+        4. Creates a subdirectory named `v` within the `fftgen` directory.
+
+    Existing project directories are reused.
+
+    Args:
+        base_dir (str, optional): The directory to set up the project in. Default is
+                                  the current directory.
+        hammer_url (str, optional): The git URL of the Hammer CAD library. Default is HAMMER_URL.
+        hammer_commit (str, optional): The commit to pin the Hammer CAD library to, see
+                                       ensure_hammer_cad(). Default is HAMMER_COMMIT.
 
     Returns:
         tuple: A tuple containing:
             - new_dir_name (str): The absolute path of the main project directory.
             - sub_dir_new_name (str): The name of the `fftgen` subdirectory.
             - sub_sub_dir_name (str): The name of the `v` subdirectory.
+            - hammer_dir (str): The absolute path of the Hammer CAD installation.
 
     Raises:
         Exception: If any of the steps fail, the `retry` function will raise an exception
                    after the specified number of retries.
     """
-    hammer_url = "https://github.com/bsg-external/ee477-hammer-cad.git"
-    new_dir_name = os.path.abspath("fft_block_design")
+    new_dir_name = os.path.abspath(os.path.join(base_dir, "fft_block_design"))
     sub_dir_new_name = "fftgen"
     sub_sub_dir_name = "v"
 
-    # Clone Hammer CAD
-    print("Cloning Hammer CAD library...")
-    retry(lambda: subprocess.run(["git", "clone", hammer_url, "hammer_cad"], check=True))
-    print("Successfully cloned Hammer CAD library.")
-
-    # Enter hammer_cad directory and run make
-    print("Running make in hammer_cad directory...")
-    os.chdir("hammer_cad")
-    retry(lambda: subprocess.run(["make"], check=True))
-    os.chdir("..")  # Move back to the original directory
-    print("Successfully ran make in hammer_cad directory.")
+    hammer_dir = ensure_hammer_cad(hammer_url, hammer_commit)
 
     # Create the new project directory
     print("Creating project directories...")
@@ -328,13 +1024,49 @@ def setup_project():
     os.makedirs(v_path, exist_ok=True)
     print("Project directories created.")
 
-    return new_dir_name, sub_dir_new_name, sub_sub_dir_name
+    return new_dir_name, sub_dir_new_name, sub_sub_dir_name, hammer_dir
+
+class DesignRejected(RuntimeError):
+    """Raised when a design point is rejected before synthesis, e.g. for being too large. It is not retried."""
 
-def process_verilog_file(filename):
+def process_verilog_file(filename, stats_path=None, use_cache=True, cache_dir=VERILOG_CACHE_DIR):
+    """
+    Analyzes a Verilog file in one streaming pass (see fftgen_verilog) and prints its statistics.
+
+    The statistics are cached next to the Verilog cache entries, keyed by the file's
+    sha256, so a file that was analyzed before (e.g. the same point in another sweep,
+    or a resumed flow) is only hashed.
+
+    Args:
+        filename (str): The path of the Verilog file.
+        stats_path (str, optional): Where to write the statistics as JSON.
+        use_cache (bool, optional): Whether to use and fill the statistics cache. Default is True.
+        cache_dir (str, optional): The cache directory. Default is VERILOG_CACHE_DIR.
+
+    Returns:
+        fftgen_verilog.VerilogStats: The statistics, or None if the file could not be read.
+    """
     print(f"Processing Verilog file: {filename}")
-    # Placeholder if modifying Verilog file is desired
+    try:
+        sha256 = file_sha256(filename) if use_cache else None
+        stats = lookup_verilog_stats(sha256, cache_dir) if use_cache else None
+        if stats:
+            print(f"Using the cached statistics of {filename}.")
+            stats.path = filename
+        else:
+            stats = fftgen_verilog.analyze_verilog(filename)
+            if use_cache:
+                store_verilog_stats(sha256, stats, cache_dir)
+    except (OSError, ValueError) as e:
+        print(f"Failed to analyze {filename}. Reason: {e}")
+        return None
+    stats.display()
+    if stats_path:
+        with open(stats_path, 'w') as f:
+            json.dump(stats.as_dict(), f, indent=2)
+    return stats
 
-def create_cfg_file(cfg_file_path):
+def create_cfg_file(cfg_file_path, width=700, height=700):
     """
     Creates and writes a Hammer configuration file at the specified path.
 
@@ -345,6 +1077,8 @@ def create_cfg_file(cfg_file_path):
 
     Args:
         cfg_file_path (str): The path where the configuration file will be created.
+        width (int, optional): The die width in um. Default is 700.
+        height (int, optional): The die height in um. Default is 700.
 
     Content:
         The configuration file contains the following sections:
@@ -358,7 +1092,7 @@ def create_cfg_file(cfg_file_path):
         Exception: If there is an error while creating or writing to the file,
                    an exception is raised with the reason for the failure.
     """
-    cfg_content = """# Main hammer config file
+    cfg_content = f"""# Main hammer config file
 
 # Set top levels
 synthesis.inputs.top_module: "dft_top"
@@ -382,11 +1116,11 @@ vlsi.inputs.placement_constraints:
   - path: "TOP" # (this name isn't actually checked...)
     type: toplevel
     # define chip dimensions
-    width:  700
-    height: 700
+    width:  {width}
+    height: {height}
     x: 0
     y: 0
-    margins: {left: 0, right: 0, top: 0, bottom: 0}
+    margins: {{left: 0, right: 0, top: 0, bottom: 0}}
 """
 
     try:
@@ -438,7 +1172,7 @@ sim.inputs.input_files_meta: [crossref, subst]
     except Exception as e:
         print(f"Failed to create {src_file_path}. Reason: {e}")
 
-def create_tb_file(tb_file_path):
+def create_tb_file(tb_file_path, trace_files=()):
     """
     Creates and writes a testbench file configuration for Hammer at the specified path.
 
@@ -448,6 +1182,8 @@ def create_tb_file(tb_file_path):
 
     Args:
         tb_file_path (str): The path where the testbench file configuration will be created.
+        trace_files (list, optional): The trace files to list, relative to the project
+                                      directory (see fftgen_traces). Default is none.
 
     Content:
         The testbench file configuration contains the following sections:
@@ -460,9 +1196,10 @@ def create_tb_file(tb_file_path):
         Exception: If there is an error while creating or writing to the file,
                    an exception is raised with the reason for the failure.
     """
-    tb_content = """# Search directories for `include directives in simulations
+    traces = "".join(f'  "{path}",\n' for path in trace_files)
+    tb_content = f"""# Search directories for `include directives in simulations
 sim.inputs.tb_incdir: [
-  "${bsg_root}/bsg_misc"
+  "${{bsg_root}}/bsg_misc"
 ]
 sim.inputs.tb_incdir_meta: [subst]
 
@@ -471,17 +1208,16 @@ sim.inputs.tb_input_files: [
   # Testbench top
   "v/spiral.v",
   # BSG utilities
-  "${bsg_root}/bsg_misc/bsg_defines.v",
-  "${bsg_root}/bsg_test/bsg_nonsynth_clock_gen.v",
-  "${bsg_root}/bsg_test/bsg_nonsynth_reset_gen.v",
-  "${bsg_root}/bsg_fsb/bsg_fsb_node_trace_replay.v",
+  "${{bsg_root}}/bsg_misc/bsg_defines.v",
+  "${{bsg_root}}/bsg_test/bsg_nonsynth_clock_gen.v",
+  "${{bsg_root}}/bsg_test/bsg_nonsynth_reset_gen.v",
+  "${{bsg_root}}/bsg_fsb/bsg_fsb_node_trace_replay.v",
 ]
 sim.inputs.tb_input_files_meta: [append, subst]
 
 # List of trace files for the simulation
 sim.inputs.trace_files: [
-
-]
+{traces}]
 """
 
     try:
@@ -541,7 +1277,7 @@ set_output_delay 0.0 -min -clock [get_clocks clk] [remove_from_collection [all_o
     except Exception as e:
         print(f"Failed to create {constraints_file_path}. Reason: {e}")
 
-def create_makefile(makefile_path):
+def create_makefile(makefile_path, hammer_dir=None):
     """
     Creates and writes a Makefile for a Hammer project at the specified path.
 
@@ -551,6 +1287,8 @@ def create_makefile(makefile_path):
 
     Args:
         makefile_path (str): The path where the Makefile will be created.
+        hammer_dir (str, optional): The absolute path of the Hammer CAD installation.
+                                    Default is `hammer_cad` two levels above the Makefile.
 
     Content:
         The Makefile contains the following sections:
@@ -563,10 +1301,11 @@ def create_makefile(makefile_path):
         Exception: If there is an error while creating or writing to the file,
                    an exception is raised with the reason for the failure.
     """
-    makefile_content = """# Make file for a Hammer project
+    top_dir = hammer_dir or "$(realpath ../../hammer_cad)"
+    makefile_content = f"""# Make file for a Hammer project
 
 # Make sure this is set to the top level directory containing module_top.mk
-TOP_DIR = $(realpath ../../hammer_cad)
+TOP_DIR = {top_dir}
 
 # Build directory location
 OBJ_DIR = build
@@ -586,12 +1325,6 @@ include $(TOP_DIR)/module_top.mk
     except Exception as e:
         print(f"Failed to create {makefile_path}. Reason: {e}")
 
-def extract_slack_time(line):
-    """Extracts the slack time from a line in the timing report."""
-    start_idx = line.find("(") + 1
-    end_idx = line.find(")")
-    return line[start_idx:end_idx].strip()
-
 def adjust_clock_period(clock_period, slack_value, process_type):
     """
     Adjusts the clock period based on the slack value and process type.
@@ -641,332 +1374,2322 @@ def adjust_clock_period(clock_period, slack_value, process_type):
 
     return clock_period
 
-def process_timing_report(report_path, clock_period, process_type, new_dir_name):
-    """Processes the timing report to adjust the clock period based on the slack value."""
+def read_setup_slack(report_path):
+    """
+    Reads the Path 1 setup result from a timing report.
+
+    Args:
+        report_path (str): The path of the Genus or Innovus setup timing report, plain
+                           or gzip-compressed.
+
+    Returns:
+        tuple: (met, slack_time, slack_value), where met is True if setup timing was met,
+               slack_time is the slack as printed (e.g. '123 ps') and slack_value is its
+               number, or None if the report has no Path 1 result.
+
+    Raises:
+        OSError: If the report cannot be read.
+    """
+    setup = fftgen_reports.scan_timing_report(report_path, max_paths=1)
+    if setup is None:
+        return None
+    return setup.met, setup.slack_time, setup.slack
+
+class LadderSearch:
+    """
+    The fixed-step clock period search.
+
+    Timing is accepted once Path 1 meets setup with at most 100 units of slack,
+    otherwise the period is moved by the steps of adjust_clock_period().
+    """
+    name = "ladder"
+    # The attributes holding the search's progress, see period_search_state()
+    STATE = ["probes"]
+
+    def __init__(self):
+        self.probes = []
+
+    def next_period(self, clock_period, slack_value, process_type, met):
+        """
+        Decides the next clock period to try from the result of a run.
+
+        Args:
+            clock_period (float): The clock period of the run in ns.
+            slack_value (float): The Path 1 setup slack as reported (ps for Synthesis,
+                                 ns for Place-and-Route).
+            process_type (str): The type of process ('Synthesis' or 'Place-and-Route').
+            met (bool): Whether setup timing was met.
+
+        Returns:
+            tuple: A tuple containing:
+                - clock_period (float): The next clock period, or the final one if done.
+                - done (bool): True if tuning is finished at clock_period.
+        """
+        done = met and 0 <= slack_value <= 100
+        next_period = clock_period if done else adjust_clock_period(clock_period, slack_value, process_type)
+        log_period_probe(self, clock_period, slack_value, process_type, next_period, done)
+        return next_period, done
+
+class BracketSearch:
+    """
+    A slack-proportional clock period search that brackets and bisects.
+
+    Each run moves the period by the reported slack directly (period - slack + margin).
+    Once both a passing and a failing period are known, the next period is kept strictly
+    inside that bracket, falling back to bisection when the proportional estimate
+    leaves it or would barely shrink it. Tuning finishes when a passing run has at most
+    accept_slack of slack or when the bracket is narrower than tolerance; in the latter
+    case the tightest passing period is run once more so the final reports match the
+    returned period. The search has no iteration budget of its own; tune_clock_period()
+    stops it at the stage's budget and keeps the tightest passing period. Until both
+    ends of the bracket are known, an estimate outside the known side is replaced by
+    double the failing period or half the passing one.
+
+    Args:
+        margin (float, optional): The slack in ns to leave on top of the estimate. Default is 0.05.
+        tolerance (float, optional): The bracket width in ns at which to stop. Default is 0.05.
+        accept_slack (float, optional): The largest passing slack in ns that is accepted
+                                        as tight enough. Default is 0.1.
+    """
+    name = "bracket"
+    # The attributes holding the search's progress, see period_search_state()
+    STATE = ["passing", "failing", "final", "probes"]
+
+    def __init__(self, margin=0.05, tolerance=0.05, accept_slack=0.1):
+        self.margin = margin
+        self.tolerance = tolerance
+        self.accept_slack = accept_slack
+        self.passing = None
+        self.failing = None
+        self.final = None
+        self.probes = []
+
+    def next_period(self, clock_period, slack_value, process_type, met):
+        """
+        Decides the next clock period to try from the result of a run.
+
+        Args:
+            clock_period (float): The clock period of the run in ns.
+            slack_value (float): The Path 1 setup slack as reported (ps for Synthesis,
+                                 ns for Place-and-Route).
+            process_type (str): The type of process ('Synthesis' or 'Place-and-Route').
+            met (bool): Whether setup timing was met.
+
+        Returns:
+            tuple: A tuple containing:
+                - clock_period (float): The next clock period, or the final one if done.
+                - done (bool): True if tuning is finished at clock_period.
+        """
+        slack_ns = slack_value / 1000 if process_type == 'Synthesis' else slack_value
+        if met:
+            self.passing = clock_period if self.passing is None else min(self.passing, clock_period)
+        else:
+            self.failing = clock_period if self.failing is None else max(self.failing, clock_period)
+
+        if self.final is not None and clock_period == self.final:
+            done, next_period = True, clock_period
+        elif met and slack_ns <= self.accept_slack:
+            done, next_period = True, clock_period
+        elif self._bracket_closed():
+            if self.passing is None or self.passing == clock_period:
+                done, next_period = True, clock_period
+            else:
+                self.final = self.passing
+                done, next_period = False, self.passing
+        else:
+            done, next_period = False, self._estimate(clock_period, slack_ns)
+
+        log_period_probe(self, clock_period, slack_value, process_type, next_period, done)
+        return next_period, done
+
+    def _bracket_closed(self):
+        return (self.passing is not None and self.failing is not None
+                and self.passing - self.failing <= self.tolerance)
+
+    def _estimate(self, clock_period, slack_ns):
+        estimate = max(0.1, clock_period - slack_ns + self.margin)
+        low = self.failing if self.failing is not None else 0.0
+        high = self.passing if self.passing is not None else float("inf")
+        if high != float("inf") and self.failing is not None:
+            # Keep the probe inside the bracket and make it shrink by a useful amount
+            width = high - low
+            if not low + width / 4 <= estimate <= high - width / 4:
+                estimate = (low + high) / 2
+        elif high == float("inf") and estimate <= low:
+            estimate = low * 2  # Only a failing period is known, so there is no midpoint
+        elif not low < estimate < high:
+            estimate = (low + high) / 2
+        return round(estimate, 3)
+
+PERIOD_SEARCH_STRATEGIES = {
+    LadderSearch.name: LadderSearch,
+    BracketSearch.name: BracketSearch,
+}
+
+def make_period_search(strategy="bracket", state=None, **kwargs):
+    """
+    Creates a clock period search for one tuning run.
+
+    Args:
+        strategy (str, optional): The name of the strategy ('bracket' or 'ladder').
+                                  Default is 'bracket'.
+        state (dict, optional): The progress of an interrupted search to continue, as
+                                returned by period_search_state().
+        **kwargs: Options for the strategy's constructor.
+
+    Returns:
+        The search object, whose next_period() decides each probe.
+
+    Raises:
+        ValueError: If the strategy is unknown.
+    """
+    if strategy not in PERIOD_SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown clock period search strategy: {strategy}")
+    search = PERIOD_SEARCH_STRATEGIES[strategy](**kwargs)
+    for key, value in (state or {}).items():
+        if key in search.STATE:
+            setattr(search, key, copy.deepcopy(value))
+    return search
+
+def period_search_state(search):
+    """Returns a copy of a clock period search's progress (its probes and bracket), for checkpoints."""
+    return {key: copy.deepcopy(getattr(search, key)) for key in search.STATE}
+
+def log_period_probe(search, clock_period, slack_value, process_type, next_period, done):
+    """Records and prints one probe of a clock period search."""
+    search.probes.append({"period": clock_period, "slack": slack_value, "next_period": next_period, "done": done})
+    unit = "ps" if process_type == 'Synthesis' else "ns"
+    outcome = "done" if done else f"next {next_period} ns"
+    print(f"[{search.name} search] {process_type} probe {len(search.probes)}: "
+          f"period {clock_period} ns, slack {slack_value} {unit} -> {outcome}")
+
+def process_timing_report(report_path, clock_period, process_type, new_dir_name, search=None):
+    """
+    Processes the timing report and decides the next clock period based on the slack value.
+
+    Args:
+        report_path (str): The path of the setup timing report.
+        clock_period (float): The clock period of the run that produced the report.
+        process_type (str): The type of process ('Synthesis' or 'Place-and-Route').
+        new_dir_name (str): The path to the project directory.
+        search (optional): The clock period search deciding the next period, as returned
+                           by make_period_search(). Default is the fixed-step ladder.
+
+    Returns:
+        tuple: A tuple containing:
+            - clock_period (float): The next clock period, or the final one if tuning is done.
+            - should_rerun (bool): True if the process should be rerun at the new period.
+    """
+    search = search or LadderSearch()
     try:
-        with open(report_path, 'r') as report_file:
-            for line in report_file:
-                if "Path 1: MET" in line:
-                    slack_time = extract_slack_time(line)
-                    print("------------------------------------------------------------")
-                    print(f"Setup timing MET in {process_type}! Path 1 Slack: {slack_time}")
-                    print("------------------------------------------------------------")
-                    slack_value = float(slack_time.split()[0])
-                    if 0 <= slack_value <= 100:
-                        clock_speed_mhz = 1000 / clock_period
-                        print(f"Clock Period: {clock_period} ns, Clock Speed: {clock_speed_mhz:.2f} MHz")
-                        print("------------------------------------------------------------")
-                        time.sleep(10)
-                        return clock_period, False  # Stop rerunning if slack is in acceptable range
-                    clock_period = adjust_clock_period(clock_period, slack_value, process_type)
-                    print(f"Tuning clock constraints. New clock period: {clock_period} ns\nRerunning {process_type} momentarily...")
-                    print("------------------------------------------------------------")
-                    time.sleep(5)
-                    create_constraints(os.path.join(new_dir_name, "cfg", "constraints.tcl"), clock_period)
-                    return clock_period, True
-                elif "Path 1: VIOLATED" in line:
-                    slack_time = extract_slack_time(line)
-                    print("------------------------------------------------------------")
-                    print(f"Setup timing VIOLATED in {process_type}! Path 1 Slack: {slack_time}")
-                    print("------------------------------------------------------------")
-                    slack_value = float(slack_time.split()[0])
-                    clock_period = adjust_clock_period(clock_period, slack_value, process_type)
-                    print(f"Tuning clock constraints. New clock period: {clock_period} ns\nRerunning {process_type} momentarily...")
-                    print("------------------------------------------------------------")
-                    time.sleep(10)
-                    create_constraints(os.path.join(new_dir_name, "cfg", "constraints.tcl"), clock_period)
-                    return clock_period, True
+        setup = read_setup_slack(report_path)
+        if setup is None:
             print("--------------------------------------------------")
             print("Timing information not found in the report.")
             print("--------------------------------------------------")
             return clock_period, False
+
+        met, slack_time, slack_value = setup
+        print("------------------------------------------------------------")
+        print(f"Setup timing {'MET' if met else 'VIOLATED'} in {process_type}! Path 1 Slack: {slack_time}")
+        print("------------------------------------------------------------")
+        next_period, done = search.next_period(clock_period, slack_value, process_type, met)
+        if done:
+            if not met:
+                print(f"Giving up tuning {process_type} after {len(search.probes)} run(s) without meeting timing.")
+            clock_speed_mhz = 1000 / clock_period
+            print(f"Clock Period: {clock_period} ns, Clock Speed: {clock_speed_mhz:.2f} MHz")
+            print("------------------------------------------------------------")
+            pause()
+            return clock_period, False  # Stop rerunning if slack is in acceptable range
+        print(f"Tuning clock constraints. New clock period: {next_period} ns\nRerunning {process_type} momentarily...")
+        print("------------------------------------------------------------")
+        pause()
+        return next_period, True
     except Exception as e:
         print(f"Failed to read the report. Reason: {e}")
         return clock_period, False
 
-def rerun_timing(new_dir_name, clock_period, process_type):
+def setup_report_path(new_dir_name, process_type):
+    """Returns the path of the setup timing report of a Synthesis or Place-and-Route run."""
+    if process_type == "Place-and-Route":
+        return os.path.join(new_dir_name, "build", "par-rundir", "timingReports", "dft_top_postRoute_all.tarpt")
+    return os.path.join(new_dir_name, "build", "syn-rundir", "reports", "final_time_ss_100C_1v60.setup_view.rpt")
+
+# The project files every Synthesis and Place-and-Route run depends on
+STAGE_INPUT_FILES = ["cfg/cfg.yml", "cfg/src.yml", "cfg/tb.yml", "cfg/constraints.tcl", "Makefile"]
+
+def stage_manifest_path(new_dir_name, process_type):
+    """Returns the path of the input manifest of a Synthesis or Place-and-Route run."""
+    stage = "par" if process_type == "Place-and-Route" else "syn"
+    return os.path.join(new_dir_name, "build", f".fftgen_{stage}_manifest.json")
+
+def project_hammer_commit(new_dir_name):
+    """Returns the commit of the Hammer CAD installation a project's Makefile points at, or None."""
+    try:
+        with open(os.path.join(new_dir_name, "Makefile")) as f:
+            top_dir = next(line.split("=", 1)[1].strip() for line in f if line.startswith("TOP_DIR"))
+        with open(os.path.join(top_dir, ".fftgen_built")) as f:
+            return json.load(f).get("commit")
+    except (OSError, ValueError, StopIteration):
+        return None
+
+def stage_inputs(new_dir_name, process_type):
     """
-    Analyzes the timing reports and adjusts the clock period to meet the timing constraints.
+    Hashes the inputs of a Synthesis or Place-and-Route run.
 
-    This function opens the timing reports, reads the slack values, and adjusts the clock period based
-    on the slack. If the slack indicates that the timing constraints are not met, it will rerun the
-    synthesis or place-and-route process with a new clock period. The process is repeated until the
-    slack is within the acceptable range.
+    The inputs are the Verilog sources, cfg.yml, src.yml, tb.yml, constraints.tcl (and so
+    the clock period), the Makefile and the Hammer CAD commit. Place-and-Route also
+    depends on the synthesis run it starts from.
 
     Args:
-        new_dir_name (str): The path to the main project directory.
-        clock_period (float): The initial clock period for the constraints.
-        process_type (str): The type of process ('Synthesis' or 'Place-and-Route') for print statements.
+        new_dir_name (str): The path to the project directory.
+        process_type (str): The type of process ('Synthesis' or 'Place-and-Route').
 
     Returns:
-        float: The final tuned clock period.
+        dict: The sha256 digest of every input, plus the overall 'hash' of them all.
+    """
+    inputs = {}
+    v_dir = os.path.join(new_dir_name, "v")
+    for name in sorted(os.listdir(v_dir)) if os.path.isdir(v_dir) else []:
+        if name.endswith((".v", ".sv")):
+            inputs[f"v/{name}"] = file_sha256(os.path.join(v_dir, name))
+    for name in STAGE_INPUT_FILES:
+        path = os.path.join(new_dir_name, name)
+        inputs[name] = file_sha256(path) if os.path.exists(path) else None
+    inputs["hammer_commit"] = project_hammer_commit(new_dir_name)
+    if process_type == "Place-and-Route":
+        syn_manifest = read_stage_manifest(new_dir_name, 'Synthesis')
+        inputs["synthesis"] = syn_manifest["inputs"]["hash"] if syn_manifest else None
+    inputs["hash"] = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+    return inputs
+
+def read_stage_manifest(new_dir_name, process_type):
+    """Returns the input manifest of the last successful run of a stage, or None."""
+    try:
+        with open(stage_manifest_path(new_dir_name, process_type)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_stage_manifest(new_dir_name, process_type, inputs):
+    """Records the inputs of a successful run of a stage, for later runs to compare against."""
+    manifest_path = stage_manifest_path(new_dir_name, process_type)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump({"process_type": process_type, "inputs": inputs, "completed_at": time.time()}, f, indent=2)
+
+def stage_is_current(new_dir_name, process_type, inputs):
+    """Returns True if the last successful run of a stage had the same inputs and its report still exists."""
+    manifest = read_stage_manifest(new_dir_name, process_type)
+    return (manifest is not None and manifest["inputs"].get("hash") == inputs["hash"]
+            and fftgen_reports.find_report(setup_report_path(new_dir_name, process_type)) is not None)
+
+# The number of earlier runs' setup reports kept per stage, so a tuning probe at a period
+# that was already run with the same inputs reuses its report
+STAGE_REPORT_ARCHIVE_MAX = 32
+
+def stage_archive_path(new_dir_name, process_type, inputs):
+    """Returns where the setup report of a run with the given inputs is archived."""
+    stage = "par" if process_type == "Place-and-Route" else "syn"
+    return os.path.join(new_dir_name, "build", ".fftgen_reports", f"{stage}-{inputs['hash'][:16]}.rpt")
+
+def archive_stage_report(new_dir_name, process_type, inputs, max_entries=STAGE_REPORT_ARCHIVE_MAX):
+    """Archives the setup report of a successful run, evicting the oldest beyond max_entries per stage."""
+    report_path = fftgen_reports.find_report(setup_report_path(new_dir_name, process_type))
+    if report_path is None:
+        return
+    archive_path = stage_archive_path(new_dir_name, process_type, inputs)
+    if report_path.endswith(".gz"):
+        archive_path += ".gz"
+    archive_dir = os.path.dirname(archive_path)
+    os.makedirs(archive_dir, exist_ok=True)
+    copy_file_atomic(report_path, archive_path)
+
+    prefix = os.path.basename(archive_path).split("-")[0] + "-"
+    archived = sorted((os.path.join(archive_dir, name) for name in os.listdir(archive_dir) if name.startswith(prefix)),
+                      key=os.path.getmtime)
+    for path in archived[:-max_entries]:
+        os.remove(path)
+
+def find_stage_report(new_dir_name, process_type, inputs):
+    """
+    Returns the setup report of an earlier successful run with the given inputs, or None.
+
+    The report of the last run in the build directory is preferred; otherwise an archived
+    report of an earlier run is returned. Only the last run's netlist and other outputs
+    are in the build directory.
+    """
+    if stage_is_current(new_dir_name, process_type, inputs):
+        return setup_report_path(new_dir_name, process_type)
+    return fftgen_reports.find_report(stage_archive_path(new_dir_name, process_type, inputs))
+
+def stage_log_path(new_dir_name, process_type):
+    """Returns a new compressed log file path for a Synthesis or Place-and-Route run, under build/logs."""
+    stage = "par" if process_type == "Place-and-Route" else "syn"
+    logs_dir = os.path.join(new_dir_name, "build", "logs")
+    index = len([name for name in os.listdir(logs_dir) if name.startswith(stage)]) + 1 \
+        if os.path.isdir(logs_dir) else 1
+    return os.path.join(logs_dir, f"{stage}-{index:03d}.log.gz")
+
+def run_stage(new_dir_name, process_type, rerun=False, incremental=None, clock_period=None, early_abort=None,
+              monitor=None):
+    """
+    Runs the make targets of one Synthesis or Place-and-Route run in the project directory.
+
+    The run is skipped, and the report of an earlier run reused, if an earlier run
+    succeeded with the same inputs (see stage_inputs() and find_stage_report()).
+    Place-and-Route reruns use `make redo-par`, which keeps the synthesized netlist.
+
+    The tool's output is streamed to a compressed log under build/logs and parsed as
+    it arrives (see fftgen_logs), printing the Hammer sub-steps and the WNS estimates.
+    With early_abort, the run is killed once those estimates show it will miss the
+    clock period by far.
+
+    Args:
+        new_dir_name (str): The path to the project directory.
+        process_type (str): The type of process ('Synthesis' or 'Place-and-Route').
+        rerun (bool, optional): Flag indicating whether this is a rerun. Default is False.
+        incremental (bool, optional): Whether to skip runs whose inputs are unchanged.
+                                      Default is INCREMENTAL.
+        clock_period (float, optional): The run's clock period in ns, for the early abort.
+        early_abort (bool, optional): Whether to kill hopeless runs. Default is EARLY_ABORT;
+                                      runs without a clock_period are never aborted.
+        monitor (dict, optional): A dict to store the run's 'log' path in, and for an
+                                  aborted run, why it was 'aborted' and its last 'wns'
+                                  estimate in ns.
+
+    Returns:
+        bool: True if the run completed successfully.
+    """
+    if incremental is None:
+        incremental = INCREMENTAL
+    if early_abort is None:
+        early_abort = EARLY_ABORT
+    monitor = monitor if monitor is not None else {}
+    inputs = stage_inputs(new_dir_name, process_type)
+    report_path = find_stage_report(new_dir_name, process_type, inputs) if incremental else None
+    if report_path:
+        print(f"{process_type} inputs are unchanged since an earlier run; reusing its report {report_path}")
+        return True
+
+    if process_type == 'Synthesis':
+        commands = [["make", "redo-syn"]] if rerun else [["make", "syn"]]
+    else:
+        commands = [["make", "redo-par"]] if rerun else [["make", "par"]]
+
+    # A run that fails part way must not leave a manifest vouching for stale reports
+    manifest_path = stage_manifest_path(new_dir_name, process_type)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    print(f"Running {' followed by '.join(repr(' '.join(c)) for c in commands)} in directory: {new_dir_name}")
+    policy = fftgen_logs.EarlyAbortPolicy(clock_period) if early_abort and clock_period else None
+    for command in commands:
+        monitor["log"] = stage_log_path(new_dir_name, process_type)
+        with fftgen_profile.span(" ".join(command), "tool", log=monitor["log"]) as span:
+            run = fftgen_logs.run_logged(command, new_dir_name, monitor["log"],
+                                         fftgen_logs.ToolLogParser(process_type), policy)
+            span.update(returncode=run.returncode, aborted=run.aborted)
+        if run.aborted:
+            monitor.update(aborted=run.aborted, wns=run.parser.wns)
+            print(f"{process_type} aborted after {run.seconds:.1f} s: {run.aborted}. Log: {run.log_path}")
+            return False
+        if run.returncode != 0:
+            print(f"{process_type} failed. Reason: '{' '.join(command)}' returned {run.returncode}. "
+                  f"Log: {run.log_path}")
+            return False
+
+    print(f"{process_type} completed successfully.")
+    write_stage_manifest(new_dir_name, process_type, inputs)
+    archive_stage_report(new_dir_name, process_type, inputs)
+    return True
+
+# The outcomes of a tuning stage's last iteration that fail the stage: a run failed, its
+# report had no timing, or no period met timing within the iteration budget
+TUNING_FAILURES = ("failed", "no-report", "unmet")
+
+def tune_clock_period(new_dir_name, clock_period, process_type, rerun=False, search=None, max_iterations=10,
+                      on_iteration=None, resumed=None):
+    """
+    Runs Synthesis or Place-and-Route repeatedly, tuning the clock period until timing closes.
+
+    Each iteration runs the stage once, reads the setup report and lets the search decide
+    the next period. Tuning stops when the search is done, when a run fails, or when the
+    iteration budget is used up; in the latter case the final period is the tightest
+    passing period that was run, and if none passed, the outcome is 'unmet' and the
+    stage fails at the last period run. If the search proposes a period that was already
+    tried (e.g. bouncing between two periods), tuning settles on the tightest passing
+    period seen so far, or fails if no period passed. Settling or running out of budget
+    on a period other than the last run's reruns it once.
+
+    Runs whose inputs match an earlier run reuse that run's report (see run_stage()). If
+    the final period's report came from an earlier run that is no longer the one in the
+    build directory, the stage is rerun once at that period so the build directory holds
+    its results.
+
+    A run killed early for hopeless timing (see run_stage()) counts as a failing probe at
+    its last WNS estimate, so the search moves on to a corrected period right away.
+
+    An interrupted tuning continues from the history of its earlier iterations, with the
+    search restored to its state after them (see make_period_search()). The earlier
+    iterations count towards the budget and their periods count as tried; if they used
+    it all up, tuning stops at once as if the budget ran out.
+
+    Args:
+        new_dir_name (str): The path to the project directory.
+        clock_period (float): The clock period of the first run. constraints.tcl must
+                              already be written for it.
+        process_type (str): The type of process ('Synthesis' or 'Place-and-Route').
+        rerun (bool, optional): Flag indicating whether the first run is a rerun. Default is False.
+        search (optional): The clock period search deciding each probe, as returned by
+                           make_period_search(). Default is the fixed-step ladder.
+        max_iterations (int, optional): The maximum number of runs, at least 1. This is the
+                                        only budget; the searches have none of their own.
+                                        Default is 10.
+        on_iteration (callable, optional): Called with the iteration's history entry and the
+                                           next period after every iteration that leads to a
+                                           rerun, e.g. to checkpoint the tuning progress.
+        resumed (list, optional): The history entries of the earlier iterations of an
+                                  interrupted tuning, which clock_period continues.
+
+    Returns:
+        tuple: A tuple containing:
+            - clock_period (float): The final tuned clock period.
+            - history (list): One dict per iteration with the iteration number, period,
+                              slack, whether timing was met, the run's runtime in seconds
+                              and the outcome ('rerun', 'done', 'settled', 'failed', ...).
+                              A last outcome in TUNING_FAILURES means the stage failed.
 
     Raises:
-        Exception: If there is an error while reading the report, an exception is raised with the reason for the failure.
+        ValueError: If max_iterations is less than 1.
     """
-    if process_type == "Place-and-Route":
-        setup_paths = [
-            os.path.join(new_dir_name, "build", "par-rundir", "timingReports", "dft_top_postRoute_all.tarpt"),
-        ]
+    if max_iterations < 1:
+        raise ValueError(f"The iteration budget must be at least 1, not {max_iterations}")
+    search = search or LadderSearch()
+    constraints_path = os.path.join(new_dir_name, "cfg", "constraints.tcl")
+    history = [dict(entry) for entry in resumed or []]
+    # Tuning only returns to a tried period to settle on it
+    settling = clock_period in [h["period"] for h in history]
+    stage_name = "par" if process_type == "Place-and-Route" else "syn"
+
+    def stop_at_budget(entry):
+        # Keep a period that was actually run rather than the untested next one
+        passing = [h["period"] for h in history if h["met"]]
+        if not passing:
+            print(f"No {process_type} period met timing within the budget of {max_iterations} iteration(s).")
+            entry["outcome"] = "unmet"
+            return entry["period"]
+        print(f"Stopping {process_type} tuning after the budget of {max_iterations} iteration(s) "
+              f"at {min(passing)} ns.")
+        entry["outcome"] = "budget"
+        return min(passing)
+
+    for iteration in range(len(history) + 1, max_iterations + 1):
+        start_time = time.time()
+        monitor = {}
+        with fftgen_profile.span(f"{stage_name}-run", "iteration", iteration=iteration, period=clock_period):
+            completed = run_stage(new_dir_name, process_type, rerun=rerun, clock_period=clock_period,
+                                  monitor=monitor)
+        entry = {"iteration": iteration, "period": clock_period, "slack": None, "met": None,
+                 "runtime": round(time.time() - start_time, 3), "outcome": "failed"}
+        history.append(entry)
+        aborted = bool(monitor.get("aborted"))
+        if aborted:
+            # The estimate stands in for the report, in the report's unit
+            slack = round(monitor["wns"] * 1000 if process_type == "Synthesis" else monitor["wns"], 3)
+            next_period, done = search.next_period(clock_period, slack, process_type, False)
+            should_rerun = not done
+            entry["slack"], entry["met"] = slack, False
+        elif not completed:
+            break
+        else:
+            probes = len(search.probes)
+            report_path = (find_stage_report(new_dir_name, process_type, stage_inputs(new_dir_name, process_type))
+                           or setup_report_path(new_dir_name, process_type))
+            with fftgen_profile.span(f"{stage_name}-timing-report", "report"):
+                next_period, should_rerun = process_timing_report(report_path, clock_period, process_type,
+                                                                  new_dir_name, search)
+            if len(search.probes) == probes:
+                entry["outcome"] = "no-report"
+                break
+            entry["slack"] = search.probes[-1]["slack"]
+            entry["met"] = entry["slack"] >= 0
+
+        if settling or not should_rerun:
+            entry["outcome"] = "settled" if settling else "done"
+            break
+
+        passing = [h["period"] for h in history if h["met"]]
+        if next_period in [h["period"] for h in history]:
+            if not passing:
+                print(f"Period {next_period} ns was already tried and no period met timing; "
+                      f"stopping {process_type} tuning.")
+                entry["outcome"] = "failed"
+                break
+            best = min(passing)
+            print(f"Period {next_period} ns was already tried; settling on {best} ns to avoid oscillating.")
+            if best == clock_period:
+                entry["outcome"] = "settled"
+                break
+            next_period, settling = best, True
+
+        if iteration == max_iterations:
+            best = stop_at_budget(entry)
+            if best != clock_period:
+                clock_period = best
+                create_constraints(constraints_path, clock_period)
+            break
+
+        entry["outcome"] = "aborted" if aborted else "rerun"
+        clock_period, rerun = next_period, True
+        create_constraints(constraints_path, clock_period)
+        if on_iteration:
+            on_iteration(entry, clock_period)
     else:
-        setup_paths = [
-            os.path.join(new_dir_name, "build", "syn-rundir", "reports", "final_time_ss_100C_1v60.setup_view.rpt")
-        ]
-
-    for report_path in setup_paths:
-        clock_period, should_rerun = process_timing_report(report_path, clock_period, process_type, new_dir_name)
-        if should_rerun:
-            if process_type == 'Synthesis':
-                run_synthesis(new_dir_name, clock_period, rerun=True)
-            else:
-                run_par(new_dir_name, clock_period, rerun=True)
-    
+        # A resumed tuning whose earlier iterations used up the budget; clock_period is
+        # the untested period it was about to run
+        best = stop_at_budget(history[-1])
+        if best != clock_period:
+            clock_period = best
+            create_constraints(constraints_path, clock_period)
+
+    if history[-1]["outcome"] in ("done", "settled", "budget") and \
+            not stage_is_current(new_dir_name, process_type, stage_inputs(new_dir_name, process_type)):
+        print(f"Rerunning {process_type} at {clock_period} ns so the build directory holds its results.")
+        start_time = time.time()
+        rundir = f"{stage_name}-rundir"
+        with fftgen_profile.span(f"{stage_name}-final-rerun", "iteration", period=clock_period):
+            completed = run_stage(new_dir_name, process_type,
+                                  rerun=os.path.isdir(os.path.join(new_dir_name, "build", rundir)),
+                                  incremental=False, early_abort=False)
+        if not completed:
+            history[-1]["outcome"] = "failed"
+        history[-1]["runtime"] = round(history[-1]["runtime"] + time.time() - start_time, 3)
+
+    print("------------------------------------------------------------")
+    print(f"{process_type} tuning history:")
+    for entry in history:
+        print(f"  #{entry['iteration']:<3} period {entry['period']:>8} ns  slack {str(entry['slack']):>10}  "
+              f"runtime {entry['runtime']:>9.1f} s  {entry['outcome']}")
+    print("------------------------------------------------------------")
+    return clock_period, history
+
+def run_synthesis(new_dir_name, clock_period, rerun=False, search=None, max_iterations=10, history=None,
+                  on_iteration=None, resumed=None):
+    """
+    Runs and tunes the synthesis process for the given project directory and clock period.
+
+    Synthesis is rerun with `make redo-syn` at tuned clock periods until the search is
+    done or the iteration budget is used up, see tune_clock_period(). If synthesis fails,
+    an error message is printed.
+
+    Args:
+        new_dir_name (str): The path to the main project directory.
+        clock_period (float): The clock period for the constraints.
+        rerun (bool, optional): Flag indicating whether this is a rerun of the synthesis.
+                                Default is False.
+        search (optional): The clock period search deciding each probe, as returned by
+                           make_period_search(). Default is the fixed-step ladder.
+        max_iterations (int, optional): The maximum number of synthesis runs. Default is 10.
+        history (list, optional): A list to append the per-iteration tuning history to.
+        on_iteration (callable, optional): Called after every iteration, see tune_clock_period().
+        resumed (list, optional): The earlier iterations of an interrupted tuning, see
+                                  tune_clock_period().
+
+    Returns:
+        float: The final tuned clock period.
+    """
+    clock_period, iterations = tune_clock_period(new_dir_name, clock_period, 'Synthesis', rerun, search, max_iterations,
+                                                 on_iteration, resumed)
+    if history is not None:
+        history.extend(dict(entry, stage='Synthesis') for entry in iterations)
     return clock_period
 
-def run_synthesis(new_dir_name, clock_period, rerun=False):
+def speculative_candidates(center, count, spread):
+    """Returns count clock periods spread evenly over center * (1 +/- spread)."""
+    if count == 1:
+        return [round(center, 3)]
+    return [round(center * (1 - spread + 2 * spread * i / (count - 1)), 3) for i in range(count)]
+
+def prepare_speculative_run(project_dir, run_dir, clock_period):
+    """
+    Creates an isolated copy of a project for synthesis at one clock period.
+
+    The run directory gets the project's Verilog and configuration files and Makefile,
+    and its own constraints.tcl for the clock period, so its build directory is
+    independent of all other runs.
+
+    Args:
+        project_dir (str): The path of the project (`fftgen`) directory.
+        run_dir (str): The path of the run directory to create.
+        clock_period (float): The clock period in ns for the run's constraints.
+    """
+    if os.path.exists(run_dir):
+        shutil.rmtree(run_dir)
+    shutil.copytree(os.path.join(project_dir, "v"), os.path.join(run_dir, "v"))
+    shutil.copytree(os.path.join(project_dir, "cfg"), os.path.join(run_dir, "cfg"))
+    create_constraints(os.path.join(run_dir, "cfg", "constraints.tcl"), clock_period)
+    shutil.copy(os.path.join(project_dir, "Makefile"), os.path.join(run_dir, "Makefile"))
+
+def run_speculative_synthesis(project_dir, clock_period, jobs=4, spread=0.5, rounds=2, keep_runs=False,
+                              history=None):
     """
-    Runs the synthesis process for the given project directory and clock period.
+    Tunes the synthesis clock period by running several syntheses in parallel.
 
-    This function changes the working directory to the specified project directory,
-    runs the synthesis process using the appropriate make command, and then analyzes
-    the timing report to adjust the clock period if necessary. If synthesis fails,
-    an error message is printed. The working directory is restored at the end.
+    Each round synthesizes the design at `jobs` candidate periods at once, each in its
+    own directory under `speculative/` with its own constraints.tcl and build directory.
+    The tightest passing period wins the round; the next round spreads its candidates
+    between the loosest failing period below the winner and the winner. If no candidate
+    passes, the next round moves the window above the loosest failing period. Tuning
+    stops early once the winner has at most 100 ps of slack.
+
+    Args:
+        project_dir (str): The path of the project (`fftgen`) directory.
+        clock_period (float): The clock period in ns to center the first round on.
+        jobs (int, optional): The number of parallel syntheses per round. Default is 4.
+        spread (float, optional): The relative spread of the first round's candidates
+                                  around clock_period. Default is 0.5 (+/- 50%).
+        rounds (int, optional): The maximum number of rounds. Default is 2.
+        keep_runs (bool, optional): Keep the losing run directories. Default is False.
+        history (list, optional): A list to append one tuning history entry per candidate
+                                  run to, with its round and an outcome of 'met',
+                                  'violated' or 'failed'. The winner's entry comes last,
+                                  with the outcome 'done'.
+
+    Returns:
+        tuple: A tuple containing:
+            - clock_period (float): The tightest passing period, or None if none passed.
+            - run_dir (str): The directory of the winning run, whose synthesized netlist
+                             Place-and-Route should use, or None if none passed.
+    """
+    spec_dir = os.path.join(project_dir, "speculative")
+    os.makedirs(spec_dir, exist_ok=True)
+    candidates = speculative_candidates(clock_period, jobs, spread)
+    results = {}
+    entries = []
+    winner = None
+
+    def synthesize(period):
+        run_dir = os.path.join(spec_dir, f"period_{period}")
+        start_time = time.time()
+        prepare_speculative_run(project_dir, run_dir, period)
+        with fftgen_profile.span("speculative-syn", "tool", period=period):
+            completed = fftgen_logs.run_logged(["make", "syn"], run_dir, os.path.join(run_dir, "syn.log.gz"),
+                                               fftgen_logs.ToolLogParser("Synthesis"), echo=None)
+        report_path = os.path.join(run_dir, "build", "syn-rundir", "reports", "final_time_ss_100C_1v60.setup_view.rpt")
+        setup = None
+        if completed.returncode == 0:
+            try:
+                setup = read_setup_slack(report_path)
+            except OSError:
+                pass
+        return period, run_dir, setup, round(time.time() - start_time, 3)
+
+    for round_index in range(1, rounds + 1):
+        candidates = [p for p in candidates if p > 0 and p not in results]
+        if not candidates:
+            break
+        print("------------------------------------------------------------")
+        print(f"Speculative synthesis round {round_index}: {len(candidates)} run(s) at "
+              f"{', '.join(f'{p} ns' for p in candidates)}")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            for period, run_dir, setup, runtime in executor.map(fftgen_profile.bind(synthesize), candidates):
+                results[period] = (run_dir, setup)
+                status = "failed" if setup is None else f"{'MET' if setup[0] else 'VIOLATED'} ({setup[1]})"
+                print(f"  {period} ns: {status}")
+                entries.append({"iteration": None, "period": period, "slack": setup[2] if setup else None,
+                                "met": setup[0] if setup else None, "runtime": runtime,
+                                "outcome": "failed" if setup is None else "met" if setup[0] else "violated",
+                                "stage": 'Synthesis', "round": round_index})
+
+        passing = sorted(p for p, (_, setup) in results.items() if setup and setup[0])
+        failing = sorted(p for p, (_, setup) in results.items() if setup and not setup[0])
+        if passing:
+            winner = passing[0]
+            if results[winner][1][2] <= 100:
+                break
+            below = [p for p in failing if p < winner]
+            low = below[-1] if below else winner * (1 - spread)
+            candidates = [round(low + (winner - low) * (i + 1) / (jobs + 1), 3) for i in range(jobs)]
+        elif failing:
+            low = failing[-1]
+            candidates = [round(low * (1 + 2 * spread * (i + 1) / jobs), 3) for i in range(jobs)]
+        else:
+            print("Speculative synthesis failed for every candidate period.")
+            break
+
+    if not keep_runs:
+        for period, (run_dir, _) in results.items():
+            if period != winner:
+                shutil.rmtree(run_dir, ignore_errors=True)
+
+    if winner is not None:
+        # The winning run is the one the flow continues from
+        winning_entry = next(entry for entry in entries if entry["period"] == winner)
+        entries.remove(winning_entry)
+        entries.append(dict(winning_entry, outcome="done"))
+    for iteration, entry in enumerate(entries, start=1):
+        entry["iteration"] = iteration
+    if history is not None:
+        history.extend(entries)
+
+    if winner is None:
+        print("No candidate period met timing in speculative synthesis.")
+        print("------------------------------------------------------------")
+        return None, None
+
+    run_dir, (_, slack_time, _) = results[winner]
+    print(f"Speculative synthesis picked {winner} ns (Path 1 Slack: {slack_time}) from {len(results)} run(s).")
+    print(f"Clock Period: {winner} ns, Clock Speed: {1000 / winner:.2f} MHz")
+    print("------------------------------------------------------------")
+    return winner, run_dir
+
+def run_par(new_dir_name, clock_period, rerun=False, search=None, max_iterations=10, history=None, on_iteration=None,
+            ppa=None, resumed=None):
+    """
+    Runs and tunes the place and route (PAR) process for the given project directory and clock period.
+
+    Place-and-Route is rerun with `make redo-par`, on the existing synthesized netlist, at
+    tuned clock periods until the search is done or the iteration budget is used up, see
+    tune_clock_period().
+    The hold time, area and power reports of the final run are then read in one pass
+    each (see fftgen_reports.read_ppa()) and displayed. If the PAR process fails, an
+    error message is printed.
 
     Args:
         new_dir_name (str): The path to the main project directory.
         clock_period (float): The clock period for the constraints.
-        rerun (bool, optional): Flag indicating whether this is a rerun of the synthesis.
+        rerun (bool, optional): Flag indicating whether this is a rerun of the PAR process.
                                 Default is False.
+        search (optional): The clock period search deciding each probe, as returned by
+                           make_period_search(). Default is the fixed-step ladder.
+        max_iterations (int, optional): The maximum number of PAR runs. Default is 10.
+        history (list, optional): A list to append the per-iteration tuning history to.
+        on_iteration (callable, optional): Called after every iteration, see tune_clock_period().
+        ppa (dict, optional): A dict to store the final run's PPA results in, see
+                              fftgen_reports.PPAResult.as_dict().
+        resumed (list, optional): The earlier iterations of an interrupted tuning, see
+                                  tune_clock_period().
 
     Returns:
         float: The final tuned clock period.
+    """
+    clock_period, iterations = tune_clock_period(new_dir_name, clock_period, 'Place-and-Route', rerun, search,
+                                                 max_iterations, on_iteration, resumed)
+    if history is not None:
+        history.extend(dict(entry, stage='Place-and-Route') for entry in iterations)
+
+    if iterations[-1]["outcome"] not in TUNING_FAILURES:
+        # Hold time slack, area and power
+        with fftgen_profile.span("ppa-reports", "report"):
+            result = fftgen_reports.read_ppa(new_dir_name)
+        result.display()
+        if ppa is not None:
+            ppa.update(result.as_dict())
 
-    Raises:
-        subprocess.CalledProcessError: If the synthesis process fails, an error message is printed.
+    return clock_period
 
+class FlowProject:
     """
-    try:
-        os.chdir(new_dir_name)
-        current_dir = os.getcwd()
-        print(f"Running 'make syn' in directory: {current_dir}" if not rerun else f"Running 'make redo-syn' in directory: {current_dir}")  # Debug print statement
-        command = ["make", "redo-syn"] if rerun else ["make", "syn"]
-        subprocess.run(command, check=True)
-        print("Synthesis completed successfully.")
-        return rerun_timing(new_dir_name, clock_period, process_type='Synthesis')
-    except subprocess.CalledProcessError as e:
-        print(f"Synthesis failed. Reason: {e}")
-        return clock_period  # Return the last known clock period
-    finally:
-        os.chdir("..")
+    The state of one design's flow, so that flows never depend on the working directory.
+
+    All paths are absolute, and every stage runs its commands with an explicit cwd, so
+    many projects can be driven concurrently from threads of one Python process.
 
-def unzip_reports(base_dir):
+    Args:
+        params (dict): The SPIRAL generator parameters.
+        base_dir (str, optional): The directory to run the flow in. Default is the
+                                  current directory.
+        initial_clock_period (float, optional): The initial clock period in ns. Default is to
+                                                predict it when the project is set up (see
+                                                fftgen_predict).
+        use_cache (bool, optional): Whether to use the local Verilog cache. Default is True.
+        verilog_path (str, optional): An already generated Verilog file to use instead of
+                                      generating one.
+        base_url (str, optional): The URL of the SPIRAL generator directory, ending in '/'.
+        search_strategy (str, optional): The clock period search strategy ('bracket' or
+                                         'ladder'). Default is 'bracket'.
+        speculative_jobs (int, optional): If above 0, tune synthesis by running this many
+                                          syntheses in parallel per round instead of one
+                                          at a time. Default is 0.
+        speculative_rounds (int, optional): The maximum number of speculative rounds. Default is 2.
+        max_iterations (int, optional): The maximum number of runs per tuning stage. Default is 10.
+        hammer_url (str, optional): The git URL of the Hammer CAD library. Default is HAMMER_URL.
+        hammer_commit (str, optional): The commit SHA or ref name to pin the Hammer CAD library
+                                       to, or None for the latest. Default is HAMMER_COMMIT.
+        extract_paths (bool, optional): Whether to extract every timing path of the final run
+                                        into a columnar table (see fftgen_paths). Default is False.
+        predict_periods (bool, optional): Whether to seed the first Synthesis period, unless
+                                          given, and the first Place-and-Route period from
+                                          past runs. Otherwise synthesis starts at
+                                          DEFAULT_CLOCK_PERIOD and PaR at the synthesis period.
+                                          Default is True.
+        max_area (float, optional): Reject the design before synthesis if its area estimated
+                                    from the Verilog (see fftgen_verilog) exceeds this many um^2.
+                                    Default is no limit.
+        trace_frames (int, optional): The number of transforms in the golden simulation traces
+                                      listed in tb.yml (see fftgen_traces), or 0 for no traces.
+                                      Default is 8.
     """
-    Unzips the timing reports in the specified directory.
+
+    def __init__(self, params, base_dir=".", initial_clock_period=None, use_cache=True, verilog_path=None,
+                 base_url=SPIRAL_BASE_URL, search_strategy="bracket", speculative_jobs=0, speculative_rounds=2,
+                 max_iterations=10, hammer_url=HAMMER_URL, hammer_commit=HAMMER_COMMIT, extract_paths=False,
+                 predict_periods=True, max_area=None, trace_frames=8):
+        self.params = params
+        self.name = point_name(params)
+        self.base_dir = os.path.abspath(base_dir)
+        self.root_dir = os.path.join(self.base_dir, "fft_block_design")
+        self.project_dir = os.path.join(self.root_dir, "fftgen")
+        self.v_dir = os.path.join(self.project_dir, "v")
+        self.cfg_dir = os.path.join(self.project_dir, "cfg")
+        self.constraints_path = os.path.join(self.cfg_dir, "constraints.tcl")
+        self.verilog_path = os.path.abspath(verilog_path) if verilog_path else None
+        self.initial_clock_period = initial_clock_period
+        self.use_cache = use_cache
+        self.base_url = base_url
+        self.search_strategy = search_strategy
+        self.speculative_jobs = speculative_jobs
+        self.speculative_rounds = speculative_rounds
+        self.max_iterations = max_iterations
+        self.hammer_url = hammer_url
+        self.hammer_commit = check_hammer_commit(hammer_commit)
+        self.extract_paths = extract_paths
+        self.predict_periods = predict_periods
+        self.max_area = max_area
+        self.trace_frames = trace_frames
+
+        # Updated as the flow progresses
+        self.hammer_dir = None
+        self.par_dir = self.project_dir  # Where PaR runs; the winning run after speculative synthesis
+        self.syn_clock_period = None
+        self.par_clock_period = None
+        self.syn_area = None  # The area of the final synthesized netlist in um^2
+        self.history = []
+        self.ppa = None  # The PPA results of the final Place-and-Route run
+        self.completed_stages = []
+        self.tuning = None  # The stage being tuned: its iterations so far, search state and the period to run next
+        self.run_key = uuid.uuid4().hex  # Identifies the flow in the results database, across resumes
+        self.stage_seconds = {}
+        self.spans = []  # The tracing spans of the flow's stages, see fftgen_profile
+
+    # The options a checkpoint records, to resume the flow with the same settings
+    CHECKPOINT_OPTIONS = ["initial_clock_period", "use_cache", "base_url", "search_strategy", "speculative_jobs",
+                          "speculative_rounds", "max_iterations", "hammer_url", "hammer_commit", "extract_paths",
+                          "predict_periods", "max_area", "trace_frames"]
+    CHECKPOINT_STATE = ["verilog_path", "hammer_dir", "par_dir", "syn_clock_period", "par_clock_period", "syn_area",
+                        "history", "ppa", "completed_stages", "tuning", "run_key", "stage_seconds", "spans"]
+
+    @property
+    def checkpoint_path(self):
+        return checkpoint_path(self.base_dir)
+
+    def save_history(self):
+        """Writes the per-iteration tuning history to tuning_history.json in the project directory."""
+        with open(os.path.join(self.project_dir, "tuning_history.json"), 'w') as f:
+            json.dump(self.history, f, indent=2)
+
+    def save_checkpoint(self):
+        """Atomically writes the project's options and progress to its checkpoint file."""
+        checkpoint = {"params": self.params, "options": {key: getattr(self, key) for key in self.CHECKPOINT_OPTIONS},
+                      "updated_at": time.time()}
+        checkpoint.update((key, getattr(self, key)) for key in self.CHECKPOINT_STATE)
+        os.makedirs(self.base_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.base_dir, prefix=".checkpoint.")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(checkpoint, f, indent=2)
+            os.replace(temp_path, self.checkpoint_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def from_checkpoint(cls, base_dir):
+        """
+        Loads a project from the checkpoint file in its base directory.
+
+        Args:
+            base_dir (str): The base directory of the project.
+
+        Returns:
+            FlowProject: The project with the checkpointed options and progress, or None
+                         if there is no readable checkpoint.
+        """
+        try:
+            with open(checkpoint_path(base_dir)) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        project = cls(checkpoint["params"], base_dir, **checkpoint["options"])
+        for key in cls.CHECKPOINT_STATE:
+            if key in checkpoint:
+                setattr(project, key, checkpoint[key])
+        return project
+
+    def save_profile(self):
+        """Writes the flow's spans to profile.json and profile.trace.json in the base directory."""
+        return fftgen_profile.write_profile(self.spans, self.base_dir, self.name)
+
+    def track_tuning(self, process_type, search, resumed=()):
+        """
+        Returns an on_iteration callback for tune_clock_period() that checkpoints the tuning
+        progress: the iterations so far, the search's state and the period to run next.
+        """
+        iterations = [dict(entry) for entry in resumed]
+
+        def on_iteration(entry, next_period):
+            iterations.append(dict(entry))
+            self.tuning = {"stage": process_type, "iteration": entry["iteration"], "period": next_period,
+                           "search": period_search_state(search), "history": list(iterations)}
+            self.save_checkpoint()
+        return on_iteration
+
+    def resume_tuning(self, process_type, clock_period):
+        """
+        Prepares a stage's tuning, continuing it from the checkpoint if it was in progress.
+
+        Args:
+            process_type (str): The type of process ('Synthesis' or 'Place-and-Route').
+            clock_period (float): The period to start at if the stage was not in progress.
+
+        Returns:
+            tuple: A tuple containing:
+                - clock_period (float): The period to run next.
+                - search: The clock period search, restored to its checkpointed state.
+                - resumed (list): The history entries of the iterations already run.
+        """
+        if self.tuning and self.tuning["stage"] == process_type:
+            print(f"Resuming {process_type} tuning after iteration {self.tuning['iteration']} "
+                  f"at {self.tuning['period']} ns")
+            search = make_period_search(self.search_strategy, self.tuning.get("search"))
+            return self.tuning["period"], search, self.tuning.get("history", [])
+        return clock_period, make_period_search(self.search_strategy), []
+
+def checkpoint_path(base_dir):
+    """Returns the path of the checkpoint file of the project in a base directory."""
+    return os.path.join(os.path.abspath(base_dir), "fftgen_checkpoint.json")
+
+def generate_stage(project):
+    """
+    Generates the project's Verilog file into its base directory, unless it already has one.
 
     Args:
-        base_dir (str): The base path to the main project directory.
+        project (FlowProject): The project.
+
+    Returns:
+        bool: True if the project has a Verilog file.
     """
+    os.makedirs(project.base_dir, exist_ok=True)
+    if not project.verilog_path:
+        project.verilog_path = generate_verilog(
+            project.params, os.path.join(project.base_dir, verilog_filename(project.params)),
+            use_cache=project.use_cache, base_url=project.base_url)
+    if not project.verilog_path:
+        return False
 
-    timing_reports_dir = os.path.join(base_dir, "build", "par-rundir", "timingReports")
+    print("Verilog file downloaded. Proceeding...")
+    pause()
+    return True
 
-    # Paths to unzipped output files
-    setup_report_path = os.path.join(timing_reports_dir, "dft_top_postRoute_all.tarpt")
-    hold_report_path = os.path.join(timing_reports_dir, "dft_top_postRoute_all_hold.tarpt")
+def setup_stage(project):
+    """
+    Sets up the project directory with its Verilog, configuration files, constraints and Makefile.
 
-    try:
-        os.chdir(timing_reports_dir)
-        
-        # Delete existing unzipped files if they exist
-        if os.path.exists(setup_report_path):
-            os.remove(setup_report_path)
-        if os.path.exists(hold_report_path):
-            os.remove(hold_report_path)
-
-        # Unzip the timing report files
-        subprocess.run(["gunzip", "dft_top_postRoute_all.tarpt.gz"], check=True)
-        subprocess.run(["gunzip", "dft_top_postRoute_all_hold.tarpt.gz"], check=True)
-        print("Timing reports unzipped successfully.")
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to unzip timing reports. Reason: {e}")
-    finally:
-        os.chdir(base_dir)
+    The Verilog file is analyzed first (see process_verilog_file()); its statistics are
+    written to verilog_stats.json in the project directory and size the floorplan.
+    Golden simulation traces are written to traces/ and listed in tb.yml.
+
+    Args:
+        project (FlowProject): The project, whose Verilog file has been generated.
+
+    Raises:
+        DesignRejected: If the design's estimated area exceeds the project's max_area.
+    """
+    # Set up project directory
+    _, _, _, project.hammer_dir = setup_project(project.base_dir, project.hammer_url, project.hammer_commit)
+    with fftgen_profile.span("verilog-analysis", "analysis"):
+        stats = process_verilog_file(project.verilog_path, os.path.join(project.project_dir, "verilog_stats.json"),
+                                     project.use_cache)
+    if stats and project.max_area and stats.estimate_area() > project.max_area:
+        raise DesignRejected(f"{project.name} is estimated at {stats.estimate_area():.0f} um^2, "
+                             f"over the {project.max_area:.0f} um^2 limit")
 
-def display_hold_time_slack(new_dir_name):
+    # Copy Verilog file to 'v' subdirectory
+    shutil.copy(project.verilog_path, os.path.join(project.v_dir, "spiral.v"))
+
+    # Create cfg.yml, src.yml, and tb.yml files
+    os.makedirs(project.cfg_dir, exist_ok=True)
+    side = stats.floorplan_side() if stats else fftgen_verilog.MIN_FLOORPLAN_SIDE
+    create_cfg_file(os.path.join(project.cfg_dir, "cfg.yml"), side, side)
+    create_src_file(os.path.join(project.cfg_dir, "src.yml"))
+    trace_files = []
+    if project.trace_frames:
+        with fftgen_profile.span("simulation-traces", "analysis", frames=project.trace_frames):
+            traces = fftgen_traces.write_traces(project.params, os.path.join(project.project_dir, "traces"),
+                                                project.trace_frames)
+        trace_files = [os.path.relpath(traces[key], project.project_dir) for key in ("input", "expected")]
+        print(f"Wrote {project.trace_frames} frame(s) of simulation traces to {os.path.dirname(traces['input'])}")
+    create_tb_file(os.path.join(project.cfg_dir, "tb.yml"), trace_files)
+
+    # Create constraints.tcl file, at a predicted clock period unless one was given
+    if project.initial_clock_period is None:
+        if project.predict_periods:
+            with fftgen_profile.span("period-prediction", "analysis"):
+                predictor = fftgen_predict.PeriodPredictor.from_db(RESULTS_DB_PATH)
+                project.initial_clock_period, source = predictor.initial_period(project.params,
+                                                                                project.verilog_path)
+            print(f"Starting synthesis at a predicted clock period of {project.initial_clock_period} ns ({source}).")
+        else:
+            project.initial_clock_period = DEFAULT_CLOCK_PERIOD
+    create_constraints(project.constraints_path, project.initial_clock_period)
+
+    # Create Makefile
+    create_makefile(os.path.join(project.project_dir, "Makefile"), project.hammer_dir)
+
+def synthesis_stage(project):
     """
-    Reads and displays the Path 1 slack from the hold time report after Place-and-Route.
+    Runs synthesis for the project and tunes its clock period.
+
+    With speculative_jobs set, several syntheses run in parallel (see
+    run_speculative_synthesis()) and PaR later runs in the winning run's directory.
+    Otherwise, or if no speculative run meets timing, synthesis is tuned serially.
 
     Args:
-        new_dir_name (str): The path to the main project directory.
+        project (FlowProject): The project, which has been set up.
+
+    Returns:
+        float: The clock period tuned by synthesis.
     """
-    hold_report_path = os.path.join(new_dir_name, "build", "par-rundir", "timingReports", "dft_top_postRoute_all_hold.tarpt")
-    
+    project.syn_clock_period = None
+    if project.speculative_jobs > 0 and not project.tuning:
+        project.syn_clock_period, winner_dir = run_speculative_synthesis(
+            project.project_dir, project.initial_clock_period, jobs=project.speculative_jobs,
+            rounds=project.speculative_rounds, history=project.history)
+        if project.syn_clock_period is not None:
+            # Place-and-Route picks up the winning run's synthesized netlist
+            create_constraints(project.constraints_path, project.syn_clock_period)
+            project.par_dir = winner_dir
+    if project.syn_clock_period is None:
+        clock_period, search, resumed = project.resume_tuning('Synthesis', project.initial_clock_period)
+        create_constraints(project.constraints_path, clock_period)
+        project.syn_clock_period = run_synthesis(
+            project.project_dir, clock_period, rerun=project.tuning is not None, search=search,
+            max_iterations=project.max_iterations, history=project.history,
+            on_iteration=project.track_tuning('Synthesis', search, resumed), resumed=resumed)
     try:
-        with open(hold_report_path, 'r') as report_file:
-            for line in report_file:
-                if "Path 1:" in line:
-                    slack_time = extract_slack_time(line)
-                    print(f"Hold time Path 1 slack in Place-and-Route: {slack_time}")
-                    print("------------------------------------------------------------")
-                    return
-            print("Hold time Path 1 information not found in the report.")
-            print("--------------------------------------------------")
-    except Exception as e:
-        print(f"Failed to read the hold time report. Reason: {e}")
+        project.syn_area = fftgen_reports.read_area_report(
+            os.path.join(project.par_dir, fftgen_reports.SYN_AREA_REPORT))
+    except OSError:
+        project.syn_area = None
+    project.save_history()
+    return project.syn_clock_period
+
+def par_stage(project):
+    """
+    Runs Place-and-Route for the project and tunes its clock period.
 
-def display_area_report(new_dir_name):
+    PaR starts at the synthesis clock period, or with predict_periods set, at the
+    synthesis period scaled by the PaR/synthesis ratio predicted from past runs.
+
+    Args:
+        project (FlowProject): The project, which has been synthesized.
+
+    Returns:
+        float: The clock period tuned by Place-and-Route.
     """
-    Reads and displays the area metrics from the area report after Place-and-Route.
+    seed_period = project.syn_clock_period
+    if project.predict_periods and not project.tuning:
+        ratio, source = fftgen_predict.PeriodPredictor.from_db(RESULTS_DB_PATH).par_ratio(project.params)
+        if ratio != 1.0:
+            seed_period = round(project.syn_clock_period * ratio, 3)
+            print(f"Starting Place-and-Route at {seed_period} ns, {round(ratio, 3)} x the synthesis period ({source}).")
+    clock_period, search, resumed = project.resume_tuning('Place-and-Route', seed_period)
+    if clock_period != project.syn_clock_period:
+        create_constraints(os.path.join(project.par_dir, "cfg", "constraints.tcl"), clock_period)
+    ppa = {}
+    project.par_clock_period = run_par(
+        project.par_dir, clock_period, rerun=project.tuning is not None, search=search,
+        max_iterations=project.max_iterations, history=project.history,
+        on_iteration=project.track_tuning('Place-and-Route', search, resumed), ppa=ppa, resumed=resumed)
+    project.ppa = ppa or None
+    if project.extract_paths and project.ppa:
+        with fftgen_profile.span("path-extraction", "report"):
+            table = fftgen_paths.extract_project_paths(project.par_dir)
+        print(f"Extracted {len(table)} timing paths into {os.path.join(project.par_dir, 'build', 'paths')}")
+    project.save_history()
+    return project.par_clock_period
+
+# The flow stages in order, and the resources one run of each stage holds. Generation and
+# setup are cheap; each synthesis or Place-and-Route run holds cores, memory and a license
+# of its tool while it runs.
+FLOW_STAGES = {
+    "generate": generate_stage,
+    "setup": setup_stage,
+    "synthesis": synthesis_stage,
+    "par": par_stage,
+}
+STAGE_RESOURCES = {
+    "generate": {"cores": 0, "memory_gb": 0, "license": None},
+    "setup": {"cores": 1, "memory_gb": 0, "license": None},
+    "synthesis": {"cores": 2, "memory_gb": 4, "license": "genus"},
+    "par": {"cores": 4, "memory_gb": 8, "license": "innovus"},
+}
+STAGE_PROCESS_TYPES = {"synthesis": 'Synthesis', "par": 'Place-and-Route'}
+
+def run_flow_stage(stage, project):
+    """
+    Runs one stage of a project's flow, unless the project's checkpoint records it as completed.
+
+    The stage is recorded in the project's checkpoint once it completes, so a flow that
+    is interrupted can be resumed from the stage it was in. The stage, and the tool runs,
+    tuning iterations, report reads and waits inside it, are traced as spans in the
+    project's `spans` (see fftgen_profile).
 
     Args:
-        new_dir_name (str): The path to the main project directory.
+        stage (str): The stage name, a key of FLOW_STAGES.
+        project (FlowProject): The project.
+
+    Returns:
+        FlowProject: The project, updated by the stage.
+
+    Raises:
+        RuntimeError: If the stage failed, so the scheduler can requeue it.
     """
-    area_report_path = os.path.join(new_dir_name, "build", "par-rundir", "dft_top_area.rpt")
-    
+    if stage in project.completed_stages:
+        return project
+    start_time = time.time()
     try:
-        with open(area_report_path, 'r') as report_file:
-            for line in report_file:
-                if line.strip().startswith("dft_top"):
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        total_area = parts[2].strip()
-                        print(f"Total Area for dft_top: {total_area} um^2")
-                        print("------------------------------------------------------------")
-                        return
-            print("Area information not found in the report.")
-            print("--------------------------------------------------")
-    except Exception as e:
-        print(f"Failed to read the area report. Reason: {e}")
+        with fftgen_profile.Profiler(project.spans).activate(), \
+                fftgen_profile.span(stage, "stage", design=project.name):
+            result = FLOW_STAGES[stage](project)
+    finally:
+        project.stage_seconds[stage] = round(project.stage_seconds.get(stage, 0) + time.time() - start_time, 3)
+    if stage == "generate" and not result:
+        raise RuntimeError(f"Failed to download Verilog file for {project.name}")
+    process_type = STAGE_PROCESS_TYPES.get(stage)
+    runs = [entry for entry in project.history if entry.get("stage") == process_type]
+    if runs and runs[-1]["outcome"] in TUNING_FAILURES:
+        raise RuntimeError(f"{process_type} of {project.name} {runs[-1]['outcome'].replace('-', ' ')}")
+    project.completed_stages.append(stage)
+    project.tuning = None
+    project.save_checkpoint()
+    return project
+
+def run_flow(params, base_dir=".", initial_clock_period=None, use_cache=True, verilog_path=None, resume=False,
+             **options):
+    """
+    Runs the full flow for one FFT configuration: generate, setup, synthesis and PaR.
+
+    The Verilog file is generated into the base directory, the project is set up
+    underneath it, and synthesis and place-and-route are tuned in turn. The flow does
+    not change the working directory, so several flows can run concurrently in threads.
+    Progress is checkpointed to fftgen_checkpoint.json in the base directory. The flow's
+    spans are written to profile.json and profile.trace.json (a Chrome trace) in the base
+    directory, and summarized when it ends.
+
+    Args:
+        params (dict): The SPIRAL generator parameters.
+        base_dir (str, optional): The directory to run the flow in. Default is the
+                                  current directory.
+        initial_clock_period (float, optional): The initial clock period in ns. Default is to
+                                                predict it (see FlowProject).
+        use_cache (bool, optional): Whether to use the local Verilog cache. Default is True.
+        verilog_path (str, optional): An already generated Verilog file to use instead of
+                                      generating one.
+        resume (bool, optional): Whether to resume from the checkpoint in the base directory,
+                                 if there is one for the same parameters. Default is False.
+        **options: Further FlowProject options (base_url, search_strategy, speculative_jobs,
+                   speculative_rounds, max_iterations, hammer_url, hammer_commit, extract_paths,
+                   predict_periods, max_area, trace_frames).
+
+    Returns:
+        FlowProject: The project, or None if the Verilog file could not be generated.
+    """
+    project = FlowProject.from_checkpoint(base_dir) if resume else None
+    if project is None or project.params != params:
+        project = FlowProject(params, base_dir, initial_clock_period, use_cache, verilog_path, **options)
+    elif project.completed_stages:
+        print(f"Resuming {project.name} after stage(s): {', '.join(project.completed_stages)}")
+    for stage in FLOW_STAGES:
+        try:
+            run_flow_stage(stage, project)
+        except RuntimeError as e:
+            print(e)
+            break
+    project.save_profile()
+    fftgen_profile.print_summary(project.spans, f"Profile of {project.name}")
+    return None if "generate" not in project.completed_stages else project
 
-def display_power_report(new_dir_name):
+def record_run(project, status, error=None, db_path=None):
     """
-    Reads and displays the power metrics from the power report after Place-and-Route.
+    Records a project's flow in the results database (see fftgen_db).
+
+    The flow is recorded under the project's run key, so recording it again, e.g. after
+    it was resumed, updates its record. Database errors are printed, not raised, so
+    they never fail a flow.
 
     Args:
-        new_dir_name (str): The path to the main project directory.
+        project (FlowProject): The project.
+        status (str): The outcome of the flow, e.g. 'completed' or 'failed'.
+        error (str, optional): Why the flow failed.
+        db_path (str, optional): The database file. Default is RESULTS_DB_PATH; if both
+                                 are None, nothing is recorded.
+
+    Returns:
+        int: The id of the flow's record, or None if it was not recorded.
     """
-    power_report_path = os.path.join(new_dir_name, "build", "par-rundir", "dft_top_power.rpt")
-    
+    db_path = db_path or RESULTS_DB_PATH
+    if not db_path:
+        return None
+    ppa = project.ppa or {}
+    results = {"status": status, "error": error, "search_strategy": project.search_strategy,
+               "initial_clock_period": project.initial_clock_period, "syn_clock_period": project.syn_clock_period,
+               "par_clock_period": project.par_clock_period, "syn_area": project.syn_area,
+               "runtime": round(sum(project.stage_seconds.values()), 3)}
+    for check in ("setup", "hold"):
+        for key in ("slack", "wns", "tns", "violating"):
+            results[f"{check}_{key}"] = (ppa.get(check) or {}).get(key)
+    for key in ("area", "internal_power", "switching_power", "leakage_power", "total_power"):
+        results[key] = ppa.get(key)
+    artifacts = {"base_dir": project.base_dir, "project_dir": project.project_dir, "par_dir": project.par_dir,
+                 "verilog": project.verilog_path, "checkpoint": project.checkpoint_path,
+                 "tuning_history": os.path.join(project.project_dir, "tuning_history.json"),
+                 "verilog_stats": os.path.join(project.project_dir, "verilog_stats.json")}
+    paths_dir = os.path.join(project.par_dir, "build", "paths")
+    if project.extract_paths and os.path.isdir(paths_dir):
+        artifacts["paths"] = paths_dir
     try:
-        with open(power_report_path, 'r') as report_file:
-            for line in report_file:
-                if "Total Internal Power:" in line:
-                    internal_power = line.split(':')[1].strip()
-                    print(f"Total Internal Power: {internal_power}")
-                elif "Total Switching Power:" in line:
-                    switching_power = line.split(':')[1].strip()
-                    print(f"Total Switching Power: {switching_power}")
-                elif "Total Leakage Power:" in line:
-                    leakage_power = line.split(':')[1].strip()
-                    print(f"Total Leakage Power: {leakage_power}")
-                elif "Total Power:" in line:
-                    total_power = line.split(':')[1].strip()
-                    print(f"Total Power: {total_power} mW")
-                    print("------------------------------------------------------------")
-                    return
-            print("Power information not found in the report.")
-            print("--------------------------------------------------")
-    except Exception as e:
-        print(f"Failed to read the power report. Reason: {e}")
+        return fftgen_db.ResultsDB(db_path).record(project.run_key, project.name, project.params, results,
+                                                   project.history, project.stage_seconds, artifacts)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Failed to record {project.name} in the results database {db_path}. Reason: {e}")
+        return None
 
-def run_par(new_dir_name, clock_period, rerun=False):
+def total_memory_gb():
+    """Returns the physical memory of the host in GiB, or None if it cannot be determined."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 1024 ** 3
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def _init_scheduler_worker(pause_seconds, incremental, results_db_path, early_abort, verify_cache):
+    """Carries the command-line settings over to a scheduler worker process."""
+    global PAUSE_SECONDS, INCREMENTAL, RESULTS_DB_PATH, EARLY_ABORT, VERIFY_VERILOG_CACHE
+    PAUSE_SECONDS, INCREMENTAL, RESULTS_DB_PATH, EARLY_ABORT = pause_seconds, incremental, results_db_path, early_abort
+    VERIFY_VERILOG_CACHE = verify_cache
+
+class FlowJob:
+    """One project going through the flow stages under a FlowScheduler."""
+
+    def __init__(self, project, stages):
+        self.project = project
+        self.stages = list(stages)
+        self.stage_index = 0
+        self.attempts = 0
+        self.ready_at = 0.0
+        self.status = "queued"
+        self.error = None
+        self.stage_times = {}
+
+    @property
+    def stage(self):
+        return self.stages[self.stage_index]
+
+class FlowScheduler:
     """
-    Runs the place and route (PAR) process for the given project directory and clock period.
+    Runs the flows of many projects on a process pool within the host's resources.
+
+    Every stage of every job is a separate task. Stages of one project run in order, while
+    stages of different projects run concurrently whenever the cores, memory and tool
+    licenses they hold (see STAGE_RESOURCES) are free. A stage needing more than the
+    host has is clamped to the host, so it runs alone rather than never. Speculative
+    synthesis holds a license per parallel synthesis, so a project's speculative_jobs is
+    clamped to the number of licenses of the synthesis tool before the stage starts. Among ready
+    jobs, those furthest along the flow go first so finished designs are not held up by
+    new ones. A failed stage is requeued after an exponential, jittered backoff, up to
+    `retries` times, before its job is marked failed.
 
-    This function changes the working directory to the specified project directory,
-    runs the PAR process using the appropriate make command, and then analyzes
-    the timing report to adjust the clock period if necessary. If the PAR process fails,
-    an error message is printed. The working directory is restored at the end.
+    Args:
+        max_workers (int, optional): The number of worker processes. Default is the number of cores.
+        cores (int, optional): The cores to schedule. Default is the number of cores.
+        memory_gb (float, optional): The memory to schedule in GiB. Default is the host's memory.
+        licenses (dict, optional): The number of licenses per tool (e.g. {'genus': 2,
+                                   'innovus': 1}). Tools not listed are unlimited.
+        retries (int, optional): The number of times a failed stage is requeued. Default is 2.
+        backoff (float, optional): The delay before the first requeue in seconds. Default is 5.
+        stages (list, optional): The stages to run, in order. Default is all of FLOW_STAGES.
+        stage_resources (dict, optional): Overrides for STAGE_RESOURCES.
+    """
+
+    def __init__(self, max_workers=None, cores=None, memory_gb=None, licenses=None, retries=2, backoff=5.0,
+                 stages=None, stage_resources=None):
+        self.cores = cores or os.cpu_count() or 1
+        self.max_workers = max_workers or self.cores
+        self.memory_gb = memory_gb if memory_gb is not None else total_memory_gb()
+        self.licenses = dict(licenses or {})
+        self.retries = retries
+        self.backoff = backoff
+        self.stages = list(stages or FLOW_STAGES)
+        self.stage_resources = {stage: dict(resources) for stage, resources in STAGE_RESOURCES.items()}
+        for stage, resources in (stage_resources or {}).items():
+            self.stage_resources.setdefault(stage, {}).update(resources)
+        self.jobs = []
+        self.in_use = {"cores": 0, "memory_gb": 0}
+        self.licenses_in_use = {}
+
+    def submit(self, project):
+        """Queues a project's flow. Returns its FlowJob."""
+        job = FlowJob(project, self.stages)
+        self.jobs.append(job)
+        return job
+
+    def copies(self, job):
+        """
+        Returns the number of tool runs a job's next stage makes at once: the speculative
+        syntheses of a synthesis stage, at most as many as there are licenses of its tool.
+        """
+        if job.stage != "synthesis":
+            return 1
+        copies = max(1, job.project.speculative_jobs)
+        tool = self.stage_resources[job.stage].get("license")
+        if tool in self.licenses:
+            copies = min(copies, max(1, self.licenses[tool]))
+        return copies
+
+    def requirements(self, job):
+        """Returns the (cores, memory in GiB, license tool, license count) that a job's next stage holds."""
+        resources = self.stage_resources[job.stage]
+        # Speculative synthesis runs several syntheses at once, each holding a license
+        copies = self.copies(job)
+        cores = min(resources.get("cores", 0) * copies, self.cores)
+        memory_gb = resources.get("memory_gb", 0) * copies
+        if self.memory_gb is not None:
+            memory_gb = min(memory_gb, self.memory_gb)
+        tool = resources.get("license")
+        return cores, memory_gb, tool, copies if tool else 0
+
+    def fits(self, requirements):
+        """Returns True if a stage with the given requirements can start now."""
+        cores, memory_gb, tool, count = requirements
+        if self.in_use["cores"] + cores > self.cores:
+            return False
+        if self.memory_gb is not None and self.in_use["memory_gb"] + memory_gb > self.memory_gb:
+            return False
+        if tool in self.licenses and self.licenses_in_use.get(tool, 0) + count > self.licenses[tool]:
+            return False
+        return True
+
+    def _hold(self, requirements, sign):
+        cores, memory_gb, tool, count = requirements
+        self.in_use["cores"] += sign * cores
+        self.in_use["memory_gb"] += sign * memory_gb
+        if tool:
+            self.licenses_in_use[tool] = self.licenses_in_use.get(tool, 0) + sign * count
+
+    def _finish(self, job, status, on_job_done):
+        job.status = status
+        if on_job_done:
+            on_job_done(job)
+
+    def run(self, on_job_done=None):
+        """
+        Runs every submitted job to completion or failure.
+
+        Args:
+            on_job_done (callable, optional): Called with each FlowJob as it completes or fails.
+
+        Returns:
+            list: The FlowJobs, in submission order, each with status 'completed' or 'failed'.
+        """
+        running = {}
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_scheduler_worker,
+                initargs=(PAUSE_SECONDS, INCREMENTAL, RESULTS_DB_PATH, EARLY_ABORT,
+                          VERIFY_VERILOG_CACHE)) as executor:
+            while any(job.status in ("queued", "running") for job in self.jobs):
+                now = time.time()
+                ready = [job for job in self.jobs if job.status == "queued" and job.ready_at <= now]
+                ready.sort(key=lambda job: -job.stage_index)
+                for job in ready:
+                    if len(running) >= self.max_workers:
+                        break
+                    requirements = self.requirements(job)
+                    if not self.fits(requirements):
+                        continue
+                    self._hold(requirements, 1)
+                    job.status = "running"
+                    copies = self.copies(job)
+                    if job.stage == "synthesis" and job.project.speculative_jobs > copies:
+                        print(f"Scheduler: running {copies} instead of {job.project.speculative_jobs} "
+                              f"speculative syntheses of {job.project.name}, the number of licenses")
+                        job.project.speculative_jobs = copies
+                    print(f"Scheduler: starting {job.stage} of {job.project.name} (attempt {job.attempts + 1}) "
+                          f"with {requirements[0]} core(s), {requirements[1]:.3g} GiB"
+                          + (f", {requirements[3]} {requirements[2]} license(s)" if requirements[2] else ""))
+                    future = executor.submit(run_flow_stage, job.stage, job.project)
+                    running[future] = (job, requirements, time.time())
+
+                # Wait for a stage to finish, or for the next backoff to expire
+                waiting = [job.ready_at for job in self.jobs if job.status == "queued" and job.ready_at > now]
+                timeout = max(0.0, min(waiting) - now) if waiting else None
+                if not running:
+                    if timeout is None:
+                        # Nothing is running and nothing is ready
+                        break
+                    time.sleep(timeout)
+                    continue
+                done, _ = concurrent.futures.wait(running, timeout=timeout,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    job, requirements, start_time = running.pop(future)
+                    self._hold(requirements, -1)
+                    job.stage_times[job.stage] = job.stage_times.get(job.stage, 0) + time.time() - start_time
+                    try:
+                        job.project = future.result()
+                    except Exception as e:
+                        job.attempts += 1
+                        job.error = str(e)
+                        if job.attempts > self.retries or isinstance(e, DesignRejected):
+                            print(f"Scheduler: {job.stage} of {job.project.name} failed after "
+                                  f"{job.attempts} attempt(s). Reason: {e}")
+                            self._finish(job, "failed", on_job_done)
+                            continue
+                        delay = self.backoff * 2 ** (job.attempts - 1) * random.uniform(0.75, 1.25)
+                        print(f"Scheduler: {job.stage} of {job.project.name} failed ({e}); "
+                              f"requeuing in {delay:.1f} s")
+                        job.ready_at = time.time() + delay
+                        job.status = "queued"
+                        continue
+
+                    job.attempts, job.error = 0, None
+                    job.stage_index += 1
+                    if job.stage_index == len(job.stages):
+                        self._finish(job, "completed", on_job_done)
+                    else:
+                        job.status = "queued"
+                        job.ready_at = 0.0
+        for job in self.jobs:
+            if job.status == "queued":
+                self._finish(job, "failed", on_job_done)
+        return self.jobs
+
+# The stages of a FlowPipeline: each runs one or more FLOW_STAGES of a project in turn
+PIPELINE_STAGES = {
+    "generate": ["generate", "setup"],
+    "synthesis": ["synthesis"],
+    "par": ["par"],
+}
+
+def pipeline_workers(jobs=1, cores=None, memory_gb=None, licenses=None, speculative_jobs=0, stage_resources=None):
+    """
+    Returns the number of synthesis and Place-and-Route workers of a FlowPipeline within
+    the given resources.
+
+    Each tool stage starts with `jobs` workers, at most as many as there are licenses of
+    its tool (a speculative synthesis worker holds a license per parallel synthesis).
+    While the workers of both stages together need more cores or memory than there are
+    (see STAGE_RESOURCES), the stage with the most workers loses one. Every stage keeps at
+    least one worker, so a stage needing more than the host has runs alone rather than never.
 
     Args:
-        new_dir_name (str): The path to the main project directory.
-        clock_period (float): The clock period for the constraints.
-        rerun (bool, optional): Flag indicating whether this is a rerun of the PAR process.
-                                Default is False.
+        jobs (int, optional): The number of workers per tool stage before the limits. Default is 1.
+        cores (int, optional): The cores to fit the workers in. Default is the number of cores.
+        memory_gb (float, optional): The memory to fit the workers in in GiB. Default is the host's memory.
+        licenses (dict, optional): The number of licenses per tool, see FlowScheduler.
+        speculative_jobs (int, optional): The number of parallel syntheses per speculative round.
+        stage_resources (dict, optional): Overrides for STAGE_RESOURCES.
 
-    Raises:
-        subprocess.CalledProcessError: If the PAR process fails, an error message is printed.
+    Returns:
+        dict: The number of workers of the 'synthesis' and 'par' stages.
     """
-    try:
-        os.chdir(new_dir_name)
-        current_dir = os.getcwd()
-        
-        if rerun:
-            print(f"Running 'make clean-build' followed by 'make par' in directory: {current_dir}")
-            subprocess.run(["make", "clean-build"], check=True)
-            subprocess.run(["make", "par"], check=True)
+    cores = cores or os.cpu_count() or 1
+    memory_gb = memory_gb if memory_gb is not None else total_memory_gb()
+    licenses = licenses or {}
+    resources = {stage: dict(STAGE_RESOURCES[stage], **(stage_resources or {}).get(stage, {}))
+                 for stage in ("synthesis", "par")}
+    copies = {"synthesis": max(1, speculative_jobs), "par": 1}
+    workers = {}
+    for stage in resources:
+        tool = resources[stage].get("license")
+        if tool in licenses:
+            copies[stage] = min(copies[stage], max(1, licenses[tool]))
+            workers[stage] = max(1, min(jobs, licenses[tool] // copies[stage]))
         else:
-            print(f"Running 'make par' in directory: {current_dir}")  # Debug print statement
-            subprocess.run(["make", "par"], check=True)
+            workers[stage] = max(1, jobs)
+
+    def fits():
+        for key, limit in (("cores", cores), ("memory_gb", memory_gb)):
+            needed = sum(workers[stage] * copies[stage] * resources[stage].get(key, 0) for stage in workers)
+            if limit is not None and needed > limit:
+                return False
+        return True
+
+    while not fits():
+        stage = max(workers, key=lambda stage: workers[stage])
+        if workers[stage] == 1:
+            break
+        workers[stage] -= 1
+    return workers
 
-        print("Place-and-Route completed successfully.")
-       
-        # Unzip the timing reports
-        unzip_reports(new_dir_name)
-       
-        # Display report info and tune
-        clock_period = rerun_timing(new_dir_name, clock_period, process_type='Place-and-Route')
+class FlowPipeline:
+    """
+    Runs the flows of many projects as a pipeline, overlapping the stages of different designs.
 
-        # Hold time slack
-        display_hold_time_slack(new_dir_name)
+    Each pipeline stage (see PIPELINE_STAGES) has its own worker threads and a bounded
+    queue in front of it. While design A is in Place-and-Route, design B can be in
+    synthesis and design C can be generating, so the throughput of a sweep is set by its
+    slowest stage rather than by the sum of all stages. When a queue is full, the stage
+    before it blocks until there is room (backpressure), so fast generation cannot run
+    far ahead of the tools. The stages run tools as subprocesses, so threads suffice.
 
-        # Area report
-        display_area_report(new_dir_name)
+    A project whose stage fails leaves the pipeline as failed; the later stages carry on
+    with the other projects.
 
-        # Power report
-        display_power_report(new_dir_name)
+    Args:
+        workers (dict, optional): The number of worker threads per stage. Default is 2 for
+                                  generation and 1 for synthesis and Place-and-Route.
+        queue_size (int, optional): The capacity of the queue in front of each stage. Default is 2.
+    """
 
-    except subprocess.CalledProcessError as e:
-        print(f"Place-and-Route failed. Reason: {e}")
-    finally:
-        os.chdir("..")
+    def __init__(self, workers=None, queue_size=2):
+        self.workers = {"generate": 2, "synthesis": 1, "par": 1}
+        self.workers.update(workers or {})
+        self.queue_size = queue_size
+        self.stats = {}
+
+    def run(self, projects, on_project_done=None):
+        """
+        Runs every project through the pipeline.
+
+        Args:
+            projects (list): The FlowProjects to run.
+            on_project_done (callable, optional): Called with (project, status, error) as each
+                                                  project completes or fails.
+
+        Returns:
+            list: A (project, status, error) tuple per project, in the given order, where
+                  status is 'completed' or 'failed'.
+        """
+        stages = list(PIPELINE_STAGES)
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in stages]
+        outcomes = {}
+        lock = threading.Lock()
+        remaining = {stage: self.workers[stage] for stage in stages}
+        self.stats = {stage: {"workers": self.workers[stage], "projects": 0, "busy": 0.0, "blocked": 0.0}
+                      for stage in stages}
+
+        def finish(project, status, error=None):
+            with lock:
+                outcomes[id(project)] = (project, status, error)
+                if on_project_done:
+                    # A failing callback must not take the worker, and the shutdown of the later stages, with it
+                    try:
+                        on_project_done(project, status, error)
+                    except Exception as e:
+                        print(f"Pipeline: failed to record {project.name}. Reason: {e}")
+
+        def worker(index):
+            stage, stats = stages[index], self.stats[stages[index]]
+            try:
+                while True:
+                    project = queues[index].get()
+                    if project is None:
+                        break
+                    start_time = time.time()
+                    try:
+                        for flow_stage in PIPELINE_STAGES[stage]:
+                            project = run_flow_stage(flow_stage, project)
+                    except Exception as e:
+                        print(f"Pipeline: {stage} of {project.name} failed. Reason: {e}")
+                        finish(project, "failed", str(e))
+                        project = None
+                    busy = time.time() - start_time
+                    with lock:
+                        stats["projects"] += 1
+                        stats["busy"] += busy
+                    if project is None:
+                        continue
+                    if index + 1 == len(stages):
+                        finish(project, "completed")
+                        continue
+                    # Blocks while the next stage's queue is full
+                    start_time = time.time()
+                    queues[index + 1].put(project)
+                    with lock:
+                        stats["blocked"] += time.time() - start_time
+            finally:
+                # The last worker of a stage shuts down the next stage
+                with lock:
+                    remaining[stage] -= 1
+                    last = remaining[stage] == 0
+                if last and index + 1 < len(stages):
+                    for _ in range(self.workers[stages[index + 1]]):
+                        queues[index + 1].put(None)
+
+        start_time = time.time()
+        threads = [threading.Thread(target=worker, args=(index,), daemon=True)
+                   for index, stage in enumerate(stages) for _ in range(self.workers[stage])]
+        for thread in threads:
+            thread.start()
+        for project in projects:
+            queues[0].put(project)
+        for _ in range(self.workers[stages[0]]):
+            queues[0].put(None)
+        for thread in threads:
+            thread.join()
+        wall = time.time() - start_time
+
+        for stats in self.stats.values():
+            stats["utilization"] = round(stats["busy"] / (wall * stats["workers"]), 3) if wall > 0 else 0.0
+            stats["busy"], stats["blocked"] = round(stats["busy"], 3), round(stats["blocked"], 3)
+        self.stats["wall"] = round(wall, 3)
+        self.print_stats()
+        return [outcomes[id(project)] for project in projects]
+
+    def print_stats(self):
+        """Prints the per-stage utilization of the last run and its bottleneck stage."""
+        stages = [stage for stage in PIPELINE_STAGES if stage in self.stats]
+        print("------------------------------------------------------------")
+        print(f"Pipeline utilization over {self.stats['wall']} s:")
+        for stage in stages:
+            stats = self.stats[stage]
+            print(f"  {stage:<10} {stats['workers']} worker(s)  {stats['projects']:>4} project(s)  "
+                  f"busy {stats['busy']:>9.1f} s  blocked {stats['blocked']:>9.1f} s  "
+                  f"utilization {100 * stats['utilization']:>5.1f}%")
+        if stages:
+            print(f"Bottleneck stage: {max(stages, key=lambda stage: self.stats[stage]['utilization'])}")
+        print("------------------------------------------------------------")
+
+def load_sweep_spec(spec_path):
+    """
+    Loads a sweep spec from a YAML or JSON file.
+
+    A sweep spec is a mapping with the following optional keys:
+        - sweep: SPIRAL parameter names mapped to lists of values. The cartesian
+                 product of all lists is swept.
+        - points: A list of explicit design points (SPIRAL parameter dicts).
+        - defaults: SPIRAL parameter values shared by every point.
+        - output_dir: The directory to create the per-point project directories in.
+        - initial_clock_period: The initial clock period in ns for every point. Without it,
+                                every point's period is predicted from past runs.
+        - min_sqnr: The SQNR in dB that fixed-point points must reach in the reference model
+                    (see fftgen_model). Points below it are rejected before generation.
 
-def main():
-    # Generate Verilog file
-    filename = fetch_verilog_file_content()
-    if not filename:
-        print("Failed to download Verilog file. Exiting.")
-        sys.exit(1)
+    Args:
+        spec_path (str): The path of the spec file (.yml, .yaml or .json).
 
-    print("Verilog file downloaded. Proceeding...")
-    time.sleep(5)
+    Returns:
+        dict: The parsed sweep spec.
 
-    # Set up project directory
-    new_dir_name, sub_dir_new_name, sub_sub_dir_name = setup_project()
-    process_verilog_file(filename)
+    Raises:
+        ValueError: If the spec is not a mapping or has an unknown key.
+    """
+    with open(spec_path, 'r') as f:
+        if spec_path.endswith((".yml", ".yaml")):
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
 
-    # Copy Verilog file to 'v' subdirectory
-    destination_path = os.path.join(new_dir_name, sub_dir_new_name, sub_sub_dir_name, filename)
-    shutil.copy(filename, destination_path)
+    if not isinstance(spec, dict):
+        raise ValueError(f"Sweep spec {spec_path} must be a mapping")
+    unknown = set(spec) - {"sweep", "points", "defaults", "output_dir", "initial_clock_period", "min_sqnr"}
+    if unknown:
+        raise ValueError(f"Unknown sweep spec key(s): {', '.join(sorted(unknown))}")
+    return spec
 
-    # Create cfg.yml, src.yml, and tb.yml files
-    cfg_dir = os.path.join(new_dir_name, sub_dir_new_name, "cfg")
-    os.makedirs(cfg_dir, exist_ok=True)
+def expand_sweep(spec):
+    """
+    Expands a sweep spec into complete SPIRAL parameter dicts and validates them.
+
+    Cartesian products naturally contain combinations SPIRAL does not support
+    (e.g. a radix that is not valid for a transform size), and hand-written points
+    may be malformed (e.g. a non-integer idN or an unknown parameter). Those points
+    are reported and left out rather than aborting the sweep. With min_sqnr in the spec, so are
+    fixed-point points whose modelled SQNR falls below it; points with the same
+    arithmetic (they differ only in architecture or stream width) are modelled once.
+
+    Args:
+        spec (dict): The sweep spec, as returned by load_sweep_spec().
 
-    cfg_file_path = os.path.join(cfg_dir, "cfg.yml")
-    create_cfg_file(cfg_file_path)
+    Returns:
+        tuple: A tuple containing:
+            - points (list): The valid SPIRAL parameter dicts, without duplicates.
+            - rejected (list): (point, reason) tuples for the invalid points.
+    """
+    defaults = spec.get("defaults") or {}
+    sweep = spec.get("sweep") or {}
+    raw_points = [dict(point) for point in spec.get("points") or []]
+
+    if sweep:
+        names = list(sweep)
+        values = [v if isinstance(v, list) else [v] for v in (sweep[name] for name in names)]
+        for combination in itertools.product(*values):
+            raw_points.append(dict(zip(names, combination)))
+
+    min_sqnr = spec.get("min_sqnr")
+    points, rejected, seen, sqnr = [], [], set(), {}
+    for raw_point in raw_points:
+        point = dict(defaults)
+        point.update(raw_point)
+        try:
+            params = normalize_params(point)
+            validate_params(params)
+        except ValueError as e:
+            rejected.append((point, str(e)))
+            continue
+        if min_sqnr is not None and params["idDataType"] == '0':
+            arithmetic = tuple(params[key] for key in ("idN", "idRadix", "idWidth", "idTWidth", "idScale",
+                                                       "idInverse"))
+            if arithmetic not in sqnr:
+                sqnr[arithmetic] = fftgen_model.evaluate_sqnr(params)["sqnr_db"]
+            if sqnr[arithmetic] < float(min_sqnr):
+                rejected.append((point, f"modelled SQNR {sqnr[arithmetic]} dB is below {min_sqnr} dB"))
+                continue
+        key = params_cache_key(params)
+        if key not in seen:
+            seen.add(key)
+            points.append(params)
+    return points, rejected
+
+def point_name(params):
+    """Returns a readable, unique directory name for a SPIRAL parameter dict."""
+    arch = "stream" if params["idArch"] == '1' else "iter"
+    dtype = "float" if params["idDataType"] == '1' else f"w{params['idWidth']}{'s' if params['idScale'] == '1' else 'u'}"
+    direction = "inv" if params["idInverse"] == '1' else "fwd"
+    name = f"fft_n{params['idN']}_r{params['idRadix']}_sw{params['idStreamWidth']}_{dtype}_{arch}_{direction}"
+    if int(params["idBRAM"]) != -1:
+        name += f"_bram{params['idBRAM']}"
+    return name
+
+def run_sweep(spec_path, output_dir=None, use_cache=True, fetch_workers=4, base_url=SPIRAL_BASE_URL,
+              search_strategy="bracket", speculative_jobs=0, max_iterations=10, jobs=1, licenses=None,
+              memory_gb=None, retries=2, pipeline=False, resume=False, extract_paths=False,
+              predict_periods=True, max_area=None, trace_frames=8, hammer_commit=HAMMER_COMMIT,
+              initial_clock_period=None):
+    """
+    Runs the full flow for every design point of a sweep spec without prompting.
+
+    Each point gets its own project directory under the output directory, named after
+    its parameters. A summary of every point is written to sweep_summary.json in the
+    output directory as the sweep progresses. The Verilog files of all points are
+    generated concurrently before the first flow starts, and the flows then run on a
+    FlowScheduler within the host's cores, memory and tool licenses. With pipeline set,
+    the flows instead run on a FlowPipeline, which overlaps the generation of later
+    points with the synthesis and Place-and-Route of earlier ones. Its synthesis and
+    Place-and-Route stages then get `jobs` workers each, within the licenses and memory
+    (see pipeline_workers()).
+
+    Every point's progress is checkpointed in its project directory (see run_flow()).
+    With resume set, points resume from their checkpoints, and points whose flows
+    completed are not run again.
+
+    Each point's spans are written to its directory as it finishes (see fftgen_profile).
+    The spans of all points and of the Verilog generation are aggregated into
+    sweep_profile.json and sweep_trace.json in the output directory.
 
-    src_file_path = os.path.join(cfg_dir, "src.yml")
-    create_src_file(src_file_path)
+    Args:
+        spec_path (str): The path of the sweep spec file.
+        output_dir (str, optional): Overrides the spec's output directory.
+        use_cache (bool, optional): Whether to use the local Verilog cache. Default is True.
+        fetch_workers (int, optional): The number of concurrent Verilog generations. Default is 4.
+        base_url (str, optional): The URL of the SPIRAL generator directory, ending in '/'.
+        search_strategy (str, optional): The clock period search strategy ('bracket' or
+                                         'ladder'). Default is 'bracket'.
+        speculative_jobs (int, optional): The number of parallel syntheses per speculative
+                                          round, or 0 to tune synthesis serially. Default is 0.
+        max_iterations (int, optional): The maximum number of runs per tuning stage. Default is 10.
+        jobs (int, optional): The number of flow stages to run at once. Default is 1.
+        licenses (dict, optional): The number of licenses per tool, see FlowScheduler.
+        memory_gb (float, optional): The memory to schedule in GiB. Default is the host's memory.
+        retries (int, optional): The number of times a failed stage is requeued. Default is 2.
+        pipeline (bool, optional): Whether to run the flows on a FlowPipeline. Default is False.
+        resume (bool, optional): Whether to resume points from their checkpoints. Default is False.
+        extract_paths (bool, optional): Whether to extract every timing path of each point's
+                                        final Place-and-Route run (see fftgen_paths). Default is False.
+        predict_periods (bool, optional): Whether to seed the clock periods of points from past
+                                          runs (see FlowProject). Default is True.
+        max_area (float, optional): Reject points whose estimated area exceeds this many um^2
+                                    before synthesis (see FlowProject). Default is no limit.
+        trace_frames (int, optional): The number of transforms in each point's simulation
+                                      traces, or 0 for none (see FlowProject). Default is 8.
+        hammer_commit (str, optional): The commit to pin the Hammer CAD library to (see
+                                       FlowProject). Default is HAMMER_COMMIT.
+        initial_clock_period (float, optional): The first synthesis period of every point in ns,
+                                                overriding the spec's initial_clock_period.
+                                                Default is the spec's, or to predict it.
 
-    tb_file_path = os.path.join(cfg_dir, "tb.yml")
-    create_tb_file(tb_file_path)
+    Returns:
+        list: A result dict (name, params, status, clock_period, run_id) per design point.
+    """
+    spec = load_sweep_spec(spec_path)
+    output_dir = os.path.abspath(output_dir or spec.get("output_dir") or "fft_sweep")
+    if initial_clock_period is None:
+        initial_clock_period = spec.get("initial_clock_period")
+    initial_clock_period = float(initial_clock_period) if initial_clock_period is not None else None
+
+    points, rejected = expand_sweep(spec)
+    for point, reason in rejected:
+        print(f"Skipping invalid design point {point}: {reason}")
+    print(f"Sweeping {len(points)} design point(s) into {output_dir}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    projects, results = [], []
+    for params in points:
+        name = point_name(params)
+        project = FlowProject.from_checkpoint(os.path.join(output_dir, name)) if resume else None
+        if project is None or project.params != params:
+            project = FlowProject(params, os.path.join(output_dir, name), initial_clock_period, use_cache,
+                                  base_url=base_url, search_strategy=search_strategy,
+                                  speculative_jobs=speculative_jobs, max_iterations=max_iterations,
+                                  extract_paths=extract_paths, predict_periods=predict_periods,
+                                  max_area=max_area, trace_frames=trace_frames, hammer_commit=hammer_commit)
+        projects.append(project)
+        results.append({"name": name, "params": params, "status": "pending", "clock_period": None})
+    summary_path = os.path.join(output_dir, "sweep_summary.json")
+    sweep_profiler = fftgen_profile.Profiler()
+    profiles = {"sweep": sweep_profiler.spans}
+    profiles.update((project.name, project.spans) for project in projects)
+
+    def record(result, project, status, error):
+        result["status"] = status
+        if status == "completed":
+            result.update(clock_period=project.syn_clock_period, par_clock_period=project.par_clock_period,
+                          ppa=project.ppa)
+        else:
+            result["error"] = error
+        if status != "pending":
+            result["run_id"] = record_run(project, status, error)
+            project.save_profile()
+            profiles[project.name] = project.spans
+        with open(summary_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    # Points whose checkpoints record a finished flow are not run again
+    pending = []
+    for project, result in zip(projects, results):
+        if project.completed_stages == list(FLOW_STAGES):
+            print(f"Design point {project.name} already completed; skipping it.")
+            record(result, project, "completed", None)
+        else:
+            pending.append((project, result))
+    with open(summary_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if pipeline:
+        print(f"Running {len(pending)} flow(s) as a pipeline...")
+        project_results = {id(project): result for project, result in pending}
+        workers = pipeline_workers(jobs=jobs, memory_gb=memory_gb, licenses=licenses,
+                                   speculative_jobs=speculative_jobs)
+        copies = max(1, speculative_jobs)
+        if licenses and "genus" in licenses:
+            copies = min(copies, max(1, licenses["genus"]))
+        if speculative_jobs > copies:
+            print(f"Pipeline: running {copies} instead of {speculative_jobs} speculative syntheses, "
+                  f"the number of licenses")
+            for project, _ in pending:
+                project.speculative_jobs = copies
+        print(f"Pipeline workers: {fetch_workers} generate, {workers['synthesis']} synthesis, "
+              f"{workers['par']} Place-and-Route")
+        flow_pipeline = FlowPipeline(workers=dict(workers, generate=fetch_workers))
+        flow_pipeline.run([project for project, _ in pending], on_project_done=lambda project, status, error: record(
+            project_results[id(project)], project, status, error))
+        with open(os.path.join(output_dir, "pipeline_stats.json"), 'w') as f:
+            json.dump(flow_pipeline.stats, f, indent=2)
+    else:
+        fetching = [project for project, _ in pending if not project.verilog_path]
+        print(f"Generating {len(fetching)} Verilog file(s) with {fetch_workers} concurrent worker(s)...")
+        fetch_jobs = []
+        for project in fetching:
+            os.makedirs(project.base_dir, exist_ok=True)
+            fetch_jobs.append((project.params, os.path.join(project.base_dir, verilog_filename(project.params))))
+        with sweep_profiler.activate(), fftgen_profile.span("verilog-batch", "stage", points=len(fetch_jobs)):
+            verilog_paths = generate_verilog_batch(fetch_jobs, max_workers=fetch_workers, use_cache=use_cache,
+                                                   base_url=base_url)
+        for project, verilog_path in zip(fetching, verilog_paths):
+            project.verilog_path = verilog_path
+
+        scheduler = FlowScheduler(max_workers=jobs, licenses=licenses, memory_gb=memory_gb, retries=retries)
+        job_results = {}
+        for project, result in pending:
+            if not project.verilog_path:
+                print(f"Failed to download Verilog file for design point {project.name}.")
+                record(result, project, "failed", "Failed to download Verilog file")
+                continue
+            job_results[id(scheduler.submit(project))] = result
+
+        print(f"Running {len(scheduler.jobs)} flow(s) with up to {scheduler.max_workers} worker(s)...")
+        scheduler.run(on_job_done=lambda job: record(job_results[id(job)], job.project, job.status, job.error))
+
+    spans = fftgen_profile.write_merged_profile(profiles, os.path.join(output_dir, "sweep_profile.json"),
+                                                os.path.join(output_dir, "sweep_trace.json"))
+    fftgen_profile.print_summary(spans, f"Profile of the sweep of {len(projects)} design point(s)")
+
+    print("------------------------------------------------------------")
+    for result in results:
+        print(f"{result['name']:<48} {result['status']:<10} {result['clock_period']}")
+    print("------------------------------------------------------------")
+    return results
+
+def explore_objectives(params, area, power, clock_period):
+    """Returns the Pareto objectives of a design point, or None if a result is missing."""
+    objectives = {"area": area, "power": power, "throughput": fftgen_explore.throughput(params, clock_period)}
+    return objectives if None not in objectives.values() else None
+
+def run_explore(spec_path, output_dir=None, use_cache=True, base_url=SPIRAL_BASE_URL, search_strategy="bracket",
+                max_iterations=10, jobs=1, licenses=None, memory_gb=None, retries=2, resume=False, margin=0.1,
+                use_prior=True, predict_periods=True, max_area=None, trace_frames=8, hammer_commit=HAMMER_COMMIT,
+                initial_clock_period=None):
+    """
+    Searches a sweep spec's design space for the area/power/throughput Pareto front.
 
-    # Initial clock period for constraints
-    initial_clock_period = 3
+    Unlike run_sweep(), Place-and-Route does not run for every point. All points are
+    synthesized first. Place-and-Route then runs in rounds of up to `jobs` points, the
+    most promising first, and before every round each remaining point's post-PaR
+    objectives are bounded from its synthesis area and clock period (see
+    fftgen_explore.PaRBoundModel). A point whose bound is dominated by a point already
+    through Place-and-Route cannot be on the front and is pruned without running it.
+    Points with a completed run in the results database are not run at all; their
+    recorded results join the front, and every recorded run calibrates the bounds.
 
-    # Create constraints.tcl file
-    constraints_file_path = os.path.join(cfg_dir, "constraints.tcl")
-    create_constraints(constraints_file_path, initial_clock_period)
+    A summary of every point (its status, objectives or the point it was pruned by)
+    and the front are written to explore_summary.json in the output directory, and the
+    spans of every point to explore_profile.json and explore_trace.json.
 
-    # Create Makefile
-    makefile_path = os.path.join(new_dir_name, sub_dir_new_name, "Makefile")
-    create_makefile(makefile_path)
+    Args:
+        spec_path (str): The path of the sweep spec file (see load_sweep_spec()).
+        output_dir (str, optional): Overrides the spec's output directory.
+        use_cache (bool, optional): Whether to use the local Verilog cache. Default is True.
+        base_url (str, optional): The URL of the SPIRAL generator directory, ending in '/'.
+        search_strategy (str, optional): The clock period search strategy. Default is 'bracket'.
+        max_iterations (int, optional): The maximum number of runs per tuning stage. Default is 10.
+        jobs (int, optional): The number of flow stages to run at once, and of Place-and-Route
+                              runs per round. Default is 1.
+        licenses (dict, optional): The number of licenses per tool, see FlowScheduler.
+        memory_gb (float, optional): The memory to schedule in GiB. Default is the host's memory.
+        retries (int, optional): The number of times a failed stage is requeued. Default is 2.
+        resume (bool, optional): Whether to resume points from their checkpoints. Default is False.
+        margin (float, optional): The relative slack granted to the PaR bounds; larger margins
+                                  prune less. Default is 0.1.
+        use_prior (bool, optional): Whether to use the results database for prior results and
+                                    calibration. Default is True.
+        predict_periods (bool, optional): Whether to seed the clock periods of points from past
+                                          runs (see FlowProject). Default is True.
+        max_area (float, optional): Reject points whose estimated area exceeds this many um^2
+                                    before synthesis (see FlowProject). Default is no limit.
+        trace_frames (int, optional): The number of transforms in each point's simulation
+                                      traces, or 0 for none (see FlowProject). Default is 8.
+        hammer_commit (str, optional): The commit to pin the Hammer CAD library to (see
+                                       FlowProject). Default is HAMMER_COMMIT.
+        initial_clock_period (float, optional): The first synthesis period of every point in ns,
+                                                overriding the spec's initial_clock_period.
+                                                Default is the spec's, or to predict it.
+
+    Returns:
+        dict: The summary: 'points' (one dict per design point with its name, params,
+              status, objectives and run_id) and 'front' (the names of the Pareto points).
+    """
+    spec = load_sweep_spec(spec_path)
+    output_dir = os.path.abspath(output_dir or spec.get("output_dir") or "fft_explore")
+    if initial_clock_period is None:
+        initial_clock_period = spec.get("initial_clock_period")
+    initial_clock_period = float(initial_clock_period) if initial_clock_period is not None else None
+
+    points, rejected = expand_sweep(spec)
+    for point, reason in rejected:
+        print(f"Skipping invalid design point {point}: {reason}")
+    print(f"Exploring {len(points)} design point(s) in {output_dir}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    db = fftgen_db.ResultsDB(RESULTS_DB_PATH) if use_prior and RESULTS_DB_PATH else None
+    model = fftgen_explore.PaRBoundModel(margin=margin)
+    if db:
+        for run in db.query(["status=completed"]):
+            model.add(run["syn_area"], run["syn_clock_period"], run["area"], run["par_clock_period"],
+                      run["total_power"])
+
+    entries, projects = [], {}
+    for params in points:
+        entry = {"name": point_name(params), "params": params, "status": "pending", "objectives": None,
+                 "run_id": None}
+        entries.append(entry)
+        prior = db.latest_run(params) if db else None
+        objectives = prior and explore_objectives(params, prior["area"], prior["total_power"],
+                                                  prior["par_clock_period"])
+        if objectives:
+            entry.update(status="prior", objectives=objectives, run_id=prior["id"])
+            continue
+        base_dir = os.path.join(output_dir, entry["name"])
+        project = FlowProject.from_checkpoint(base_dir) if resume else None
+        if project is None or project.params != params:
+            project = FlowProject(params, base_dir, initial_clock_period, use_cache, base_url=base_url,
+                                  search_strategy=search_strategy, max_iterations=max_iterations,
+                                  predict_periods=predict_periods, max_area=max_area,
+                                  trace_frames=trace_frames, hammer_commit=hammer_commit)
+        projects[entry["name"]] = project
+    summary_path = os.path.join(output_dir, "explore_summary.json")
+
+    def finish(entry, project, status, error=None):
+        entry["status"] = status
+        projects[entry["name"]] = project
+        if status == "par":
+            ppa = project.ppa or {}
+            entry["objectives"] = explore_objectives(entry["params"], ppa.get("area"), ppa.get("total_power"),
+                                                     project.par_clock_period)
+            if entry["objectives"] is None:
+                entry["status"], error = "failed", "Place-and-Route reported no area or power"
+            else:
+                model.add(project.syn_area, project.syn_clock_period, ppa["area"], project.par_clock_period,
+                          ppa["total_power"])
+        if error:
+            entry["error"] = error
+        if status != "synthesized":
+            entry["run_id"] = record_run(project, "completed" if entry["status"] == "par" else entry["status"],
+                                         error)
+        project.save_profile()
+        save_summary()
+
+    def save_summary():
+        measured = [entry for entry in entries if entry["objectives"]]
+        front = fftgen_explore.pareto_front(measured, key=lambda entry: entry["objectives"])
+        summary = {"points": entries, "front": [entry["name"] for entry in front]}
+        with open(summary_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def run_stages(stages, batch, on_done):
+        scheduler = FlowScheduler(max_workers=jobs, licenses=licenses, memory_gb=memory_gb, retries=retries,
+                                  stages=stages)
+        job_entries = {id(scheduler.submit(projects[entry["name"]])): entry for entry in batch}
+        scheduler.run(on_job_done=lambda job: on_done(job_entries[id(job)], job.project, job.status, job.error))
+
+    # Synthesize every point that has no results yet
+    to_synthesize = []
+    for entry in entries:
+        if entry["status"] != "pending":
+            continue
+        project = projects[entry["name"]]
+        if project.completed_stages == list(FLOW_STAGES):
+            finish(entry, project, "par")
+        elif "synthesis" in project.completed_stages:
+            entry["status"] = "synthesized"
+        else:
+            to_synthesize.append(entry)
+    print(f"Synthesizing {len(to_synthesize)} design point(s)...")
+    run_stages(["generate", "setup", "synthesis"], to_synthesize,
+               lambda entry, project, status, error: finish(entry, project,
+                                                            "synthesized" if status == "completed" else "failed",
+                                                            error))
+
+    # Place-and-Route the most promising points, pruning those that can no longer reach the front
+    par_rounds = 0
+    while True:
+        measured = [entry for entry in entries if entry["objectives"]]
+        front = fftgen_explore.pareto_front(measured, key=lambda entry: entry["objectives"])
+        candidates = []
+        for entry in entries:
+            if entry["status"] != "synthesized":
+                continue
+            project = projects[entry["name"]]
+            bound = model.bound(entry["params"], project.syn_area, project.syn_clock_period)
+            dominator = bound and next((other for other in front
+                                        if fftgen_explore.dominates(other["objectives"], bound)), None)
+            if dominator:
+                print(f"Pruning {entry['name']}: even its best case is dominated by {dominator['name']}")
+                entry["dominated_by"] = dominator["name"]
+                finish(entry, project, "pruned", f"Dominated by {dominator['name']}")
+            else:
+                candidates.append((entry, bound or fftgen_explore.synthesis_estimate(
+                    entry["params"], project.syn_area, project.syn_clock_period)))
+        if not candidates:
+            break
 
-    # Run synthesis and get the final clock period
-    final_clock_period = run_synthesis(os.path.join(new_dir_name, sub_dir_new_name), initial_clock_period)
+        # Points on the front of the estimates go first; points without estimates cannot be ranked
+        estimated = [(entry, estimate) for entry, estimate in candidates if estimate]
+        ranks = fftgen_explore.pareto_ranks([estimate for _, estimate in estimated])
+        order = [entry for entry, estimate in candidates if not estimate] + \
+                [entry for _, (entry, estimate) in sorted(zip(ranks, estimated),
+                                                          key=lambda item: (item[0], -item[1][1]["throughput"]))]
+        batch = order[:max(1, jobs)]
+        par_rounds += 1
+        print(f"Place-and-Route round {par_rounds}: {', '.join(entry['name'] for entry in batch)} "
+              f"({len(candidates) - len(batch)} candidate(s) left)")
+        run_stages(["par"], batch, lambda entry, project, status, error: finish(
+            entry, project, "par" if status == "completed" else "failed", error))
+
+    summary = save_summary()
+    spans = fftgen_profile.write_merged_profile({name: project.spans for name, project in projects.items()},
+                                                os.path.join(output_dir, "explore_profile.json"),
+                                                os.path.join(output_dir, "explore_trace.json"))
+    fftgen_profile.print_summary(spans, f"Profile of the exploration of {len(projects)} design point(s)")
+    counts = {status: sum(entry["status"] == status for entry in entries)
+              for status in ("par", "pruned", "prior", "failed")}
+    print("------------------------------------------------------------")
+    print(f"Pareto front of {len(entries)} design point(s):")
+    for entry in entries:
+        if entry["name"] in summary["front"]:
+            objectives = entry["objectives"]
+            print(f"  {entry['name']:<48} area {objectives['area']:>12.1f} um^2  power {objectives['power']:>8.4f} mW  "
+                  f"throughput {objectives['throughput']:>7.4f} GS/s  ({entry['status']})")
+    print(f"Place-and-Route ran for {counts['par']} point(s); {counts['pruned']} were pruned, {counts['prior']} "
+          f"reused prior results and {counts['failed']} failed.")
+    print("------------------------------------------------------------")
+    return summary
+
+def parse_args(argv=None):
+    """Parses the command line. Without a subcommand the flow runs interactively."""
+    parser = argparse.ArgumentParser(description="Scripted SKY130 flow for SPIRAL-generated FFT blocks.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the local Verilog cache.")
+    parser.add_argument("--verify-cache", action="store_true",
+                        help="Re-hash cached Verilog files on every hit instead of trusting their size and mtime.")
+    parser.add_argument("--spiral-url", default=SPIRAL_BASE_URL,
+                        help="The URL of the SPIRAL generator directory (default: %(default)s).")
+    parser.add_argument("--search", choices=sorted(PERIOD_SEARCH_STRATEGIES), default="bracket",
+                        help="The clock period search strategy (default: %(default)s).")
+    parser.add_argument("--speculative", type=int, default=0, metavar="K",
+                        help="Tune synthesis by running K syntheses in parallel at a spread of "
+                             "clock periods (default: serial tuning).")
+    parser.add_argument("--clock-period", type=float, default=None, metavar="NS",
+                        help="Start synthesis at this clock period, for every point of a sweep or exploration "
+                             "(default: a sweep spec's initial_clock_period, or predicted from past runs).")
+    parser.add_argument("--no-predict", action="store_true",
+                        help=f"Do not predict the first clock periods: start synthesis at {DEFAULT_CLOCK_PERIOD} ns "
+                             "and Place-and-Route at the synthesis period.")
+    parser.add_argument("--max-area", type=float, default=None, metavar="UM2",
+                        help="Reject designs whose area estimated from their Verilog exceeds this many um^2, "
+                             "before synthesis (default: no limit).")
+    parser.add_argument("--trace-frames", type=int, default=8, metavar="F",
+                        help="The number of transforms in the golden RTL simulation traces listed in tb.yml, "
+                             "or 0 for none (default: %(default)s).")
+    parser.add_argument("--max-iterations", type=int, default=10,
+                        help="The maximum number of runs per tuning stage, at least 1 (default: %(default)s).")
+    parser.add_argument("--hammer-commit", default=HAMMER_COMMIT,
+                        help="Pin the shared Hammer CAD library to this commit SHA or ref name (default: latest).")
+    parser.add_argument("--no-incremental", action="store_true",
+                        help="Rerun Synthesis and Place-and-Route even if their inputs are unchanged.")
+    parser.add_argument("--no-early-abort", action="store_true",
+                        help="Let every Synthesis and Place-and-Route run finish, even when its timing "
+                             "estimates are hopeless.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume interrupted flows from their checkpoints instead of starting over.")
+    parser.add_argument("--extract-paths", action="store_true",
+                        help="Extract every timing path of the final Place-and-Route run into "
+                             "build/paths for fftgen_paths.py queries.")
+    parser.add_argument("--db", default=RESULTS_DB_PATH,
+                        help="The SQLite database finished flows are recorded in (default: %(default)s).")
+    parser.add_argument("--no-db", action="store_true", help="Do not record flows in the results database.")
+    parser.add_argument("--pause", type=float, default=None, metavar="SECONDS",
+                        help="Pause after key status messages (default: 5 interactively, 0 for sweeps).")
+    subparsers = parser.add_subparsers(dest="command")
+
+    sweep_parser = subparsers.add_parser("sweep", help="Run the flow for every point of a YAML/JSON sweep spec.")
+    sweep_parser.add_argument("spec", help="The sweep spec file.")
+    sweep_parser.add_argument("--output-dir", help="The directory for the per-point project directories.")
+    sweep_parser.add_argument("--fetch-workers", type=int, default=4,
+                              help="The number of concurrent Verilog generations (default: %(default)s).")
+    sweep_parser.add_argument("--jobs", type=int, default=1,
+                              help="The number of flow stages to run at once (default: %(default)s).")
+    sweep_parser.add_argument("--licenses", type=int, default=None, metavar="N",
+                              help="The number of Genus and of Innovus licenses (default: unlimited).")
+    sweep_parser.add_argument("--memory-gb", type=float, default=None,
+                              help="The memory to schedule flows within in GiB (default: the host's memory).")
+    sweep_parser.add_argument("--retries", type=int, default=2,
+                              help="The number of times a failed stage is requeued (default: %(default)s).")
+    sweep_parser.add_argument("--pipeline", action="store_true",
+                              help="Overlap the generate, Synthesis and Place-and-Route stages of different "
+                                   "design points in a pipeline instead of scheduling them. --jobs then "
+                                   "sets the Synthesis and the Place-and-Route workers each, reduced to fit "
+                                   "--licenses and --memory-gb.")
+
+    explore_parser = subparsers.add_parser(
+        "explore", help="Search a sweep spec's design space for the area/power/throughput Pareto front, "
+                        "skipping Place-and-Route for points that cannot reach it.")
+    explore_parser.add_argument("spec", help="The sweep spec file.")
+    explore_parser.add_argument("--output-dir", help="The directory for the per-point project directories.")
+    explore_parser.add_argument("--jobs", type=int, default=1,
+                                help="The number of flow stages, and of Place-and-Route runs per round, to run "
+                                     "at once (default: %(default)s).")
+    explore_parser.add_argument("--licenses", type=int, default=None, metavar="N",
+                                help="The number of Genus and of Innovus licenses (default: unlimited).")
+    explore_parser.add_argument("--memory-gb", type=float, default=None,
+                                help="The memory to schedule flows within in GiB (default: the host's memory).")
+    explore_parser.add_argument("--retries", type=int, default=2,
+                                help="The number of times a failed stage is requeued (default: %(default)s).")
+    explore_parser.add_argument("--margin", type=float, default=0.1,
+                                help="The relative slack of the Place-and-Route bounds; larger margins prune "
+                                     "less (default: %(default)s).")
+    explore_parser.add_argument("--no-prior", action="store_true",
+                                help="Ignore prior results in the results database.")
+
+    args = parser.parse_args(argv)
+    try:
+        check_hammer_commit(args.hammer_commit)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.max_iterations < 1:
+        parser.error(f"--max-iterations must be at least 1, not {args.max_iterations}")
+    return args
 
-    # Run PaR with tuned clock
-    run_par(os.path.join(new_dir_name, sub_dir_new_name), final_clock_period)
+def main():
+    global PAUSE_SECONDS, INCREMENTAL, RESULTS_DB_PATH, EARLY_ABORT, VERIFY_VERILOG_CACHE
+    args = parse_args()
+    VERIFY_VERILOG_CACHE = args.verify_cache
+    INCREMENTAL = not args.no_incremental
+    EARLY_ABORT = not args.no_early_abort
+    RESULTS_DB_PATH = None if args.no_db else args.db
+    use_cache = not args.no_cache
+    PAUSE_SECONDS = args.pause if args.pause is not None else (0 if args.command else 5)
+
+    if args.command == "sweep":
+        results = run_sweep(args.spec, args.output_dir, use_cache=use_cache,
+                            fetch_workers=args.fetch_workers, base_url=args.spiral_url,
+                            search_strategy=args.search, speculative_jobs=args.speculative,
+                            max_iterations=args.max_iterations, jobs=args.jobs,
+                            licenses=None if args.licenses is None else {"genus": args.licenses,
+                                                                         "innovus": args.licenses},
+                            memory_gb=args.memory_gb, retries=args.retries, pipeline=args.pipeline,
+                            resume=args.resume, extract_paths=args.extract_paths,
+                            predict_periods=not args.no_predict, max_area=args.max_area,
+                            trace_frames=args.trace_frames, hammer_commit=args.hammer_commit,
+                            initial_clock_period=args.clock_period)
+        sys.exit(0 if all(r["status"] == "completed" for r in results) else 1)
+
+    if args.command == "explore":
+        summary = run_explore(args.spec, args.output_dir, use_cache=use_cache, base_url=args.spiral_url,
+                              search_strategy=args.search, max_iterations=args.max_iterations, jobs=args.jobs,
+                              licenses=None if args.licenses is None else {"genus": args.licenses,
+                                                                           "innovus": args.licenses},
+                              memory_gb=args.memory_gb, retries=args.retries, resume=args.resume,
+                              margin=args.margin, use_prior=not args.no_prior, predict_periods=not args.no_predict,
+                              max_area=args.max_area, trace_frames=args.trace_frames,
+                              hammer_commit=args.hammer_commit, initial_clock_period=args.clock_period)
+        sys.exit(0 if summary["front"] else 1)
+
+    # Prompt for the FFT block specifications, unless resuming an interrupted flow
+    checkpoint = FlowProject.from_checkpoint(os.getcwd()) if args.resume else None
+    if checkpoint:
+        params = checkpoint.params
+        print(f"Resuming the flow for {checkpoint.name} from {checkpoint.checkpoint_path}")
+    else:
+        params = prompt_fft_params()
+    if not params:
+        print("Failed to download Verilog file. Exiting.")
+        sys.exit(1)
+
+    # Run the flow in the current directory
+    project = run_flow(params, os.getcwd(), args.clock_period, use_cache=use_cache, base_url=args.spiral_url,
+                       search_strategy=args.search, speculative_jobs=args.speculative,
+                       max_iterations=args.max_iterations, resume=args.resume,
+                       extract_paths=args.extract_paths, predict_periods=not args.no_predict,
+                       max_area=args.max_area, trace_frames=args.trace_frames, hammer_commit=args.hammer_commit)
+    if project is None:
+        print("Failed to download Verilog file. Exiting.")
+        sys.exit(1)
+    completed = project.completed_stages == list(FLOW_STAGES)
+    run_id = record_run(project, "completed" if completed else "failed")
+    if run_id is not None:
+        print(f"Recorded the flow as run {run_id} in {RESULTS_DB_PATH}")
 
 if __name__ == "__main__":
     main()
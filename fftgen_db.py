@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+#
+# SQLite results database for fftgen.py.
+#
+# Every flow that fftgen.py runs, interactively or as part of a sweep, is
+# recorded as one row of a local SQLite database: the SPIRAL parameters (one
+# indexed column each), the tuned Synthesis and Place-and-Route clock periods,
+# the final PPA numbers, and the artifact paths. Every tuning iteration's
+# period and slack, and every stage's runtime, are kept in child tables. This
+# makes comparing hundreds of configurations an indexed query instead of a
+# walk through build directories.
+#
+# Usage: python3 fftgen_db.py query [--where COLUMN=VALUE]... [--order-by=[-]COLUMN] [--limit N]
+#        python3 fftgen_db.py show RUN_ID
+#        python3 fftgen_db.py export [--where ...] [--format csv|json] [--output FILE]
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import sqlite3
+import argparse
+
+DEFAULT_DB_PATH = os.environ.get(
+    "FFTGEN_DB", os.path.join(os.path.expanduser("~"), ".cache", "fftgen", "results.db"))
+
+# The SPIRAL parameters, each stored in its own integer column
+PARAM_COLUMNS = ["idN", "idRadix", "idStreamWidth", "idDataType", "idWidth", "idTWidth", "idScale", "idArch",
+                 "idInverse", "idOrder", "idBRAM", "idIP"]
+
+# The columns of the runs table after the parameters, with their SQL types
+RESULT_COLUMNS = [
+    ("status", "TEXT"), ("search_strategy", "TEXT"), ("initial_clock_period", "REAL"),
+    ("syn_clock_period", "REAL"), ("par_clock_period", "REAL"), ("syn_area", "REAL"),
+    ("setup_slack", "REAL"), ("setup_wns", "REAL"), ("setup_tns", "REAL"), ("setup_violating", "INTEGER"),
+    ("hold_slack", "REAL"), ("hold_wns", "REAL"), ("hold_tns", "REAL"), ("hold_violating", "INTEGER"),
+    ("area", "REAL"), ("internal_power", "REAL"), ("switching_power", "REAL"), ("leakage_power", "REAL"),
+    ("total_power", "REAL"), ("runtime", "REAL"), ("error", "TEXT"),
+]
+
+RUN_COLUMNS = ["id", "run_key", "name", "recorded_at"] + PARAM_COLUMNS + [column for column, _ in RESULT_COLUMNS]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    {", ".join(f"{name} INTEGER" for name in PARAM_COLUMNS)},
+    {", ".join(f"{name} {sql_type}" for name, sql_type in RESULT_COLUMNS)},
+    params TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_params ON runs (idN, idRadix, idStreamWidth, idDataType, idWidth, idArch, idInverse);
+CREATE INDEX IF NOT EXISTS runs_idRadix ON runs (idRadix);
+CREATE INDEX IF NOT EXISTS runs_idStreamWidth ON runs (idStreamWidth);
+CREATE INDEX IF NOT EXISTS runs_idWidth ON runs (idWidth);
+CREATE INDEX IF NOT EXISTS runs_idArch ON runs (idArch);
+CREATE INDEX IF NOT EXISTS runs_name ON runs (name);
+CREATE TABLE IF NOT EXISTS iterations (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    iteration INTEGER NOT NULL,
+    period REAL,
+    slack REAL,
+    met INTEGER,
+    runtime REAL,
+    outcome TEXT
+);
+CREATE INDEX IF NOT EXISTS iterations_run ON iterations (run_id);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    seconds REAL
+);
+CREATE INDEX IF NOT EXISTS stages_run ON stages (run_id);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_run ON artifacts (run_id);
+"""
+
+# A --where filter, e.g. 'idN=64', 'area<150000' or 'status!=completed'
+FILTER = re.compile(r"^\s*(\w+)\s*(<=|>=|!=|=|<|>)\s*(.*?)\s*$")
+
+def _number(value):
+    """Returns value as an int or float if it is one, else unchanged."""
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            pass
+    return value
+
+def parse_filters(filters):
+    """
+    Parses --where filters into a SQL WHERE clause.
+
+    Args:
+        filters (list): Filters of the form COLUMN OP VALUE, where OP is one of
+                        =, !=, <, <=, > and >=, and COLUMN is a column of the runs table.
+
+    Returns:
+        tuple: The WHERE clause (empty if there are no filters) and its parameters.
+
+    Raises:
+        ValueError: If a filter is malformed or names an unknown column.
+    """
+    clauses, values = [], []
+    for text in filters or []:
+        match = FILTER.match(text)
+        if not match:
+            raise ValueError(f"Invalid filter '{text}'. Use COLUMN=VALUE, COLUMN<VALUE, ...")
+        column, op, value = match.groups()
+        if column not in RUN_COLUMNS:
+            raise ValueError(f"Unknown column '{column}'. Columns: {', '.join(RUN_COLUMNS)}")
+        clauses.append(f"{column} {op} ?")
+        values.append(_number(value))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), values
+
+class ResultsDB:
+    """
+    The SQLite database of flow results.
+
+    Every call opens its own connection, so one ResultsDB can be shared by the threads
+    of a FlowPipeline, and several fftgen.py processes can record into the same file.
+
+    Attributes:
+        path (str): The database file.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self.connect()
+        try:
+            connection.executescript(SCHEMA)
+            # Databases created by an older fftgen_db.py lack the newer result columns
+            existing = {row["name"] for row in connection.execute("PRAGMA table_info(runs)")}
+            for column, sql_type in RESULT_COLUMNS:
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE runs ADD COLUMN {column} {sql_type}")
+            connection.commit()
+        finally:
+            connection.close()
+
+    def connect(self):
+        """Opens a connection that returns rows as sqlite3.Row, with foreign keys enabled."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys = ON")
+        return connection
+
+    def record(self, run_key, name, params, results, iterations=(), stages=None, artifacts=None):
+        """
+        Records one flow run, replacing an earlier record with the same key.
+
+        Args:
+            run_key (str): A unique key of the run. Recording a resumed run again under
+                           its key updates its row instead of adding one.
+            name (str): The run's design point name.
+            params (dict): The SPIRAL parameters.
+            results (dict): Values for the RESULT_COLUMNS; missing columns are NULL.
+            iterations (list, optional): Tuning history entries with 'stage', 'iteration',
+                                         'period', 'slack', 'met', 'runtime' and 'outcome'.
+            stages (dict, optional): The runtime in seconds of each flow stage.
+            artifacts (dict, optional): Artifact paths by kind, e.g. 'verilog' or 'par_dir'.
+
+        Returns:
+            int: The id of the run's row.
+        """
+        columns = ["run_key", "name", "recorded_at"] + PARAM_COLUMNS + [column for column, _ in RESULT_COLUMNS] + \
+                  ["params"]
+        values = [run_key, name, time.time()] + [_number(params.get(key)) for key in PARAM_COLUMNS] + \
+                 [results.get(column) for column, _ in RESULT_COLUMNS] + [json.dumps(params, sort_keys=True)]
+        connection = self.connect()
+        try:
+            with connection:
+                # A run recorded again keeps its id
+                existing = connection.execute("SELECT id FROM runs WHERE run_key = ?", (run_key,)).fetchone()
+                if existing:
+                    connection.execute("DELETE FROM runs WHERE id = ?", (existing["id"],))
+                    columns, values = ["id"] + columns, [existing["id"]] + values
+                run_id = connection.execute(
+                    f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    values).lastrowid
+                connection.executemany(
+                    "INSERT INTO iterations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, entry.get("stage"), entry.get("iteration"), entry.get("period"), entry.get("slack"),
+                      entry.get("met"), entry.get("runtime"), entry.get("outcome")) for entry in iterations])
+                connection.executemany("INSERT INTO stages VALUES (?, ?, ?)",
+                                       [(run_id, stage, seconds) for stage, seconds in (stages or {}).items()])
+                connection.executemany("INSERT INTO artifacts VALUES (?, ?, ?)",
+                                       [(run_id, kind, path) for kind, path in (artifacts or {}).items() if path])
+            return run_id
+        finally:
+            connection.close()
+
+    def query(self, filters=None, order_by=None, limit=None, columns=None):
+        """
+        Selects runs.
+
+        Args:
+            filters (list, optional): --where filters, see parse_filters().
+            order_by (str, optional): The column to sort by, descending if prefixed with '-'.
+                                      Default is the recording order.
+            limit (int, optional): The maximum number of runs.
+            columns (list, optional): The columns to return. Default is all of RUN_COLUMNS.
+
+        Returns:
+            list: One dict per run.
+
+        Raises:
+            ValueError: If a filter, the sort column or a column is invalid.
+        """
+        columns = columns or RUN_COLUMNS
+        for column in columns:
+            if column not in RUN_COLUMNS:
+                raise ValueError(f"Unknown column '{column}'. Columns: {', '.join(RUN_COLUMNS)}")
+        where, values = parse_filters(filters)
+        sql = f"SELECT {', '.join(columns)} FROM runs{where}"
+        if order_by:
+            column = order_by.lstrip("-")
+            if column not in RUN_COLUMNS:
+                raise ValueError(f"Unknown column '{column}'. Columns: {', '.join(RUN_COLUMNS)}")
+            sql += f" ORDER BY {column} IS NULL, {column}{' DESC' if order_by.startswith('-') else ''}"
+        else:
+            sql += " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            values.append(int(limit))
+        connection = self.connect()
+        try:
+            return [dict(row) for row in connection.execute(sql, values)]
+        finally:
+            connection.close()
+
+    def latest_run(self, params, status="completed"):
+        """
+        Returns the most recently recorded run of a design point as a dict, or None.
+
+        Args:
+            params (dict): The SPIRAL parameters of the design point.
+            status (str, optional): Only consider runs with this status. Default is 'completed'.
+        """
+        filters = [f"{key}={_number(params.get(key))}" for key in PARAM_COLUMNS if params.get(key) is not None]
+        runs = self.query(filters + [f"status={status}"], order_by="-recorded_at", limit=1)
+        return runs[0] if runs else None
+
+    def run_details(self, run_id):
+        """Returns a run's row with its 'iterations', 'stages' and 'artifacts', or None if there is no such run."""
+        connection = self.connect()
+        try:
+            row = connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            run = dict(row)
+            run["params"] = json.loads(run["params"])
+            run["iterations"] = [dict(r) for r in connection.execute(
+                "SELECT stage, iteration, period, slack, met, runtime, outcome FROM iterations WHERE run_id = ? "
+                "ORDER BY rowid", (run_id,))]
+            run["stages"] = {r["stage"]: r["seconds"] for r in connection.execute(
+                "SELECT stage, seconds FROM stages WHERE run_id = ? ORDER BY rowid", (run_id,))}
+            run["artifacts"] = {r["kind"]: r["path"] for r in connection.execute(
+                "SELECT kind, path FROM artifacts WHERE run_id = ? ORDER BY rowid", (run_id,))}
+            return run
+        finally:
+            connection.close()
+
+def export_runs(runs, output, fmt="csv"):
+    """Writes runs, as returned by ResultsDB.query(), to an open file as CSV or JSON."""
+    if fmt == "json":
+        json.dump(runs, output, indent=2)
+        output.write("\n")
+        return
+    writer = csv.DictWriter(output, fieldnames=list(runs[0]) if runs else RUN_COLUMNS)
+    writer.writeheader()
+    writer.writerows(runs)
+
+# The columns the query command prints by default
+QUERY_COLUMNS = ["id", "name", "status", "syn_clock_period", "par_clock_period", "setup_wns", "hold_wns", "area",
+                 "total_power", "runtime"]
+
+def print_runs(runs, columns):
+    """Prints runs as an aligned table."""
+    cells = [[("" if run[column] is None else str(round(run[column], 4) if isinstance(run[column], float)
+                                                  else run[column])) for column in columns] for run in runs]
+    widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+    print(f"{len(runs)} run(s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the fftgen.py results database.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="The database file (default: %(default)s).")
+    subparsers = parser.add_subparsers(dest="command")
+
+    def add_selection(subparser):
+        subparser.add_argument("--where", action="append", default=[], metavar="FILTER",
+                               help="Filter runs, e.g. idN=256, area<150000 or status=completed. Repeatable.")
+        subparser.add_argument("--order-by", metavar="[-]COLUMN", help="Sort by a column, descending with '-' (e.g. --order-by=-area).")
+        subparser.add_argument("--limit", type=int, help="The maximum number of runs.")
+        subparser.add_argument("--columns", help="Comma-separated columns to show.")
+
+    add_selection(subparsers.add_parser("query", help="Print matching runs."))
+    show_parser = subparsers.add_parser("show", help="Print one run with its tuning iterations, stages and artifacts.")
+    show_parser.add_argument("run_id", type=int)
+    export_parser = subparsers.add_parser("export", help="Export matching runs as CSV or JSON.")
+    add_selection(export_parser)
+    export_parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    export_parser.add_argument("--output", help="The output file (default: stdout).")
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        sys.exit(2)
+
+    db = ResultsDB(args.db)
+    try:
+        if args.command == "show":
+            run = db.run_details(args.run_id)
+            if run is None:
+                print(f"No run with id {args.run_id}.")
+                sys.exit(1)
+            print(json.dumps(run, indent=2))
+            return
+        columns = args.columns.split(",") if args.columns else None
+        runs = db.query(args.where, args.order_by, args.limit,
+                        columns or (QUERY_COLUMNS if args.command == "query" else None))
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
+
+    if args.command == "query":
+        print_runs(runs, columns or QUERY_COLUMNS)
+    elif args.output:
+        with open(args.output, 'w', newline='') as f:
+            export_runs(runs, f, args.format)
+        print(f"Exported {len(runs)} run(s) to {args.output}")
+    else:
+        export_runs(runs, sys.stdout, args.format)
+
+if __name__ == "__main__":
+    main()
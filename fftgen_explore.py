@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+#
+# Pareto-front helpers for fftgen.py's design-space explorer.
+#
+# A design point is scored on three objectives: area and total power, to be
+# minimized, and throughput, to be maximized. Place-and-Route is by far the
+# most expensive stage of the flow, so the explorer (fftgen.py explore) only
+# runs it for points that could still be on the area/power/throughput Pareto
+# front. It bounds a point's post-PaR objectives from its post-synthesis area
+# and clock period, using the most optimistic synthesis-to-PaR ratios seen on
+# points that did go through Place-and-Route (including prior runs from the
+# results database), and skips the point if even that bound is dominated.
+
+import math
+
+# The objectives and whether each is minimized or maximized
+OBJECTIVES = {"area": "min", "power": "min", "throughput": "max"}
+
+def throughput(params, clock_period):
+    """
+    Estimates the throughput of an FFT core in samples per ns (Gsamples/s).
+
+    A fully-streaming core accepts idStreamWidth samples every cycle. An iterative
+    core reuses one radix-r stage for all log_r(N) stages of the transform, so its
+    throughput is lower by that factor.
+
+    Args:
+        params (dict): The SPIRAL parameters.
+        clock_period (float): The clock period in ns.
+
+    Returns:
+        float: The throughput, or None if the clock period is unknown.
+    """
+    if not clock_period:
+        return None
+    samples = int(params["idStreamWidth"]) / clock_period
+    if str(params["idArch"]) == '1':
+        return samples
+    return samples / max(1, round(math.log(int(params["idN"]), int(params["idRadix"]))))
+
+def dominates(a, b):
+    """Returns whether objective dict a Pareto-dominates b: no worse in every objective, better in one."""
+    better = False
+    for name, sense in OBJECTIVES.items():
+        x, y = (a[name], b[name]) if sense == "min" else (-a[name], -b[name])
+        if x > y:
+            return False
+        if x < y:
+            better = True
+    return better
+
+def pareto_front(items, key=lambda item: item):
+    """
+    Returns the items whose objectives no other item dominates.
+
+    Args:
+        items (list): The items.
+        key (callable, optional): Maps an item to its objective dict. Default is the item itself.
+
+    Returns:
+        list: The non-dominated items, in their original order.
+    """
+    objectives = [key(item) for item in items]
+    return [item for i, item in enumerate(items)
+            if not any(dominates(other, objectives[i]) for j, other in enumerate(objectives) if j != i)]
+
+def pareto_ranks(items, key=lambda item: item):
+    """Returns the non-dominated sorting rank of every item: 0 for the front, 1 for the front without it, ..."""
+    ranks, remaining, rank = {}, list(range(len(items))), 0
+    objectives = [key(item) for item in items]
+    while remaining:
+        front = [i for i in remaining if not any(dominates(objectives[j], objectives[i]) for j in remaining)]
+        for i in front:
+            ranks[i] = rank
+        remaining = [i for i in remaining if i not in ranks]
+        rank += 1
+    return [ranks[i] for i in range(len(items))]
+
+class PaRBoundModel:
+    """
+    Bounds the post-PaR objectives of a design point from its synthesis results.
+
+    Place-and-Route adds buffers, clock tree and wire load, so PaR area and clock period
+    are close to, but not simply equal to, their synthesis values. The model keeps the
+    PaR/synthesis ratio of area and clock period, and the ratio of PaR power to
+    synthesis area over clock period (dynamic power follows switched capacitance times
+    frequency), for every point that went through both. The bound of a new point uses
+    the most optimistic ratio of each, relaxed by a margin, so it is better than the
+    point's actual result unless the point beats every point seen so far by the margin.
+
+    Attributes:
+        margin (float): The relative slack granted to every bound.
+        min_samples (int): The number of calibration points needed before bounding.
+        samples (list): (area ratio, period ratio, power ratio) per calibration point.
+    """
+
+    def __init__(self, margin=0.1, min_samples=2):
+        self.margin = margin
+        self.min_samples = min_samples
+        self.samples = []
+
+    def add(self, syn_area, syn_clock_period, area, par_clock_period, power):
+        """Adds a point with both synthesis and PaR results. Points with missing results are ignored."""
+        if not all((syn_area, syn_clock_period, area, par_clock_period, power)):
+            return
+        self.samples.append((area / syn_area, par_clock_period / syn_clock_period,
+                             power / (syn_area / syn_clock_period)))
+
+    @property
+    def calibrated(self):
+        return len(self.samples) >= self.min_samples
+
+    def bound(self, params, syn_area, syn_clock_period):
+        """
+        Returns the optimistic post-PaR objectives of a synthesized point.
+
+        Returns:
+            dict: The area, power and throughput bound, or None if the model is not yet
+                  calibrated or the point's synthesis results are missing.
+        """
+        if not self.calibrated or not syn_area or not syn_clock_period:
+            return None
+        area_ratio = min(sample[0] for sample in self.samples) * (1 - self.margin)
+        period_ratio = min(sample[1] for sample in self.samples) * (1 - self.margin)
+        power_ratio = min(sample[2] for sample in self.samples) * (1 - self.margin)
+        return {"area": syn_area * area_ratio, "power": power_ratio * syn_area / syn_clock_period,
+                "throughput": throughput(params, syn_clock_period * period_ratio)}
+
+def synthesis_estimate(params, syn_area, syn_clock_period):
+    """
+    Returns uncalibrated objectives from synthesis results alone, to rank points before
+    any has gone through Place-and-Route. Power is taken as area over clock period.
+    """
+    if not syn_area or not syn_clock_period:
+        return None
+    return {"area": syn_area, "power": syn_area / syn_clock_period,
+            "throughput": throughput(params, syn_clock_period)}
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+#
+# Live tool logs for fftgen.py.
+#
+# Synthesis and Place-and-Route used to inherit the terminal, and nothing was
+# known about a run until it finished and its report was read. run_logged()
+# instead reads the tool's output on a background thread as it is written,
+# compresses it into a per-run log file, and feeds every line to a ToolLogParser,
+# which follows the Hammer sub-step the tool is in and the intermediate timing
+# estimates (WNS) Genus and Innovus print while optimizing. An EarlyAbortPolicy
+# looks at the parser after every line and kills the run once its slack is
+# clearly hopeless, so clock period tuning can retry at a corrected period
+# without waiting for the run to finish.
+#
+# Usage: python3 fftgen_logs.py <log file> [--process-type Synthesis|Place-and-Route]
+
+import os
+import re
+import sys
+import gzip
+import time
+import queue
+import signal
+import argparse
+import threading
+import subprocess
+
+# Hammer sub-steps, e.g. "[synthesis] Running sub-step 'syn_map'"
+STEP = re.compile(r"Running sub-step '?(\w+)'?")
+
+# Intermediate worst negative slack estimates: Innovus summary tables ("|     WNS (ns):| -0.160 |")
+# and Genus optimization progress ("WNS = -123 ps"). Values without a unit are in the tool's
+# report unit.
+WNS = re.compile(r"\bWNS\b\s*(?:\((ps|ns)\))?[\s:=|]*(-?\d+(?:\.\d+)?)\s*(ps|ns)?")
+
+# The sub-steps after technology mapping, whose timing estimates are close to the final ones.
+# Estimates from earlier steps (e.g. syn_generic, floorplanning) are too pessimistic to act on.
+TRUSTED_STEPS = {"syn_map", "syn_opt", "place_opt_design", "clock_tree", "route_design", "opt_design"}
+
+# The slack past which adjust_clock_period() takes its largest step, in ns
+HOPELESS_SLACK = -1.0
+
+class ToolLogParser:
+    """
+    Follows the progress and timing estimates of a Synthesis or Place-and-Route run, one line at a time.
+
+    Args:
+        process_type (str, optional): 'Synthesis' (estimates in ps by default) or
+                                      'Place-and-Route' (in ns). Default is 'Synthesis'.
+
+    Attributes:
+        step (str): The Hammer sub-step the tool is in, or None before the first one.
+        steps (list): (sub-step, seconds since the start) of every sub-step entered.
+        wns (float): The latest WNS estimate in ns, or None.
+        estimates (list): (sub-step, WNS in ns) of every estimate.
+        lines (int): The number of lines read.
+    """
+
+    def __init__(self, process_type="Synthesis"):
+        self.default_unit = "ps" if process_type == "Synthesis" else "ns"
+        self.start_time = time.time()
+        self.step = None
+        self.steps = []
+        self.wns = None
+        self.estimates = []
+        self.lines = 0
+
+    def feed(self, line):
+        """
+        Parses one line of tool output.
+
+        Returns:
+            str: A short description of the progress the line shows (a new sub-step or
+                 a WNS estimate), or None.
+        """
+        self.lines += 1
+        match = STEP.search(line)
+        if match:
+            self.step = match.group(1)
+            self.steps.append((self.step, round(time.time() - self.start_time, 3)))
+            return f"sub-step {self.step}"
+        match = WNS.search(line)
+        if match:
+            unit = match.group(1) or match.group(3) or self.default_unit
+            value = float(match.group(2))
+            self.wns = value / 1000 if unit == "ps" else value
+            self.estimates.append((self.step, self.wns))
+            return f"WNS {self.wns:.3f} ns in {self.step or 'start-up'}"
+        return None
+
+    def as_dict(self):
+        return {"steps": self.steps, "estimates": self.estimates, "wns": self.wns, "lines": self.lines}
+
+class EarlyAbortPolicy:
+    """
+    Decides when a run's timing estimates show it cannot come close to meeting its clock period.
+
+    A run is hopeless once `patience` consecutive estimates from trusted sub-steps are
+    below HOPELESS_SLACK and below -fraction of the clock period. Such a run fails by far
+    more than a step of adjust_clock_period(), so its final report adds nothing the
+    estimate does not already tell.
+
+    Args:
+        clock_period (float): The run's clock period in ns.
+        fraction (float, optional): The slack, relative to the clock period, a run must
+                                    miss by. Default is 0.25.
+        patience (int, optional): The number of consecutive hopeless estimates needed.
+                                  Default is 2.
+        trusted_steps (set, optional): The sub-steps whose estimates count. Default is TRUSTED_STEPS.
+    """
+
+    def __init__(self, clock_period, fraction=0.25, patience=2, trusted_steps=None):
+        self.threshold = min(HOPELESS_SLACK, -fraction * clock_period)
+        self.patience = patience
+        self.trusted_steps = TRUSTED_STEPS if trusted_steps is None else trusted_steps
+
+    def check(self, parser):
+        """Returns why the run should be aborted, or None to let it continue."""
+        recent = parser.estimates[-self.patience:]
+        if len(recent) < self.patience or any(step not in self.trusted_steps for step, _ in recent):
+            return None
+        if all(wns < self.threshold for _, wns in recent):
+            return (f"WNS {parser.wns:.3f} ns in {parser.step} is past {self.threshold:.3f} ns "
+                    f"for {self.patience} estimates")
+        return None
+
+class ToolRun:
+    """
+    The result of run_logged().
+
+    Attributes:
+        returncode (int): The tool's exit status (negative if it was killed).
+        aborted (str): Why the policy aborted the run, or None.
+        log_path (str): The compressed log file.
+        parser (ToolLogParser): The parser, with the run's progress and estimates.
+        seconds (float): The run's wall time.
+    """
+
+    def __init__(self, returncode, aborted, log_path, parser, seconds):
+        self.returncode = returncode
+        self.aborted = aborted
+        self.log_path = log_path
+        self.parser = parser
+        self.seconds = seconds
+
+def _read_lines(stream, lines):
+    for line in iter(stream.readline, b""):
+        lines.put(line)
+    lines.put(None)
+
+def _terminate(process, grace=10.0):
+    """Stops a tool and everything it started (make, the tool and its children)."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+def run_logged(command, cwd, log_path, parser=None, policy=None, echo=print):
+    """
+    Runs a tool with its output streamed to a compressed log file and parsed as it arrives.
+
+    The output is read on a background thread, so the run is watched (and can be
+    aborted) even while the tool is silent. The tool runs in its own process group,
+    which is killed as a whole when the policy aborts the run.
+
+    Args:
+        command (list): The command, e.g. ['make', 'syn'].
+        cwd (str): The directory to run it in.
+        log_path (str): The log file to write; compressed if it ends in '.gz'.
+        parser (ToolLogParser, optional): The parser to feed every line to.
+        policy (EarlyAbortPolicy, optional): Checked after every parsed estimate.
+        echo (callable, optional): Called with every progress description of the parser,
+                                   or None for silence. Default is print.
+
+    Returns:
+        ToolRun: The result.
+    """
+    parser = parser or ToolLogParser()
+    os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+    opener = gzip.open if log_path.endswith(".gz") else open
+    start_time = time.time()
+    lines = queue.Queue()
+    aborted = None
+    with opener(log_path, 'wb') as log:
+        process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   start_new_session=True)
+        reader = threading.Thread(target=_read_lines, args=(process.stdout, lines), daemon=True)
+        reader.start()
+        try:
+            while True:
+                line = lines.get()
+                if line is None:
+                    break
+                log.write(line)
+                progress = parser.feed(line.decode(errors="replace"))
+                if progress is None:
+                    continue
+                if echo:
+                    echo(f"  [{time.time() - start_time:7.1f} s] {progress}")
+                if policy and aborted is None:
+                    aborted = policy.check(parser)
+                    if aborted:
+                        log.write(f"\n*** fftgen: aborting the run: {aborted}\n".encode())
+                        _terminate(process)
+        except BaseException:
+            _terminate(process)
+            raise
+        finally:
+            returncode = process.wait()
+            reader.join()
+            process.stdout.close()
+    return ToolRun(returncode, aborted, log_path, parser, round(time.time() - start_time, 3))
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Synthesis or Place-and-Route log through the progress "
+                                                 "parser and the early-abort policy.")
+    parser.add_argument("log", help="The log file, plain or gzip-compressed.")
+    parser.add_argument("--process-type", choices=["Synthesis", "Place-and-Route"], default="Synthesis")
+    parser.add_argument("--clock-period", type=float, help="Check the early-abort policy at this clock period in ns.")
+    args = parser.parse_args()
+    log_parser = ToolLogParser(args.process_type)
+    policy = EarlyAbortPolicy(args.clock_period) if args.clock_period else None
+    opener = gzip.open if args.log.endswith(".gz") else open
+    with opener(args.log, 'rt', errors="replace") as f:
+        for line in f:
+            progress = log_parser.feed(line)
+            if progress:
+                print(f"line {log_parser.lines}: {progress}")
+                reason = policy.check(log_parser) if policy else None
+                if reason:
+                    print(f"The run would be aborted here: {reason}")
+                    return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
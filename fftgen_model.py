@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+#
+# Fixed-point FFT reference model for fftgen.py.
+#
+# The data width and scaling of a SPIRAL core decide its accuracy, but until
+# now the only way to see their effect was to generate and synthesize it. This
+# module models the arithmetic of the configured transform with NumPy, over a
+# whole batch of inputs at once, and measures its signal-to-quantization-noise
+# ratio (SQNR) and overflows against an exact FFT. A batch of a thousand
+# 1024-point transforms takes about a second, so widths that cannot meet an
+# accuracy target are pruned before any generation or EDA time is spent
+# (see the `min_sqnr` key of sweep specs).
+#
+# The model is a radix-r decimation-in-frequency FFT over the same stages as
+# the core: log_r(N) radix-r stages, and one smaller stage when N is not a power
+# of r. Each fixed-point stage computes its butterflies, divides the result by
+# r when the core is scaled, rounds it to the data width, and multiplies it by
+# twiddle factors quantized to the twiddle width (idTWidth), rounding again.
+# Values that leave the data width's range wrap around (or saturate), and are
+# counted as overflows. Trivial twiddles (1, -1, j, -j) are exact. Butterflies
+# of radix 8 and above, which contain non-trivial constants, are computed at
+# full internal precision. Floating-point cores are modelled in single precision.
+# SPIRAL does not document its rounding, so rounding to nearest is the default and
+# truncation can be selected.
+#
+# Values are kept as integers in complex128 arrays, so the model is bit-accurate
+# while the data and twiddle widths add up to at most 52 bits. Above that,
+# twiddle products are rounded to double precision before they are quantized,
+# which can only change the rounding of rare ties.
+#
+# Usage: python3 fftgen_model.py [--batch B] [--inputs FILE.npy] [--widths 8-24 --target DB] PARAM=VALUE...
+
+import sys
+import time
+import json
+import math
+import argparse
+import numpy as np
+
+# Inputs the model generates, see random_inputs()
+INPUT_KINDS = ["uniform", "gaussian", "tone"]
+
+# The most samples (transforms x points) modelled at once, to bound memory
+MAX_CHUNK_SAMPLES = 1 << 21
+
+def stage_radices(n, radix):
+    """Returns the radix of every stage of an N-point FFT: radix while it divides, then the remainder."""
+    radices, remaining = [], int(n)
+    while remaining > 1:
+        r = radix if remaining % radix == 0 else remaining
+        radices.append(r)
+        remaining //= r
+    return radices
+
+def _digit_reversal(radices):
+    """Returns the frequency held at every output position of the decimation-in-frequency stages."""
+    base, stride = np.zeros(1, dtype=np.int64), 1
+    for r in radices:
+        base = (base[:, None] + stride * np.arange(r)).reshape(-1)
+        stride *= r
+    return base
+
+class FFTModel:
+    """
+    A vectorized, bit-accurate model of the arithmetic of a SPIRAL FFT core.
+
+    Attributes:
+        n (int): The transform size.
+        radices (list): The radix of every stage.
+        inverse (bool): Whether the transform is inverse (positive exponent, unnormalized).
+        floating (bool): Whether the core is single-precision floating point.
+        width (int): The fixed-point data width in bits, including the sign bit.
+        twiddle_width (int): The fixed-point twiddle width in bits.
+        scaled (bool): Whether every stage divides by its radix, so the output is the
+                       transform divided by N.
+        rounding (str): 'round' (to nearest, ties up) or 'truncate' (towards minus infinity).
+        overflow (str): 'wrap' (two's complement) or 'saturate'.
+    """
+
+    def __init__(self, params, rounding="round", overflow="wrap"):
+        if rounding not in ("round", "truncate"):
+            raise ValueError(f"Unknown rounding {rounding}")
+        if overflow not in ("wrap", "saturate"):
+            raise ValueError(f"Unknown overflow handling {overflow}")
+        self.n = int(params["idN"])
+        self.radices = stage_radices(self.n, int(params["idRadix"]))
+        self.inverse = str(params.get("idInverse", '0')) == '1'
+        self.floating = str(params.get("idDataType", '0')) == '1'
+        self.width = 32 if self.floating else int(params["idWidth"])
+        twiddle_width = int(params.get("idTWidth", self.width))
+        self.twiddle_width = twiddle_width if twiddle_width > 1 and not self.floating else self.width
+        self.scaled = not self.floating and str(params.get("idScale", '1')) == '1'
+        self.rounding = rounding
+        self.overflow = overflow
+        self.order = _digit_reversal(self.radices)
+        self._twiddles = [self._stage_twiddles(i) for i in range(len(self.radices))]
+
+    @property
+    def stages(self):
+        return len(self.radices)
+
+    def _stage_twiddles(self, index):
+        length = self.n // int(np.prod(self.radices[:index]))
+        r = self.radices[index]
+        sign = 1 if self.inverse else -1
+        exact = np.exp(sign * 2j * np.pi * np.outer(np.arange(r), np.arange(length // r)) / length)
+        if self.floating:
+            return exact.astype(np.complex64)
+        one = 2 ** (self.twiddle_width - 1)
+        twiddles = np.round(exact * one)
+        trivial = np.isclose(np.abs(exact.real), 1) | np.isclose(np.abs(exact.imag), 1)
+        clipped = np.clip(twiddles.real, -one, one - 1) + 1j * np.clip(twiddles.imag, -one, one - 1)
+        return np.where(trivial, twiddles, clipped)
+
+    def _shift(self, values, bits):
+        """Divides integer-valued complex values by 2^bits, rounding to the configured mode."""
+        scale = 2.0 ** -bits
+        offset = 0.5 if self.rounding == "round" else 0.0
+        return np.floor(values.real * scale + offset) + 1j * np.floor(values.imag * scale + offset)
+
+    def _fit(self, values, overflows):
+        """Brings values into the data width's range, counting the components that were out of it."""
+        low, high = -2.0 ** (self.width - 1), 2.0 ** (self.width - 1) - 1
+        parts = []
+        for part in (values.real, values.imag):
+            out = (part < low) | (part > high)
+            if not out.any():
+                parts.append(part)
+                continue
+            overflows += out.sum(axis=1)
+            if self.overflow == "saturate":
+                parts.append(np.clip(part, low, high))
+            else:
+                parts.append(np.mod(part - low, 2.0 ** self.width) + low)
+        return parts[0] + 1j * parts[1]
+
+    def quantize(self, x):
+        """
+        Quantizes inputs to the core's format.
+
+        Args:
+            x (numpy.ndarray): Complex inputs of shape (batch, N), as fractions in [-1, 1).
+
+        Returns:
+            numpy.ndarray: The integer-valued complex128 fixed-point inputs, or complex64
+                           values for floating-point cores.
+        """
+        x = np.asarray(x)
+        if self.floating:
+            return x.astype(np.complex64)
+        one = 2.0 ** (self.width - 1)
+        return np.clip(np.round(x.real * one), -one, one - 1) + 1j * np.clip(np.round(x.imag * one), -one, one - 1)
+
+    def transform(self, x):
+        """
+        Runs quantized inputs through the modelled core.
+
+        Args:
+            x (numpy.ndarray): Quantized inputs of shape (batch, N), see quantize().
+
+        Returns:
+            tuple: A tuple containing:
+                - output (numpy.ndarray): The outputs as fractions, in natural order.
+                - overflows (numpy.ndarray): The overflowing components per transform
+                  and stage, of shape (batch, stages).
+        """
+        batch = x.shape[0]
+        overflows = np.zeros((batch, self.stages), dtype=np.int64)
+        y, groups, length = x.reshape(batch, 1, self.n), 1, self.n
+        for index, r in enumerate(self.radices):
+            m = length // r
+            y = y.reshape(batch, groups, r, m)
+            y = np.fft.ifft(y, axis=2) * r if self.inverse else np.fft.fft(y, axis=2)
+            if self.floating:
+                y = y.astype(np.complex64) * self._twiddles[index]
+            else:
+                y = self._shift(y, int(math.log2(r)) if self.scaled else 0)
+                y = self._fit(y.reshape(batch, -1), overflows[:, index]).reshape(batch, groups, r, m)
+                y = self._shift(y * self._twiddles[index], self.twiddle_width - 1)
+                y = self._fit(y.reshape(batch, -1), overflows[:, index])
+            y = y.reshape(batch, groups * r, m)
+            groups, length = groups * r, m
+        output = np.empty((batch, self.n), dtype=np.complex128)
+        output[:, self.order] = y.reshape(batch, self.n)
+        if not self.floating:
+            output /= 2.0 ** (self.width - 1)
+        return output, overflows
+
+    def reference(self, x):
+        """Returns the exact transform of quantized inputs, as fractions, with the core's scaling."""
+        x = np.asarray(x, dtype=np.complex128)
+        if not self.floating:
+            x = x / 2.0 ** (self.width - 1)
+        y = np.fft.ifft(x, axis=1) * self.n if self.inverse else np.fft.fft(x, axis=1)
+        return y / self.n if self.scaled else y
+
+def default_amplitude(params):
+    """
+    Returns the input amplitude that keeps a core clear of overflow: 0.5 per component
+    for scaled and floating-point cores, 0.5 / N for unscaled ones, whose output grows by N.
+    """
+    if str(params.get("idDataType", '0')) == '0' and str(params.get("idScale", '1')) == '0':
+        return 0.5 / int(params["idN"])
+    return 0.5
+
+def random_inputs(n, batch, kind="uniform", amplitude=0.5, rng=None):
+    """
+    Generates a batch of random complex inputs.
+
+    Args:
+        n (int): The transform size.
+        batch (int): The number of transforms.
+        kind (str, optional): 'uniform' (each component uniform in [-amplitude, amplitude)),
+                              'gaussian' (each component normal with a standard deviation of
+                              amplitude / 3, clipped to the amplitude) or 'tone' (one complex
+                              exponential of the given amplitude at a random frequency and phase).
+                              Default is 'uniform'.
+        amplitude (float, optional): The amplitude, as a fraction of full scale. Default is 0.5.
+        rng (numpy.random.Generator, optional): The random generator. Default is a new one.
+
+    Returns:
+        numpy.ndarray: The inputs, of shape (batch, n).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if kind == "uniform":
+        return amplitude * (rng.uniform(-1, 1, (batch, n)) + 1j * rng.uniform(-1, 1, (batch, n)))
+    if kind == "gaussian":
+        parts = np.clip(rng.normal(0, amplitude / 3, (2, batch, n)), -amplitude, amplitude)
+        return parts[0] + 1j * parts[1]
+    if kind == "tone":
+        frequencies = rng.uniform(0, n, (batch, 1))
+        phases = rng.uniform(0, 2 * np.pi, (batch, 1))
+        return amplitude / math.sqrt(2) * np.exp(1j * (2 * np.pi * frequencies * np.arange(n) / n + phases))
+    raise ValueError(f"Unknown input kind {kind} (valid: {', '.join(INPUT_KINDS)})")
+
+def _sqnr_db(signal, noise):
+    with np.errstate(divide="ignore"):
+        return 10 * np.log10(signal / noise) if np.ndim(noise) else \
+            (math.inf if noise == 0 else 10 * math.log10(signal / noise))
+
+def evaluate_sqnr(params, batch=1000, inputs=None, kind="uniform", amplitude=None, seed=0, rounding="round",
+                  overflow="wrap"):
+    """
+    Measures the SQNR and overflows of a configured core over a batch of inputs.
+
+    The noise is the difference between the modelled core and an exact FFT of the same
+    quantized inputs, so it measures the core's arithmetic rather than the quantization
+    of its inputs.
+
+    Args:
+        params (dict): The SPIRAL parameters.
+        batch (int, optional): The number of random transforms. Default is 1000.
+        inputs (numpy.ndarray, optional): Inputs to use instead of random ones, of shape
+                                          (batch, N) or (N,), as fractions of full scale.
+        kind (str, optional): The kind of random inputs, see random_inputs(). Default is 'uniform'.
+        amplitude (float, optional): The random input amplitude. Default is default_amplitude().
+        seed (int, optional): The random seed. Default is 0.
+        rounding (str, optional): The rounding mode, see FFTModel. Default is 'round'.
+        overflow (str, optional): The overflow handling, see FFTModel. Default is 'wrap'.
+
+    Returns:
+        dict: 'sqnr_db' (over the whole batch), 'min_sqnr_db' and 'p5_sqnr_db' (of single
+              transforms), 'overflow_rate' (the fraction of transforms with an overflow),
+              'overflows_per_stage', 'batch' and 'seconds'.
+    """
+    start_time = time.time()
+    model = FFTModel(params, rounding=rounding, overflow=overflow)
+    rng = np.random.default_rng(seed)
+    if inputs is not None:
+        inputs = np.atleast_2d(np.asarray(inputs))
+        if inputs.shape[1] != model.n:
+            raise ValueError(f"Inputs have {inputs.shape[1]} points, not {model.n}")
+        batch = inputs.shape[0]
+    amplitude = default_amplitude(params) if amplitude is None else amplitude
+
+    signal = noise = 0.0
+    per_transform, overflowed, stage_overflows = [], 0, np.zeros(model.stages, dtype=np.int64)
+    chunk = max(1, MAX_CHUNK_SAMPLES // model.n)
+    for first in range(0, batch, chunk):
+        count = min(chunk, batch - first)
+        x = inputs[first:first + count] if inputs is not None else \
+            random_inputs(model.n, count, kind, amplitude, rng)
+        quantized = model.quantize(x)
+        output, overflows = model.transform(quantized)
+        reference = model.reference(quantized)
+        signal_power = np.sum(np.abs(reference) ** 2, axis=1)
+        noise_power = np.sum(np.abs(output - reference) ** 2, axis=1)
+        signal += signal_power.sum()
+        noise += noise_power.sum()
+        per_transform.append(_sqnr_db(signal_power, noise_power))
+        overflowed += int(np.count_nonzero(overflows.sum(axis=1)))
+        stage_overflows += overflows.sum(axis=0)
+    per_transform = np.concatenate(per_transform)
+    return {"sqnr_db": round(_sqnr_db(signal, noise), 2),
+            "min_sqnr_db": round(float(np.min(per_transform)), 2),
+            "p5_sqnr_db": round(float(np.percentile(per_transform, 5)), 2),
+            "overflow_rate": overflowed / batch,
+            "overflows_per_stage": stage_overflows.tolist(),
+            "batch": batch,
+            "seconds": round(time.time() - start_time, 3)}
+
+def min_width(params, target_sqnr, widths=range(4, 33), **kwargs):
+    """
+    Finds the narrowest fixed-point data width whose modelled SQNR meets a target.
+
+    The twiddle width follows the data width, as the interactive prompts set it.
+
+    Args:
+        params (dict): The SPIRAL parameters; idWidth and idTWidth are varied.
+        target_sqnr (float): The SQNR target in dB.
+        widths (iterable, optional): The widths to try, in increasing order. Default is 4 to 32.
+        **kwargs: Passed to evaluate_sqnr().
+
+    Returns:
+        tuple: The width, or None if no width meets the target, and the results of every
+               width tried, by width.
+    """
+    results = {}
+    for width in widths:
+        point = dict(params, idWidth=str(width), idTWidth=str(width))
+        results[width] = evaluate_sqnr(point, **kwargs)
+        if results[width]["sqnr_db"] >= target_sqnr:
+            return width, results
+    return None, results
+
+def _parse_widths(text):
+    low, _, high = text.partition("-")
+    return range(int(low), int(high or low) + 1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Model the fixed-point accuracy of a SPIRAL FFT core.")
+    parser.add_argument("--batch", type=int, default=1000, help="The number of random transforms (default: %(default)s).")
+    parser.add_argument("--inputs", help="A .npy file of complex inputs, of shape (batch, N) or (N,), as fractions "
+                                         "of full scale.")
+    parser.add_argument("--kind", choices=INPUT_KINDS, default="uniform",
+                        help="The kind of random inputs (default: %(default)s).")
+    parser.add_argument("--amplitude", type=float, default=None,
+                        help="The random input amplitude as a fraction of full scale (default: 0.5, or 0.5/N unscaled).")
+    parser.add_argument("--seed", type=int, default=0, help="The random seed (default: %(default)s).")
+    parser.add_argument("--rounding", choices=["round", "truncate"], default="round",
+                        help="The rounding mode of every stage (default: %(default)s).")
+    parser.add_argument("--saturate", action="store_true", help="Saturate instead of wrapping on overflow.")
+    parser.add_argument("--widths", type=_parse_widths, metavar="LOW-HIGH",
+                        help="Sweep the data width over this range instead of using idWidth.")
+    parser.add_argument("--target", type=float, metavar="DB",
+                        help="With --widths, stop at the narrowest width meeting this SQNR.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    parser.add_argument("params", nargs="+", metavar="PARAM=VALUE",
+                        help="SPIRAL parameters, e.g. idN=1024 idRadix=4 idWidth=16 idScale=1 idInverse=0")
+    args = parser.parse_args()
+    params = {"idN": 64, "idRadix": 2, "idDataType": '0', "idWidth": 16, "idScale": '1', "idInverse": '0'}
+    for item in args.params:
+        key, _, value = item.partition("=")
+        params[key] = value
+    params.setdefault("idTWidth", params["idWidth"])
+    options = {"batch": args.batch, "inputs": np.load(args.inputs) if args.inputs else None, "kind": args.kind,
+               "amplitude": args.amplitude, "seed": args.seed, "rounding": args.rounding,
+               "overflow": "saturate" if args.saturate else "wrap"}
+
+    if args.widths:
+        target = args.target if args.target is not None else math.inf
+        width, results = min_width(params, target, args.widths, **options)
+    else:
+        width, results = None, {int(params["idWidth"]): evaluate_sqnr(params, **options)}
+    if args.json:
+        print(json.dumps({"min_width": width, "results": results}, indent=2))
+    else:
+        for w, result in results.items():
+            print(f"width {w:>2}: SQNR {result['sqnr_db']:7.2f} dB (worst transform {result['min_sqnr_db']:.2f} dB), "
+                  f"overflow in {100 * result['overflow_rate']:.1f}% of {result['batch']} transforms "
+                  f"({result['seconds']} s)")
+        if args.target is not None and args.widths:
+            print(f"Narrowest width meeting {args.target} dB: {width}" if width else
+                  f"No width meets {args.target} dB")
+    return 0 if args.target is None or width else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+#
+# Full-path timing report extraction for fftgen.py.
+#
+# fftgen.py's clock period tuning only looks at the worst path of a timing
+# report. For critical-path analytics this module parses every path of the
+# Genus setup report and the Innovus setup and hold reports into compact,
+# NumPy-backed columns: check, slack, data arrival, logic depth, cell count,
+# startpoint, endpoint, hierarchy group and per-cell-type counts. The columns
+# are saved as .npy files that are memory-mapped on load, so queries across
+# many runs (slack histograms, top-K failing endpoints, which part of the FFT
+# is limiting) never re-read the text reports.
+#
+# Usage: python3 fftgen_paths.py extract <project_dir> [--output DIR]
+#        python3 fftgen_paths.py query <paths_dir>... [--histogram] [--top K] [--groups]
+
+import os
+import re
+import sys
+import json
+import array
+import argparse
+import numpy as np
+
+import fftgen_reports
+
+# The reports extracted from a project, relative to its project (`fftgen`) directory
+PATH_REPORTS = [
+    fftgen_reports.SYN_SETUP_REPORT,
+    fftgen_reports.PAR_SETUP_REPORT,
+    fftgen_reports.PAR_HOLD_REPORT,
+]
+
+# The columns of a path table, one row per timing path. Slacks and arrivals are in ns.
+PATH_DTYPE = np.dtype([
+    ("report", np.uint8),     # Index into the table's reports
+    ("check", np.uint8),      # 0 for setup, 1 for hold
+    ("index", np.uint32),     # The path's number within its report
+    ("slack", np.float32),
+    ("arrival", np.float32),  # The data path arrival time
+    ("depth", np.uint16),     # The number of combinational cells on the path
+    ("cells", np.uint16),     # The number of cells on the path, including the flops
+    ("startpoint", np.uint32),  # Index into the table's pins
+    ("endpoint", np.uint32),    # Index into the table's pins
+    ("start_group", np.uint16),  # Index into the table's groups
+    ("end_group", np.uint16),    # Index into the table's groups
+])
+CHECKS = ["Setup", "Hold"]
+
+PATH_HEADER = re.compile(rb"Path\s+(\d+):\s+(?:MET|VIOLATED)\s*\(\s*([-+]?[0-9.]+(?:[eE][-+]?[0-9]+)?)\s*(\w*)\s*\)\s*(\w*)")
+SKY130_CELL = re.compile(rb"sky130_fd_sc_\w+?__(\w+)")
+SEQUENTIAL_CELL = re.compile(r"^(s?df|dl|edf)")
+UNIT_SCALE = {b"ps": 0.001, b"ns": 1.0, b"": 1.0}
+
+def hierarchy_group(pin, levels=2):
+    """
+    Returns the hierarchy group of a pin: its instance path with the register and pin
+    name dropped and instance numbers removed, e.g. 'bfly/mult' for 'bfly3/mult/q_reg_12_/D'.
+    """
+    parts = pin.split("/")[:-2][:levels]
+    return re.sub(r"\d+", "", "/".join(parts)) or "(top)"
+
+class _Interner:
+    """Assigns consecutive ids to strings."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def __call__(self, value):
+        return self.ids.setdefault(value, len(self.ids))
+
+    def values(self):
+        return list(self.ids)
+
+def _new_columns():
+    columns = {name: array.array(code) for name, code in (
+        ("report", "B"), ("check", "B"), ("index", "L"), ("slack", "f"), ("arrival", "f"), ("depth", "H"),
+        ("cells", "H"), ("startpoint", "L"), ("endpoint", "L"), ("start_group", "H"), ("end_group", "H"))}
+    columns["cell_counts"] = []
+    return columns
+
+def _parse_report(path, report_id, columns, pins, groups, cell_types):
+    """Appends every path of one report to the columns in a single streaming pass."""
+    current = None
+
+    def finish(current):
+        if current is None or current["start"] is None or current["end"] is None:
+            return
+        columns["report"].append(report_id)
+        columns["check"].append(current["check"])
+        columns["index"].append(current["index"])
+        columns["slack"].append(current["slack"])
+        columns["arrival"].append(current["arrival"])
+        columns["depth"].append(min(current["depth"], 65535))
+        columns["cells"].append(min(current["cells"], 65535))
+        columns["startpoint"].append(pins(current["start"]))
+        columns["endpoint"].append(pins(current["end"]))
+        columns["start_group"].append(groups(hierarchy_group(current["start"])))
+        columns["end_group"].append(groups(hierarchy_group(current["end"])))
+        columns["cell_counts"].append(current["cell_counts"])
+
+    with fftgen_reports.open_report(path) as f:
+        for line in f:
+            stripped = line.lstrip()
+            if not stripped:
+                continue
+            if stripped.startswith(b"Path"):
+                match = PATH_HEADER.match(stripped)
+                if match:
+                    finish(current)
+                    scale = UNIT_SCALE.get(match.group(3), 1.0)
+                    current = {"index": int(match.group(1)), "slack": float(match.group(2)) * scale,
+                               "check": 1 if match.group(4) == b"Hold" else 0, "scale": scale, "arrival": 0.0,
+                               "start": None, "end": None, "depth": 0, "cells": 0, "cell_counts": {}}
+                continue
+            if current is None:
+                continue
+            if stripped.startswith(b"Startpoint:"):
+                current["start"] = stripped.split()[-1].decode()
+            elif stripped.startswith(b"Endpoint:"):
+                current["end"] = stripped.split()[-1].decode()
+            elif stripped.startswith(b"Data Path:"):
+                try:
+                    current["arrival"] = float(stripped.split()[-1]) * current["scale"]
+                except ValueError:
+                    pass
+            elif b"sky130_" in stripped:
+                match = SKY130_CELL.search(stripped)
+                if match:
+                    cell = match.group(1).decode()
+                    cell_id = cell_types(cell)
+                    current["cells"] += 1
+                    current["cell_counts"][cell_id] = current["cell_counts"].get(cell_id, 0) + 1
+                    if not SEQUENTIAL_CELL.match(cell):
+                        current["depth"] += 1
+    finish(current)
+
+def extract_paths(report_paths, output_dir):
+    """
+    Extracts every timing path of the given reports into a columnar path table.
+
+    Args:
+        report_paths (list): The timing reports, plain or gzip-compressed. Missing reports are skipped.
+        output_dir (str): The directory to write the table to.
+
+    Returns:
+        PathTable: The table, memory-mapped from output_dir.
+    """
+    columns = _new_columns()
+    pins, groups, cell_types = _Interner(), _Interner(), _Interner()
+    reports = []
+    for path in report_paths:
+        found = fftgen_reports.find_report(path)
+        if found is None:
+            continue
+        _parse_report(found, len(reports), columns, pins, groups, cell_types)
+        reports.append(found)
+
+    table = np.zeros(len(columns["slack"]), dtype=PATH_DTYPE)
+    for name in PATH_DTYPE.names:
+        table[name] = np.frombuffer(columns[name], dtype=columns[name].typecode) if len(table) else []
+    cell_counts = np.zeros((len(table), len(cell_types.ids)), dtype=np.uint16)
+    for row, counts in enumerate(columns["cell_counts"]):
+        for cell_id, count in counts.items():
+            cell_counts[row, cell_id] = min(count, 65535)
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, "paths.npy"), table)
+    np.save(os.path.join(output_dir, "cell_counts.npy"), cell_counts)
+    np.save(os.path.join(output_dir, "pins.npy"), np.array(pins.values() or [""], dtype=np.str_))
+    with open(os.path.join(output_dir, "meta.json"), 'w') as f:
+        json.dump({"reports": reports, "groups": groups.values(), "cell_types": cell_types.values(),
+                   "paths": len(table)}, f, indent=2)
+    return PathTable.load(output_dir)
+
+def extract_project_paths(project_dir, output_dir=None):
+    """Extracts the paths of a project's synthesis and Place-and-Route reports into build/paths."""
+    output_dir = output_dir or os.path.join(project_dir, "build", "paths")
+    return extract_paths([os.path.join(project_dir, report) for report in PATH_REPORTS], output_dir)
+
+class PathTable:
+    """
+    A columnar table of timing paths, memory-mapped from the files written by extract_paths().
+
+    Attributes:
+        paths (numpy.ndarray): One PATH_DTYPE row per path.
+        cell_counts (numpy.ndarray): The number of cells of each type per path (paths x cell types).
+        pins (numpy.ndarray): The start- and endpoint pin names.
+        groups (list): The hierarchy group names.
+        cell_types (list): The cell type names, e.g. 'nand2_1'.
+        reports (list): The reports the paths were extracted from.
+    """
+
+    def __init__(self, paths, cell_counts, pins, meta):
+        self.paths = paths
+        self.cell_counts = cell_counts
+        self.pins = pins
+        self.groups = meta["groups"]
+        self.cell_types = meta["cell_types"]
+        self.reports = meta["reports"]
+
+    @classmethod
+    def load(cls, table_dir):
+        """Memory-maps a path table from its directory."""
+        with open(os.path.join(table_dir, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(np.load(os.path.join(table_dir, "paths.npy"), mmap_mode='r'),
+                   np.load(os.path.join(table_dir, "cell_counts.npy"), mmap_mode='r'),
+                   np.load(os.path.join(table_dir, "pins.npy"), mmap_mode='r'), meta)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def select(self, check="Setup", report=None):
+        """Returns a boolean mask of the paths of one check ('Setup' or 'Hold'), optionally of one report index."""
+        mask = self.paths["check"] == CHECKS.index(check)
+        if report is not None:
+            mask &= self.paths["report"] == report
+        return mask
+
+    def slack_histogram(self, bins=20, check="Setup", report=None):
+        """Returns (counts, bin edges in ns) of the path slacks."""
+        return np.histogram(self.paths["slack"][self.select(check, report)], bins=bins)
+
+    def top_failing_endpoints(self, k=10, check="Setup", report=None):
+        """
+        Returns the k endpoints with the worst negative slack.
+
+        Returns:
+            list: (endpoint pin, worst slack in ns, number of failing paths to it) tuples,
+                  worst first.
+        """
+        mask = self.select(check, report) & (self.paths["slack"] < 0)
+        endpoints, slacks = self.paths["endpoint"][mask], self.paths["slack"][mask]
+        if not len(endpoints):
+            return []
+        order = np.lexsort((slacks, endpoints))
+        endpoints, slacks = endpoints[order], slacks[order]
+        unique, first, counts = np.unique(endpoints, return_index=True, return_counts=True)
+        worst = slacks[first]
+        top = np.argsort(worst)[:k]
+        return [(str(self.pins[unique[i]]), round(float(worst[i]), 6), int(counts[i])) for i in top]
+
+    def group_summary(self, check="Setup", report=None, by="end_group"):
+        """
+        Summarizes the paths per hierarchy group (e.g. 'bfly/mult' or 'twiddle_rom'), to show
+        which part of the design limits timing.
+
+        Returns:
+            list: A dict per group (group, paths, failing, worst slack, tns, mean depth), worst first.
+        """
+        mask = self.select(check, report)
+        group_ids, slacks, depths = self.paths[by][mask], self.paths["slack"][mask], self.paths["depth"][mask]
+        summary = []
+        for group_id in np.unique(group_ids):
+            in_group = group_ids == group_id
+            group_slacks = slacks[in_group]
+            summary.append({"group": self.groups[group_id], "paths": int(in_group.sum()),
+                            "failing": int((group_slacks < 0).sum()), "worst": round(float(group_slacks.min()), 6),
+                            "tns": round(float(group_slacks[group_slacks < 0].sum()), 6),
+                            "mean_depth": round(float(depths[in_group].mean()), 2)})
+        return sorted(summary, key=lambda row: row["worst"])
+
+    def cell_usage(self, check="Setup", report=None, slack_below=0.0):
+        """Returns the total count of each cell type over the paths with slack below slack_below, most used first."""
+        mask = self.select(check, report) & (self.paths["slack"] < slack_below)
+        totals = self.cell_counts[mask].sum(axis=0) if mask.any() else np.zeros(len(self.cell_types))
+        return sorted(((self.cell_types[i], int(total)) for i, total in enumerate(totals) if total),
+                      key=lambda item: -item[1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract and query every timing path of fftgen reports.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    extract_parser = subparsers.add_parser("extract", help="Extract the paths of a project's reports.")
+    extract_parser.add_argument("project_dir", help="The project (`fftgen`) directory.")
+    extract_parser.add_argument("--output", help="The table directory (default: <project_dir>/build/paths).")
+
+    query_parser = subparsers.add_parser("query", help="Query one or more extracted path tables.")
+    query_parser.add_argument("table_dirs", nargs="+", metavar="table_dir")
+    query_parser.add_argument("--check", choices=CHECKS, default="Setup")
+    query_parser.add_argument("--report", type=int, help="Only the paths of this report index.")
+    query_parser.add_argument("--histogram", action="store_true", help="Print a slack histogram.")
+    query_parser.add_argument("--top", type=int, default=0, metavar="K", help="Print the K worst failing endpoints.")
+    query_parser.add_argument("--groups", action="store_true", help="Summarize the paths per hierarchy group.")
+
+    args = parser.parse_args()
+
+    if args.command == "extract":
+        table = extract_project_paths(args.project_dir, args.output)
+        print(f"Extracted {len(table)} paths from {len(table.reports)} report(s)")
+        for index, report in enumerate(table.reports):
+            print(f"  [{index}] {report}")
+    elif args.command == "query":
+        for table_dir in args.table_dirs:
+            table = PathTable.load(table_dir)
+            print("------------------------------------------------------------")
+            print(f"{table_dir}: {int(table.select(args.check, args.report).sum())} {args.check} paths")
+            if args.histogram:
+                counts, edges = table.slack_histogram(check=args.check, report=args.report)
+                for count, low, high in zip(counts, edges[:-1], edges[1:]):
+                    print(f"  {low:>9.3f} .. {high:>9.3f} ns  {count:>8}  "
+                          f"{'#' * int(50 * count / max(1, counts.max()))}")
+            for endpoint, slack, count in table.top_failing_endpoints(args.top, args.check, args.report):
+                print(f"  {slack:>9.3f} ns  {count:>6} path(s)  {endpoint}")
+            if args.groups:
+                for row in table.group_summary(args.check, args.report):
+                    print(f"  {row['group']:<24} {row['paths']:>8} paths  {row['failing']:>8} failing  "
+                          f"worst {row['worst']:>9.3f} ns  TNS {row['tns']:>11.3f} ns  depth {row['mean_depth']:.1f}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
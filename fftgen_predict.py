@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+#
+# Clock period seeds for fftgen.py.
+#
+# Clock period tuning converges in fewer Synthesis and Place-and-Route runs the
+# closer its first period is to the period the design closes at. Rather than
+# always starting at 3 ns, the flow seeds synthesis with a period predicted
+# from past runs in the results database (see fftgen_db): the closed period of
+# the same design point if it was run before, otherwise a ridge regression of
+# the log closed period on the SPIRAL parameters. Without enough past runs, a
+# heuristic from the design's data path width and its Verilog (whether it has
+# multipliers at all) is used. A second model predicts the ratio of the
+# Place-and-Route period to the synthesis period, to seed run_par().
+#
+# Usage: python3 fftgen_predict.py [--db FILE] [--verilog FILE] PARAM=VALUE...
+
+import math
+import sqlite3
+import argparse
+import numpy as np
+
+import fftgen_db
+import fftgen_verilog
+
+# The number of past runs needed before the regression models are used
+MIN_TRAINING_RUNS = 6
+
+# The Place-and-Route to synthesis period ratio without past runs: PaR starts at the synthesis period
+DEFAULT_PAR_RATIO = 1.0
+
+# Predicted periods are kept within these bounds in ns
+MIN_PERIOD, MAX_PERIOD = 0.5, 20.0
+
+FEATURE_NAMES = ["log2 N", "log2 radix", "log2 stream width", "data width", "floating point", "streaming", "scaled"]
+
+def features(params):
+    """Returns the regression features of a SPIRAL parameter dict."""
+    floating = str(params["idDataType"]) == '1'
+    return [math.log2(int(params["idN"])), math.log2(int(params["idRadix"])), math.log2(int(params["idStreamWidth"])),
+            32.0 if floating else float(params["idWidth"]), 1.0 if floating else 0.0,
+            1.0 if str(params["idArch"]) == '1' else 0.0, 1.0 if str(params["idScale"]) == '1' else 0.0]
+
+class RidgeModel:
+    """
+    A ridge regression of log(target) on the features of SPIRAL parameter dicts.
+
+    Regressing the log keeps predictions positive and makes the model multiplicative,
+    e.g. a wider data path lengthens the critical path by a factor, not an offset.
+
+    Attributes:
+        ridge (float): The L2 penalty on the coefficients, not on the intercept.
+        weights (numpy.ndarray): The fitted intercept and coefficients, or None before fitting.
+    """
+
+    def __init__(self, ridge=0.1):
+        self.ridge = ridge
+        self.weights = None
+
+    def fit(self, param_dicts, targets):
+        x = np.array([[1.0] + features(params) for params in param_dicts])
+        y = np.log(np.array(targets, dtype=float))
+        penalty = self.ridge * np.eye(x.shape[1])
+        penalty[0, 0] = 0.0
+        self.weights = np.linalg.solve(x.T @ x + penalty, x.T @ y)
+        return self
+
+    def predict(self, params):
+        return float(np.exp(np.dot([1.0] + features(params), self.weights)))
+
+def heuristic_period(params, verilog_path=None):
+    """
+    Estimates the closed clock period of a design in ns without past runs.
+
+    The critical path of a SPIRAL FFT core is a twiddle multiplication followed by a
+    butterfly addition, which grows with the data width; floating-point operators are
+    far slower. Designs whose Verilog has no multiplier (e.g. 4-point transforms, whose
+    twiddles are trivial) only have the adders.
+
+    Args:
+        params (dict): The SPIRAL parameters.
+        verilog_path (str, optional): The design's Verilog file, for its statistics.
+
+    Returns:
+        float: The estimated period, rounded to 0.1 ns.
+    """
+    if str(params["idDataType"]) == '1':
+        period = 5.0
+    else:
+        width = int(params["idWidth"])
+        has_multipliers = True
+        if verilog_path:
+            try:
+                has_multipliers = fftgen_verilog.analyze_verilog(verilog_path).multipliers > 0
+            except (OSError, ValueError):
+                pass
+        period = 0.9 + 0.1 * width if has_multipliers else 0.6 + 0.05 * width
+    if int(params["idRadix"]) > 2:
+        period += 0.3
+    return round(min(MAX_PERIOD, max(MIN_PERIOD, period)), 1)
+
+class PeriodPredictor:
+    """
+    Predicts the first Synthesis period and the Place-and-Route period ratio of a design.
+
+    Attributes:
+        runs (list): The past runs, as returned by fftgen_db.ResultsDB.query(), with both
+                     their parameters and closed periods.
+        syn_model (RidgeModel): The synthesis period model, or None with too few runs.
+        par_model (RidgeModel): The PaR/synthesis period ratio model, or None with too few runs.
+    """
+
+    def __init__(self, runs):
+        self.runs = [run for run in runs if run.get("syn_clock_period") and run.get("idN")]
+        self.syn_model = self.par_model = None
+        if len(self.runs) >= MIN_TRAINING_RUNS:
+            self.syn_model = RidgeModel().fit(self.runs, [run["syn_clock_period"] for run in self.runs])
+        par_runs = [run for run in self.runs if run.get("par_clock_period")]
+        if len(par_runs) >= MIN_TRAINING_RUNS:
+            self.par_model = RidgeModel().fit(par_runs, [run["par_clock_period"] / run["syn_clock_period"]
+                                                         for run in par_runs])
+        self.par_ratios = [run["par_clock_period"] / run["syn_clock_period"] for run in par_runs]
+
+    @classmethod
+    def from_db(cls, db_path):
+        """Loads the completed runs of a results database. A missing or unreadable database gives no runs."""
+        try:
+            return cls(fftgen_db.ResultsDB(db_path).query(["status=completed"]) if db_path else [])
+        except (sqlite3.Error, OSError):
+            return cls([])
+
+    def _same_point(self, params):
+        for run in reversed(self.runs):
+            if all(str(run.get(key)) == str(params[key]) for key in fftgen_db.PARAM_COLUMNS if key in params):
+                return run
+        return None
+
+    def initial_period(self, params, verilog_path=None):
+        """
+        Predicts the period to start synthesis tuning at.
+
+        Returns:
+            tuple: The period in ns, rounded to 0.01 ns, and where it came from ('past run',
+                   'model of N runs' or 'heuristic').
+        """
+        same = self._same_point(params)
+        if same:
+            return round(same["syn_clock_period"], 3), "past run"
+        if self.syn_model:
+            periods = [run["syn_clock_period"] for run in self.runs]
+            period = min(max(periods) * 2, max(min(periods) / 2, self.syn_model.predict(params)))
+            return round(min(MAX_PERIOD, max(MIN_PERIOD, period)), 2), f"model of {len(self.runs)} runs"
+        return heuristic_period(params, verilog_path), "heuristic"
+
+    def par_ratio(self, params):
+        """
+        Predicts the ratio of the closed Place-and-Route period to the synthesis period.
+
+        Returns:
+            tuple: The ratio and where it came from ('past run', 'model of N runs',
+                   'median of N runs' or 'default').
+        """
+        same = self._same_point(params)
+        if same and same.get("par_clock_period"):
+            return same["par_clock_period"] / same["syn_clock_period"], "past run"
+        if self.par_model:
+            ratio = self.par_model.predict(params)
+            return min(max(self.par_ratios), max(min(self.par_ratios), ratio)), \
+                f"model of {len(self.par_ratios)} runs"
+        if self.par_ratios:
+            return float(np.median(self.par_ratios)), f"median of {len(self.par_ratios)} runs"
+        return DEFAULT_PAR_RATIO, "default"
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict the clock period seeds of a design point.")
+    parser.add_argument("--db", default=fftgen_db.DEFAULT_DB_PATH, help="The results database (default: %(default)s).")
+    parser.add_argument("--verilog", help="The design's Verilog file, for the heuristic.")
+    parser.add_argument("params", nargs="+", metavar="PARAM=VALUE",
+                        help="SPIRAL parameters, e.g. idN=256 idRadix=2 idStreamWidth=2 idDataType=0 idWidth=16 "
+                             "idScale=1 idArch=1")
+    args = parser.parse_args()
+    params = {"idN": 64, "idRadix": 2, "idStreamWidth": 2, "idDataType": '0', "idWidth": 16, "idScale": '1',
+              "idArch": '1'}
+    for item in args.params:
+        key, _, value = item.partition("=")
+        params[key] = value
+    predictor = PeriodPredictor.from_db(args.db)
+    period, source = predictor.initial_period(params, args.verilog)
+    ratio, ratio_source = predictor.par_ratio(params)
+    print(f"Initial synthesis period: {period} ns ({source})")
+    print(f"Place-and-Route period: {round(ratio, 3)} x the synthesis period ({ratio_source})")
+    if predictor.syn_model:
+        for name, weight in zip(["intercept"] + FEATURE_NAMES, predictor.syn_model.weights):
+            print(f"  {name:<20} {weight:+.4f}")
+
+if __name__ == "__main__":
+    main()
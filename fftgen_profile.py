@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+#
+# Lightweight tracing spans for fftgen.py.
+#
+# A flow's wall clock goes to many places: polling the SPIRAL server, cloning
+# and building Hammer CAD, every `make syn` / `make redo-par`, reading
+# (decompressing) reports, retries and pauses. span() records a named interval
+# with its wall time, the CPU time of the calling thread, the CPU time of the
+# child processes reaped during it (make and the tools it runs), and the peak
+# resident memory of the Python process and of its largest child so far.
+#
+# Spans go to the Profiler active in the calling thread (see
+# Profiler.activate()); without one, span() does nothing, so the
+# instrumentation costs next to nothing outside a profiled flow. A profiler
+# appends plain dicts to a list, which fftgen.py keeps on the FlowProject, so
+# spans survive checkpoints and the trip back from scheduler worker processes.
+#
+# Spans are written as JSON and as Chrome trace events (load them in
+# chrome://tracing or https://ui.perfetto.dev), and summarized per span name.
+#
+# Usage: python3 fftgen_profile.py <profile.json or directory>... [--chrome TRACE] [--json SUMMARY]
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import threading
+import contextlib
+
+PROFILE_FILE = "profile.json"
+CHROME_TRACE_FILE = "profile.trace.json"
+
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+RSS_UNIT_MB = 1 / (1024 * 1024) if sys.platform == "darwin" else 1 / 1024
+
+# The CPU time of the calling thread, where the platform has it
+thread_time = getattr(time, "thread_time", time.process_time)
+
+_local = threading.local()
+
+class Profiler:
+    """
+    Records spans into a list of dicts.
+
+    Child CPU time is measured from the rusage of reaped child processes, which is per
+    process: spans that run at the same time in threads of one process (e.g. the
+    stages of a FlowPipeline) each count the CPU time of all children reaped meanwhile.
+    Under a FlowScheduler, every stage runs alone in its worker process, so the
+    figures are exact.
+
+    Args:
+        spans (list, optional): The list to append spans to. Default is a new list.
+    """
+
+    def __init__(self, spans=None):
+        self.spans = spans if spans is not None else []
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Makes this the profiler span() records to in the calling thread, for the duration of the block."""
+        previous = getattr(_local, "profiler", None)
+        _local.profiler = self
+        try:
+            yield self
+        finally:
+            _local.profiler = previous
+
+    @contextlib.contextmanager
+    def span(self, name, category="flow", **attrs):
+        """
+        Records a span around a block. Attributes given, or added to the yielded dict
+        inside the block, are stored in the span's 'args'.
+        """
+        stack = _local.__dict__.setdefault("stack", [])
+        args = dict(attrs)
+        start, cpu = time.time(), thread_time()
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        stack.append(name)
+        try:
+            yield args
+        finally:
+            stack.pop()
+            end = resource.getrusage(resource.RUSAGE_CHILDREN)
+            self.spans.append({
+                "name": name, "cat": category, "start": round(start, 6), "wall": round(time.time() - start, 6),
+                "cpu": round(thread_time() - cpu, 6),
+                "child_cpu": round(end.ru_utime + end.ru_stime - children.ru_utime - children.ru_stime, 6),
+                "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT_MB, 1),
+                "child_max_rss_mb": round(end.ru_maxrss * RSS_UNIT_MB, 1),
+                "pid": os.getpid(), "thread": threading.current_thread().name, "depth": len(stack),
+                "parent": stack[-1] if stack else None, "args": args})
+
+def current():
+    """Returns the profiler active in the calling thread, or None."""
+    return getattr(_local, "profiler", None)
+
+@contextlib.contextmanager
+def span(name, category="flow", **attrs):
+    """Records a span to the profiler active in the calling thread (see Profiler.span()), if any."""
+    profiler = current()
+    if profiler is None:
+        yield dict(attrs)
+        return
+    with profiler.span(name, category, **attrs) as args:
+        yield args
+
+def bind(func):
+    """
+    Returns func wrapped to record its spans to the caller's profiler, for running it
+    on another thread (e.g. in a ThreadPoolExecutor).
+    """
+    profiler = current()
+    if profiler is None:
+        return func
+    parents = list(getattr(_local, "stack", []))
+
+    def bound(*args, **kwargs):
+        stack = getattr(_local, "stack", None)
+        _local.stack = list(parents)  # Spans on the thread nest under the caller's open spans
+        try:
+            with profiler.activate():
+                return func(*args, **kwargs)
+        finally:
+            _local.stack = stack if stack is not None else []
+    return bound
+
+def summarize(spans):
+    """
+    Aggregates spans by name.
+
+    Args:
+        spans (list): The spans.
+
+    Returns:
+        list: One dict per span name (name, category, count, wall, mean, max, cpu,
+              child_cpu, max_rss_mb, child_max_rss_mb, share), by descending total wall
+              time. 'share' is the fraction of the wall time of the top-level spans.
+    """
+    rows = {}
+    for s in spans:
+        row = rows.setdefault(s["name"], {"name": s["name"], "category": s["cat"], "count": 0, "wall": 0.0,
+                                          "max": 0.0, "cpu": 0.0, "child_cpu": 0.0, "max_rss_mb": 0.0,
+                                          "child_max_rss_mb": 0.0})
+        row["count"] += 1
+        row["wall"] += s["wall"]
+        row["max"] = max(row["max"], s["wall"])
+        row["cpu"] += s["cpu"]
+        row["child_cpu"] += s["child_cpu"]
+        row["max_rss_mb"] = max(row["max_rss_mb"], s["max_rss_mb"])
+        row["child_max_rss_mb"] = max(row["child_max_rss_mb"], s["child_max_rss_mb"])
+    total = sum(s["wall"] for s in spans if s["depth"] == 0)
+    for row in rows.values():
+        row["mean"] = row["wall"] / row["count"]
+        row["share"] = row["wall"] / total if total > 0 else 0.0
+        for key in ("wall", "mean", "max", "cpu", "child_cpu", "share"):
+            row[key] = round(row[key], 3 if key != "share" else 4)
+    return sorted(rows.values(), key=lambda row: -row["wall"])
+
+def print_summary(spans, title="Profile"):
+    """Prints the per-name summary of spans as a table."""
+    rows = summarize(spans)
+    print("------------------------------------------------------------")
+    print(f"{title} ({len(spans)} span(s)):")
+    print(f"  {'span':<24} {'count':>6} {'wall s':>10} {'share':>7} {'mean s':>9} {'max s':>9} {'cpu s':>8} "
+          f"{'child cpu s':>11} {'peak MB':>8} {'child MB':>9}")
+    for row in rows:
+        print(f"  {row['name']:<24} {row['count']:>6} {row['wall']:>10.2f} {100 * row['share']:>6.1f}% "
+              f"{row['mean']:>9.3f} {row['max']:>9.3f} {row['cpu']:>8.2f} {row['child_cpu']:>11.2f} "
+              f"{row['max_rss_mb']:>8.0f} {row['child_max_rss_mb']:>9.0f}")
+    print("------------------------------------------------------------")
+
+def chrome_trace(groups):
+    """
+    Converts spans to the Chrome trace-event format.
+
+    Args:
+        groups (dict): Spans per process name (e.g. per design point). Each group is
+                       shown as one process, with one track per recording thread.
+
+    Returns:
+        dict: The trace, with complete ('X') events in microseconds and metadata events
+              naming the processes and threads.
+    """
+    events = []
+    origin = min((s["start"] for spans in groups.values() for s in spans), default=0.0)
+    for pid, (group, spans) in enumerate(groups.items(), start=1):
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": group}})
+        threads = {}
+        for s in spans:
+            tid = threads.setdefault((s["pid"], s["thread"]), len(threads) + 1)
+            args = dict(s["args"], cpu=s["cpu"], child_cpu=s["child_cpu"], max_rss_mb=s["max_rss_mb"],
+                        child_max_rss_mb=s["child_max_rss_mb"])
+            events.append({"name": s["name"], "cat": s["cat"], "ph": "X", "pid": pid, "tid": tid,
+                           "ts": round((s["start"] - origin) * 1e6), "dur": round(s["wall"] * 1e6), "args": args})
+        for (os_pid, thread), tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": f"{thread} (pid {os_pid})"}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+def write_profile(spans, output_dir, name=None):
+    """
+    Writes spans to profile.json and profile.trace.json in a directory.
+
+    Args:
+        spans (list): The spans.
+        output_dir (str): The directory.
+        name (str, optional): The process name in the Chrome trace. Default is the directory name.
+
+    Returns:
+        tuple: The paths of the JSON spans and of the Chrome trace.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    profile_path = os.path.join(output_dir, PROFILE_FILE)
+    trace_path = os.path.join(output_dir, CHROME_TRACE_FILE)
+    with open(profile_path, 'w') as f:
+        json.dump({"spans": spans, "summary": summarize(spans)}, f, indent=1)
+    with open(trace_path, 'w') as f:
+        json.dump(chrome_trace({name or os.path.basename(os.path.abspath(output_dir)): spans}), f)
+    return profile_path, trace_path
+
+def write_merged_profile(groups, summary_path, trace_path):
+    """
+    Writes the aggregation of many flows' spans: a summary over all of them, and per group
+    (e.g. per design point), and one Chrome trace with a process per group.
+
+    Args:
+        groups (dict): Spans per group name.
+        summary_path (str): The JSON summary to write.
+        trace_path (str): The Chrome trace to write.
+
+    Returns:
+        list: All the spans.
+    """
+    spans = [s for group in groups.values() for s in group]
+    summary = {"summary": summarize(spans),
+               "groups": {group: {"wall": round(sum(s["wall"] for s in group_spans if s["depth"] == 0), 3),
+                                  "child_cpu": round(sum(s["child_cpu"] for s in group_spans if s["depth"] == 0), 3),
+                                  "spans": len(group_spans)}
+                          for group, group_spans in groups.items()}}
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    with open(trace_path, 'w') as f:
+        json.dump(chrome_trace(groups), f)
+    return spans
+
+def load_profiles(paths):
+    """
+    Loads the spans of profile.json files, searching directories recursively.
+
+    Returns:
+        dict: Spans per profile, named after the directory each profile is in.
+    """
+    groups = {}
+    for path in paths:
+        if os.path.isdir(path):
+            found = sorted(os.path.join(root, PROFILE_FILE) for root, _, files in os.walk(path)
+                           if PROFILE_FILE in files)
+        else:
+            found = [path]
+        for profile_path in found:
+            with open(profile_path) as f:
+                spans = json.load(f)["spans"]
+            groups[os.path.relpath(os.path.dirname(os.path.abspath(profile_path)))] = spans
+    return groups
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize and merge fftgen flow profiles.")
+    parser.add_argument("profiles", nargs="+", help="profile.json files, or directories to search for them.")
+    parser.add_argument("--chrome", metavar="TRACE", help="Write the merged Chrome trace to this file.")
+    parser.add_argument("--json", metavar="SUMMARY", help="Write the aggregated summary to this file.")
+    args = parser.parse_args()
+    groups = load_profiles(args.profiles)
+    if not groups:
+        print("No profiles found.")
+        return 1
+    spans = [s for group in groups.values() for s in group]
+    print_summary(spans, f"Profile of {len(groups)} flow(s)")
+    if args.chrome or args.json:
+        write_merged_profile(groups, args.json or os.devnull, args.chrome or os.devnull)
+        for path in (args.chrome, args.json):
+            if path:
+                print(f"Wrote {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+#
+# Report ingestion for fftgen.py.
+#
+# Genus and Innovus write their timing reports as plain text or gzip-compressed
+# text, and these reports can grow to hundreds of megabytes for large FFT cores.
+# This module reads every report in a single streaming pass, straight from the
+# .gz file when there is one, and never decompresses a report to disk. The
+# results of a Place-and-Route run are collected into one PPAResult: setup and
+# hold slack (worst path, WNS and TNS), area, and internal, switching, leakage
+# and total power.
+
+import os
+import re
+import gzip
+
+# Reports are scanned in chunks of this many bytes, split at line boundaries
+REPORT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# The header line of one timing path, e.g. "Path 1: VIOLATED (-0.123 ns) Setup Check with Pin ...".
+# The pattern is not anchored with ^ and MULTILINE, which makes the regex engine try every
+# position; instead it starts with a literal the engine can search for quickly, and
+# scan_timing_report() checks that each match starts a line.
+PATH_HEADER = re.compile(
+    rb"Path[ \t]+(\d+):[ \t]+(MET|VIOLATED)[ \t]*\([ \t]*([-+]?[0-9.]+(?:[eE][-+]?[0-9]+)?)[ \t]*([A-Za-z]*)[ \t]*\)")
+
+# The Synthesis reports of a project, relative to its project directory
+SYN_SETUP_REPORT = os.path.join("build", "syn-rundir", "reports", "final_time_ss_100C_1v60.setup_view.rpt")
+SYN_AREA_REPORT = os.path.join("build", "syn-rundir", "reports", "final_area.rpt")
+
+# The Place-and-Route reports of a project, relative to its project directory
+PAR_SETUP_REPORT = os.path.join("build", "par-rundir", "timingReports", "dft_top_postRoute_all.tarpt")
+PAR_HOLD_REPORT = os.path.join("build", "par-rundir", "timingReports", "dft_top_postRoute_all_hold.tarpt")
+PAR_AREA_REPORT = os.path.join("build", "par-rundir", "dft_top_area.rpt")
+PAR_POWER_REPORT = os.path.join("build", "par-rundir", "dft_top_power.rpt")
+
+def find_report(path):
+    """
+    Returns the path a report actually exists at, or None.
+
+    A report is looked up both as given and with or without a .gz suffix, so callers
+    can name a report without knowing whether the tool compressed it.
+    """
+    candidates = [path, path[:-3]] if path.endswith(".gz") else [path, path + ".gz"]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def open_report(path):
+    """
+    Opens a plain or gzip-compressed report for binary reading.
+
+    Args:
+        path (str): The report path, with or without a .gz suffix.
+
+    Returns:
+        file: The open report, decompressing on the fly if it is gzip-compressed.
+
+    Raises:
+        OSError: If the report does not exist or cannot be read.
+    """
+    found = find_report(path)
+    if found is None:
+        raise FileNotFoundError(f"No such report: {path}")
+    with open(found, 'rb') as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    return gzip.open(found, 'rb') if compressed else open(found, 'rb')
+
+def iter_report_chunks(path, chunk_size=REPORT_CHUNK_SIZE):
+    """Yields a report's contents in chunks of whole lines."""
+    with open_report(path) as f:
+        rest = b""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            chunk = rest + chunk
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                rest = chunk
+                continue
+            rest = chunk[end:]
+            yield chunk[:end]
+        if rest:
+            yield rest
+
+class TimingSummary:
+    """
+    The path slacks of one setup or hold timing report.
+
+    Attributes:
+        unit (str): The unit slacks are reported in ('ps' for Genus, 'ns' for Innovus).
+        paths (int): The number of reported paths.
+        violating (int): The number of paths with negative slack.
+        met (bool): Whether Path 1, the worst path, met timing.
+        slack (float): The slack of Path 1.
+        slack_time (str): The slack of Path 1 as printed in the report, e.g. '123 ps'.
+        wns (float): The worst negative slack over all paths, or 0.0 if all paths met.
+        tns (float): The total negative slack over all paths.
+    """
+
+    def __init__(self, unit, met, slack, slack_time):
+        self.unit = unit
+        self.met = met
+        self.slack = slack
+        self.slack_time = slack_time
+        self.paths = 0
+        self.violating = 0
+        self.wns = 0.0
+        self.tns = 0.0
+
+    def as_dict(self):
+        return {"unit": self.unit, "met": self.met, "slack": self.slack, "wns": self.wns, "tns": round(self.tns, 6),
+                "paths": self.paths, "violating": self.violating}
+
+def scan_timing_report(path, max_paths=None, chunk_size=REPORT_CHUNK_SIZE):
+    """
+    Reads the path slacks of a Genus or Innovus timing report in one streaming pass.
+
+    Args:
+        path (str): The report path. Plain and gzip-compressed reports are both read.
+        max_paths (int, optional): Stop after this many paths, e.g. 1 to read only the
+                                   worst path. Default is all paths.
+        chunk_size (int, optional): The number of bytes read at a time.
+
+    Returns:
+        TimingSummary: The slacks of the report, or None if it has no timing paths.
+
+    Raises:
+        OSError: If the report cannot be read.
+    """
+    summary = None
+    for chunk in iter_report_chunks(path, chunk_size):
+        for match in PATH_HEADER.finditer(chunk):
+            line_start = chunk.rfind(b"\n", 0, match.start()) + 1
+            if chunk[line_start:match.start()].strip(b" \t"):
+                continue  # Not at the start of a line
+            status, value, unit = match.group(2), match.group(3), match.group(4)
+            slack = float(value)
+            if summary is None:
+                slack_time = f"{value.decode()} {unit.decode()}".strip()
+                summary = TimingSummary(unit.decode(), status == b"MET", slack, slack_time)
+            summary.paths += 1
+            if slack < 0:
+                summary.violating += 1
+                summary.tns += slack
+                summary.wns = min(summary.wns, slack)
+            if max_paths is not None and summary.paths >= max_paths:
+                return summary
+    return summary
+
+def read_area_report(path, top="dft_top"):
+    """Returns the total area in um^2 of the top module from an area report, or None if it is not found."""
+    with open_report(path) as f:
+        for line in f:
+            parts = line.split()
+            if parts and parts[0] == top.encode() and len(parts) >= 3:
+                try:
+                    return float(parts[2])
+                except ValueError:
+                    return None
+    return None
+
+def read_power_report(path):
+    """
+    Reads the total powers in mW from a power report.
+
+    Returns:
+        dict: The 'internal', 'switching', 'leakage' and 'total' power; powers not
+              found in the report are None.
+    """
+    labels = {b"Total Internal Power:": "internal", b"Total Switching Power:": "switching",
+              b"Total Leakage Power:": "leakage", b"Total Power:": "total"}
+    power = dict.fromkeys(labels.values())
+    with open_report(path) as f:
+        for line in f:
+            stripped = line.strip()
+            for label, key in labels.items():
+                if stripped.startswith(label):
+                    try:
+                        power[key] = float(stripped[len(label):].split()[0])
+                    except (ValueError, IndexError):
+                        pass
+            if power["total"] is not None:
+                break
+    return power
+
+class PPAResult:
+    """
+    The performance, power and area of one Place-and-Route run.
+
+    Attributes:
+        setup (TimingSummary): The setup timing, or None if the report is missing or empty.
+        hold (TimingSummary): The hold timing, or None if the report is missing or empty.
+        area (float): The total area of dft_top in um^2, or None.
+        internal_power (float): The total internal power in mW, or None.
+        switching_power (float): The total switching power in mW, or None.
+        leakage_power (float): The total leakage power in mW, or None.
+        total_power (float): The total power in mW, or None.
+        errors (list): The reports that could not be read, with the reasons.
+    """
+
+    def __init__(self):
+        self.setup = None
+        self.hold = None
+        self.area = None
+        self.internal_power = None
+        self.switching_power = None
+        self.leakage_power = None
+        self.total_power = None
+        self.errors = []
+
+    def as_dict(self):
+        return {"setup": self.setup.as_dict() if self.setup else None,
+                "hold": self.hold.as_dict() if self.hold else None,
+                "area": self.area, "internal_power": self.internal_power, "switching_power": self.switching_power,
+                "leakage_power": self.leakage_power, "total_power": self.total_power}
+
+    def display(self):
+        """Prints the hold slack, area and power, as reported after Place-and-Route."""
+        if self.hold:
+            print(f"Hold time Path 1 slack in Place-and-Route: {self.hold.slack_time}")
+            print(f"Hold WNS: {self.hold.wns} {self.hold.unit}, TNS: {round(self.hold.tns, 6)} {self.hold.unit} "
+                  f"({self.hold.violating} of {self.hold.paths} paths violated)")
+        else:
+            print("Hold time Path 1 information not found in the report.")
+        print("------------------------------------------------------------")
+        if self.setup:
+            print(f"Setup WNS: {self.setup.wns} {self.setup.unit}, TNS: {round(self.setup.tns, 6)} {self.setup.unit} "
+                  f"({self.setup.violating} of {self.setup.paths} paths violated)")
+            print("------------------------------------------------------------")
+        if self.area is not None:
+            print(f"Total Area for dft_top: {self.area} um^2")
+        else:
+            print("Area information not found in the report.")
+        print("------------------------------------------------------------")
+        if self.total_power is not None:
+            print(f"Total Internal Power: {self.internal_power} mW")
+            print(f"Total Switching Power: {self.switching_power} mW")
+            print(f"Total Leakage Power: {self.leakage_power} mW")
+            print(f"Total Power: {self.total_power} mW")
+        else:
+            print("Power information not found in the report.")
+        print("------------------------------------------------------------")
+        for error in self.errors:
+            print(error)
+
+def read_ppa(project_dir):
+    """
+    Reads the setup, hold, area and power reports of a project's Place-and-Route run.
+
+    Each report is read in a single pass, from its .gz file if the tool compressed it.
+    Reports that are missing or unreadable leave their fields None and are listed in
+    the result's errors.
+
+    Args:
+        project_dir (str): The project (`fftgen`) directory.
+
+    Returns:
+        PPAResult: The results of the run.
+    """
+    result = PPAResult()
+    try:
+        result.setup = scan_timing_report(os.path.join(project_dir, PAR_SETUP_REPORT))
+    except OSError as e:
+        result.errors.append(f"Failed to read the setup timing report. Reason: {e}")
+    try:
+        result.hold = scan_timing_report(os.path.join(project_dir, PAR_HOLD_REPORT))
+    except OSError as e:
+        result.errors.append(f"Failed to read the hold time report. Reason: {e}")
+    try:
+        result.area = read_area_report(os.path.join(project_dir, PAR_AREA_REPORT))
+    except OSError as e:
+        result.errors.append(f"Failed to read the area report. Reason: {e}")
+    try:
+        power = read_power_report(os.path.join(project_dir, PAR_POWER_REPORT))
+        result.internal_power, result.switching_power = power["internal"], power["switching"]
+        result.leakage_power, result.total_power = power["leakage"], power["total"]
+    except OSError as e:
+        result.errors.append(f"Failed to read the power report. Reason: {e}")
+    return result
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+#
+# Local stand-ins for the external services and tools used by fftgen.py.
+#
+# The SPIRAL generator is replaced by a small HTTP server that mimics the
+# gen.php / gen2.php / download flow of pmilder.ece.stonybrook.edu/dftgen, so
+# the generation client can be exercised and benchmarked without network
+# access and without loading the real server.
+#
+# The EDA tools are replaced by a fake Hammer CAD repository whose
+# module_top.mk runs this script as a stand-in for Genus and Innovus: it
+# sleeps for a configurable runtime while printing Hammer sub-steps and
+# converging WNS estimates, then writes synthetic reports in the
+# formats fftgen.py reads, with slack following the constrained clock period.
+
+import os
+import re
+import sys
+import gzip
+import time
+import json
+import random
+import hashlib
+import argparse
+import threading
+import subprocess
+import socketserver
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+def synthetic_verilog(params, target_bytes=64 * 1024):
+    """
+    Builds a deterministic, SPIRAL-like Verilog file for a set of generator parameters.
+
+    The file contains a `dft_top` module instantiating butterfly, twiddle ROM and
+    memory modules, padded with additional stage modules to roughly target_bytes.
+
+    Args:
+        params (dict): The SPIRAL generator parameters.
+        target_bytes (int, optional): The approximate size of the file. Default is 64 KiB.
+
+    Returns:
+        str: The Verilog source.
+    """
+    width = int(params.get("idWidth", 16))
+    width = 32 if width == 1 else width
+    stream_width = int(params.get("idStreamWidth", 2))
+    n = int(params.get("idN", 64))
+    tag = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+    ports = ",\n".join(f"  input [{width - 1}:0] X{i},\n  output [{width - 1}:0] Y{i}" for i in range(stream_width))
+    parts = [
+        f"// Synthetic SPIRAL stand-in output {tag}\n",
+        f"// Parameters: {json.dumps(params, sort_keys=True, default=str)}\n",
+        f"module dft_top(\n  input clk,\n  input reset,\n  input next,\n  output next_out,\n{ports}\n);\n",
+        "".join(f"  stage0 s{i}(.clk(clk), .reset(reset));\n  rom{tag} r{i}(clk, , );\n  mem{tag} m{i}(clk, , , , , );\n"
+                for i in range(max(1, stream_width // 2))),
+        "endmodule\n\n",
+        f"module rom{tag}(clk, addr, dout);\n  input clk;\n  input [{max(1, (n - 1).bit_length()) - 1}:0] addr;\n"
+        f"  output reg [{width - 1}:0] dout;\n  always @(posedge clk) begin\n    case(addr)\n",
+    ]
+    parts += [f"      {i}: dout <= {width}'d{(i * 2654435761) % (1 << width)};\n" for i in range(min(n, 64))]
+    parts += [
+        "      default: dout <= 0;\n    endcase\n  end\nendmodule\n\n",
+        f"module mem{tag}(clk, wen, waddr, raddr, din, dout);\n  input clk, wen;\n"
+        f"  input [{(n - 1).bit_length() - 1}:0] waddr, raddr;\n  input [{2 * width - 1}:0] din;\n"
+        f"  output reg [{2 * width - 1}:0] dout;\n  reg [{2 * width - 1}:0] ram [{n - 1}:0];\n"
+        "  always @(posedge clk) begin\n    if (wen) ram[waddr] <= din;\n    dout <= ram[raddr];\n  end\nendmodule\n\n",
+    ]
+
+    size = sum(len(part) for part in parts)
+    stage = 0
+    while size < target_bytes or stage == 0:
+        body = (
+            f"module stage{stage}(clk, reset);\n  input clk, reset;\n"
+            f"  reg [{width - 1}:0] a{stage}, b{stage}, t{stage};\n"
+            f"  wire [{2 * width - 1}:0] p{stage};\n"
+            f"  assign p{stage} = a{stage} * t{stage};\n"
+            f"  always @(posedge clk) begin\n    a{stage} <= a{stage} + b{stage};\n"
+            f"    b{stage} <= a{stage} - b{stage};\n  end\nendmodule\n\n"
+        )
+        parts.append(body)
+        size += len(body)
+        stage += 1
+    return "".join(parts)
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class FakeSpiralServer:
+    """
+    A local HTTP stand-in for the SPIRAL DFT generator.
+
+    gen.php answers with a results iframe that only points at gen2.php once the
+    configured generation delay has passed since the first request for a parameter
+    set, gen2.php links to the download, and the download serves synthetic Verilog.
+    Request counts are kept per endpoint for assertions and benchmarks.
+
+    Args:
+        generation_delay (float, optional): Seconds before a parameter set is "generated".
+        verilog_bytes (int, optional): The approximate size of the served Verilog files.
+        latency (float, optional): Seconds added to every response.
+        truncated_downloads (int, optional): The number of downloads to cut short (sending
+                                             the full Content-Length but only half the
+                                             body), to exercise download retries.
+        port (int, optional): The port to listen on. Default is 0 (any free port).
+    """
+
+    def __init__(self, generation_delay=0.0, verilog_bytes=64 * 1024, latency=0.0, truncated_downloads=0, port=0):
+        self.generation_delay = generation_delay
+        self.verilog_bytes = verilog_bytes
+        self.latency = latency
+        self.truncated_downloads = truncated_downloads
+        self.requests = {"gen.php": 0, "gen2.php": 0, "download.php": 0}
+        self._started = {}
+        self._params = {}
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer(("127.0.0.1", port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """The URL of the generator directory, to pass as fftgen's base_url."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}/dftgen/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                query = dict(urllib.parse.parse_qsl(url.query))
+                endpoint = url.path.rsplit("/", 1)[-1]
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if endpoint == "gen.php":
+                    body = server._gen_page(query)
+                    content_type = "text/html"
+                elif endpoint == "gen2.php":
+                    body = f'<html><body><a href="download.php?id={query.get("id", "")}">Download Verilog</a></body></html>'
+                    content_type = "text/html"
+                elif endpoint == "download.php" and query.get("id") in server._params:
+                    body = synthetic_verilog(server._params[query["id"]], server.verilog_bytes)
+                    content_type = "text/plain"
+                else:
+                    self.send_error(404)
+                    return
+
+                with server._lock:
+                    server.requests[endpoint] += 1
+                    truncate = endpoint == "download.php" and server.truncated_downloads > 0
+                    if truncate:
+                        server.truncated_downloads -= 1
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data[:len(data) // 2] if truncate else data)
+
+        return Handler
+
+    def _gen_page(self, query):
+        key = hashlib.sha256(json.dumps(query, sort_keys=True).encode()).hexdigest()[:16]
+        with self._lock:
+            self._params.setdefault(key, query)
+            started = self._started.setdefault(key, time.time())
+        if time.time() - started >= self.generation_delay:
+            src = f"gen2.php?id={key}"
+        else:
+            src = "wait.html"
+        return f'<html><body><iframe id="resframe" src="{src}"></iframe></body></html>'
+
+STD_CELLS = ["nand2_1", "nor2_1", "xor2_1", "xnor2_1", "inv_1", "a21oi_1", "o21ai_0", "mux2_1", "fa_1", "maj3_1"]
+HIER_PREFIXES = ["bfly{0}/mult", "bfly{0}/add", "twiddle_rom{0}", "perm{0}/mem", "stage{0}/codeBlock"]
+
+def _timing_path(index, slack, period, style, check, rng):
+    """Formats one path of a Genus ('genus', ps) or Innovus ('innovus', ns) timing report."""
+    scale, unit, fmt = (1000, "ps", "{:.0f}") if style == "genus" else (1, "ns", "{:.3f}")
+    status = "MET" if slack >= 0 else "VIOLATED"
+    start = HIER_PREFIXES[rng.randrange(len(HIER_PREFIXES))].format(rng.randrange(8))
+    end = HIER_PREFIXES[rng.randrange(len(HIER_PREFIXES))].format(rng.randrange(8))
+    start_pin = f"{start}/q_reg_{rng.randrange(32)}_"
+    end_pin = f"{end}/q_reg_{rng.randrange(32)}_"
+    depth = rng.randint(3, 18)
+    arrival = max(0.0, period - 0.185 - slack) if check == "Setup" else 0.05 + slack
+
+    lines = [
+        f"Path {index}: {status} ({fmt.format(slack * scale)} {unit}) {check} Check with Pin {end_pin}/CK->D",
+        "          Group: clk",
+        f"     Startpoint: (R) {start_pin}/CK",
+        "          Clock: (R) clk",
+        f"       Endpoint: (F) {end_pin}/D",
+        "          Clock: (R) clk",
+        "",
+        f"     Required Time:= {fmt.format((arrival + slack) * scale):>9}",
+        f"      Launch Clock:- {fmt.format(0):>9}",
+        f"         Data Path:- {fmt.format(arrival * scale):>9}",
+        f"             Slack:= {fmt.format(slack * scale):>9}",
+        "",
+        "#" + "-" * 100,
+        "#  Timing Point                                Flags  Arc     Edge  Cell                          Fanout  Delay  Arrival",
+        "#" + "-" * 100,
+        f"  {start_pin + '/CK':<44} -      -       R     (arrival)                          {8:>2} {fmt.format(0):>6} {fmt.format(0):>8}",
+        f"  {start_pin + '/Q':<44} -      CK->Q   F     sky130_fd_sc_hd__dfxtp_1           {2:>2} "
+        f"{fmt.format(0.3 * scale):>6} {fmt.format(0.3 * scale):>8}",
+    ]
+    t = 0.3
+    step = max(0.0, arrival - 0.3) / depth
+    for i in range(depth):
+        t += step
+        cell = STD_CELLS[rng.randrange(len(STD_CELLS))]
+        lines.append(f"  {f'{start}/g{rng.randrange(100000)}/Y':<44} -      A->Y    {'RF'[i % 2]}     "
+                     f"sky130_fd_sc_hd__{cell:<16} {rng.randint(1, 4):>2} {fmt.format(step * scale):>6} "
+                     f"{fmt.format(t * scale):>8}")
+    lines.append(f"  {end_pin + '/D':<44} <<<    -       F     sky130_fd_sc_hd__dfxtp_1           {1:>2} "
+                 f"{fmt.format(0):>6} {fmt.format(arrival * scale):>8}")
+    lines.append("#" + "-" * 100)
+    lines.append("")
+    return "\n".join(lines) + "\n"
+
+def write_timing_report(path, slack, period, style="genus", check="Setup", paths=20, seed=0):
+    """
+    Writes a synthetic timing report with the worst path first.
+
+    Args:
+        path (str): The report path. Paths ending in .gz are written gzip-compressed.
+        slack (float): The worst (Path 1) slack in ns.
+        period (float): The constrained clock period in ns.
+        style (str, optional): 'genus' (slack in ps) or 'innovus' (slack in ns). Default is 'genus'.
+        check (str, optional): 'Setup' or 'Hold'. Default is 'Setup'.
+        paths (int, optional): The number of paths to report. Default is 20.
+        seed (int, optional): The seed for the path contents. Default is 0.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'wt') as f:
+        tool = "Genus(TM) Synthesis Solution" if style == "genus" else "Innovus(TM) Implementation System"
+        f.write(f"{'=' * 60}\n  Generated by: {tool} (fftgen stand-in)\n  Design: dft_top\n{'=' * 60}\n\n")
+        path_slack = slack
+        for index in range(1, paths + 1):
+            f.write(_timing_path(index, round(path_slack, 4), period, style, check, rng))
+            path_slack += rng.uniform(0.0, 0.01)
+
+def timing_report_paths(megabytes, period=3.0, style="genus", check="Setup"):
+    """Returns the number of paths that makes a synthetic timing report about megabytes large, uncompressed."""
+    sample = _timing_path(1, -0.01, period, style, check, random.Random(0))
+    return max(1, int(megabytes * 1024 * 1024 / len(sample)))
+
+def write_par_reports(project_dir, setup_slack, hold_slack, period, area, paths=20, seed=0):
+    """
+    Writes the reports of a Place-and-Route run: gzip-compressed setup and hold timing
+    reports, and the area and power reports, in the formats fftgen_reports reads.
+
+    Args:
+        project_dir (str): The project (`fftgen`) directory.
+        setup_slack (float): The worst setup slack in ns.
+        hold_slack (float): The worst hold slack in ns.
+        period (float): The constrained clock period in ns.
+        area (float): The total area in um^2. Power is derived from it and the period.
+        paths (int, optional): The number of paths per timing report. Default is 20.
+        seed (int, optional): The seed for the path contents. Default is 0.
+
+    Returns:
+        str: The par-rundir directory the reports were written to.
+    """
+    par_dir = os.path.join(project_dir, "build", "par-rundir")
+    reports_dir = os.path.join(par_dir, "timingReports")
+    write_timing_report(os.path.join(reports_dir, "dft_top_postRoute_all.tarpt.gz"), setup_slack, period,
+                        "innovus", "Setup", paths, seed)
+    write_timing_report(os.path.join(reports_dir, "dft_top_postRoute_all_hold.tarpt.gz"), hold_slack,
+                        period, "innovus", "Hold", paths, seed + 1)
+
+    with open(os.path.join(par_dir, "dft_top_area.rpt"), 'w') as f:
+        f.write("Hinst Name                 Module Name       Inst Count     Total Area\n")
+        f.write("-" * 72 + "\n")
+        f.write(f"dft_top                    {int(area / 8):>10}     {area:>12.3f}\n")
+        f.write(f"  s0                       stage0            {int(area / 16):>10}     {area / 2:>12.3f}\n")
+    internal, switching, leakage = area * 1e-5 / period, area * 1.2e-5 / period, area * 1e-7
+    total = internal + switching + leakage
+    with open(os.path.join(par_dir, "dft_top_power.rpt"), 'w') as f:
+        f.write("Total Power\n" + "-" * 72 + "\n")
+        f.write(f"Total Internal Power:   {internal:>12.8f}   {100 * internal / total:>8.4f}%\n")
+        f.write(f"Total Switching Power:  {switching:>12.8f}   {100 * switching / total:>8.4f}%\n")
+        f.write(f"Total Leakage Power:    {leakage:>12.8f}   {100 * leakage / total:>8.4f}%\n")
+        f.write(f"Total Power:            {total:>12.8f}\n")
+    return par_dir
+
+def _constrained_period(project_dir):
+    with open(os.path.join(project_dir, "cfg", "constraints.tcl")) as f:
+        return float(re.search(r"-period\s+(\S+)", f.read()).group(1))
+
+def _design_factor(project_dir):
+    """A deterministic per-design factor in [0, 1) taken from the Verilog source."""
+    digest = hashlib.sha256()
+    with open(os.path.join(project_dir, "v", "spiral.v"), 'rb') as f:
+        digest.update(f.read(1024 * 1024))
+    return int(digest.hexdigest()[:8], 16) / 16 ** 8
+
+def _design_scale(project_dir):
+    """
+    Scales the area and critical path of a design with its SPIRAL parameters, read from
+    the Verilog header: area grows with the stream width, bit width and transform size,
+    the critical path with the bit width.
+
+    Returns:
+        tuple: The area scale and the critical path scale, both 1.0 for unknown designs.
+    """
+    with open(os.path.join(project_dir, "v", "spiral.v")) as f:
+        header = f.read(4096)
+    match = re.search(r"^// Parameters: (.*)$", header, re.MULTILINE)
+    if not match:
+        return 1.0, 1.0
+    params = json.loads(match.group(1))
+    width = int(params.get("idWidth", 16))
+    width = 32 if width == 1 else width
+    n = int(params.get("idN", 64))
+    area_scale = int(params.get("idStreamWidth", 2)) / 2 * width / 16 * (1 + 0.1 * (n.bit_length() - 7))
+    return max(0.1, area_scale), 0.75 + width / 64
+
+# The Hammer sub-steps the stand-in tools go through, and whether each prints a WNS estimate
+FAKE_SYN_STEPS = [("init_environment", False), ("syn_generic", True), ("syn_map", True), ("syn_opt", True),
+                  ("generate_reports", False), ("write_outputs", False)]
+FAKE_PAR_STEPS = [("init_design", False), ("floorplan_design", False), ("place_opt_design", True),
+                  ("clock_tree", True), ("route_design", True), ("opt_design", True), ("write_design", False)]
+
+def _log_progress(steps, seconds, slack, critical_path, style):
+    """
+    Prints Hammer sub-step lines over a run's runtime, with WNS estimates that start
+    pessimistic and converge on the final slack, like Genus and Innovus do while optimizing.
+    """
+    tool = "synthesis" if style == "genus" else "par"
+    estimating = [name for name, estimates in steps if estimates]
+    for name, estimates in steps:
+        print(f"[{tool}] Running sub-step '{name}'", flush=True)
+        time.sleep(seconds / len(steps))
+        if estimates:
+            remaining = 1 - (estimating.index(name) + 1) / len(estimating)
+            wns = min(0.0, slack - 0.3 * critical_path * remaining)
+            if style == "genus":
+                print(f"Info: {name}: WNS = {round(wns * 1000)} ps", flush=True)
+            else:
+                print(f"|     WNS (ns):| {wns:7.3f} |", flush=True)
+
+def _achieved_critical_path(critical_path, period, config, seed):
+    """
+    The critical path a run achieves at a clock period: the tools recover config['effort']
+    of the shortfall when the period is tighter than the design's critical path, and
+    results jitter by up to +/- config['slack_noise'] ns, deterministically per run.
+    """
+    shortfall = max(0.0, critical_path - period)
+    jitter = random.Random(seed).uniform(-1, 1) * config["slack_noise"]
+    return critical_path - config["effort"] * shortfall + jitter
+
+def run_fake_tool(stage, config, project_dir="."):
+    """
+    Stands in for one Hammer make target, writing the reports fftgen.py reads.
+
+    The design's critical path is config['critical_path'] ns scaled by up to
+    config['design_spread'] per design, and a further config['par_penalty'] after
+    Place-and-Route, so the slack of every run follows the constrained clock period. Area
+    and critical path also scale with the design's parameters (see _design_scale()). The
+    slack curve bends and jitters with config['effort'] and config['slack_noise'] (see
+    _achieved_critical_path()). A run fails with
+    probability config['failure_rate'], like a tool that lost its license or ran out
+    of memory.
+
+    Args:
+        stage (str): 'syn' or 'par'.
+        config (dict): The fake tool settings (see create_fake_hammer()).
+        project_dir (str, optional): The project (`fftgen`) directory. Default is '.'.
+
+    Returns:
+        int: The tool's exit status, 0 on success.
+    """
+    build_dir = os.path.join(project_dir, "build")
+    period = _constrained_period(project_dir)
+    factor = _design_factor(project_dir)
+    area_scale, path_scale = _design_scale(project_dir)
+    critical_path = config["critical_path"] * path_scale * (1 + config["design_spread"] * factor)
+    seed = int(factor * 1e6) + int(period * 1000)
+    if random.random() < config["failure_rate"]:
+        print(f"Stand-in {'Genus' if stage == 'syn' else 'Innovus'}: injected failure", flush=True)
+        return 1
+
+    syn_report = os.path.join(build_dir, "syn-rundir", "reports", "final_time_ss_100C_1v60.setup_view.rpt")
+    if stage == "syn" or not os.path.exists(syn_report):
+        slack = period - _achieved_critical_path(critical_path, period, config, seed)
+        _log_progress(FAKE_SYN_STEPS, config["syn_seconds"], slack, critical_path, "genus")
+        write_timing_report(syn_report, slack, period, "genus", "Setup", config["report_paths"], seed)
+        syn_area = 0.9 * config["area"] * area_scale * (1 + config["design_spread"] * factor)
+        with open(os.path.join(os.path.dirname(syn_report), "final_area.rpt"), 'w') as f:
+            f.write("  Instance   Module   Cell Count   Cell Area   Net Area   Total Area\n")
+            f.write("-" * 72 + "\n")
+            f.write(f"dft_top              {int(syn_area / 8):>10}  {syn_area:>12.3f}      0.000  {syn_area:>12.3f}\n")
+        print(f"Stand-in Genus: wrote {syn_report}", flush=True)
+    if stage == "syn":
+        return 0
+
+    slack = period - _achieved_critical_path(critical_path * (1 + config["par_penalty"]), period, config, seed + 1)
+    _log_progress(FAKE_PAR_STEPS, config["par_seconds"], slack, critical_path, "innovus")
+    area = config["area"] * area_scale * (1 + config["design_spread"] * factor)
+    par_dir = write_par_reports(project_dir, slack, 0.02 + 0.05 * factor, period, area, config["report_paths"], seed)
+    print(f"Stand-in Innovus: wrote reports to {par_dir}", flush=True)
+    return 0
+
+FAKE_TOOL_DEFAULTS = {
+    "syn_seconds": 0.5,
+    "par_seconds": 1.0,
+    "critical_path": 2.0,
+    "design_spread": 0.5,
+    "par_penalty": 0.1,
+    "area": 250000.0,
+    "report_paths": 20,
+    "failure_rate": 0.0,
+    "effort": 0.0,
+    "slack_noise": 0.0,
+}
+
+def create_fake_hammer(path, **settings):
+    """
+    Creates a git repository standing in for ee477-hammer-cad.
+
+    The repository's Makefile builds nothing, and its module_top.mk implements the
+    syn, redo-syn, par, redo-par and clean-build targets by running this script's
+    fake tool. Point fftgen at it with the FFTGEN_HAMMER_URL environment variable or
+    setup_project()'s hammer_url argument.
+
+    Args:
+        path (str): Where to create the repository.
+        **settings: Overrides for FAKE_TOOL_DEFAULTS (syn_seconds, par_seconds,
+                    critical_path, design_spread, par_penalty, area, report_paths,
+                    failure_rate, effort, slack_noise).
+
+    Returns:
+        str: The absolute path of the repository.
+    """
+    path = os.path.abspath(path)
+    config = dict(FAKE_TOOL_DEFAULTS)
+    config.update(settings)
+    os.makedirs(path, exist_ok=True)
+
+    with open(os.path.join(path, "fake_tool.json"), 'w') as f:
+        json.dump(config, f, indent=2)
+    with open(os.path.join(path, "Makefile"), 'w') as f:
+        f.write("# Stand-in for the Hammer CAD build; there is nothing to build\nall:\n\t@touch .built\n")
+    tool = f"{sys.executable} {os.path.abspath(__file__)} tool --config {os.path.join(path, 'fake_tool.json')}"
+    with open(os.path.join(path, "module_top.mk"), 'w') as f:
+        f.write(f"""# Stand-in for the Hammer CAD module_top.mk
+OBJ_DIR ?= build
+FAKE_TOOL = {tool}
+
+syn redo-syn:
+\t$(FAKE_TOOL) syn
+
+par redo-par:
+\t$(FAKE_TOOL) par
+
+clean-build:
+\trm -rf $(OBJ_DIR)
+
+.PHONY: syn redo-syn par redo-par clean-build
+""")
+
+    git = ["git", "-c", "user.name=fftgen", "-c", "user.email=fftgen@localhost"]
+    subprocess.run(git + ["init", "-q", path], check=True)
+    subprocess.run(git + ["-C", path, "add", "-A"], check=True)
+    subprocess.run(git + ["-C", path, "commit", "-q", "-m", "Fake Hammer CAD"], check=True)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local stand-ins for the SPIRAL generator and EDA tools.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    spiral_parser = subparsers.add_parser("spiral", help="Serve a stand-in for the SPIRAL DFT generator.")
+    spiral_parser.add_argument("--port", type=int, default=8000)
+    spiral_parser.add_argument("--generation-delay", type=float, default=2.0)
+    spiral_parser.add_argument("--verilog-bytes", type=int, default=64 * 1024)
+
+    hammer_parser = subparsers.add_parser("hammer", help="Create a stand-in Hammer CAD repository.")
+    hammer_parser.add_argument("path")
+    for key, value in FAKE_TOOL_DEFAULTS.items():
+        hammer_parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+
+    tool_parser = subparsers.add_parser("tool", help="Run the stand-in tool for one make target.")
+    tool_parser.add_argument("stage", choices=["syn", "par"])
+    tool_parser.add_argument("--config", required=True)
+
+    args = parser.parse_args()
+
+    if args.command == "hammer":
+        settings = {key: getattr(args, key) for key in FAKE_TOOL_DEFAULTS}
+        print(f"Created a stand-in Hammer CAD repository at {create_fake_hammer(args.path, **settings)}")
+    elif args.command == "tool":
+        with open(args.config) as f:
+            config = dict(FAKE_TOOL_DEFAULTS, **json.load(f))
+        sys.exit(run_fake_tool(args.stage, config))
+    elif args.command == "spiral":
+        server = FakeSpiralServer(args.generation_delay, args.verilog_bytes, port=args.port).start()
+        print(f"Serving a SPIRAL stand-in at {server.base_url} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.stop()
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
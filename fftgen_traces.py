@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+#
+# Golden trace files for the RTL simulation of a SPIRAL FFT core.
+#
+# tb.yml wires bsg_fsb_node_trace_replay into the simulation, which replays
+# trace files of one command per line: a 4-bit opcode, then the payload as
+# binary digits ('_' is ignored). This module writes two such files for the
+# configured core. fft_input.tr sends the core's inputs, one line per clock
+# cycle. fft_expected.tr receives the outputs the core should produce, and
+# the replay node compares each one exactly. A cycle carries idStreamWidth
+# words: the real and imaginary parts of idStreamWidth / 2 consecutive
+# samples, in natural order, X0 (the first real part) in the least
+# significant bits. A frame of an N-point transform takes 2N / idStreamWidth
+# lines, and the testbench pulses `next` before every frame.
+#
+# The expected outputs come from the bit-accurate model in fftgen_model, so
+# they follow its rounding mode. Frames are generated in vectorized batches
+# and written as they are formatted, so memory stays bounded even for
+# thousands of 32K-point frames.
+#
+# Usage: python3 fftgen_traces.py <output dir> [--frames F] [--seed S] PARAM=VALUE...
+
+import os
+import sys
+import json
+import argparse
+import numpy as np
+
+import fftgen_model
+
+# The opcodes of bsg_fsb_node_trace_replay
+TRACE_OPS = {"wait": 0, "send": 1, "receive": 2, "done": 3, "finish": 4}
+
+INPUT_TRACE = "fft_input.tr"
+EXPECTED_TRACE = "fft_expected.tr"
+TRACE_META = "traces.json"
+
+# The most words formatted at once, to bound memory (formatting takes about 130 bytes per word)
+MAX_CHUNK_WORDS = 1 << 20
+
+def to_words(values, model):
+    """
+    Converts complex values to the words on the core's ports.
+
+    Args:
+        values (numpy.ndarray): Complex values of shape (frames, N): integer-valued for
+                                fixed point (see fftgen_model.FFTModel.quantize()), single
+                                precision for floating point.
+        model (fftgen_model.FFTModel): The core's model.
+
+    Returns:
+        numpy.ndarray: uint64 words of shape (frames, 2N), real and imaginary parts
+                       interleaved, as two's complement or IEEE single-precision bits.
+    """
+    frames = values.shape[0]
+    if model.floating:
+        parts = np.asarray(values, dtype=np.complex64).view(np.float32).view(np.uint32)
+        return parts.astype(np.uint64).reshape(frames, -1)
+    parts = np.empty((frames, 2 * model.n), dtype=np.int64)
+    parts[:, 0::2] = values.real
+    parts[:, 1::2] = values.imag
+    return (parts & ((1 << model.width) - 1)).astype(np.uint64)
+
+def format_lines(op, words, stream_width, width):
+    """
+    Formats words as trace lines, one per clock cycle, without any per-line Python work.
+
+    Args:
+        op (str): The opcode, a key of TRACE_OPS.
+        words (numpy.ndarray): The uint64 words, in the order they enter or leave the core.
+        stream_width (int): The number of words per cycle.
+        width (int): The bits per word.
+
+    Returns:
+        bytes: The lines, e.g. '0001_<payload>' followed by a newline.
+    """
+    cycles = np.ascontiguousarray(words.reshape(-1, stream_width)[:, ::-1], dtype=">u8")
+    bits = np.unpackbits(cycles.view(np.uint8).reshape(len(cycles), stream_width, 8), axis=2)
+    bits = bits[:, :, 64 - width:].reshape(len(cycles), -1)
+    lines = np.empty((len(cycles), 5 + bits.shape[1] + 1), dtype=np.uint8)
+    lines[:, :4] = np.frombuffer(format(TRACE_OPS[op], "04b").encode(), dtype=np.uint8)
+    lines[:, 4] = ord("_")
+    lines[:, 5:-1] = bits + ord("0")
+    lines[:, -1] = ord("\n")
+    return lines.tobytes()
+
+def _command(op, payload_bits):
+    return f"{TRACE_OPS[op]:04b}_{'0' * payload_bits}\n"
+
+def write_traces(params, output_dir, frames=8, kind="uniform", amplitude=None, seed=0, rounding="round"):
+    """
+    Writes the input and expected-output trace files of a core, and their description.
+
+    Args:
+        params (dict): The SPIRAL parameters.
+        output_dir (str): The directory to write fft_input.tr, fft_expected.tr and traces.json to.
+        frames (int, optional): The number of transforms. Default is 8.
+        kind (str, optional): The kind of random inputs, see fftgen_model.random_inputs().
+                              Default is 'uniform'.
+        amplitude (float, optional): The input amplitude. Default is
+                                     fftgen_model.default_amplitude().
+        seed (int, optional): The random seed. Default is 0.
+        rounding (str, optional): The model's rounding mode. Default is 'round'.
+
+    Returns:
+        dict: The description written to traces.json: the trace paths, the parameters,
+              frames, lines per frame, payload bits, seed and the number of modelled
+              overflows (which should be 0 for meaningful traces).
+    """
+    model = fftgen_model.FFTModel(params, rounding=rounding)
+    stream_width = int(params["idStreamWidth"])
+    amplitude = fftgen_model.default_amplitude(params) if amplitude is None else amplitude
+    rng = np.random.default_rng(seed)
+    payload_bits = stream_width * model.width
+    chunk = max(1, MAX_CHUNK_WORDS // (2 * model.n))
+    os.makedirs(output_dir, exist_ok=True)
+    input_path = os.path.join(output_dir, INPUT_TRACE)
+    expected_path = os.path.join(output_dir, EXPECTED_TRACE)
+
+    overflows = 0
+    with open(input_path, 'wb') as inputs, open(expected_path, 'wb') as expected:
+        header = (f"# {frames} frame(s) of {point_description(params)}, seed {seed}\n"
+                  f"# One line per cycle: {stream_width} x {model.width}-bit words, X0 in the low bits\n")
+        inputs.write(header.encode())
+        expected.write(header.encode())
+        for first in range(0, frames, chunk):
+            count = min(chunk, frames - first)
+            x = model.quantize(fftgen_model.random_inputs(model.n, count, kind, amplitude, rng))
+            y, frame_overflows = model.transform(x)
+            overflows += int(frame_overflows.sum())
+            if model.floating:
+                y = y.astype(np.complex64)
+            else:
+                y = y * 2.0 ** (model.width - 1)
+            inputs.write(format_lines("send", to_words(x, model), stream_width, model.width))
+            expected.write(format_lines("receive", to_words(y, model), stream_width, model.width))
+        inputs.write(_command("done", payload_bits).encode())
+        expected.write((_command("done", payload_bits) + _command("finish", payload_bits)).encode())
+
+    meta = {"input": input_path, "expected": expected_path, "params": params, "frames": frames,
+            "lines_per_frame": 2 * model.n // stream_width, "payload_bits": payload_bits, "seed": seed,
+            "rounding": rounding, "overflows": overflows}
+    with open(os.path.join(output_dir, TRACE_META), 'w') as f:
+        json.dump(meta, f, indent=2, default=str)
+    return meta
+
+def point_description(params):
+    """Returns a short description of a core, e.g. '1024-point forward radix-4 16-bit scaled FFT'."""
+    direction = "inverse" if str(params.get("idInverse", '0')) == '1' else "forward"
+    if str(params.get("idDataType", '0')) == '1':
+        arithmetic = "floating-point"
+    else:
+        arithmetic = f"{params['idWidth']}-bit {'scaled' if str(params.get('idScale', '1')) == '1' else 'unscaled'}"
+    return f"{params['idN']}-point {direction} radix-{params['idRadix']} {arithmetic} FFT"
+
+def main():
+    parser = argparse.ArgumentParser(description="Write golden RTL simulation traces for a SPIRAL FFT core.")
+    parser.add_argument("output_dir", help="The directory to write the traces to.")
+    parser.add_argument("--frames", type=int, default=8, help="The number of transforms (default: %(default)s).")
+    parser.add_argument("--kind", choices=fftgen_model.INPUT_KINDS, default="uniform",
+                        help="The kind of random inputs (default: %(default)s).")
+    parser.add_argument("--amplitude", type=float, default=None,
+                        help="The input amplitude as a fraction of full scale (default: 0.5, or 0.5/N unscaled).")
+    parser.add_argument("--seed", type=int, default=0, help="The random seed (default: %(default)s).")
+    parser.add_argument("--rounding", choices=["round", "truncate"], default="round",
+                        help="The rounding mode of the model (default: %(default)s).")
+    parser.add_argument("params", nargs="+", metavar="PARAM=VALUE",
+                        help="SPIRAL parameters, e.g. idN=1024 idRadix=4 idStreamWidth=4 idWidth=16")
+    args = parser.parse_args()
+    params = {"idN": 64, "idRadix": 2, "idStreamWidth": 2, "idDataType": '0', "idWidth": 16, "idScale": '1',
+              "idInverse": '0'}
+    for item in args.params:
+        key, _, value = item.partition("=")
+        params[key] = value
+    meta = write_traces(params, args.output_dir, args.frames, args.kind, args.amplitude, args.seed, args.rounding)
+    print(f"Wrote {meta['frames']} frame(s) of {meta['lines_per_frame']} lines to {meta['input']} and "
+          f"{meta['expected']}")
+    if meta["overflows"]:
+        print(f"Warning: the model overflowed {meta['overflows']} time(s); lower --amplitude.")
+
+if __name__ == "__main__":
+    sys.exit(main())
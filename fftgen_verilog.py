@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+#
+# Streaming Verilog analyzer for fftgen.py.
+#
+# SPIRAL writes a whole FFT core as one flat Verilog file, which reaches
+# hundreds of megabytes for the largest 32K-point cores. This module reads the
+# file through a read-only memory map, one line at a time, and keeps only
+# per-module aggregates, so memory use is bounded by the number of distinct
+# modules and declarations rather than by the size of the file. It collects the
+# module hierarchy, register bits, multiplier and adder counts, memory and ROM
+# depths and widths, and line and byte counts, and flattens them over the
+# instance tree under the top module. Parameterized modules (e.g. a memory with
+# depth and width parameters) are evaluated per instance. Comments, both // and
+# /* */, are skipped, and operators are only counted on the right-hand side of
+# continuous and procedural assignments, so conditions, parameter expressions
+# and ranges add no multipliers or adders.
+#
+# The statistics give a rough SKY130 area estimate, used to size the floorplan
+# and to reject oversized configurations before synthesis.
+#
+# Usage: python3 fftgen_verilog.py <verilog file> [--json]
+
+import re
+import ast
+import sys
+import json
+import math
+import mmap
+import argparse
+
+# Rough SKY130 HD areas in um^2, for estimate_area()
+FLOP_AREA = 20.0         # One D flip-flop (sky130_fd_sc_hd__dfxtp_1)
+ADDER_BIT_AREA = 25.0    # One full adder bit
+MULTIPLIER_BIT_AREA = 22.0  # Per partial product bit of an array multiplier
+MEMORY_BIT_AREA = 18.0   # One bit of a memory built from latches and muxes
+ROM_BIT_AREA = 2.0       # One bit of a case-statement ROM, after logic minimization
+
+# The version of the analysis, stored with cached statistics; bump it when the counts change
+STATS_VERSION = 2
+
+# The placement utilization the floorplan is sized for, and the smallest die side in um
+FLOORPLAN_UTILIZATION = 0.6
+MIN_FLOORPLAN_SIDE = 700
+
+VERILOG_KEYWORDS = {
+    "module", "endmodule", "input", "output", "inout", "wire", "reg", "assign", "always", "initial", "begin", "end",
+    "if", "else", "case", "casez", "casex", "endcase", "default", "for", "parameter", "localparam", "integer",
+    "genvar", "generate", "endgenerate", "function", "endfunction", "task", "endtask", "posedge", "negedge", "or",
+    "and", "not", "signed", "defparam", "supply0", "supply1", "tri", "wand", "wor",
+}
+
+MODULE = re.compile(rb"^\s*module\s+(\w+)")
+PARAMETER = re.compile(r"\b(?:parameter|localparam)\b\s*(?:integer\s*)?(?:\[[^\]]*\]\s*)?(.*)$")
+REG_DECL = re.compile(r"^\s*(?:output\s+)?reg\b\s*(?:signed\s*)?(\[[^\]]+\])?\s*(.*)$")
+RANGE = re.compile(r"\[\s*([^:\]]+?)\s*:\s*([^\]]+?)\s*\]")
+INSTANCE_MODULE = re.compile(rb"^(\w+)\s*")
+INSTANCE_NAME = re.compile(rb"\s*(\w+)\s*\(")
+CASE_ITEM = re.compile(rb"^\s*(?:\d+'[sS]?[bBoOdDhH])?[0-9a-fA-FxXzZ_]+\s*:\s*(\w+)")
+SIZED_LITERAL = re.compile(r"\d*'[sS]?([bBoOdDhH])([0-9a-fA-F_]+)")
+BRACKETS = re.compile(rb"\[[^\]]*\]")
+COMMENT_START = re.compile(rb"//|/\*")
+WORD = re.compile(rb"\w+")
+DELIMITERS = re.compile(r"[()\[\],]")
+DECLARED_NAME = re.compile(r"(\w+)\s*(\[.*\])?")
+OPERATOR = re.compile(rb"[*+-]")
+BINARY_ADD = re.compile(rb"[\w)}]\s*[+-]")  # A + or - after an operand, not a unary sign
+
+# The left-hand side of an assignment, up to its '=' or '<='. A continuous assignment is an
+# 'assign' or a net declaration with a value; a procedural assignment may follow 'else',
+# 'begin' or a case item label.
+CONTINUOUS_ASSIGNMENT = re.compile(rb"^(?:assign|wire)\b[^=;]*?(?<![<>=!])=(?!=)")
+PROCEDURAL_ASSIGNMENT = re.compile(rb"^(?:else\b\s*)?(?:begin\b\s*)?(?:[\w']+\s*:\s*)?"
+                                   rb"(?:\{[^}]*\}|[\w.]+(?:\s*\[[^\]]*\])*)\s*<?=(?!=)")
+# 'always' or 'initial' and its event control, e.g. 'always @(posedge clk)'
+PROCEDURAL_BLOCK = re.compile(rb"^(?:always|initial)\b\s*(?:@\s*(?:\*|\([^)]*\)|\w+)\s*)?")
+
+# Module items that end the procedural code of an 'always' or 'initial' block without 'begin'
+MODULE_ITEMS = {b"assign", b"wire", b"reg", b"input", b"output", b"inout", b"parameter", b"localparam",
+                b"function", b"task", b"generate", b"endgenerate", b"genvar", b"defparam"}
+
+# Longer declarations or assignments are cut off, so a missing ';' cannot make a statement swallow the file
+MAX_STATEMENT_BYTES = 1 << 16
+
+def _literal(match):
+    base = {"b": 2, "o": 8, "d": 10, "h": 16}[match.group(1).lower()]
+    return str(int(match.group(2).replace("_", ""), base))
+
+_OPERATORS = {ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b, ast.Mult: lambda a, b: a * b,
+              ast.Div: lambda a, b: a // b, ast.FloorDiv: lambda a, b: a // b, ast.Mod: lambda a, b: a % b,
+              ast.LShift: lambda a, b: a << b, ast.RShift: lambda a, b: a >> b}
+
+def evaluate(expression, params):
+    """
+    Evaluates a constant Verilog expression, such as a range bound 'width-1'.
+
+    Args:
+        expression (str): The expression, with integers, sized literals, parameter
+                          names, parentheses and + - * / % << >>.
+        params (dict): Parameter values by name.
+
+    Returns:
+        int: The value, or None if the expression is not a constant this evaluator handles.
+    """
+    def walk(node):
+        if isinstance(node, ast.Expression):
+            return walk(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, int):
+            return node.value
+        if type(node).__name__ == "Num":  # Python < 3.8
+            return node.n
+        if isinstance(node, ast.Name):
+            value = params.get(node.id)
+            if value is None:
+                raise ValueError(node.id)
+            return value
+        if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+            return _OPERATORS[type(node.op)](walk(node.left), walk(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -walk(node.operand)
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "_clog2" and len(node.args) == 1:
+            return max(0, (walk(node.args[0]) - 1).bit_length())
+        raise ValueError(ast.dump(node))
+    try:
+        text = SIZED_LITERAL.sub(_literal, expression.strip()).replace("$clog2", "_clog2")
+        return walk(ast.parse(text, mode="eval"))
+    except (ValueError, SyntaxError, ZeroDivisionError, TypeError):
+        return None
+
+def _range_size(match, params):
+    high, low = evaluate(match.group(1), params), evaluate(match.group(2), params)
+    return None if high is None or low is None else abs(high - low) + 1
+
+class ModuleStats:
+    """
+    The statistics of one module, counting only what it declares itself.
+
+    Register and memory widths are kept as unevaluated range expressions with their
+    counts, so that parameterized modules can be evaluated per instance.
+
+    Attributes:
+        name (str): The module name.
+        params (list): (name, default expression) of its parameters, in declaration order.
+        registers (dict): The number of scalar reg bits declared per range expression
+                          ('' for 1-bit registers).
+        memories (dict): (width range, depth range) -> the number of memory arrays.
+        roms (list): (depth, width range) of each case-statement ROM.
+        reg_ranges (dict): The range expression of each reg, while the module is being read.
+        multipliers (int): The number of multiplications.
+        adders (int): The number of additions and subtractions.
+        instances (dict): (module, parameter overrides) -> the number of instances.
+        lines (int): The number of lines of the module.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.params = []
+        self.registers = {}
+        self.reg_ranges = {}
+        self.memories = {}
+        self.roms = []
+        self.multipliers = 0
+        self.adders = 0
+        self.instances = {}
+        self.lines = 0
+
+    def param_values(self, overrides=()):
+        """Returns the module's parameter values, with positional or named overrides applied."""
+        values, named = {}, {}
+        positional = [value for value in overrides if "=" not in value]
+        for value in overrides:
+            if "=" in value:
+                key, _, expression = value.partition("=")
+                named[key] = expression
+        for i, (name, default) in enumerate(self.params):
+            expression = named.get(name, positional[i] if i < len(positional) else default)
+            values[name] = evaluate(expression, values)
+        return values
+
+class VerilogStats:
+    """
+    The statistics of a Verilog file, flattened over the instance tree under its top module.
+
+    Attributes:
+        path (str): The Verilog file.
+        lines (int): The number of lines.
+        bytes (int): The file size in bytes.
+        modules (dict): ModuleStats by module name.
+        top (str): The top module: 'dft_top' if present, else the last module no other
+                   module instantiates.
+        register_bits (int): The register bits of the whole design.
+        multipliers (int): The multiplications of the whole design.
+        adders (int): The additions and subtractions of the whole design.
+        memories (list): One dict (module, depth, width, instances) per distinct memory.
+        roms (list): One dict (module, depth, width, instances) per distinct ROM.
+        instance_counts (dict): The number of instances of every module under the top.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lines = 0
+        self.bytes = 0
+        self.modules = {}
+        self.top = None
+        self.register_bits = 0
+        self.multipliers = 0
+        self.adders = 0
+        self.memories = []
+        self.roms = []
+        self.instance_counts = {}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds statistics from their as_dict(), e.g. a cached analysis.
+
+        Of the modules, only the hierarchy is restored, without parameter overrides.
+
+        Raises:
+            KeyError: If a field is missing.
+        """
+        stats = cls(data["path"])
+        for key in ("lines", "bytes", "top", "register_bits", "multipliers", "adders", "memories", "roms",
+                    "instance_counts"):
+            setattr(stats, key, data[key])
+        for name, children in data["hierarchy"].items():
+            module = stats.modules[name] = ModuleStats(name)
+            module.instances = {(child, ()): count for child, count in children.items()}
+        return stats
+
+    @property
+    def memory_bits(self):
+        return sum(m["depth"] * m["width"] * m["instances"] for m in self.memories)
+
+    @property
+    def rom_bits(self):
+        return sum(r["depth"] * r["width"] * r["instances"] for r in self.roms)
+
+    @property
+    def data_width(self):
+        """The widest register or memory word of the design, a proxy for its data path width."""
+        widths = [m["width"] for m in self.memories] + [r["width"] for r in self.roms]
+        return max(widths) if widths else 0
+
+    def hierarchy(self):
+        """Returns the distinct child modules of every module, with their instance counts."""
+        tree = {}
+        for name, module in self.modules.items():
+            children = {}
+            for (child, _), count in module.instances.items():
+                children[child] = children.get(child, 0) + count
+            tree[name] = children
+        return tree
+
+    def estimate_area(self):
+        """
+        Returns a rough SKY130 standard-cell area estimate in um^2.
+
+        Multipliers are taken as data_width x data_width arrays and adders as data_width
+        bits, so the estimate is only meant to rank configurations and to catch
+        designs that are orders of magnitude too large.
+        """
+        width = self.data_width or 16
+        return (self.register_bits * FLOP_AREA + self.adders * width * ADDER_BIT_AREA
+                + self.multipliers * width * width * MULTIPLIER_BIT_AREA
+                + self.memory_bits * MEMORY_BIT_AREA + self.rom_bits * ROM_BIT_AREA)
+
+    def floorplan_side(self):
+        """Returns the side in um of a square die that fits the estimated area at FLOORPLAN_UTILIZATION."""
+        side = math.sqrt(self.estimate_area() / FLOORPLAN_UTILIZATION)
+        return max(MIN_FLOORPLAN_SIDE, int(math.ceil(side / 10.0)) * 10)
+
+    def as_dict(self):
+        return {"path": self.path, "lines": self.lines, "bytes": self.bytes, "modules": len(self.modules),
+                "top": self.top, "register_bits": self.register_bits, "multipliers": self.multipliers,
+                "adders": self.adders, "memories": self.memories, "roms": self.roms, "memory_bits": self.memory_bits,
+                "rom_bits": self.rom_bits, "data_width": self.data_width,
+                "estimated_area": round(self.estimate_area(), 1), "floorplan_side": self.floorplan_side(),
+                "instance_counts": self.instance_counts, "hierarchy": self.hierarchy()}
+
+    def display(self):
+        """Prints a summary of the statistics."""
+        print(f"Verilog: {self.lines} lines, {self.bytes} bytes, {len(self.modules)} modules, top module {self.top}")
+        print(f"Registers: {self.register_bits} bits; multipliers: {self.multipliers}; adders: {self.adders}")
+        for kind, items in (("Memory", self.memories), ("ROM", self.roms)):
+            for item in items:
+                print(f"{kind} in {item['module']}: {item['depth']} x {item['width']} bits, "
+                      f"{item['instances']} instance(s)")
+        print(f"Estimated area: {self.estimate_area():.0f} um^2; floorplan {self.floorplan_side()} um square")
+
+def _declared_names(text):
+    """Splits the names part of a declaration, e.g. 'a, b [0:7], c = 0', into (name, array range text)."""
+    for name in _split_top_level(text, "([", ")]"):
+        name = name.split("=")[0].strip()
+        if name:
+            match = DECLARED_NAME.match(name)
+            if match:
+                yield match.group(1), match.group(2)
+
+def _parse_statement(module, statement):
+    """Records a complete parameter or reg declaration of a module."""
+    match = PARAMETER.search(statement)
+    if match:
+        for item in _split_top_level(match.group(1).rstrip(";")):
+            name, _, value = item.partition("=")
+            if value and re.match(r"^\s*\w+\s*$", name):
+                module.params.append((name.strip(), value.strip().rstrip(")")))
+        return
+    match = REG_DECL.match(statement)
+    if not match:
+        return
+    width_range = match.group(1) or ""
+    for name, array in _declared_names(match.group(2).rstrip(";")):
+        module.reg_ranges[name] = width_range
+        if array:
+            key = (width_range, array)
+            module.memories[key] = module.memories.get(key, 0) + 1
+        else:
+            module.registers[width_range] = module.registers.get(width_range, 0) + 1
+
+def _split_top_level(text, opening="(", closing=")"):
+    """Splits text at the commas outside the given brackets, in one pass over its delimiters."""
+    if not any(char in text for char in opening):
+        items = text.split(",")
+        return [item.strip() for item in items if item.strip()]
+    items, depth, start = [], 0, 0
+    for match in DELIMITERS.finditer(text):
+        char = match.group()
+        if char in opening:
+            depth += 1
+        elif char in closing:
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(text[start:match.start()])
+            start = match.end()
+    items.append(text[start:])
+    return [item.strip() for item in items if item.strip()]
+
+def _strip_comments(line, in_comment):
+    """
+    Removes // and /* */ comments from a line.
+
+    Args:
+        line (bytes): The line.
+        in_comment (bool): Whether the line starts inside a /* */ comment.
+
+    Returns:
+        tuple: The code of the line, and whether a /* */ comment continues past it.
+    """
+    parts, position = [], 0
+    while position < len(line):
+        if in_comment:
+            end = line.find(b"*/", position)
+            if end < 0:
+                break
+            position, in_comment = end + 2, False
+            continue
+        match = COMMENT_START.search(line, position)
+        if not match:
+            parts.append(line[position:])
+            break
+        parts.append(line[position:match.start()])
+        if match.group() == b"//":
+            break
+        position, in_comment = match.end(), True
+    return b" ".join(parts), in_comment
+
+def _count_operators(module, statements, assignment):
+    """
+    Counts the arithmetic operators on the right-hand side of assignments, ignoring ranges and indices.
+
+    Args:
+        module (ModuleStats): The module to add the counts to.
+        statements (bytes): One or more statements, separated by ';'.
+        assignment (re.Pattern): Matches the left-hand side of the assignments to count;
+                                 statements it does not match are not counted.
+    """
+    if not OPERATOR.search(statements):
+        return
+    for statement in statements.rstrip(b";").split(b";"):
+        statement = statement.strip()
+        match = assignment.match(statement)
+        if match:
+            expression = statement[match.end():]
+            if b"[" in expression:
+                expression = BRACKETS.sub(b"", expression)
+            module.multipliers += expression.count(b"*")
+            module.adders += len(BINARY_ADD.findall(expression))
+
+def _finish_statement(module, assignment, parts):
+    """Records a complete declaration (assignment None) or assignment, collected as a list of lines."""
+    statement = b" ".join(parts)
+    if assignment is None:
+        _parse_statement(module, statement.decode(errors="replace"))
+    else:
+        _count_operators(module, statement, assignment)
+
+def _parse_instance(line):
+    """
+    Parses the start of a module instantiation, e.g. 'memMod #(1024, 32, 10) mem0(...'.
+
+    Returns:
+        tuple: The module name and its parameter overrides ('value' or 'name=value'),
+               or None if the line does not start an instantiation.
+    """
+    match = INSTANCE_MODULE.match(line)
+    if not match or match.group(1).decode() in VERILOG_KEYWORDS:
+        return None
+    position, overrides = match.end(), ()
+    if line[position:position + 1] == b"#":
+        start = line.find(b"(", position)
+        depth, end = 0, start
+        while start >= 0 and end < len(line):
+            depth += {40: 1, 41: -1}.get(line[end], 0)  # '(' and ')'
+            if depth == 0:
+                break
+            end += 1
+        if start < 0 or depth != 0:
+            return None
+        overrides = tuple(re.sub(r"^\.(\w+)\((.*)\)$", r"\1=\2", value)
+                          for value in _split_top_level(line[start + 1:end].decode().replace(" ", "")))
+        position = end + 1
+    if not INSTANCE_NAME.match(line, position):
+        return None
+    return match.group(1).decode(), overrides
+
+def analyze_verilog(path):
+    """
+    Analyzes a Verilog file in one streaming pass over a read-only memory map.
+
+    Args:
+        path (str): The Verilog file.
+
+    Returns:
+        VerilogStats: The statistics, flattened under the top module.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    stats = VerilogStats(path)
+    with open(path, 'rb') as f:
+        stats.bytes = f.seek(0, 2)
+        if stats.bytes == 0:
+            return stats
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            module, module_start, lines = None, 0, 0
+            in_case, case_items, case_target = False, 0, None
+            in_comment, procedural = False, False
+            # A statement that spans lines: its lines, their size, and the assignment
+            # pattern it is counted with (None for a declaration)
+            statement, statement_size, assignment = None, 0, None
+            for line in iter(mm.readline, b""):
+                lines += 1
+                if in_comment or b"/" in line:
+                    line, in_comment = _strip_comments(line, in_comment)
+                if module is None:
+                    match = MODULE.match(line)
+                    if match:
+                        name = match.group(1).decode()
+                        module = stats.modules.setdefault(name, ModuleStats(name))
+                        module_start, procedural = lines, False
+                    continue
+                stripped = line.strip()
+                if not stripped:
+                    continue
+
+                # Declarations and assignments can span lines; collect them up to their ';'
+                if statement is not None:
+                    statement.append(stripped)
+                    statement_size += len(stripped)
+                    if b";" in stripped or statement_size > MAX_STATEMENT_BYTES:
+                        _finish_statement(module, assignment, statement)
+                        statement = None
+                    continue
+                if stripped.startswith(b"endmodule"):
+                    module.lines += lines - module_start + 1
+                    module.reg_ranges = {}
+                    module = None
+                    continue
+                match = WORD.match(stripped)
+                first = match.group() if match else b""
+                if first in MODULE_ITEMS:
+                    procedural = False
+                    if first in (b"reg", b"parameter", b"localparam") or \
+                            (first == b"output" and re.search(rb"\breg\b", stripped)):
+                        statement, statement_size, assignment = [stripped], len(stripped), None
+                    elif first == b"assign" or (first == b"wire" and b"=" in stripped):
+                        statement, statement_size, assignment = [stripped], len(stripped), CONTINUOUS_ASSIGNMENT
+                    if statement is not None and b";" in stripped:
+                        _finish_statement(module, assignment, statement)
+                        statement = None
+                    continue
+                if first in (b"always", b"initial"):
+                    procedural = True
+                    stripped = stripped[PROCEDURAL_BLOCK.match(stripped).end():]  # The statement after the event control
+                    match = WORD.match(stripped)
+                    first = match.group() if match else b""
+
+                if first in (b"case", b"casez", b"casex"):
+                    in_case, case_items, case_target = True, 0, None
+                    continue
+                if in_case:
+                    if first == b"endcase":
+                        in_case = False
+                        if case_items >= 4 and case_target in module.reg_ranges:
+                            module.roms.append((case_items, module.reg_ranges[case_target]))
+                        continue
+                    match = CASE_ITEM.match(stripped)
+                    if match:
+                        case_items += 1
+                        case_target = case_target or match.group(1).decode()
+
+                if procedural and b"=" in stripped and first != b"for":
+                    if not stripped.endswith(b";") and \
+                            PROCEDURAL_ASSIGNMENT.match(stripped.rpartition(b";")[2].strip()):
+                        statement, statement_size, assignment = [stripped], len(stripped), PROCEDURAL_ASSIGNMENT
+                    else:
+                        _count_operators(module, stripped, PROCEDURAL_ASSIGNMENT)
+                    continue
+                instance = _parse_instance(stripped) if b"(" in stripped else None
+                if instance:
+                    module.instances[instance] = module.instances.get(instance, 0) + 1
+                    procedural = False
+            stats.lines = lines
+            if module is not None:  # A truncated file
+                module.lines += lines - module_start + 1
+
+    _flatten(stats)
+    return stats
+
+def _flatten(stats):
+    """Totals the statistics of every module over the instance tree under the top module."""
+    if not stats.modules:
+        return
+    instantiated = {child for module in stats.modules.values() for child, _ in module.instances}
+    if "dft_top" in stats.modules:
+        stats.top = "dft_top"
+    else:
+        roots = [name for name in stats.modules if name not in instantiated]
+        stats.top = roots[-1] if roots else list(stats.modules)[-1]
+
+    memories, roms, memo = {}, {}, {}
+
+    def visit(name, overrides, multiplicity, stack):
+        module = stats.modules.get(name)
+        if module is None or name in stack:
+            return
+        stats.instance_counts[name] = stats.instance_counts.get(name, 0) + multiplicity
+        key = (name, overrides)
+        if key not in memo:
+            params = module.param_values(overrides)
+            register_bits = 0
+            for width_range, count in module.registers.items():
+                match = RANGE.search(width_range)
+                register_bits += count * ((_range_size(match, params) or 1) if match else 1)
+            local_memories = []
+            for (width_range, array), count in module.memories.items():
+                width_match, depth_match = RANGE.search(width_range), RANGE.search(array)
+                width = (_range_size(width_match, params) or 1) if width_match else 1
+                depth = _range_size(depth_match, params) if depth_match else None
+                if depth:
+                    local_memories.append((depth, width, count))
+            local_roms = []
+            for depth, width_range in module.roms:
+                match = RANGE.search(width_range)
+                local_roms.append((depth, (_range_size(match, params) or 1) if match else 1))
+            memo[key] = (register_bits, local_memories, local_roms)
+        register_bits, local_memories, local_roms = memo[key]
+        stats.register_bits += register_bits * multiplicity
+        stats.multipliers += module.multipliers * multiplicity
+        stats.adders += module.adders * multiplicity
+        for depth, width, count in local_memories:
+            entry = memories.setdefault((name, depth, width), 0)
+            memories[(name, depth, width)] = entry + count * multiplicity
+        for depth, width in local_roms:
+            roms[(name, depth, width)] = roms.get((name, depth, width), 0) + multiplicity
+        for (child, child_overrides), count in module.instances.items():
+            visit(child, child_overrides, multiplicity * count, stack | {name})
+
+    visit(stats.top, (), 1, frozenset())
+    stats.memories = [{"module": m, "depth": d, "width": w, "instances": n} for (m, d, w), n in memories.items()]
+    stats.roms = [{"module": m, "depth": d, "width": w, "instances": n} for (m, d, w), n in roms.items()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the statistics of a SPIRAL Verilog file.")
+    parser.add_argument("verilog", help="The Verilog file.")
+    parser.add_argument("--json", action="store_true", help="Print the statistics as JSON.")
+    args = parser.parse_args()
+    try:
+        stats = analyze_verilog(args.verilog)
+    except OSError as e:
+        print(f"Failed to read {args.verilog}. Reason: {e}")
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(stats.as_dict(), indent=2))
+    else:
+        stats.display()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Shared fixtures for the fftgen tests. The tests run against the local
+# stand-ins in fftgen_standins.py, so they need neither network access nor
+# the EDA tools.
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fftgen
+import fftgen_standins
+
+POINT = {"idN": "64", "idWidth": "16", "idArch": "1", "idRadix": "2", "idStreamWidth": "2"}
+
+@pytest.fixture
+def point():
+    """Returns a copy of a valid SPIRAL parameter set."""
+    return dict(POINT)
+
+@pytest.fixture
+def verilog_file(tmp_path, point):
+    """Writes the stand-in Verilog file of the test point and returns its path."""
+    path = tmp_path / "dft_top.v"
+    path.write_text(fftgen_standins.synthetic_verilog(point, target_bytes=8 * 1024))
+    return str(path)
+
+class FakeStage:
+    """
+    A stand-in for Synthesis and Place-and-Route runs in one project directory, with a
+    setup slack of slack(period) ns. The periods it ran at are kept in runs, and with
+    interrupt_after set, the run after that many raises KeyboardInterrupt.
+    """
+
+    def __init__(self, project_dir):
+        self.project_dir = project_dir
+        self.runs = []
+        self.interrupt_after = None
+        os.makedirs(os.path.join(project_dir, "cfg"), exist_ok=True)
+
+    @staticmethod
+    def slack(period):
+        return round(period - 2.0, 4)  # A 2 ns critical path
+
+    def run_stage(self, new_dir_name, process_type, rerun=False, incremental=None, clock_period=None,
+                  early_abort=None, monitor=None):
+        if self.interrupt_after is not None and len(self.runs) >= self.interrupt_after:
+            raise KeyboardInterrupt
+        period = self.constrained_period(new_dir_name)
+        self.runs.append(period)
+        style = "genus" if process_type == "Synthesis" else "innovus"
+        fftgen_standins.write_timing_report(fftgen.setup_report_path(new_dir_name, process_type),
+                                            self.slack(period), period, style=style, paths=2)
+        fftgen.write_stage_manifest(new_dir_name, process_type, fftgen.stage_inputs(new_dir_name, process_type))
+        return True
+
+    def tune(self, clock_period, process_type="Place-and-Route", **kwargs):
+        fftgen.create_constraints(os.path.join(self.project_dir, "cfg", "constraints.tcl"), clock_period)
+        return fftgen.tune_clock_period(self.project_dir, clock_period, process_type, **kwargs)
+
+    def constrained_period(self, project_dir=None):
+        with open(os.path.join(project_dir or self.project_dir, "cfg", "constraints.tcl")) as f:
+            return float(re.search(r"-period\s+(\S+)", f.read()).group(1))
+
+@pytest.fixture
+def fake_stage(tmp_path, monkeypatch):
+    """Replaces run_stage() with a FakeStage for a project directory under tmp_path."""
+    stage = FakeStage(str(tmp_path / "fftgen"))
+    monkeypatch.setattr(fftgen, "run_stage", stage.run_stage)
+    return stage
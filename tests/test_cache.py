@@ -0,0 +1,91 @@
+import os
+
+import fftgen
+
+def test_cache_miss(tmp_path, point):
+    cache_dir = str(tmp_path / "cache")
+    assert fftgen.lookup_verilog_cache(point, str(tmp_path / "out.v"), cache_dir=cache_dir) is None
+    assert not os.path.exists(tmp_path / "out.v")
+
+def test_cache_hit(tmp_path, point, verilog_file):
+    cache_dir = str(tmp_path / "cache")
+    stored = fftgen.store_verilog_cache(point, verilog_file, cache_dir=cache_dir)
+    destination = str(tmp_path / "out.v")
+    meta = fftgen.lookup_verilog_cache(point, destination, cache_dir=cache_dir)
+    assert meta == stored
+    assert fftgen.file_sha256(destination) == meta["sha256"]
+
+def flip_first_byte(path, keep_mtime):
+    """Flips a bit of a file's first byte, keeping its size and optionally its mtime."""
+    st = os.stat(path)
+    with open(path, 'r+b') as f:
+        first = f.read(1)
+        f.seek(0)
+        f.write(bytes([first[0] ^ 0x01]))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns if keep_mtime else st.st_mtime_ns + 10 ** 9))
+
+def test_cache_hit_does_not_hash(tmp_path, point, verilog_file, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    fftgen.store_verilog_cache(point, verilog_file, cache_dir=cache_dir)
+    def no_hashing(path):
+        raise AssertionError(f"hashed {path}")
+    monkeypatch.setattr(fftgen, "file_sha256", no_hashing)
+    assert fftgen.lookup_verilog_cache(point, str(tmp_path / "out.v"), cache_dir=cache_dir) is not None
+
+def test_cache_corruption_same_size(tmp_path, point, verilog_file):
+    cache_dir = str(tmp_path / "cache")
+    fftgen.store_verilog_cache(point, verilog_file, cache_dir=cache_dir)
+    cached = os.path.join(cache_dir, fftgen.params_cache_key(point) + ".v")
+    flip_first_byte(cached, keep_mtime=False)
+    assert fftgen.lookup_verilog_cache(point, str(tmp_path / "out.v"), cache_dir=cache_dir) is None
+    assert not os.path.exists(cached)
+
+def test_cache_verify_finds_corruption_with_the_same_mtime(tmp_path, point, verilog_file):
+    cache_dir = str(tmp_path / "cache")
+    fftgen.store_verilog_cache(point, verilog_file, cache_dir=cache_dir)
+    cached = os.path.join(cache_dir, fftgen.params_cache_key(point) + ".v")
+    flip_first_byte(cached, keep_mtime=True)
+    # Size and mtime match, so only a verified lookup reads the file
+    assert fftgen.lookup_verilog_cache(point, str(tmp_path / "out.v"), cache_dir=cache_dir) is not None
+    assert fftgen.lookup_verilog_cache(point, str(tmp_path / "out.v"), cache_dir=cache_dir, verify=True) is None
+    assert not os.path.exists(cached)
+
+def test_cache_touched_entry_is_rehashed(tmp_path, point, verilog_file, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    stored = fftgen.store_verilog_cache(point, verilog_file, cache_dir=cache_dir)
+    cached = os.path.join(cache_dir, fftgen.params_cache_key(point) + ".v")
+    os.utime(cached, ns=(stored["mtime_ns"], stored["mtime_ns"] + 10 ** 9))
+    hashed = []
+    file_sha256 = fftgen.file_sha256
+    monkeypatch.setattr(fftgen, "file_sha256", lambda path: hashed.append(path) or file_sha256(path))
+    meta = fftgen.lookup_verilog_cache(point, str(tmp_path / "out.v"), cache_dir=cache_dir)
+    assert meta["mtime_ns"] == stored["mtime_ns"] + 10 ** 9 and hashed == [cached]
+    # The new mtime is recorded, so the next hit is not hashed
+    assert fftgen.lookup_verilog_cache(point, str(tmp_path / "out.v"), cache_dir=cache_dir) == meta
+    assert hashed == [cached]
+
+def test_cache_corruption_truncated(tmp_path, point, verilog_file):
+    cache_dir = str(tmp_path / "cache")
+    fftgen.store_verilog_cache(point, verilog_file, cache_dir=cache_dir)
+    cached = os.path.join(cache_dir, fftgen.params_cache_key(point) + ".v")
+    with open(cached, 'r+b') as f:
+        f.truncate(10)
+    assert fftgen.lookup_verilog_cache(point, str(tmp_path / "out.v"), cache_dir=cache_dir) is None
+
+def test_cache_keyed_by_params(tmp_path, point, verilog_file):
+    cache_dir = str(tmp_path / "cache")
+    fftgen.store_verilog_cache(point, verilog_file, cache_dir=cache_dir)
+    other = dict(point, idN="128")
+    assert fftgen.lookup_verilog_cache(other, str(tmp_path / "out.v"), cache_dir=cache_dir) is None
+
+def test_cache_evicts_least_recently_used(tmp_path, point, verilog_file):
+    cache_dir = str(tmp_path / "cache")
+    points = [dict(point, idN=n) for n in ("64", "128", "256")]
+    for i, p in enumerate(points[:2]):
+        fftgen.store_verilog_cache(p, verilog_file, cache_dir=cache_dir)
+        os.utime(os.path.join(cache_dir, fftgen.params_cache_key(p) + ".json"), (i, i))
+    # A hit on the older entry makes the other one the least recently used
+    assert fftgen.lookup_verilog_cache(points[0], str(tmp_path / "out.v"), cache_dir=cache_dir) is not None
+    fftgen.store_verilog_cache(points[2], verilog_file, cache_dir=cache_dir, max_entries=2)
+    assert [fftgen.lookup_verilog_cache(p, str(tmp_path / "out.v"), cache_dir=cache_dir) is not None
+            for p in points] == [True, False, True]
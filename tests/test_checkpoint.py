@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+import fftgen
+
+def make_project(tmp_path, point, name, **options):
+    project = fftgen.FlowProject(fftgen.normalize_params(point), str(tmp_path / name), 5.0, **options)
+    os.makedirs(project.cfg_dir)
+    return project
+
+def slow_slack(period):
+    return round((period - 2.0) / 2, 4)  # Converges over several probes
+
+@pytest.mark.parametrize("strategy", ["bracket", "ladder"])
+def test_resumed_tuning_matches_uninterrupted(tmp_path, point, fake_stage, strategy):
+    fake_stage.slack = slow_slack
+    reference = make_project(tmp_path, point, "reference", search_strategy=strategy, max_iterations=5)
+    fake_stage.project_dir = reference.project_dir
+    fftgen.synthesis_stage(reference)
+    reference_runs = list(fake_stage.runs)
+    assert len(reference.history) >= 3
+
+    project = make_project(tmp_path, point, "interrupted", search_strategy=strategy, max_iterations=5)
+    fake_stage.project_dir = project.project_dir
+    fake_stage.runs, fake_stage.interrupt_after = [], 2
+    with pytest.raises(KeyboardInterrupt):
+        fftgen.synthesis_stage(project)
+
+    resumed = fftgen.FlowProject.from_checkpoint(project.base_dir)
+    assert resumed.tuning["stage"] == 'Synthesis'
+    assert resumed.tuning["iteration"] == 2
+    assert [entry["period"] for entry in resumed.tuning["history"]] == reference_runs[:2]
+    assert len(resumed.tuning["search"]["probes"]) == 2
+    if strategy == "bracket":
+        assert resumed.tuning["search"]["passing"] is not None
+
+    fake_stage.interrupt_after = None
+    fftgen.synthesis_stage(resumed)
+    assert fake_stage.runs == reference_runs
+    assert resumed.syn_clock_period == reference.syn_clock_period
+    strip = lambda history: [{k: v for k, v in entry.items() if k != "runtime"} for entry in history]
+    assert strip(resumed.history) == strip(reference.history)
+
+def test_restored_search_state(tmp_path):
+    search = fftgen.make_period_search("bracket")
+    search.next_period(4.0, 2000, 'Synthesis', True)
+    search.next_period(1.5, -500, 'Synthesis', False)
+    state = fftgen.period_search_state(search)
+    restored = fftgen.make_period_search("bracket", state)
+    assert (restored.passing, restored.failing, restored.final) == (4.0, 1.5, None)
+    assert restored.probes == search.probes and restored.probes is not search.probes
+    assert restored.next_period(2.5, 100, 'Synthesis', True) == search.next_period(2.5, 100, 'Synthesis', True)
+
+def test_completed_stage_clears_tuning(tmp_path, point, fake_stage):
+    project = make_project(tmp_path, point, "done")
+    fake_stage.project_dir = project.project_dir
+    fftgen.run_flow_stage("synthesis", project)
+    loaded = fftgen.FlowProject.from_checkpoint(project.base_dir)
+    assert loaded.tuning is None
+    assert loaded.completed_stages == ["synthesis"]
+    assert loaded.syn_clock_period == project.syn_clock_period
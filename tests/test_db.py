@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+
+import pytest
+
+import fftgen_db
+
+PARAMS = {"idN": "64", "idRadix": "2", "idStreamWidth": "2", "idWidth": "16", "idArch": "1"}
+
+@pytest.fixture
+def db(tmp_path):
+    return fftgen_db.ResultsDB(str(tmp_path / "results.db"))
+
+def record(db, name, area, status="completed", **params):
+    return db.record(f"key-{name}", name, dict(PARAMS, **params), {"status": status, "area": area})
+
+def test_record_again_keeps_id_and_replaces_children(db):
+    run_id = db.record("key", "n64", PARAMS, {"status": "running"},
+                       iterations=[{"stage": "syn", "iteration": 1, "period": 5.0, "slack": -0.2, "met": 0}],
+                       stages={"synthesis": 10.0}, artifacts={"verilog": "/tmp/a.v", "par_dir": None})
+    other_id = db.record("other", "n128", dict(PARAMS, idN="128"), {"status": "completed"})
+    again = db.record("key", "n64", PARAMS, {"status": "completed", "area": 1000.0},
+                      iterations=[{"stage": "syn", "iteration": 1, "period": 5.0, "slack": -0.2, "met": 0},
+                                  {"stage": "syn", "iteration": 2, "period": 5.5, "slack": 0.1, "met": 1}],
+                      stages={"synthesis": 12.0, "par": 30.0}, artifacts={"verilog": "/tmp/b.v"})
+    assert again == run_id != other_id
+    assert len(db.query()) == 2
+    run = db.run_details(run_id)
+    assert run["status"] == "completed" and run["area"] == 1000.0
+    assert [entry["period"] for entry in run["iterations"]] == [5.0, 5.5]
+    assert run["stages"] == {"synthesis": 12.0, "par": 30.0}
+    assert run["artifacts"] == {"verilog": "/tmp/b.v"}
+    assert run["params"] == PARAMS and run["idN"] == 64
+    assert db.run_details(other_id)["iterations"] == []
+    assert db.run_details(12345) is None
+
+def test_parse_filters():
+    assert fftgen_db.parse_filters(None) == ("", [])
+    where, values = fftgen_db.parse_filters(["idN=64", "area < 1.5e5", "status!=failed"])
+    assert where == " WHERE idN = ? AND area < ? AND status != ?"
+    assert values == [64, 150000.0, "failed"]
+
+@pytest.mark.parametrize("text, message", [("bogus=1", "Unknown column"), ("idN", "Invalid filter"),
+                                           ("idN~64", "Invalid filter"), ("id N=1", "Invalid filter")])
+def test_parse_filters_rejects(text, message):
+    with pytest.raises(ValueError, match=message):
+        fftgen_db.parse_filters([text])
+
+def test_query_filters_order_and_limit(db):
+    record(db, "a", 300.0, idN="64")
+    record(db, "b", 100.0, idN="128")
+    record(db, "c", None, idN="256")
+    record(db, "d", 200.0, status="failed", idN="512")
+    assert [run["name"] for run in db.query()] == ["a", "b", "c", "d"]
+    # Runs without a value sort last either way
+    assert [run["name"] for run in db.query(order_by="area")] == ["b", "d", "a", "c"]
+    assert [run["name"] for run in db.query(order_by="-area")] == ["a", "d", "b", "c"]
+    assert [run["name"] for run in db.query(order_by="area", limit=2)] == ["b", "d"]
+    assert [run["name"] for run in db.query(["status=completed", "idN>=128"])] == ["b", "c"]
+    assert db.query(["idN=128"], columns=["name", "area"]) == [{"name": "b", "area": 100.0}]
+    for kwargs in ({"order_by": "-bogus"}, {"columns": ["name", "bogus"]}, {"filters": ["bogus=1"]}):
+        with pytest.raises(ValueError):
+            db.query(**kwargs)
+
+def test_latest_run(db, monkeypatch):
+    times = iter([100.0, 200.0, 300.0])
+    monkeypatch.setattr(fftgen_db.time, "time", lambda: next(times))
+    record(db, "old", 300.0)
+    record(db, "new", 200.0)
+    record(db, "newest-failed", 100.0, status="failed")
+    assert db.latest_run(PARAMS)["name"] == "new"
+    assert db.latest_run(PARAMS, status="failed")["name"] == "newest-failed"
+    assert db.latest_run(dict(PARAMS, idN="1024")) is None
+
+def test_export_runs(db):
+    record(db, "a", 300.0)
+    record(db, "b", None, idN="128")
+    runs = db.query(columns=["name", "idN", "area"])
+
+    output = io.StringIO()
+    fftgen_db.export_runs(runs, output, "csv")
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert rows == [{"name": "a", "idN": "64", "area": "300.0"}, {"name": "b", "idN": "128", "area": ""}]
+
+    output = io.StringIO()
+    fftgen_db.export_runs(runs, output, "json")
+    assert json.loads(output.getvalue()) == runs
+
+    output = io.StringIO()
+    fftgen_db.export_runs([], output, "csv")
+    assert output.getvalue().strip() == ",".join(fftgen_db.RUN_COLUMNS)
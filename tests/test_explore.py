@@ -0,0 +1,86 @@
+import json
+import os
+
+import pytest
+
+import fftgen
+import fftgen_explore
+import fftgen_reports
+import fftgen_standins
+
+def objectives(area, power, throughput):
+    return {"area": area, "power": power, "throughput": throughput}
+
+def test_dominates():
+    a = objectives(100, 1.0, 2.0)
+    assert fftgen_explore.dominates(a, objectives(200, 1.0, 2.0))
+    assert fftgen_explore.dominates(a, objectives(100, 1.0, 1.0))  # Throughput is maximized
+    assert not fftgen_explore.dominates(a, a)
+    assert not fftgen_explore.dominates(a, objectives(50, 2.0, 2.0))  # A trade-off
+    assert not fftgen_explore.dominates(objectives(200, 1.0, 2.0), a)
+
+def test_pareto_front_and_ranks():
+    points = [objectives(100, 1.0, 1.0),   # Front
+              objectives(200, 2.0, 4.0),   # Front
+              objectives(150, 1.5, 1.0),   # Dominated by 0
+              objectives(300, 3.0, 0.5),   # Dominated by 0 and 2
+              objectives(100, 1.0, 1.0)]   # Equal to 0, so on the front with it
+    assert fftgen_explore.pareto_front(points) == [points[0], points[1], points[4]]
+    assert fftgen_explore.pareto_ranks(points) == [0, 0, 1, 2, 0]
+    named = [{"name": str(i), "objectives": point} for i, point in enumerate(points)]
+    assert [item["name"] for item in fftgen_explore.pareto_front(named, key=lambda item: item["objectives"])] == \
+           ["0", "1", "4"]
+    assert fftgen_explore.pareto_front([]) == [] and fftgen_explore.pareto_ranks([]) == []
+
+def test_par_bound_model():
+    params = {"idN": "64", "idRadix": "2", "idStreamWidth": "2", "idArch": "1"}
+    model = fftgen_explore.PaRBoundModel(margin=0.1, min_samples=2)
+    model.add(1000.0, 2.0, 1100.0, 2.2, 0.6)
+    model.add(1000.0, None, 1100.0, 2.2, 0.6)  # Incomplete results are ignored
+    assert not model.calibrated and model.bound(params, 1000.0, 2.0) is None
+    model.add(1000.0, 2.0, 1200.0, 2.1, 0.5)
+    assert model.calibrated
+    bound = model.bound(params, 2000.0, 4.0)
+    # The most optimistic ratio of each objective, relaxed by the margin
+    assert bound["area"] == pytest.approx(2000.0 * 1.1 * 0.9)
+    assert bound["power"] == pytest.approx(0.5 / (1000.0 / 2.0) * 0.9 * 2000.0 / 4.0)
+    assert bound["throughput"] == pytest.approx(fftgen_explore.throughput(params, 4.0 * 1.05 * 0.9))
+    assert model.bound(params, None, 4.0) is None
+
+# The synthesis area of each explored point by (idStreamWidth, idWidth); every point closes at 2 ns
+SYN_AREAS = {("2", "16"): 100000.0, ("4", "16"): 200000.0, ("2", "24"): 400000.0}
+
+def fake_synthesis(project):
+    project.syn_clock_period = 2.0
+    project.syn_area = SYN_AREAS[(project.params["idStreamWidth"], project.params["idWidth"])]
+    return project.syn_clock_period
+
+def fake_par(project):
+    project.par_clock_period = 2.1
+    fftgen_standins.write_par_reports(project.par_dir, -0.01, 0.02, project.par_clock_period,
+                                      1.1 * project.syn_area, paths=2)
+    project.ppa = fftgen_reports.read_ppa(project.par_dir).as_dict()
+    return project.par_clock_period
+
+def test_dominated_point_skips_par(tmp_path, monkeypatch):
+    monkeypatch.setattr(fftgen, "RESULTS_DB_PATH", str(tmp_path / "results.db"))
+    monkeypatch.setitem(fftgen.FLOW_STAGES, "generate", lambda project: True)
+    monkeypatch.setitem(fftgen.FLOW_STAGES, "setup", lambda project: None)
+    monkeypatch.setitem(fftgen.FLOW_STAGES, "synthesis", fake_synthesis)
+    monkeypatch.setitem(fftgen.FLOW_STAGES, "par", fake_par)
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps({"defaults": {"idN": 64, "idArch": 1},
+                                     "points": [{"idStreamWidth": 2, "idWidth": 16}, {"idStreamWidth": 4, "idWidth": 16},
+                                                {"idStreamWidth": 2, "idWidth": 24}]}))
+
+    summary = fftgen.run_explore(str(spec_path), output_dir=str(tmp_path / "explore"), use_prior=False,
+                                 predict_periods=False, trace_frames=0, initial_clock_period=2.0)
+    points = {(entry["params"]["idStreamWidth"], entry["params"]["idWidth"]): entry for entry in summary["points"]}
+    small, wide, large = points[("2", "16")], points[("4", "16")], points[("2", "24")]
+    # The first two points calibrate the bounds; the third has the throughput of the first at 4 x its area
+    assert small["status"] == wide["status"] == "par"
+    assert large["status"] == "pruned" and large["dominated_by"] in (small["name"], wide["name"])
+    assert summary["front"] == [small["name"], wide["name"]]
+    for entry, ran in ((small, True), (wide, True), (large, False)):
+        point_dirs = [dirs for _, dirs, _ in os.walk(str(tmp_path / "explore" / entry["name"]))]
+        assert any("par-rundir" in dirs for dirs in point_dirs) == ran
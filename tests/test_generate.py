@@ -0,0 +1,121 @@
+import hashlib
+import os
+
+import pytest
+import requests
+
+import fftgen
+import fftgen_standins
+
+class TrackedSession(requests.Session):
+    closed = False
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+@pytest.fixture
+def owned_sessions(monkeypatch):
+    """Records the sessions generate_verilog() creates for itself."""
+    sessions = []
+
+    def create_http_session(pool_size=8):
+        sessions.append(TrackedSession())
+        return sessions[-1]
+    monkeypatch.setattr(fftgen, "create_http_session", create_http_session)
+    return sessions
+
+def test_generate_from_fake_server(tmp_path, point, owned_sessions):
+    with fftgen_standins.FakeSpiralServer(generation_delay=0.2, verilog_bytes=4096) as server:
+        path = fftgen.generate_verilog(point, str(tmp_path / "out.v"), use_cache=False, base_url=server.base_url)
+        assert server.requests["download.php"] == 1
+        assert server.requests["gen.php"] >= 2
+    assert path == str(tmp_path / "out.v")
+    assert "module dft_top" in (tmp_path / "out.v").read_text()
+    assert len(owned_sessions) == 1 and owned_sessions[0].closed
+
+def test_generate_closes_owned_session_on_failure(tmp_path, point, owned_sessions):
+    path = fftgen.generate_verilog(point, str(tmp_path / "out.v"), use_cache=False,
+                                   base_url="http://127.0.0.1:9/dftgen/", request_timeout=1)
+    assert path is None
+    assert len(owned_sessions) == 1 and owned_sessions[0].closed
+
+def test_generate_keeps_given_session_open(tmp_path, point):
+    session = TrackedSession()
+    with fftgen_standins.FakeSpiralServer(verilog_bytes=4096) as server:
+        assert fftgen.generate_verilog(point, str(tmp_path / "out.v"), use_cache=False, session=session,
+                                       base_url=server.base_url)
+    assert not session.closed
+    session.close()
+
+def test_generate_retries_truncated_download(tmp_path, point, monkeypatch):
+    monkeypatch.setattr(fftgen.time, "sleep", lambda seconds: None)
+    with fftgen_standins.FakeSpiralServer(verilog_bytes=4096, truncated_downloads=1) as server:
+        path = fftgen.generate_verilog(point, str(tmp_path / "out.v"), use_cache=False, base_url=server.base_url)
+        assert server.requests["download.php"] == 2
+    assert path and "endmodule" in (tmp_path / "out.v").read_text()
+
+class FakeResponse:
+    """A streamed response serving body in chunks, with the given headers."""
+
+    def __init__(self, body, headers, chunk_size=1000):
+        self.body = body
+        self.headers = headers
+        self.chunk_size = chunk_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, stream=False, timeout=None):
+        return self.response
+
+@pytest.fixture
+def verilog_body(point):
+    return fftgen_standins.synthetic_verilog(point, target_bytes=4096).encode("utf-8")
+
+def download(tmp_path, body, headers):
+    output_path = str(tmp_path / "out.v")
+    return output_path, fftgen.stream_download(FakeSession(FakeResponse(body, headers)), "http://spiral/x", output_path)
+
+def test_stream_download(tmp_path, verilog_body):
+    body = verilog_body + b"\n\n  \n"  # Trailing whitespace in a chunk of its own
+    output_path, (sha256, size) = download(tmp_path, body, {"Content-Length": str(len(body))})
+    assert (sha256, size) == (hashlib.sha256(body).hexdigest(), len(body))
+    assert open(output_path, 'rb').read() == body
+    assert os.listdir(tmp_path) == ["out.v"]
+
+def test_stream_download_rejects_a_content_length_mismatch(tmp_path, verilog_body):
+    with pytest.raises(IOError, match="Incomplete download"):
+        download(tmp_path, verilog_body, {"Content-Length": str(len(verilog_body) + 1)})
+    assert os.listdir(tmp_path) == []  # Neither the output nor the partial file
+
+@pytest.mark.parametrize("marker, cut", [(b"module stage", 20), (b"endmodule", 4)])
+def test_stream_download_rejects_a_truncated_body(tmp_path, verilog_body, marker, cut):
+    # Cut just after the last module began, with the previous endmodule close before the
+    # cut, or inside the last endmodule. A chunked response has no Content-Length to check.
+    body = verilog_body[:verilog_body.rindex(marker) + cut]
+    with pytest.raises(IOError, match="Corrupt download"):
+        download(tmp_path, body, {"Transfer-Encoding": "chunked"})
+    assert os.listdir(tmp_path) == []
+
+def test_ends_with_endmodule(tmp_path):
+    path = tmp_path / "v.v"
+    cases = [("module a;\nendmodule\n", True), ("endmodule", True), ("module a;\nendmodule" + " " * 9000, True),
+             ("module a;\nxendmodule\n", False), ("module a;\nendmodule\n// trailer\n", False), ("", False)]
+    for text, expected in cases:
+        path.write_text(text)
+        assert fftgen.ends_with_endmodule(str(path), block_size=8) == expected, text
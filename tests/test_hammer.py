@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+import fftgen
+
+@pytest.mark.parametrize("commit", ["0123abcd" * 5, "main", "v1.2", "release/1.0", "feature_x-2"])
+def test_valid_hammer_commits(commit):
+    assert fftgen.check_hammer_commit(commit) == commit
+
+@pytest.mark.parametrize("commit", ["", "-upload-pack=evil", "../../etc", "a..b", "ref with space", "main/",
+                                    "/abs", "a//b", "x.lock", "$(rm -rf x)"])
+def test_invalid_hammer_commits(tmp_path, commit):
+    with pytest.raises(ValueError):
+        fftgen.check_hammer_commit(commit)
+    with pytest.raises(ValueError):
+        fftgen.ensure_hammer_cad("https://example.invalid/hammer.git", commit, cache_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+def test_hammer_commit_dir_names():
+    assert fftgen.hammer_commit_dir_name(None) == "head"
+    assert fftgen.hammer_commit_dir_name("main") == "main"
+    slashed = fftgen.hammer_commit_dir_name("release/1.0")
+    assert "/" not in slashed and slashed != fftgen.hammer_commit_dir_name("release-1.0")
+
+def test_project_carries_hammer_commit(tmp_path, point):
+    params = fftgen.normalize_params(point)
+    project = fftgen.FlowProject(params, str(tmp_path), hammer_commit="release/1.0")
+    project.save_checkpoint()
+    assert fftgen.FlowProject.from_checkpoint(str(tmp_path)).hammer_commit == "release/1.0"
+    with pytest.raises(ValueError):
+        fftgen.FlowProject(params, str(tmp_path), hammer_commit="../x")
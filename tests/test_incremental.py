@@ -0,0 +1,155 @@
+import os
+import re
+
+import pytest
+
+import fftgen
+import fftgen_logs
+import fftgen_standins
+
+class FakeTool:
+    """
+    A stand-in for the make targets under run_stage(), writing a setup report with a slack
+    of period - 2 ns at the constrained period. The commands it ran are kept in commands.
+    """
+
+    def __init__(self, project_dir):
+        self.project_dir = project_dir
+        self.commands = []
+        self.reports = {}
+
+    def run_logged(self, command, cwd, log_path, parser=None, policy=None, echo=print):
+        with open(os.path.join(cwd, "cfg", "constraints.tcl")) as f:
+            period = float(re.search(r"-period\s+(\S+)", f.read()).group(1))
+        self.commands.append(" ".join(command))
+        process_type = "Synthesis" if "syn" in command[-1] else "Place-and-Route"
+        report_path = fftgen.setup_report_path(cwd, process_type)
+        fftgen_standins.write_timing_report(report_path, round(period - 2.0, 4), period,
+                                            style="genus" if process_type == "Synthesis" else "innovus", paths=2)
+        with open(report_path) as f:
+            self.reports[(process_type, period)] = f.read()
+        return fftgen_logs.ToolRun(0, None, log_path, parser, 0.0)
+
+    def constrain(self, clock_period):
+        fftgen.create_constraints(os.path.join(self.project_dir, "cfg", "constraints.tcl"), clock_period)
+
+@pytest.fixture
+def fake_tool(tmp_path, monkeypatch):
+    """A project directory under tmp_path whose tool runs go to a FakeTool, constrained at 2.5 ns."""
+    project_dir = tmp_path / "fftgen"
+    (project_dir / "cfg").mkdir(parents=True)
+    (project_dir / "v").mkdir()
+    (project_dir / "v" / "spiral.v").write_text("module dft_top(clk);\n  input clk;\nendmodule\n")
+    for name in ("cfg.yml", "src.yml", "tb.yml"):
+        (project_dir / "cfg" / name).write_text(f"# {name}\n")
+    (project_dir / "Makefile").write_text("TOP_DIR = /nonexistent\n")
+    tool = FakeTool(str(project_dir))
+    tool.constrain(2.5)
+    monkeypatch.setattr(fftgen.fftgen_logs, "run_logged", tool.run_logged)
+    return tool
+
+def test_unchanged_inputs_skip_the_stage(fake_tool, capsys):
+    project_dir = fake_tool.project_dir
+    inputs = fftgen.stage_inputs(project_dir, "Synthesis")
+    assert not fftgen.stage_is_current(project_dir, "Synthesis", inputs)
+    assert fftgen.run_stage(project_dir, "Synthesis", incremental=True)
+    assert fftgen.stage_inputs(project_dir, "Synthesis") == inputs
+    assert fftgen.stage_is_current(project_dir, "Synthesis", inputs)
+
+    capsys.readouterr()
+    assert fftgen.run_stage(project_dir, "Synthesis", rerun=True, incremental=True)
+    assert fake_tool.commands == ["make syn"]
+    assert "inputs are unchanged" in capsys.readouterr().out
+
+    # Without incremental runs, the tool always runs
+    assert fftgen.run_stage(project_dir, "Synthesis", rerun=True, incremental=False)
+    assert fake_tool.commands == ["make syn", "make redo-syn"]
+
+@pytest.mark.parametrize("change", ["period", "constraints", "cfg", "verilog"])
+def test_changed_inputs_rerun_the_stage(fake_tool, change):
+    project_dir = fake_tool.project_dir
+    assert fftgen.run_stage(project_dir, "Synthesis", incremental=True)
+    before = fftgen.stage_inputs(project_dir, "Synthesis")
+    if change == "period":
+        fake_tool.constrain(3.0)
+    elif change == "constraints":
+        with open(os.path.join(project_dir, "cfg", "constraints.tcl"), 'a') as f:
+            f.write("set_input_delay 0.1 -clock clk [all_inputs]\n")
+    elif change == "cfg":
+        with open(os.path.join(project_dir, "cfg", "cfg.yml"), 'a') as f:
+            f.write("vlsi.core.max_threads: 8\n")
+    else:
+        with open(os.path.join(project_dir, "v", "spiral.v"), 'a') as f:
+            f.write("// regenerated\n")
+    after = fftgen.stage_inputs(project_dir, "Synthesis")
+    assert after["hash"] != before["hash"]
+    assert not fftgen.stage_is_current(project_dir, "Synthesis", after)
+    assert fftgen.find_stage_report(project_dir, "Synthesis", after) is None
+
+    assert fftgen.run_stage(project_dir, "Synthesis", rerun=True, incremental=True)
+    assert fake_tool.commands == ["make syn", "make redo-syn"]
+    assert fftgen.stage_is_current(project_dir, "Synthesis", after)
+
+def test_par_inputs_follow_synthesis(fake_tool):
+    project_dir = fake_tool.project_dir
+    assert fftgen.run_stage(project_dir, "Synthesis", incremental=True)
+    assert fftgen.run_stage(project_dir, "Place-and-Route", incremental=True)
+    # A new synthesis run at another period reruns Place-and-Route at the old one
+    fake_tool.constrain(3.0)
+    assert fftgen.run_stage(project_dir, "Synthesis", rerun=True, incremental=True)
+    fake_tool.constrain(2.5)
+    inputs = fftgen.stage_inputs(project_dir, "Place-and-Route")
+    assert fftgen.find_stage_report(project_dir, "Place-and-Route", inputs) is None
+    assert fftgen.run_stage(project_dir, "Place-and-Route", rerun=True, incremental=True)
+    assert fake_tool.commands == ["make syn", "make par", "make redo-syn", "make redo-par"]
+
+def test_archived_report_matches_the_inputs(fake_tool):
+    project_dir = fake_tool.project_dir
+    report_path = fftgen.setup_report_path(project_dir, "Synthesis")
+    assert fftgen.run_stage(project_dir, "Synthesis", incremental=True)
+    first = fftgen.stage_inputs(project_dir, "Synthesis")
+    fake_tool.constrain(3.0)
+    assert fftgen.run_stage(project_dir, "Synthesis", rerun=True, incremental=True)
+    second = fftgen.stage_inputs(project_dir, "Synthesis")
+
+    # The build directory holds the 3 ns run; the 2.5 ns report comes from the archive
+    fake_tool.constrain(2.5)
+    assert fftgen.stage_inputs(project_dir, "Synthesis") == first
+    assert not fftgen.stage_is_current(project_dir, "Synthesis", first)
+    assert fftgen.stage_is_current(project_dir, "Synthesis", second)
+    archived = fftgen.find_stage_report(project_dir, "Synthesis", first)
+    assert archived == fftgen.stage_archive_path(project_dir, "Synthesis", first)
+    with open(archived) as f:
+        assert f.read() == fake_tool.reports[("Synthesis", 2.5)]
+    assert fftgen.find_stage_report(project_dir, "Synthesis", second) == report_path
+
+    assert fftgen.run_stage(project_dir, "Synthesis", rerun=True, incremental=True)
+    assert fake_tool.commands == ["make syn", "make redo-syn"]
+    # The reused report is not copied into the build directory
+    with open(report_path) as f:
+        assert f.read() == fake_tool.reports[("Synthesis", 3.0)]
+
+def test_archive_evicts_the_oldest(fake_tool):
+    project_dir = fake_tool.project_dir
+    runs = []
+    for i, period in enumerate((2.5, 3.0, 3.5)):
+        fake_tool.constrain(period)
+        assert fftgen.run_stage(project_dir, "Synthesis", rerun=i > 0, incremental=True)
+        inputs = fftgen.stage_inputs(project_dir, "Synthesis")
+        fftgen.archive_stage_report(project_dir, "Synthesis", inputs, max_entries=2)
+        runs.append(inputs)
+        os.utime(fftgen.stage_archive_path(project_dir, "Synthesis", inputs), (i, i))
+    assert [os.path.exists(fftgen.stage_archive_path(project_dir, "Synthesis", inputs))
+            for inputs in runs] == [False, True, True]
+    assert fftgen.find_stage_report(project_dir, "Synthesis", runs[0]) is None
+
+def test_par_retune_uses_redo_par(fake_tool):
+    project_dir = fake_tool.project_dir
+    assert fftgen.run_stage(project_dir, "Synthesis", incremental=True)
+    fake_tool.constrain(1.5)
+    history = []
+    period = fftgen.run_par(project_dir, 1.5, max_iterations=10, history=history)
+    assert period > 2.0 and len(history) > 1
+    par_commands = fake_tool.commands[1:]
+    assert par_commands[0] == "make par" and set(par_commands[1:]) == {"make redo-par"}
+    assert not any("clean" in command for command in fake_tool.commands)
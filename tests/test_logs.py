@@ -0,0 +1,100 @@
+import gzip
+import os
+import time
+
+import pytest
+
+import fftgen_logs
+import fftgen_standins
+
+def feed(parser, *lines):
+    return [parser.feed(line) for line in lines]
+
+def test_parser_reads_genus_and_innovus_estimates():
+    parser = fftgen_logs.ToolLogParser("Synthesis")
+    progress = feed(parser, "[synthesis] Running sub-step 'syn_map'", "Info: syn_map: WNS = -123 ps", "nothing here")
+    assert progress == ["sub-step syn_map", "WNS -0.123 ns in syn_map", None]
+    assert parser.step == "syn_map" and parser.wns == pytest.approx(-0.123)
+
+    parser = fftgen_logs.ToolLogParser("Place-and-Route")
+    feed(parser, "|     WNS (ns):| -0.160 |")
+    assert parser.wns == pytest.approx(-0.16) and parser.estimates == [(None, pytest.approx(-0.16))]
+    assert parser.lines == 1
+
+@pytest.mark.parametrize("process_type, line, wns", [
+    ("Synthesis", "WNS: -250", -0.25),          # Genus reports in ps
+    ("Place-and-Route", "WNS: -0.25", -0.25),   # Innovus reports in ns
+    ("Synthesis", "WNS = -0.5 ns", -0.5),       # An explicit unit wins
+    ("Place-and-Route", "WNS (ps): -40", -0.04),
+])
+def test_parser_default_unit(process_type, line, wns):
+    parser = fftgen_logs.ToolLogParser(process_type)
+    parser.feed(line)
+    assert parser.wns == pytest.approx(wns)
+
+def test_policy_patience():
+    policy = fftgen_logs.EarlyAbortPolicy(2.0, patience=2)
+    assert policy.threshold == fftgen_logs.HOPELESS_SLACK
+    assert fftgen_logs.EarlyAbortPolicy(8.0).threshold == -2.0
+    parser = fftgen_logs.ToolLogParser()
+    feed(parser, "Running sub-step 'syn_map'", "WNS = -1500 ps")
+    assert policy.check(parser) is None  # One hopeless estimate is not enough
+    feed(parser, "WNS = -500 ps")
+    assert policy.check(parser) is None  # The last two are not both hopeless
+    feed(parser, "Running sub-step 'syn_opt'", "WNS = -1200 ps")
+    assert policy.check(parser) is None
+    feed(parser, "WNS = -1100 ps")
+    assert "past -1.000 ns for 2 estimates" in policy.check(parser)
+
+def test_policy_ignores_untrusted_steps():
+    policy = fftgen_logs.EarlyAbortPolicy(2.0, patience=2)
+    parser = fftgen_logs.ToolLogParser()
+    feed(parser, "WNS = -5000 ps", "Running sub-step 'syn_generic'", "WNS = -4000 ps", "WNS = -3000 ps")
+    assert policy.check(parser) is None
+    feed(parser, "Running sub-step 'syn_map'", "WNS = -2000 ps")
+    assert policy.check(parser) is None  # The previous estimate came from syn_generic
+    feed(parser, "WNS = -1900 ps")
+    assert policy.check(parser) is not None
+
+def fake_project(tmp_path, **settings):
+    """
+    A project directory and the command that runs the fake Genus on it. The command is a
+    shell running make, which does not pass a SIGTERM on to make and the tool under it.
+    """
+    hammer = fftgen_standins.create_fake_hammer(str(tmp_path / "hammer"), **settings)
+    project_dir = tmp_path / "fftgen"
+    (project_dir / "cfg").mkdir(parents=True)
+    (project_dir / "v").mkdir()
+    (project_dir / "cfg" / "constraints.tcl").write_text("create_clock clk -name clk -period 2.0\n")
+    (project_dir / "v" / "spiral.v").write_text("module dft_top(clk);\n  input clk;\nendmodule\n")
+    report = project_dir / "build" / "syn-rundir" / "reports" / "final_time_ss_100C_1v60.setup_view.rpt"
+    command = f"make -s -f {os.path.join(hammer, 'module_top.mk')} syn && echo 'make finished'"
+    return ["sh", "-c", command], str(project_dir), report
+
+def test_run_logged(tmp_path):
+    command, project_dir, report = fake_project(tmp_path, syn_seconds=0.3, critical_path=1.0, design_spread=0.0)
+    echoed = []
+    run = fftgen_logs.run_logged(command, project_dir, str(tmp_path / "syn.log.gz"),
+                                 policy=fftgen_logs.EarlyAbortPolicy(2.0), echo=echoed.append)
+    assert run.returncode == 0 and run.aborted is None
+    assert report.exists()
+    assert [step for step, _ in run.parser.steps] == [step for step, _ in fftgen_standins.FAKE_SYN_STEPS]
+    assert len(echoed) == len(run.parser.steps) + len(run.parser.estimates)
+    with gzip.open(run.log_path, 'rt') as f:
+        assert "Stand-in Genus: wrote" in f.read()
+
+def test_run_logged_kills_the_process_group(tmp_path):
+    syn_seconds = 3.0
+    command, project_dir, report = fake_project(tmp_path, syn_seconds=syn_seconds, critical_path=20.0,
+                                                design_spread=0.0)
+    run = fftgen_logs.run_logged(command, project_dir, str(tmp_path / "syn.log"),
+                                 policy=fftgen_logs.EarlyAbortPolicy(2.0), echo=None)
+    assert run.aborted and run.returncode != 0
+    assert run.seconds < syn_seconds
+    assert [step for step, _ in run.parser.estimates] == ["syn_generic", "syn_map", "syn_opt"]
+    with open(run.log_path) as f:
+        assert "*** fftgen: aborting the run" in f.read()
+    # The fake Genus runs under the shell and make; had only the shell been killed, it would
+    # still write its report
+    time.sleep(syn_seconds - run.seconds + 1.0)
+    assert not report.exists()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import fftgen_model
+
+def params(n, radix, width=24, scale=1, inverse=0):
+    return {"idN": str(n), "idRadix": str(radix), "idDataType": '0', "idWidth": str(width), "idTWidth": str(width),
+            "idScale": str(scale), "idInverse": str(inverse)}
+
+def test_stage_radices():
+    assert fftgen_model.stage_radices(64, 2) == [2] * 6
+    assert fftgen_model.stage_radices(64, 8) == [8, 8]
+    assert fftgen_model.stage_radices(8, 4) == [4, 2]
+    assert fftgen_model.stage_radices(32, 4) == [4, 4, 2]
+
+@pytest.mark.parametrize("n, radix", [(64, 2), (64, 4), (8, 4), (32, 4), (64, 8)])
+@pytest.mark.parametrize("inverse", [0, 1])
+def test_transform_matches_numpy(n, radix, inverse):
+    model = fftgen_model.FFTModel(params(n, radix, width=26, inverse=inverse))
+    x = model.quantize(fftgen_model.random_inputs(n, 4, rng=np.random.default_rng(1)))
+    output, overflows = model.transform(x)
+    fractions = x / 2.0 ** 25
+    expected = np.fft.ifft(fractions, axis=1) if inverse else np.fft.fft(fractions, axis=1) / n
+    assert overflows.shape == (4, model.stages) and not overflows.any()
+    np.testing.assert_allclose(output, expected, atol=1e-5)
+    np.testing.assert_allclose(model.reference(x), expected, atol=1e-12)
+
+def test_scaled_and_unscaled_magnitude():
+    n = 64
+    x = fftgen_model.random_inputs(n, 4, amplitude=0.5 / n, rng=np.random.default_rng(2))
+    scaled = fftgen_model.FFTModel(params(n, 2, scale=1))
+    unscaled = fftgen_model.FFTModel(params(n, 2, scale=0))
+    assert fftgen_model.default_amplitude(params(n, 2, scale=0)) == 0.5 / n
+    scaled_output, _ = scaled.transform(scaled.quantize(x))
+    unscaled_output, overflows = unscaled.transform(unscaled.quantize(x))
+    # The unscaled core grows by N; the scaled one divides by N
+    assert not overflows.any()
+    np.testing.assert_allclose(unscaled_output, np.fft.fft(unscaled.quantize(x) / 2.0 ** 23, axis=1), atol=1e-4)
+    np.testing.assert_allclose(unscaled_output, n * scaled_output, atol=n * 1e-4)
+
+@pytest.mark.parametrize("overflow, expected", [("wrap", -0.5), ("saturate", 127 / 128)])
+def test_overflow(overflow, expected):
+    # 0.75 + 0.75 is 192 / 128, beyond the 8-bit range in the unscaled butterfly
+    model = fftgen_model.FFTModel(params(2, 2, width=8, scale=0), overflow=overflow)
+    output, overflows = model.transform(model.quantize(np.array([[0.75, 0.75]])))
+    assert overflows.tolist() == [[1]]
+    assert output.tolist() == [[expected, 0.0]]
+
+def test_overflow_rate():
+    point = params(64, 2, width=12, scale=0)
+    assert fftgen_model.evaluate_sqnr(point, batch=20)["overflow_rate"] == 0.0
+    for overflow in ("wrap", "saturate"):
+        result = fftgen_model.evaluate_sqnr(point, batch=20, amplitude=0.5, overflow=overflow)
+        assert result["overflow_rate"] == 1.0 and sum(result["overflows_per_stage"]) > 0
+    with pytest.raises(ValueError):
+        fftgen_model.FFTModel(point, overflow="clip")
+
+def test_min_width_stops_at_first_width():
+    point = params(64, 2)
+    width, results = fftgen_model.min_width(point, 40.0, batch=20)
+    assert list(results) == list(range(4, width + 1))
+    assert results[width]["sqnr_db"] >= 40.0
+    assert all(result["sqnr_db"] < 40.0 for w, result in results.items() if w < width)
+    width, results = fftgen_model.min_width(point, 1000.0, widths=range(8, 11), batch=5)
+    assert width is None and list(results) == [8, 9, 10]
@@ -0,0 +1,113 @@
+import gzip
+import json
+import os
+
+import numpy as np
+import pytest
+
+import fftgen_paths
+import fftgen_standins
+
+def path_text(index, slack, unit, check, start, end, arrival, cells):
+    """Formats one timing path in the layout shared by Genus and Innovus reports."""
+    status = "MET" if slack >= 0 else "VIOLATED"
+    lines = [f"Path {index}: {status} ({slack} {unit}) {check} Check with Pin {end}",
+             "          Group: clk",
+             f"     Startpoint: (R) {start}",
+             f"       Endpoint: (F) {end}",
+             "",
+             f"         Data Path:- {arrival:>9}",
+             f"             Slack:= {slack:>9}",
+             "#" + "-" * 60]
+    lines += [f"  {start}/g{i}/Y  -  A->Y  R  sky130_fd_sc_hd__{cell}  1  10  {10 * i}" for i, cell in enumerate(cells)]
+    return "\n".join(lines) + "\n\n"
+
+FLOP = "dfxtp_1"
+
+def write_reports(tmp_path):
+    genus = str(tmp_path / "final_time.setup_view.rpt")
+    with open(genus, 'w') as f:
+        f.write("Generated by: Genus(TM) Synthesis Solution\n\n")
+        f.write(path_text(1, -120, "ps", "Setup", "perm0/mem/q_reg_2_/CK", "bfly3/mult/q_reg_1_/D", 2900,
+                          [FLOP, "nand2_1", "xor2_1", "fa_1", FLOP]))
+        f.write(path_text(2, -40, "ps", "Setup", "twiddle_rom1/q_reg_0_/CK", "bfly3/mult/q_reg_1_/D", 2800,
+                          [FLOP, "nand2_1", FLOP]))
+        f.write(path_text(3, 15, "ps", "Setup", "perm0/mem/q_reg_4_/CK", "twiddle_rom2/q_reg_5_/D", 2700,
+                          [FLOP, "inv_1", FLOP]))
+    setup = str(tmp_path / "dft_top_postRoute_all.tarpt.gz")
+    with gzip.open(setup, 'wt') as f:
+        f.write(path_text(1, -0.080, "ns", "Setup", "bfly0/add/q_reg_7_/CK", "perm1/mem/q_reg_3_/D", 3.0,
+                          [FLOP, "mux2_1", FLOP]))
+    hold = str(tmp_path / "dft_top_postRoute_all_hold.tarpt.gz")
+    with gzip.open(hold, 'wt') as f:
+        f.write(path_text(1, 0.020, "ns", "Hold", "bfly0/add/q_reg_7_/CK", "perm1/mem/q_reg_3_/D", 0.1,
+                          [FLOP, FLOP]))
+    return [genus, setup, hold, str(tmp_path / "missing.tarpt")]
+
+@pytest.fixture
+def table(tmp_path):
+    return fftgen_paths.extract_paths(write_reports(tmp_path), str(tmp_path / "paths"))
+
+def test_hierarchy_group():
+    assert fftgen_paths.hierarchy_group("bfly3/mult/q_reg_12_/D") == "bfly/mult"
+    assert fftgen_paths.hierarchy_group("twiddle_rom1/q_reg_0_/CK") == "twiddle_rom"
+    assert fftgen_paths.hierarchy_group("q_reg_0_/D") == "(top)"
+
+def test_extract_round_trip(tmp_path, table):
+    table_dir = str(tmp_path / "paths")
+    for name in ("paths.npy", "cell_counts.npy", "pins.npy", "meta.json"):
+        assert os.path.exists(os.path.join(table_dir, name))
+    with open(os.path.join(table_dir, "meta.json")) as f:
+        meta = json.load(f)
+    assert meta["paths"] == 5 and len(meta["reports"]) == 3  # The missing report is skipped
+
+    loaded = fftgen_paths.PathTable.load(table_dir)
+    assert isinstance(loaded.paths, np.memmap) and isinstance(loaded.cell_counts, np.memmap)
+    assert len(loaded) == 5
+    assert list(loaded.paths["report"]) == [0, 0, 0, 1, 2]
+    assert list(loaded.paths["check"]) == [0, 0, 0, 0, 1]
+    # Genus slacks in ps are converted to ns
+    assert loaded.paths["slack"] == pytest.approx([-0.12, -0.04, 0.015, -0.08, 0.02])
+    assert loaded.paths["arrival"][0] == pytest.approx(2.9)
+    assert list(loaded.paths["cells"]) == [5, 3, 3, 3, 2]
+    assert list(loaded.paths["depth"]) == [3, 1, 1, 1, 0]
+    assert str(loaded.pins[loaded.paths["endpoint"][0]]) == "bfly3/mult/q_reg_1_/D"
+    assert loaded.groups[loaded.paths["start_group"][0]] == "perm/mem"
+
+def test_slack_histogram(table):
+    counts, edges = table.slack_histogram(bins=2)
+    assert list(counts) == [2, 2]
+    assert edges[0] == pytest.approx(-0.12) and edges[-1] == pytest.approx(0.015)
+    counts, _ = table.slack_histogram(bins=2, check="Hold")
+    assert counts.sum() == 1
+
+def test_top_failing_endpoints(table):
+    assert table.top_failing_endpoints() == [("bfly3/mult/q_reg_1_/D", pytest.approx(-0.12), 2),
+                                             ("perm1/mem/q_reg_3_/D", pytest.approx(-0.08), 1)]
+    assert len(table.top_failing_endpoints(k=1)) == 1
+    assert [row[0] for row in table.top_failing_endpoints(report=1)] == ["perm1/mem/q_reg_3_/D"]
+    assert table.top_failing_endpoints(check="Hold") == []
+
+def test_group_summary(table):
+    rows = table.group_summary()
+    assert [row["group"] for row in rows] == ["bfly/mult", "perm/mem", "twiddle_rom"]
+    assert rows[0]["paths"] == 2 and rows[0]["failing"] == 2
+    assert rows[0]["worst"] == pytest.approx(-0.12) and rows[0]["tns"] == pytest.approx(-0.16)
+    assert rows[0]["mean_depth"] == 2.0
+    assert rows[2]["failing"] == 0 and rows[2]["tns"] == 0.0
+    assert [row["group"] for row in table.group_summary(by="start_group")] == ["perm/mem", "bfly/add", "twiddle_rom"]
+
+def test_cell_usage(table):
+    usage = dict(table.cell_usage())
+    assert usage == {FLOP: 6, "nand2_1": 2, "xor2_1": 1, "fa_1": 1, "mux2_1": 1}
+    assert table.cell_usage()[0] == (FLOP, 6)
+    assert dict(table.cell_usage(report=0, slack_below=-0.1)) == {FLOP: 2, "nand2_1": 1, "xor2_1": 1, "fa_1": 1}
+    assert table.cell_usage(check="Hold") == []
+
+def test_extract_project_paths(tmp_path):
+    fftgen_standins.write_par_reports(str(tmp_path), -0.1, 0.02, 4.0, 1000.0, paths=6)
+    table = fftgen_paths.extract_project_paths(str(tmp_path))
+    assert len(table) == 12 and len(table.reports) == 2
+    assert table.select("Setup").sum() == table.select("Hold").sum() == 6
+    assert table.paths["slack"][table.select("Setup")].min() == pytest.approx(-0.1)
+    assert os.path.isdir(os.path.join(str(tmp_path), "build", "paths"))
@@ -0,0 +1,86 @@
+import pytest
+
+import fftgen
+import fftgen_db
+import fftgen_predict
+
+def params(**overrides):
+    point = {"idN": "64", "idRadix": "2", "idStreamWidth": "2", "idWidth": "16", "idArch": "1"}
+    point.update({key: str(value) for key, value in overrides.items()})
+    return fftgen.normalize_params(point)
+
+def run(point, syn_clock_period, par_clock_period=None):
+    return dict(point, syn_clock_period=syn_clock_period, par_clock_period=par_clock_period)
+
+def training_runs(count, syn_scale=1.0):
+    """Past runs over widths and sizes, whose periods grow with the data width."""
+    runs = []
+    for i in range(count):
+        point = params(idN=64 << (i % 3), idWidth=8 + 4 * i)
+        runs.append(run(point, syn_scale * (1.0 + 0.1 * int(point["idWidth"])),
+                        syn_scale * (1.1 + 0.01 * i) * (1.0 + 0.1 * int(point["idWidth"]))))
+    return runs
+
+def test_heuristic_without_enough_runs():
+    target = params(idWidth=24)
+    predictor = fftgen_predict.PeriodPredictor(training_runs(fftgen_predict.MIN_TRAINING_RUNS - 1))
+    assert predictor.syn_model is None
+    assert predictor.initial_period(target) == (fftgen_predict.heuristic_period(target), "heuristic")
+
+def test_model_with_enough_runs():
+    predictor = fftgen_predict.PeriodPredictor(training_runs(fftgen_predict.MIN_TRAINING_RUNS))
+    period, source = predictor.initial_period(params(idN=128, idWidth=18))
+    assert source == f"model of {fftgen_predict.MIN_TRAINING_RUNS} runs"
+    assert period == pytest.approx(1.0 + 0.1 * 18, rel=0.2)
+
+def test_past_run_comes_first():
+    runs = training_runs(fftgen_predict.MIN_TRAINING_RUNS)
+    target = params(idN=128, idWidth=18)
+    runs.insert(0, run(target, 4.321, 4.5))
+    predictor = fftgen_predict.PeriodPredictor(runs)
+    assert predictor.syn_model is not None
+    assert predictor.initial_period(target) == (4.321, "past run")
+    assert predictor.par_ratio(target) == (pytest.approx(4.5 / 4.321), "past run")
+
+@pytest.mark.parametrize("syn_scale, expected", [(0.01, fftgen_predict.MIN_PERIOD), (100.0, fftgen_predict.MAX_PERIOD)])
+def test_model_is_clamped(syn_scale, expected):
+    predictor = fftgen_predict.PeriodPredictor(training_runs(fftgen_predict.MIN_TRAINING_RUNS, syn_scale))
+    period, source = predictor.initial_period(params(idWidth=18))
+    assert source.startswith("model") and period == expected
+
+def test_heuristic_is_clamped():
+    assert fftgen_predict.heuristic_period(params(idWidth=300)) == fftgen_predict.MAX_PERIOD
+    assert fftgen_predict.MIN_PERIOD <= fftgen_predict.heuristic_period(params(idWidth=1)) < 2.0
+
+def test_par_ratio_fallbacks():
+    target = params(idN=128, idWidth=18)
+    assert fftgen_predict.PeriodPredictor([]).par_ratio(target) == (fftgen_predict.DEFAULT_PAR_RATIO, "default")
+
+    runs = training_runs(3)
+    ratios = [r["par_clock_period"] / r["syn_clock_period"] for r in runs]
+    assert fftgen_predict.PeriodPredictor(runs).par_ratio(target) == (pytest.approx(sorted(ratios)[1]),
+                                                                      "median of 3 runs")
+    # A past run of the point without a PaR period does not count as a past run
+    runs.append(run(target, 2.0))
+    assert fftgen_predict.PeriodPredictor(runs).par_ratio(target)[1] == "median of 3 runs"
+
+    runs = training_runs(fftgen_predict.MIN_TRAINING_RUNS)
+    ratios = [r["par_clock_period"] / r["syn_clock_period"] for r in runs]
+    ratio, source = fftgen_predict.PeriodPredictor(runs).par_ratio(target)
+    assert source == f"model of {len(runs)} runs"
+    assert min(ratios) <= ratio <= max(ratios)
+
+def test_from_db(tmp_path):
+    target = params(idWidth=20)
+    missing = fftgen_predict.PeriodPredictor.from_db(str(tmp_path / "missing.db"))
+    assert missing.runs == [] and missing.initial_period(target)[1] == "heuristic"
+    assert fftgen_predict.PeriodPredictor.from_db(None).runs == []
+    # A directory is not a database
+    assert fftgen_predict.PeriodPredictor.from_db(str(tmp_path)).runs == []
+
+    db = fftgen_db.ResultsDB(str(tmp_path / "results.db"))
+    db.record("done", "done", target, {"status": "completed", "syn_clock_period": 2.5, "par_clock_period": 2.75})
+    db.record("failed", "failed", params(idWidth=12), {"status": "failed", "syn_clock_period": 1.5})
+    predictor = fftgen_predict.PeriodPredictor.from_db(db.path)
+    assert len(predictor.runs) == 1
+    assert predictor.initial_period(target) == (2.5, "past run")
@@ -0,0 +1,89 @@
+import concurrent.futures
+import threading
+
+import pytest
+
+import fftgen_profile
+
+def make_span(name, start, wall, depth=0, parent=None, thread="MainThread", pid=100, **args):
+    return {"name": name, "cat": "flow", "start": start, "wall": wall, "cpu": 0.0, "child_cpu": 0.0,
+            "max_rss_mb": 10.0, "child_max_rss_mb": 0.0, "pid": pid, "thread": thread, "depth": depth,
+            "parent": parent, "args": args}
+
+def test_spans_nest():
+    profiler = fftgen_profile.Profiler()
+    with profiler.activate():
+        with fftgen_profile.span("flow", design="n64"):
+            with fftgen_profile.span("synthesis", "stage") as args:
+                args["period"] = 2.5
+                with fftgen_profile.span("make", "tool"):
+                    pass
+        with fftgen_profile.span("report"):
+            pass
+    spans = {s["name"]: s for s in profiler.spans}
+    assert [s["name"] for s in profiler.spans] == ["make", "synthesis", "flow", "report"]  # In order of completion
+    assert (spans["flow"]["depth"], spans["flow"]["parent"]) == (0, None)
+    assert (spans["synthesis"]["depth"], spans["synthesis"]["parent"]) == (1, "flow")
+    assert (spans["make"]["depth"], spans["make"]["parent"]) == (2, "synthesis")
+    assert (spans["report"]["depth"], spans["report"]["parent"]) == (0, None)
+    assert spans["flow"]["args"] == {"design": "n64"} and spans["synthesis"]["args"] == {"period": 2.5}
+    assert spans["synthesis"]["cat"] == "stage"
+    assert spans["flow"]["wall"] >= spans["synthesis"]["wall"] >= spans["make"]["wall"]
+
+def test_span_without_profiler_records_nothing():
+    assert fftgen_profile.current() is None
+    with fftgen_profile.span("orphan", value=1) as args:
+        assert args == {"value": 1}
+    profiler = fftgen_profile.Profiler()
+    with profiler.activate():
+        assert fftgen_profile.current() is profiler
+    assert fftgen_profile.current() is None and profiler.spans == []
+
+def test_bind_carries_the_parent_stack_to_a_pool_thread():
+    def work(index):
+        with fftgen_profile.span("download", index=index):
+            return threading.current_thread().name
+
+    assert fftgen_profile.bind(work) is work  # Nothing to carry without a profiler
+    profiler = fftgen_profile.Profiler()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        with profiler.activate(), fftgen_profile.span("generate"):
+            with fftgen_profile.span("batch"):
+                threads = list(executor.map(fftgen_profile.bind(work), range(3)))
+        # The pool threads are left without the profiler, so unbound work records nothing
+        executor.submit(work, 9).result()
+    downloads = [s for s in profiler.spans if s["name"] == "download"]
+    assert sorted(s["args"]["index"] for s in downloads) == [0, 1, 2]  # Not 9
+    assert all(s["depth"] == 2 and s["parent"] == "batch" for s in downloads)
+    assert {s["thread"] for s in downloads} == set(threads) and threading.current_thread().name not in threads
+    assert [s["name"] for s in profiler.spans if s["depth"] == 0] == ["generate"]
+
+def test_summarize():
+    spans = [make_span("flow", 0.0, 10.0),
+             make_span("make", 1.0, 3.0, depth=1, parent="flow"),
+             make_span("make", 5.0, 5.0, depth=1, parent="flow"),
+             make_span("flow", 20.0, 30.0)]
+    rows = {row["name"]: row for row in fftgen_profile.summarize(spans)}
+    assert [row["name"] for row in fftgen_profile.summarize(spans)] == ["flow", "make"]
+    assert rows["flow"]["count"] == 2 and rows["flow"]["wall"] == 40.0 and rows["flow"]["mean"] == 20.0
+    assert rows["flow"]["max"] == 30.0 and rows["flow"]["share"] == 1.0
+    # Shares are of the top-level wall time, so nested spans are not counted twice
+    assert rows["make"]["mean"] == 4.0 and rows["make"]["share"] == pytest.approx(8.0 / 40.0)
+    assert fftgen_profile.summarize([]) == []
+
+def test_chrome_trace():
+    groups = {"n64": [make_span("flow", 100.0, 2.5), make_span("make", 100.5, 1.25, depth=1, parent="flow",
+                                                                  thread="worker", period=2.0)],
+              "n256": [make_span("flow", 101.0, 0.000125, pid=200)]}
+    trace = fftgen_profile.chrome_trace(groups)
+    assert trace["displayTimeUnit"] == "ms"
+    events = trace["traceEvents"]
+    assert {(e["pid"], e["args"]["name"]) for e in events if e["name"] == "process_name"} == {(1, "n64"), (2, "n256")}
+    assert {(e["pid"], e["tid"], e["args"]["name"]) for e in events if e["name"] == "thread_name"} == \
+        {(1, 1, "MainThread (pid 100)"), (1, 2, "worker (pid 100)"), (2, 1, "MainThread (pid 200)")}
+    assert all(e["ph"] == "M" for e in events if e["name"] in ("process_name", "thread_name"))
+    complete = [(e["pid"], e["tid"], e["name"], e["ts"], e["dur"]) for e in events if e["ph"] == "X"]
+    # Times are in microseconds from the earliest span
+    assert complete == [(1, 1, "flow", 0, 2500000), (1, 2, "make", 500000, 1250000), (2, 1, "flow", 1000000, 125)]
+    make = next(e for e in events if e["name"] == "make")
+    assert make["cat"] == "flow" and make["args"]["period"] == 2.0 and "child_cpu" in make["args"]
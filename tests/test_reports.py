@@ -0,0 +1,100 @@
+import gzip
+import os
+
+import pytest
+
+import fftgen_reports
+import fftgen_standins
+
+def report_slacks(path):
+    """Returns the Slack:= values of a timing report, read independently of fftgen_reports."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rt') as f:
+        return [float(line.split()[-1]) for line in f if line.strip().startswith("Slack:=")]
+
+def test_open_report_detects_gzip(tmp_path):
+    plain = str(tmp_path / "plain.rpt")
+    compressed = str(tmp_path / "compressed.rpt.gz")
+    fftgen_standins.write_timing_report(plain, -0.1, 3.0, paths=2)
+    fftgen_standins.write_timing_report(compressed, -0.1, 3.0, paths=2)
+    with open(plain, 'rb') as f:
+        text = f.read()
+    with fftgen_reports.open_report(plain) as f:
+        assert f.read() == text
+    # The .gz suffix is optional and the contents are decompressed on the fly
+    with fftgen_reports.open_report(str(tmp_path / "compressed.rpt")) as f:
+        assert f.read() == text
+    # A gzip file without the suffix is recognized by its magic bytes
+    os.rename(compressed, str(tmp_path / "renamed.rpt"))
+    with fftgen_reports.open_report(str(tmp_path / "renamed.rpt")) as f:
+        assert f.read() == text
+    with pytest.raises(FileNotFoundError):
+        fftgen_reports.open_report(str(tmp_path / "missing.rpt"))
+
+@pytest.mark.parametrize("style, unit, scale", [("genus", "ps", 1000), ("innovus", "ns", 1)])
+def test_scan_timing_report(tmp_path, style, unit, scale):
+    path = str(tmp_path / "setup.rpt.gz")
+    fftgen_standins.write_timing_report(path, -0.25, 3.0, style=style, paths=12)
+    slacks = report_slacks(path)
+    summary = fftgen_reports.scan_timing_report(path, chunk_size=4096)
+    assert summary.unit == unit
+    assert not summary.met
+    assert summary.slack == pytest.approx(-0.25 * scale)
+    assert summary.paths == 12 and summary.violating == 12
+    assert summary.wns == pytest.approx(min(slacks))
+    assert summary.tns == pytest.approx(sum(slacks))
+
+def test_scan_timing_report_counts_only_violations(tmp_path):
+    path = str(tmp_path / "setup.rpt")
+    fftgen_standins.write_timing_report(path, -0.02, 3.0, paths=20)
+    slacks = report_slacks(path)
+    summary = fftgen_reports.scan_timing_report(path)
+    assert 0 < summary.violating < summary.paths == 20
+    assert summary.violating == sum(slack < 0 for slack in slacks)
+    assert summary.tns == pytest.approx(sum(slack for slack in slacks if slack < 0))
+
+def test_scan_timing_report_met(tmp_path):
+    path = str(tmp_path / "hold.rpt")
+    fftgen_standins.write_timing_report(path, 0.05, 3.0, style="innovus", check="Hold", paths=4)
+    summary = fftgen_reports.scan_timing_report(path)
+    assert summary.met and summary.slack_time == "0.050 ns"
+    assert summary.wns == 0.0 and summary.tns == 0.0 and summary.violating == 0
+
+def test_scan_timing_report_max_paths(tmp_path):
+    path = str(tmp_path / "setup.rpt")
+    fftgen_standins.write_timing_report(path, -0.25, 3.0, paths=12)
+    summary = fftgen_reports.scan_timing_report(path, max_paths=1)
+    assert summary.paths == 1
+    assert summary.wns == summary.tns == summary.slack == -250
+
+def test_scan_timing_report_without_paths(tmp_path):
+    path = tmp_path / "empty.rpt"
+    path.write_text("No paths found.\n")
+    assert fftgen_reports.scan_timing_report(str(path)) is None
+
+def test_read_area_and_power(tmp_path):
+    par_dir = fftgen_standins.write_par_reports(str(tmp_path), -0.1, 0.02, 4.0, 12345.5, paths=3)
+    assert fftgen_reports.read_area_report(os.path.join(par_dir, "dft_top_area.rpt")) == pytest.approx(12345.5)
+    assert fftgen_reports.read_area_report(os.path.join(par_dir, "dft_top_area.rpt"), top="missing") is None
+    power = fftgen_reports.read_power_report(os.path.join(par_dir, "dft_top_power.rpt"))
+    assert power["internal"] == pytest.approx(12345.5 * 1e-5 / 4.0)
+    assert power["switching"] == pytest.approx(12345.5 * 1.2e-5 / 4.0)
+    assert power["leakage"] == pytest.approx(12345.5 * 1e-7)
+    assert power["total"] == pytest.approx(power["internal"] + power["switching"] + power["leakage"])
+
+def test_read_ppa(tmp_path):
+    fftgen_standins.write_par_reports(str(tmp_path), -0.1, 0.02, 4.0, 12345.5, paths=3)
+    result = fftgen_reports.read_ppa(str(tmp_path))
+    assert result.errors == []
+    assert result.setup.slack == pytest.approx(-0.1) and result.setup.paths == 3
+    assert result.hold.met and result.hold.slack == pytest.approx(0.02)
+    assert result.area == pytest.approx(12345.5)
+    assert result.total_power is not None
+
+def test_read_ppa_lists_missing_reports(tmp_path):
+    par_dir = fftgen_standins.write_par_reports(str(tmp_path), -0.1, 0.02, 4.0, 12345.5, paths=3)
+    os.remove(os.path.join(par_dir, "dft_top_power.rpt"))
+    result = fftgen_reports.read_ppa(str(tmp_path))
+    assert result.area == pytest.approx(12345.5)
+    assert result.total_power is None
+    assert len(result.errors) == 1 and "power report" in result.errors[0]
@@ -0,0 +1,96 @@
+import fftgen
+
+def make_project(tmp_path, point, name, verilog_file=None, speculative_jobs=0):
+    params = fftgen.normalize_params(dict(point, idN=name))
+    return fftgen.FlowProject(params, str(tmp_path / str(name)), 3.0, verilog_path=verilog_file,
+                              speculative_jobs=speculative_jobs)
+
+def test_requirements_scale_with_speculative_jobs(tmp_path, point):
+    scheduler = fftgen.FlowScheduler(cores=64, memory_gb=256)
+    job = scheduler.submit(make_project(tmp_path, point, 64, speculative_jobs=4))
+    job.stage_index = job.stages.index("synthesis")
+    assert scheduler.requirements(job) == (8, 16, "genus", 4)
+    job.stage_index = job.stages.index("par")
+    assert scheduler.requirements(job) == (4, 8, "innovus", 1)
+
+def test_speculative_copies_clamped_to_licenses(tmp_path, point):
+    scheduler = fftgen.FlowScheduler(cores=64, memory_gb=256, licenses={"genus": 2})
+    job = scheduler.submit(make_project(tmp_path, point, 64, speculative_jobs=4))
+    job.stage_index = job.stages.index("synthesis")
+    # Every synthesis that runs holds a license, and the resources follow the clamped count
+    assert scheduler.copies(job) == 2
+    assert scheduler.requirements(job) == (4, 8, "genus", 2)
+    assert scheduler.fits(scheduler.requirements(job))
+
+def test_resources_are_held_and_released(tmp_path, point):
+    scheduler = fftgen.FlowScheduler(cores=8, memory_gb=16, licenses={"innovus": 1})
+    first = scheduler.submit(make_project(tmp_path, point, 64))
+    second = scheduler.submit(make_project(tmp_path, point, 256))
+    for job in (first, second):
+        job.stage_index = job.stages.index("par")
+    requirements = scheduler.requirements(first)
+    assert scheduler.fits(requirements)
+    scheduler._hold(requirements, 1)
+    assert scheduler.in_use == {"cores": 4, "memory_gb": 8}
+    assert scheduler.licenses_in_use == {"innovus": 1}
+    assert not scheduler.fits(scheduler.requirements(second))  # No Innovus license left
+    scheduler._hold(requirements, -1)
+    assert scheduler.in_use == {"cores": 0, "memory_gb": 0}
+    assert scheduler.licenses_in_use == {"innovus": 0}
+    assert scheduler.fits(scheduler.requirements(second))
+
+def test_stage_larger_than_host_is_clamped(tmp_path, point):
+    scheduler = fftgen.FlowScheduler(cores=2, memory_gb=4)
+    job = scheduler.submit(make_project(tmp_path, point, 64))
+    job.stage_index = job.stages.index("par")
+    assert scheduler.requirements(job) == (2, 4, "innovus", 1)
+    assert scheduler.fits(scheduler.requirements(job))
+
+class RecordingScheduler(fftgen.FlowScheduler):
+    """Records the most licenses and cores held at once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.peak = {"cores": 0, "genus": 0}
+
+    def _hold(self, requirements, sign):
+        super()._hold(requirements, sign)
+        self.peak["cores"] = max(self.peak["cores"], self.in_use["cores"])
+        self.peak["genus"] = max(self.peak["genus"], self.licenses_in_use.get("genus", 0))
+
+def test_run_respects_licenses(tmp_path, point, verilog_file):
+    # The generate stage stands in for a licensed tool run
+    scheduler = RecordingScheduler(max_workers=4, cores=8, memory_gb=16, licenses={"genus": 2},
+                                   stages=["generate"], stage_resources={"generate": {"cores": 1,
+                                                                                      "license": "genus"}})
+    for size in (64, 128, 256, 512, 1024):
+        scheduler.submit(make_project(tmp_path, point, size, verilog_file))
+    jobs = scheduler.run()
+    assert [job.status for job in jobs] == ["completed"] * 5
+    assert scheduler.peak["genus"] <= 2 and scheduler.peak["cores"] <= 2
+    assert scheduler.in_use == {"cores": 0, "memory_gb": 0}
+    assert scheduler.licenses_in_use == {"genus": 0}
+
+def test_pipeline_workers_follow_jobs_and_licenses():
+    assert fftgen.pipeline_workers(jobs=4, cores=64, memory_gb=256) == {"synthesis": 4, "par": 4}
+    assert fftgen.pipeline_workers(jobs=4, cores=64, memory_gb=256,
+                                   licenses={"genus": 2, "innovus": 1}) == {"synthesis": 2, "par": 1}
+    # A speculative synthesis worker holds a license per parallel synthesis
+    assert fftgen.pipeline_workers(jobs=4, cores=64, memory_gb=256, licenses={"genus": 4},
+                                   speculative_jobs=2) == {"synthesis": 2, "par": 4}
+
+def test_pipeline_workers_fit_memory():
+    # 2 syntheses (4 GiB each) and 2 Place-and-Route runs (8 GiB each) do not fit in 20 GiB
+    assert fftgen.pipeline_workers(jobs=2, cores=64, memory_gb=20) == {"synthesis": 1, "par": 2}
+    assert fftgen.pipeline_workers(jobs=2, cores=6, memory_gb=256) == {"synthesis": 1, "par": 1}
+    assert fftgen.pipeline_workers(jobs=4, cores=64, memory_gb=2) == {"synthesis": 1, "par": 1}
+
+def test_pipeline_survives_a_failing_callback(tmp_path, point, monkeypatch):
+    monkeypatch.setattr(fftgen, "run_flow_stage", lambda stage, project: project)
+    projects = [make_project(tmp_path, point, size) for size in (64, 128, 256)]
+
+    def on_project_done(project, status, error):
+        raise OSError("disk full")
+    flow_pipeline = fftgen.FlowPipeline(workers={"generate": 2, "synthesis": 2, "par": 1})
+    outcomes = flow_pipeline.run(projects, on_project_done=on_project_done)
+    assert [status for _, status, _ in outcomes] == ["completed"] * 3
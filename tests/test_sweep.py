@@ -0,0 +1,30 @@
+import fftgen
+
+def test_expand_sweep_product():
+    points, rejected = fftgen.expand_sweep({"defaults": {"idStreamWidth": 4},
+                                            "sweep": {"idN": [64, 256], "idRadix": [2, 4]}})
+    assert rejected == []
+    assert sorted((p["idN"], p["idRadix"]) for p in points) == [(64, '2'), (64, '4'), (256, '2'), (256, '4')]
+
+def test_expand_sweep_defaults_and_duplicates():
+    points, rejected = fftgen.expand_sweep({"defaults": {"idWidth": 12},
+                                            "points": [{"idN": 64}, {"idN": "64", "idWidth": "12"}]})
+    assert rejected == []
+    assert len(points) == 1
+    assert points[0]["idWidth"] == '12' and points[0]["idTWidth"] == '12'
+
+def test_expand_sweep_rejects_bad_points():
+    points, rejected = fftgen.expand_sweep({"points": [{"idN": 64}, {"idN": "sixty-four"}, {"idN": 64, "idFoo": 1},
+                                                       {"idN": 48}, {"idN": 64, "idRadix": 3}]})
+    assert [p["idN"] for p in points] == [64]
+    reasons = {str(point.get("idN")) + str(point.get("idRadix", "")): reason for point, reason in rejected}
+    assert len(rejected) == 4
+    assert "idN must be an integer" in reasons["sixty-four"]
+    assert "idFoo" in reasons["64"]
+    assert "power-of-2" in reasons["48"]
+    assert "idRadix 3" in reasons["643"]
+
+def test_expand_sweep_rejects_missing_idn():
+    points, rejected = fftgen.expand_sweep({"sweep": {"idWidth": [12, 16]}})
+    assert points == []
+    assert len(rejected) == 2 and all("idN" in reason for _, reason in rejected)
@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+import pytest
+import yaml
+
+import fftgen
+import fftgen_model
+import fftgen_traces
+
+def params(n=16, stream_width=4, width=12, floating=False):
+    return {"idN": str(n), "idRadix": "2", "idStreamWidth": str(stream_width), "idDataType": '1' if floating else '0',
+            "idWidth": str(width), "idTWidth": str(width), "idScale": '1', "idInverse": '0'}
+
+def decode(line, stream_width, width):
+    """Returns the opcode and the words of a trace line, X0 first."""
+    op, payload = line.split("_", 1)
+    assert len(payload) == stream_width * width
+    words = [int(payload[len(payload) - (i + 1) * width:len(payload) - i * width], 2) for i in range(stream_width)]
+    return int(op, 2), words
+
+def signed(words, width):
+    words = np.asarray(words, dtype=np.int64)
+    return np.where(words >= 1 << (width - 1), words - (1 << width), words)
+
+def read_trace(path):
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if not line.startswith("#")]
+
+def test_format_lines_puts_x0_in_the_low_bits():
+    words = np.array([1, 2, 3, 4], dtype=np.uint64)
+    assert fftgen_traces.format_lines("send", words, 2, 4) == b"0001_00100001\n0001_01000011\n"
+    lines = fftgen_traces.format_lines("receive", words, 4, 6).decode().splitlines()
+    assert lines == ["0010_000100000011000010000001"]
+    assert decode(lines[0], 4, 6) == (fftgen_traces.TRACE_OPS["receive"], [1, 2, 3, 4])
+
+def test_fixed_point_words():
+    model = fftgen_model.FFTModel(params(n=2, width=8))
+    words = fftgen_traces.to_words(np.array([[3 - 1j, -128 + 127j]]), model)
+    assert words.tolist() == [[3, 255, 128, 127]]  # Real and imaginary parts interleaved, two's complement
+    assert signed(words[0], 8).tolist() == [3, -1, -128, 127]
+
+def test_floating_point_words():
+    model = fftgen_model.FFTModel(params(n=2, floating=True))
+    words = fftgen_traces.to_words(np.array([[1.0 - 2.0j, 0.5 + 0j]], dtype=np.complex64), model)
+    assert words.tolist() == [[0x3f800000, 0xc0000000, 0x3f000000, 0]]
+    line = fftgen_traces.format_lines("send", words, 2, 32).decode().splitlines()[0]
+    assert decode(line, 2, 32)[1] == [0x3f800000, 0xc0000000]
+
+@pytest.mark.parametrize("stream_width", [2, 4])
+def test_write_traces_round_trip(tmp_path, stream_width):
+    point, frames, seed = params(stream_width=stream_width), 3, 7
+    meta = fftgen_traces.write_traces(point, str(tmp_path), frames=frames, seed=seed)
+    lines_per_frame = 2 * 16 // stream_width
+    assert meta["lines_per_frame"] == lines_per_frame and meta["payload_bits"] == stream_width * 12
+    assert meta["overflows"] == 0
+    with open(tmp_path / fftgen_traces.TRACE_META) as f:
+        assert json.load(f)["frames"] == frames
+
+    # The inputs and outputs the traces should carry, from the same random inputs
+    model = fftgen_model.FFTModel(point)
+    x = model.quantize(fftgen_model.random_inputs(16, frames, amplitude=0.5, rng=np.random.default_rng(seed)))
+    y = model.transform(x)[0] * 2.0 ** 11
+    for path, op, values, trailer in ((meta["input"], "send", x, ["done"]),
+                                      (meta["expected"], "receive", y, ["done", "finish"])):
+        lines = read_trace(path)
+        assert len(lines) == frames * lines_per_frame + len(trailer)
+        for line, name in zip(lines[-len(trailer):], trailer):
+            assert decode(line, stream_width, 12) == (fftgen_traces.TRACE_OPS[name], [0] * stream_width)
+        decoded = [decode(line, stream_width, 12) for line in lines[:-len(trailer)]]
+        assert {opcode for opcode, _ in decoded} == {fftgen_traces.TRACE_OPS[op]}
+        words = signed([word for _, cycle in decoded for word in cycle], 12).reshape(frames, 16, 2)
+        assert words[..., 0].tolist() == values.real.tolist()
+        assert words[..., 1].tolist() == values.imag.tolist()
+
+def test_tb_file_lists_traces(tmp_path):
+    tb_path = str(tmp_path / "tb.yml")
+    traces = ["traces/fft_input.tr", "traces/fft_expected.tr"]
+    fftgen.create_tb_file(tb_path, traces)
+    with open(tb_path) as f:
+        tb = yaml.safe_load(f)
+    assert tb["sim.inputs.trace_files"] == traces
+    assert "${bsg_root}/bsg_fsb/bsg_fsb_node_trace_replay.v" in tb["sim.inputs.tb_input_files"]
+    fftgen.create_tb_file(tb_path)
+    with open(tb_path) as f:
+        assert yaml.safe_load(f)["sim.inputs.trace_files"] == []
@@ -0,0 +1,158 @@
+import os
+import re
+import subprocess
+
+import pytest
+
+import fftgen
+import fftgen_standins
+
+def test_ladder_converges(fake_stage):
+    period, history = fake_stage.tune(5.0, "Synthesis", search=fftgen.LadderSearch())
+    assert history[-1]["outcome"] == "done"
+    assert history[-1]["met"]
+    assert 2.0 <= period <= 2.1
+    assert fake_stage.constrained_period() == period == fake_stage.runs[-1]
+
+@pytest.mark.parametrize("process_type", ["Synthesis", "Place-and-Route"])
+def test_bracket_converges(fake_stage, process_type):
+    period, history = fake_stage.tune(5.0, process_type, search=fftgen.BracketSearch())
+    assert history[-1]["outcome"] == "done"
+    assert history[-1]["met"]
+    assert 2.0 <= period <= 2.1
+    assert len(history) <= 3
+    assert fake_stage.constrained_period() == period == fake_stage.runs[-1]
+
+def test_bracket_works_to_the_stage_budget(fake_stage):
+    # Half the distance to the critical path is slack, so every probe passes and none is tight
+    fake_stage.slack = lambda period: round((period - 2.0) / 2, 4)
+    search = fftgen.BracketSearch(accept_slack=0.0)
+    period, history = fake_stage.tune(10.0, "Place-and-Route", search=search, max_iterations=12)
+    assert len(history) == 12 and all(h["met"] for h in history)
+    assert period == min(h["period"] for h in history) == fake_stage.constrained_period()
+
+def test_bracket_estimate_below_the_failing_period_is_finite():
+    search = fftgen.BracketSearch()
+    # A failing run reporting positive slack (e.g. a hold-fixing run) estimates below its own period
+    period, done = search.next_period(2.0, 0.5, "Place-and-Route", False)
+    assert not done and period == 4.0
+    # Bisection once a passing period is known
+    search.next_period(4.0, 1.5, "Place-and-Route", True)
+    assert search.next_period(2.0, 0.5, "Place-and-Route", False) == (3.0, False)
+
+def test_budget_keeps_tightest_passing_period(fake_stage):
+    # The ladder walks down from 6 ns in 2 ns steps: 6 and 4 pass, the budget ends before 2
+    period, history = fake_stage.tune(6.0, "Synthesis", search=fftgen.LadderSearch(), max_iterations=2)
+    assert [h["period"] for h in history] == [6.0, 4.0]
+    assert history[-1]["outcome"] == "budget"
+    assert period == 4.0
+    assert fake_stage.runs == [6.0, 4.0]
+    assert fake_stage.constrained_period() == 4.0
+
+def test_budget_reruns_passing_period_after_failing_probe(fake_stage):
+    fake_stage.slack = lambda period: round(period - 2.0, 4) if period != 2.0 else -0.2
+    period, history = fake_stage.tune(4.0, "Synthesis", search=fftgen.LadderSearch(), max_iterations=2)
+    assert [h["period"] for h in history] == [4.0, 2.0]
+    assert history[-1]["outcome"] == "budget"
+    assert period == 4.0
+    assert fake_stage.runs == [4.0, 2.0, 4.0]  # Rerun so the build directory holds the 4 ns results
+    assert fake_stage.constrained_period() == 4.0
+
+def test_budget_without_passing_period_is_unmet(fake_stage):
+    fake_stage.slack = lambda period: -1.5
+    period, history = fake_stage.tune(0.5, "Synthesis", search=fftgen.LadderSearch(), max_iterations=2)
+    assert [h["period"] for h in history] == [0.5, 2.5]
+    assert not any(h["met"] for h in history)
+    assert history[-1]["outcome"] == "unmet"
+    assert period == history[-1]["period"] == fake_stage.runs[-1]
+    assert fake_stage.constrained_period() == period
+
+def test_unmet_budget_fails_the_stage(tmp_path, point, fake_stage):
+    fake_stage.slack = lambda period: -1.5
+    project = fftgen.FlowProject(fftgen.normalize_params(point), str(tmp_path / "unmet"), 2.0, max_iterations=3)
+    os.makedirs(project.cfg_dir)
+    fake_stage.project_dir = project.project_dir
+    with pytest.raises(RuntimeError, match="unmet"):
+        fftgen.run_flow_stage("synthesis", project)
+    assert len(fake_stage.runs) == 3
+    assert "synthesis" not in project.completed_stages
+    assert project.history[-1]["outcome"] == "unmet"
+
+def test_resumed_tuning_past_its_budget(fake_stage):
+    fake_stage.slack = lambda period: round(period - 2.0, 4) if period != 2.0 else -0.2
+    _, history = fake_stage.tune(4.0, "Synthesis", search=fftgen.LadderSearch(), max_iterations=2)
+    resumed = [dict(entry, outcome="rerun") for entry in history]
+    fake_stage.runs = []
+    period, history = fake_stage.tune(1.0, "Synthesis", search=fftgen.LadderSearch(), max_iterations=2,
+                                      resumed=resumed)
+    assert [h["period"] for h in history] == [4.0, 2.0]
+    assert history[-1]["outcome"] == "budget"
+    assert period == 4.0 == fake_stage.constrained_period()
+    assert fake_stage.runs == []  # The 4 ns results are still in the build directory
+
+def test_resumed_tuning_past_its_budget_without_passing_period(fake_stage):
+    resumed = [{"iteration": 1, "period": 1.5, "slack": -500, "met": False, "runtime": 1.0, "outcome": "rerun"}]
+    period, history = fake_stage.tune(2.0, "Synthesis", search=fftgen.LadderSearch(), max_iterations=1,
+                                      resumed=resumed)
+    assert history[-1]["outcome"] == "unmet"
+    assert period == 1.5 == fake_stage.constrained_period()
+    assert fake_stage.runs == []
+
+def test_budget_must_allow_a_run(fake_stage, capsys):
+    with pytest.raises(ValueError):
+        fake_stage.tune(4.0, "Synthesis", max_iterations=0)
+    assert fake_stage.runs == []
+    with pytest.raises(SystemExit):
+        fftgen.parse_args(["--max-iterations", "0"])
+    assert "--max-iterations must be at least 1" in capsys.readouterr().err
+
+class BouncingSearch:
+    """A search that alternates between two periods and never finishes."""
+    name = "bouncing"
+
+    def __init__(self, periods):
+        self.periods = periods
+        self.probes = []
+
+    def next_period(self, clock_period, slack_value, process_type, met):
+        next_period = self.periods[1] if clock_period == self.periods[0] else self.periods[0]
+        fftgen.log_period_probe(self, clock_period, slack_value, process_type, next_period, False)
+        return next_period, False
+
+def test_oscillation_settles_on_tightest_passing_period(fake_stage):
+    period, history = fake_stage.tune(2.5, search=BouncingSearch([2.5, 1.5]))
+    assert [h["period"] for h in history] == [2.5, 1.5, 2.5]
+    assert history[-1]["outcome"] == "settled"
+    assert period == 2.5
+    assert fake_stage.constrained_period() == 2.5 == fake_stage.runs[-1]
+
+def test_oscillation_without_passing_period_fails(fake_stage):
+    period, history = fake_stage.tune(1.5, search=BouncingSearch([1.5, 1.0]))
+    assert [h["period"] for h in history] == [1.5, 1.0]
+    assert history[-1]["outcome"] == "failed"
+    assert fake_stage.runs == [1.5, 1.0]  # The failing period is not run again
+
+def test_speculative_synthesis_history(tmp_path, monkeypatch):
+    project_dir = str(tmp_path / "fftgen")
+    for name in ("v", "cfg"):
+        os.makedirs(os.path.join(project_dir, name))
+    open(os.path.join(project_dir, "Makefile"), 'w').close()
+
+    def run_logged(command, cwd, log_path, parser, echo=None):
+        with open(os.path.join(cwd, "cfg", "constraints.tcl")) as f:
+            period = float(re.search(r"-period\s+(\S+)", f.read()).group(1))
+        fftgen_standins.write_timing_report(fftgen.setup_report_path(cwd, "Synthesis"), round(period - 2.0, 4),
+                                            period, paths=2)
+        return subprocess.CompletedProcess(command, 0)
+    monkeypatch.setattr(fftgen.fftgen_logs, "run_logged", run_logged)
+
+    history = []
+    winner, run_dir = fftgen.run_speculative_synthesis(project_dir, 4.0, jobs=3, rounds=1, history=history)
+    assert winner == 2.0
+    assert run_dir == os.path.join(project_dir, "speculative", "period_2.0")
+    assert sorted(entry["period"] for entry in history) == [2.0, 4.0, 6.0]
+    assert [entry["iteration"] for entry in history] == [1, 2, 3]
+    assert history[-1]["period"] == 2.0 and history[-1]["outcome"] == "done"
+    assert all(entry["stage"] == "Synthesis" and entry["round"] == 1 and entry["outcome"] in ("met", "done")
+               for entry in history)
+    assert {entry["period"]: entry["slack"] for entry in history} == {2.0: 0.0, 4.0: 2000.0, 6.0: 4000.0}
@@ -0,0 +1,100 @@
+import os
+
+import fftgen
+import fftgen_verilog
+
+DESIGN = """/* A block comment hiding a module:
+module hidden(a);
+  assign x = a * b + c;
+endmodule
+*/
+module sub(clk, a, b, y);
+  input clk;
+  input [15:0] a, b;   // a + b * c
+  output reg [15:0] y;
+  parameter W = 4 * 4 + 1;
+  localparam H = W * 2 - 1;
+  wire [15:0] s = a + b;  /* a * b */ wire [15:0] t;
+  assign t = (a == b) ? a - b : -a;
+  reg [15:0] r0, r1;
+  always @(posedge clk) begin
+    if (a + b > 3)
+      y <= s * t; // * +
+    else begin
+      r0 <= a +
+            b;
+    end
+    /* r1 <= a * b;
+       r1 <= a * b; */
+    r1 <= 16'd5 - a; r0 <= -16'd3;
+  end
+  always @(posedge clk) y <= a * b;
+endmodule
+module dft_top(clk);
+  input clk;
+  sub s0(clk, , , );
+  sub s1(clk, , , );
+endmodule
+"""
+
+def write_design(tmp_path, text=DESIGN):
+    path = tmp_path / "design.v"
+    path.write_text(text)
+    return str(path)
+
+def test_block_comments_are_skipped(tmp_path):
+    stats = fftgen_verilog.analyze_verilog(write_design(tmp_path))
+    assert set(stats.modules) == {"sub", "dft_top"}
+    assert stats.instance_counts == {"dft_top": 1, "sub": 2}
+
+def test_only_assignments_count_operators(tmp_path):
+    stats = fftgen_verilog.analyze_verilog(write_design(tmp_path))
+    # Per instance: s * t and a * b; a + b (wire), a - b (assign), the two-line a + b and 16'd5 - a
+    assert stats.multipliers == 2 * 2
+    assert stats.adders == 2 * 4
+    assert stats.register_bits == 2 * 3 * 16
+
+def test_module_lines(tmp_path):
+    stats = fftgen_verilog.analyze_verilog(write_design(tmp_path))
+    assert stats.lines == DESIGN.count("\n")
+    assert stats.modules["sub"].lines == 22
+    assert stats.modules["dft_top"].lines == 5
+
+def test_long_declaration(tmp_path):
+    names = [f"r{i}" for i in range(5000)]
+    path = write_design(tmp_path, "module dft_top(clk);\n  reg [7:0] " + ",\n    ".join(names) + ";\nendmodule\n")
+    assert fftgen_verilog.analyze_verilog(path).register_bits == 8 * len(names)
+
+def test_stats_round_trip(tmp_path):
+    stats = fftgen_verilog.analyze_verilog(write_design(tmp_path))
+    restored = fftgen_verilog.VerilogStats.from_dict(stats.as_dict())
+    assert restored.as_dict() == stats.as_dict()
+
+def test_stats_cache(tmp_path, verilog_file, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    first = fftgen.process_verilog_file(verilog_file, cache_dir=cache_dir)
+    sha256 = fftgen.file_sha256(verilog_file)
+    assert os.path.exists(fftgen.verilog_stats_cache_path(sha256, cache_dir))
+
+    def analyze(path):
+        raise AssertionError("analyzed a cached file")
+    monkeypatch.setattr(fftgen.fftgen_verilog, "analyze_verilog", analyze)
+    cached = fftgen.process_verilog_file(verilog_file, cache_dir=cache_dir)
+    assert cached.as_dict() == first.as_dict()
+
+def test_stats_cache_keyed_by_content(tmp_path, verilog_file):
+    cache_dir = str(tmp_path / "cache")
+    fftgen.process_verilog_file(verilog_file, cache_dir=cache_dir)
+    with open(verilog_file, 'a') as f:
+        f.write("module extra(clk);\n  reg [7:0] r;\nendmodule\n")
+    stats = fftgen.process_verilog_file(verilog_file, cache_dir=cache_dir)
+    assert "extra" in stats.modules
+
+def test_stats_removed_with_cache_entry(tmp_path, point, verilog_file):
+    cache_dir = str(tmp_path / "cache")
+    meta = fftgen.store_verilog_cache(point, verilog_file, cache_dir=cache_dir)
+    fftgen.process_verilog_file(verilog_file, cache_dir=cache_dir)
+    stats_path = fftgen.verilog_stats_cache_path(meta["sha256"], cache_dir)
+    assert os.path.exists(stats_path)
+    fftgen.remove_verilog_cache_entry(cache_dir, meta["key"])
+    assert not os.path.exists(stats_path)